@@ -0,0 +1,204 @@
+"""
+Boots the full game for benchmarking with scripted_game.boot_scripted_game,
+the same boot the gameplay tests use (dummy SDL drivers, a ScriptedInputService
+in place of the real input service), and wraps the hot paths with timers.
+
+    game = boot_game(u5_dir)
+    game.scripted.queue_keys(pygame.K_UP, pygame.K_UP)
+    game.party_controller.run()
+    game.frame_timer.summary()    # DisplayServiceImplementation.render
+    game.turn_timer.summary()     # PartyController.run, input to next input
+    game.combat_turn_timer.summary()  # CombatController.enter_combat, input to next party member's input
+
+Pass a cache_root to keep the on-disk caches (decoded assets, baked light maps)
+somewhere other than the engine's log/ directory, e.g. for synthetic game files.
+
+Frames
+------
+ScriptedInputService hands out queued events immediately, where the real
+input service renders while it waits for a key.  BenchmarkInputService puts
+that back: it renders `frames_per_event` frames before returning each event,
+so a scripted walk draws the screen the way a played one does.
+
+Turns
+-----
+A turn is measured from the moment an input event is handed to the game until
+the game next asks for input, i.e. handling the key, passing time, every NPC
+moving, and (when it happens) the combat screen setting itself up.  Only the
+intervals in which time actually passed are counted; console typing and the
+like are left out.
+
+Combat rounds don't pass time, so they're timed separately: from one party
+member's input to the next party member being handed the controls, i.e.
+handling the action and every monster's turn in between.
+"""
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import pygame
+
+from scripted_game import boot_scripted_game
+from service_implementations.scripted_input_service import ScriptedInputService
+
+
+def percentiles(samples: list[float], points = (50, 90, 99)) -> dict[str, float]:
+    # nearest-rank, so every reported value is one that was actually measured.
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {f"p{point}": ordered[max(0, math.ceil(point / 100 * len(ordered)) - 1)] for point in points}
+    result["max"]  = ordered[-1]
+    result["mean"] = sum(ordered) / len(ordered)
+    return result
+
+
+class SampleTimer:
+
+    def __init__(self):
+        self.samples_ms = list[float]()
+
+    def add(self, elapsed_ns: int):
+        self.samples_ms.append(elapsed_ns / 1_000_000)
+
+    def summary(self) -> dict:
+        return {"count": len(self.samples_ms)} | {name: round(value, 3) for name, value in percentiles(self.samples_ms).items()}
+
+
+def time_calls(func: Callable, timer: SampleTimer) -> Callable:
+    def timed(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.add(time.perf_counter_ns() - start)
+    return timed
+
+
+class BenchmarkInputService(ScriptedInputService):
+
+    def __init__(self):
+        super().__init__()
+        self.frames_per_event = 1
+        self.turn_timer = SampleTimer()
+        self.combat_turn_timer = SampleTimer()
+
+        self._handed_out_ns: int = None
+        self._time_passed = False
+        self._combat_turn = False
+
+    # Called (via the dark event service) whenever the party's turn is over.
+    def time_passed(self):
+        self._time_passed = True
+
+    # Called (via the npc service) whenever a party member is given a combat turn.
+    def combat_turn_started(self):
+        self._combat_turn = True
+
+    def get_next_event(self) -> pygame.event.Event:
+        now = time.perf_counter_ns()
+        if not self._handed_out_ns is None:
+            if self._time_passed:
+                self.turn_timer.add(now - self._handed_out_ns)
+            elif self._combat_turn:
+                self.combat_turn_timer.add(now - self._handed_out_ns)
+        self._time_passed = False
+        self._combat_turn = False
+
+        if not self._has_quit:
+            for _ in range(self.frames_per_event):
+                self.display_service.render()
+
+        event = super().get_next_event()
+        self._handed_out_ns = time.perf_counter_ns()
+        return event
+
+
+class PeakMemory:
+    # ru_maxrss is free to read but not available everywhere (i.e. Windows), tracemalloc is the fallback.
+
+    def __init__(self):
+        try:
+            import resource
+            self._resource = resource
+        except ImportError:
+            self._resource = None
+            tracemalloc.start()
+
+    def peak_bytes(self) -> int:
+        if self._resource is None:
+            return tracemalloc.get_traced_memory()[1]
+        max_rss = self._resource.getrusage(self._resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS.
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def source(self) -> str:
+        return "tracemalloc" if self._resource is None else "ru_maxrss"
+
+
+class BenchmarkGame:
+
+    def __init__(self, provider, party_controller, scripted: BenchmarkInputService, frame_timer: SampleTimer, startup: dict):
+        self.provider         = provider
+        self.party_controller = party_controller
+        self.party_agent      = party_controller.party_agent
+        self.scripted         = scripted
+        self.frame_timer      = frame_timer
+        self.turn_timer       = scripted.turn_timer
+        self.combat_turn_timer = scripted.combat_turn_timer
+        self.startup          = startup
+
+    def run(self):
+        self.party_controller.run()
+
+
+def boot_game(u5_dir: Path, cache_root: Path = None) -> BenchmarkGame:
+    timings = {}
+    provider = boot_scripted_game(u5_dir, BenchmarkInputService, cache_root, timings)
+    initialised_at = time.time()
+
+    from controllers.party_controller import PartyController
+    from dark_libraries.dark_events   import DarkEventService
+    from data.global_registry_loader  import GlobalRegistryLoader
+    from services.display_service     import DisplayService
+    from services.input_service       import InputService
+
+    scripted = provider.resolve(InputService)
+
+    # count a turn whenever the party's pass_time goes out.
+    dark_event_service = provider.resolve(DarkEventService)
+    pass_time = dark_event_service.pass_time
+    def _pass_time(party_location):
+        scripted.time_passed()
+        return pass_time(party_location)
+    dark_event_service.pass_time = _pass_time
+
+    # and a combat turn whenever a party member is next to move.
+    from models.agents.party_member_agent import PartyMemberAgent
+    from services.npc_service             import NpcService
+    npc_service = provider.resolve(NpcService)
+    get_next_moving_npc = npc_service.get_next_moving_npc
+    def _get_next_moving_npc():
+        npc = get_next_moving_npc()
+        if isinstance(npc, PartyMemberAgent):
+            scripted.combat_turn_started()
+        return npc
+    npc_service.get_next_moving_npc = _get_next_moving_npc
+
+    frame_timer = SampleTimer()
+    display_service = provider.resolve(DisplayService)
+    display_service.render = time_calls(display_service.render, frame_timer)
+
+    global_registry_loader = provider.resolve(GlobalRegistryLoader)
+    startup = {
+        "compose_seconds":    round(timings["composed"] - timings["started"], 4),
+        "initialise_seconds": round(timings["initialised"] - timings["composed"], 4),
+        "initialised_at":     initialised_at,
+        "loader_workers":     global_registry_loader.LOADER_WORKERS,
+        "stage_seconds":      {name: round(seconds, 4) for name, seconds in global_registry_loader.stage_seconds.items()},
+    }
+
+    return BenchmarkGame(provider, provider.resolve(PartyController), scripted, frame_timer, startup)
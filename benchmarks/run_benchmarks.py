@@ -0,0 +1,171 @@
+"""
+Runs the benchmark scenarios and writes the results as JSON, so that runs can
+be compared across commits.
+
+Run from repo root:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --scenario town_walk --output town.json
+    python -m benchmarks.run_benchmarks --compare log/benchmarks/<earlier run>.json
+    python -m benchmarks.run_benchmarks --synthetic
+
+The U5 game files are found the way configure.py finds them.  Without them (or
+with --synthetic) the run uses files from data/synthetic_u5_data.py instead,
+which is recorded in the results so the two kinds of run aren't compared.
+
+Every scenario runs in a process of its own, so that each one pays for its own
+startup and peak memory isn't inherited from the one before.
+
+For each scenario the results have:
+    startup      launch to "Initialisation completed" (interpreter start and imports included),
+                 compose/initialise time, and GlobalRegistryLoader's per-stage seconds
+    frame_ms     DisplayServiceImplementation.render percentiles
+    turn_ms      PartyController.run per-turn latency percentiles
+    combat_turn_ms  CombatController.enter_combat party member to party member latency percentiles
+    peak_memory  bytes, and how it was measured
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.scenarios import SCENARIOS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd = ROOT, capture_output = True, text = True, check = True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenario(name: str, u5_dir: Path, frames_per_event: int, launched_at: float = None, cache_root: Path = None) -> dict:
+    from benchmarks.harness import PeakMemory, boot_game
+
+    memory = PeakMemory()
+
+    game = boot_game(u5_dir, cache_root)
+    if not launched_at is None:
+        game.startup["launch_seconds"] = round(game.startup["initialised_at"] - launched_at, 4)
+    game.scripted.frames_per_event = frames_per_event
+    SCENARIOS[name](game.scripted)
+
+    start = time.perf_counter()
+    game.run()
+    run_seconds = time.perf_counter() - start
+
+    return {
+        "startup":     game.startup,
+        "run_seconds": round(run_seconds, 4),
+        "frame_ms":    game.frame_timer.summary(),
+        "turn_ms":     game.turn_timer.summary(),
+        "combat_turn_ms": game.combat_turn_timer.summary(),
+        "peak_memory": {"bytes": memory.peak_bytes(), "source": memory.source()},
+    }
+
+
+def run_scenario_in_child(name: str, u5_dir: Path, frames_per_event: int, cache_root: Path = None) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result_path = Path(temp_dir) / f"{name}.json"
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.run_benchmarks",
+                "--child", name,
+                "--u5-dir", str(u5_dir),
+                "--frames-per-event", str(frames_per_event),
+                "--output", str(result_path),
+                "--launched-at", repr(time.time()),
+            ] + ([] if cache_root is None else ["--cache-root", str(cache_root)]),
+            cwd = ROOT, check = True
+        )
+        return json.loads(result_path.read_text())
+
+
+def compare(previous: dict, current: dict):
+    print(f"{'scenario':<16} {'metric':<16} {previous.get('commit')!s:>10} {current.get('commit')!s:>10} {'change':>8}")
+    for name, results in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        old, new = before["startup"].get("launch_seconds"), results["startup"].get("launch_seconds")
+        if old and new:
+            print(f"{name:<16} {'launch s':<16} {old:>10.3f} {new:>10.3f} {(new - old) / old * 100:>+7.1f}%")
+        for metric in ("frame_ms", "turn_ms", "combat_turn_ms"):
+            for point in ("p50", "p99"):
+                old, new = before.get(metric, {}).get(point), results[metric].get(point)
+                if old is None or new is None:
+                    continue
+                change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+                print(f"{name:<16} {metric[:-3] + ' ' + point:<16} {old:>10.3f} {new:>10.3f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", action = "append", choices = sorted(SCENARIOS), help = "run only this scenario (repeatable)")
+    parser.add_argument("--output", type = Path, help = "where to write the JSON results")
+    parser.add_argument("--compare", type = Path, help = "an earlier results file to compare against")
+    parser.add_argument("--u5-dir", type = Path, help = "the U5 game files (default: as configured)")
+    parser.add_argument("--frames-per-event", type = int, default = 1, help = "frames rendered before each scripted input")
+    parser.add_argument("--synthetic", action = "store_true", help = "use generated game files, even if the real ones are installed")
+    parser.add_argument("--seed", type = int, default = 0, help = "seed for the generated game files")
+    parser.add_argument("--child", help = argparse.SUPPRESS)
+    parser.add_argument("--launched-at", type = float, help = argparse.SUPPRESS)
+    parser.add_argument("--cache-root", type = Path, help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.output.write_text(json.dumps(run_scenario(args.child, args.u5_dir, args.frames_per_event, args.launched_at, args.cache_root)))
+        return
+
+    from scripted_game import find_u5_dir
+
+    u5_dir = None if args.synthetic else args.u5_dir or find_u5_dir()
+    synthetic_dir = None
+    cache_root = None
+    if u5_dir is None:
+        from data.synthetic_u5_data import write_synthetic_u5_data
+        if not args.synthetic:
+            print("U5 game files not found, using synthetic ones (run configure.py, or pass --u5-dir, to use the real ones).")
+        synthetic_dir = tempfile.TemporaryDirectory()
+        u5_dir = write_synthetic_u5_data(Path(synthetic_dir.name) / "u5", args.seed)
+        # the synthetic files' caches go with them, rather than into (and pruning) the real game's.
+        cache_root = Path(synthetic_dir.name) / "caches"
+
+    results = {
+        "commit":           git_commit(),
+        "timestamp":        datetime.now().isoformat(timespec = "seconds"),
+        "python":           platform.python_version(),
+        "platform":         platform.platform(),
+        "frames_per_event": args.frames_per_event,
+        "game_files":       "real" if synthetic_dir is None else f"synthetic (seed {args.seed})",
+        "scenarios":        {},
+    }
+    for name in args.scenario or SCENARIOS:
+        print(f"Running {name}...")
+        results["scenarios"][name] = run_scenario_in_child(name, u5_dir, args.frames_per_event, cache_root)
+
+    if not synthetic_dir is None:
+        synthetic_dir.cleanup()
+
+    output = args.output or ROOT / "log" / "benchmarks" / f"{datetime.now():%Y%m%d-%H%M%S}-{results['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents = True, exist_ok = True)
+    output.write_text(json.dumps(results, indent = 2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        previous = json.loads(args.compare.read_text())
+        if previous.get("game_files", "real") != results["game_files"]:
+            print(f"Warning: comparing a run on {results['game_files']} game files against one on {previous.get('game_files', 'real')} ones.")
+        compare(previous, results)
+
+
+if __name__ == "__main__":
+    main()
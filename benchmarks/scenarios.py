@@ -0,0 +1,67 @@
+"""
+Scripted play-throughs for the benchmarks.  Each one only queues input; the
+runner boots a fresh game, queues the scenario, and runs the main loop until
+the queue drains.
+
+Scenarios have to cope with being blocked (water, walls, NPCs) - a bump still
+costs a turn, so it is still measured.
+"""
+from typing import Callable
+
+import pygame
+
+from service_implementations.scripted_input_service import ScriptedInputService
+
+type QueueFunc = Callable[[ScriptedInputService], None]
+
+
+def _console(scripted: ScriptedInputService, command: str):
+    scripted.queue_key(pygame.K_BACKQUOTE)
+    scripted.queue_string(command)
+
+
+def _walk(scripted: ScriptedInputService, *legs: tuple[int, int]):
+    for key, steps in legs:
+        scripted.queue_keys(*([key] * steps))
+
+
+def britannia_walk(scripted: ScriptedInputService):
+    # a lap around the overworld, whatever the saved game was doing.
+    _console(scripted, "teleport world")
+    for _ in range(2):
+        _walk(scripted,
+            (pygame.K_UP,    15),
+            (pygame.K_RIGHT, 15),
+            (pygame.K_DOWN,  15),
+            (pygame.K_LEFT,  15),
+        )
+
+
+def town_walk(scripted: ScriptedInputService):
+    # up the main street of Britain and back, with the townsfolk going about their day.
+    _console(scripted, "teleport britain")
+    _walk(scripted,
+        (pygame.K_UP,    20),
+        (pygame.K_LEFT,  6),
+        (pygame.K_RIGHT, 12),
+        (pygame.K_LEFT,  6),
+        (pygame.K_DOWN,  20),
+    )
+    scripted.queue_keys(*([pygame.K_SPACE] * 20))
+
+
+def combat(scripted: ScriptedInputService):
+    # a skeleton next to the party attacks as soon as time passes, then everyone takes turns on the combat map.
+    # Fought in the overworld: entering combat from inside a town leaves the townsfolk active.
+    _console(scripted, "teleport world")
+    _console(scripted, "spawn skeleton")
+    scripted.queue_keys(*([pygame.K_SPACE] * 3))
+    for _ in range(10):
+        scripted.queue_keys(pygame.K_SPACE, pygame.K_LEFT, pygame.K_SPACE, pygame.K_RIGHT)
+
+
+SCENARIOS: dict[str, QueueFunc] = {
+    "britannia_walk": britannia_walk,
+    "town_walk":      town_walk,
+    "combat":         combat,
+}
@@ -1,3 +1,4 @@
+import time
 from pathlib import Path
 
 import pygame
@@ -19,7 +20,6 @@ from services.console_service import ConsoleService
 from services.display_service import DisplayService
 from services.info_panel_data_provider import InfoPanelDataProvider
 from services.info_panel_service import InfoPanelService
-from services.light_map_level_baker import LightMapLevelBaker
 from services.map_cache.map_cache_service import MapCacheService
 from services.sound_service import SoundService
 from services.world_clock           import WorldClock
@@ -27,6 +27,7 @@ from services.world_loot.world_loot_service import WorldLootService
 from view.info_panel import InfoPanel
 from view.interactive_console import InteractiveConsole
 from view.main_display              import MainDisplay
+from view.scaled_surface_cache      import ScaledSurfaceCache
 
 class InitialisationController(LoggerMixin):
 
@@ -44,21 +45,24 @@ class InitialisationController(LoggerMixin):
     display_service:  DisplayService
     console_service: ConsoleService
 
-    light_map_level_baker: LightMapLevelBaker
     saved_game_loader: SavedGameLoader
     info_panel_service: InfoPanelService
     info_panel_data_provider: InfoPanelDataProvider
     info_panel: InfoPanel
     interactive_console: InteractiveConsole
     sound_service: SoundService
+    scaled_surface_cache: ScaledSurfaceCache
 
 
     def init(self, u5_path: Path):
 
+        start = time.perf_counter()
+
         # Set's pygame screen/video mode.
         self.display_service.init()
 
         self.global_registry_loader.load(u5_path)
+        self.log(f"Registries loaded after {time.perf_counter() - start:.2f}s")
 
         self._set_window_icon(NpcTileId.ADVENTURER.value)
 
@@ -98,14 +102,15 @@ class InitialisationController(LoggerMixin):
         # TODO: Incorporate saved game data
         self.world_loot_service.register_loot_containers()
 
+        # Fixed light maps get baked per level, as the party arrives (see LightMapLevelBaker)
         self.map_cache_service.init()
-        self.light_map_level_baker.bake_level_light_maps()
 
         self.sound_service.init()
 
         #
         # Start displaying stuff
         #
+        self.scaled_surface_cache.prescale_registry()
         self.main_display.init()
         self.interactive_console.init()
         self.info_panel.init()
@@ -122,7 +127,7 @@ class InitialisationController(LoggerMixin):
         self.console_service.print_ascii(list(range(128)))
         self.console_service.print_runes(list(range(128)))
 
-        self.log("Initialisation completed.")
+        self.log(f"Initialisation completed in {time.perf_counter() - start:.2f}s")
 
     def _set_window_icon(self, tile_id: int):
         sprite = self.global_registry.sprites.get(tile_id)
@@ -71,9 +71,9 @@ class MoveController(LoggerMixin):
         # handle bumping into NPCs.
         #---------------------------------------------------------------------------------
         # TODO: This will need to track every party member
-        if target_location.coord in self.npc_service.get_occupied_coords():
+        if self.npc_service.is_occupied(target_location.coord):
         #---------------------------------------------------------------------------------
-            self.log(f"DEBUG: Blocking move to {target_location.coord}: _get_occupied_coords() {self.npc_service.get_occupied_coords()}")
+            self.debug("Blocking move to %s: occupied by %s", target_location.coord, self.npc_service.get_npc_at(target_location.coord))
             return MoveOutcome(blocked=True)
 
 
@@ -157,6 +157,46 @@ class PartyController(DarkEventListenerMixin, LoggerMixin):
         self.console_command_service.register("spawn",     self._spawn_command)
         self.console_command_service.register("loc",       self._loc_command)
         self.console_command_service.register("quit",      lambda args: self.dark_event_service.quit())
+        self.console_command_service.register("events",    self._events_command)
+        self.console_command_service.register("wait",      self._wait_command)
+
+    def _events_command(self, args: list[str]):
+        option = args[0].lower() if args else ""
+        if option in ("on", "off"):
+            self.dark_event_service.set_timing_enabled(option == "on")
+            self.console_service.print_ascii(f"Event timing {option}")
+            return
+        if option == "reset":
+            self.dark_event_service.reset_timings()
+            self.console_service.print_ascii("Event timing reset")
+            return
+        if option != "":
+            self.console_service.print_ascii("Usage: events [on|off|reset]")
+            return
+
+        report = self.dark_event_service.get_timing_report()
+        if not report:
+            self.console_service.print_ascii("No event timings" + ("" if self.dark_event_service.is_timing_enabled() else ", try: events on"))
+            return
+
+        # The whole table goes to the log, the console only has room for the slowest few.
+        for line in report:
+            self.log(f"Event timing: {line}")
+        for line in report[:5]:
+            self.console_service.print_ascii(line)
+
+    def _wait_command(self, args: list[str]):
+        try:
+            hours = int(args[0]) if args else 1
+        except ValueError:
+            hours = 0
+        if hours <= 0:
+            self.console_service.print_ascii("Usage: wait [hours]")
+            return
+        # the last minute of it passes as a normal turn, so that everyone catches up.
+        self.world_clock.skip_time(hours * 60 - 1)
+        self.dark_event_service.pass_time(self.party_agent.get_current_location())
+        self.console_service.print_ascii(f"Waited {hours} hour{'s' if hours > 1 else ''}")
 
     def _spawn_command(self, args: list[str]):
         if not args:
@@ -1,23 +1,113 @@
+import time
+from typing import Callable
+
 from dark_libraries.logging import LoggerMixin
 from models.global_location import GlobalLocation
 
+# Events that DarkEventListenerMixin implements as a no-op, so listeners that don't override them needn't be called.
+_SKIPPABLE_EVENTS = ("loaded", "pass_time", "level_changed", "party_moved")
+
+# quit always goes to everyone, as the mixin's own quit() records that it happened.
+_EVENTS = _SKIPPABLE_EVENTS + ("quit",)
+
+class DarkEventTiming:
+    __slots__ = ("count", "total_us", "max_us")
+
+    def __init__(self):
+        self.count    = 0
+        self.total_us = 0
+        self.max_us   = 0
+
+    def add(self, elapsed_us: int):
+        self.count += 1
+        self.total_us += elapsed_us
+        if elapsed_us > self.max_us:
+            self.max_us = elapsed_us
+
 class DarkEventService(LoggerMixin):
 
     def __init__(self):
         self._party_location: GlobalLocation = None
         self._dark_event_listeners = list['DarkEventListenerMixin']()
+
+        # event name -> (listener name, bound handler) for just the listeners that handle that event.
+        self._handlers = {event_name: list[tuple[str, Callable]]() for event_name in _EVENTS}
+
+        # Opt-in, see set_timing_enabled.  Keyed on (listener name, event name).
+        self._timing_enabled = False
+        self._timings = dict[tuple[str, str], DarkEventTiming]()
+
         super().__init__()
 
+    @classmethod
+    def _handles(cls, listener: 'DarkEventListenerMixin', event_name: str) -> bool:
+        if not event_name in _SKIPPABLE_EVENTS:
+            return True
+        handler = getattr(listener, event_name)
+        # Listeners that don't use the mixin at all just get everything.
+        return getattr(handler, "__func__", handler) is not getattr(DarkEventListenerMixin, event_name)
+
     def subscribe(self, listener: 'DarkEventListenerMixin'):
         self._dark_event_listeners.append(listener)
-        self.log(f"Added dark_event_listener: {listener.__class__.__name__}")
-
+        listener_name = listener.__class__.__name__
+
+        handled = [event_name for event_name in _EVENTS if __class__._handles(listener, event_name)]
+        for event_name in handled:
+            self._handlers[event_name].append((listener_name, getattr(listener, event_name)))
+
+        self.log(f"Added dark_event_listener: {listener_name} ({', '.join(handled)})")
+
+    #
+    # Timing
+    #
+    def set_timing_enabled(self, enabled: bool):
+        self._timing_enabled = enabled
+
+    def is_timing_enabled(self) -> bool:
+        return self._timing_enabled
+
+    def reset_timings(self):
+        self._timings.clear()
+
+    def get_timings(self) -> dict[tuple[str, str], DarkEventTiming]:
+        return self._timings
+
+    def get_timing_report(self) -> list[str]:
+        # slowest (by total) first.
+        ordered = sorted(self._timings.items(), key = lambda item: item[1].total_us, reverse = True)
+        return [
+            f"{listener_name}.{event_name}: n={timing.count} total={timing.total_us}us max={timing.max_us}us"
+            for (listener_name, event_name), timing in ordered
+        ]
+
+    def _dispatch(self, event_name: str, *args):
+        handlers = self._handlers[event_name]
+
+        if not self._timing_enabled:
+            for _, handler in handlers:
+                handler(*args)
+            return
+
+        for listener_name, handler in handlers:
+            start = time.perf_counter_ns()
+            handler(*args)
+            elapsed_us = (time.perf_counter_ns() - start) // 1000
+
+            key = (listener_name, event_name)
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = DarkEventTiming()
+                self._timings[key] = timing
+            timing.add(elapsed_us)
+
+    #
+    # Events
+    #
     def loaded(self, party_location: GlobalLocation):
 
-        self.log(f"DEBUG: Propogating event 'loaded' to {len(self._dark_event_listeners)} listeners: {party_location}")
+        self.debug("Propogating event 'loaded' to %d listeners: %s", len(self._handlers["loaded"]), party_location)
 
-        for listener in self._dark_event_listeners:
-            listener.loaded(party_location)
+        self._dispatch("loaded", party_location)
 
         self._party_location = party_location
 
@@ -28,10 +118,9 @@ class DarkEventService(LoggerMixin):
                 self._level_changed(party_location)
             self._party_moved(party_location)
 
-        self.log(f"DEBUG: Propogating event 'pass_time' to {len(self._dark_event_listeners)} listeners: {party_location}")
+        self.debug("Propogating event 'pass_time' to %d listeners: %s", len(self._handlers["pass_time"]), party_location)
 
-        for listener in self._dark_event_listeners:
-            listener.pass_time(party_location)
+        self._dispatch("pass_time", party_location)
 
         self._party_location = party_location
 
@@ -51,19 +140,16 @@ class DarkEventService(LoggerMixin):
         self._party_location = party_location
 
     def _level_changed(self, party_location: GlobalLocation):
-        self.log(f"DEBUG: Propogating event 'level_changed' to {len(self._dark_event_listeners)} listeners: {self._party_location} -> {party_location}")
-        for listener in self._dark_event_listeners:
-            listener.level_changed(party_location)
+        self.debug("Propogating event 'level_changed' to %d listeners: %s -> %s", len(self._handlers["level_changed"]), self._party_location, party_location)
+        self._dispatch("level_changed", party_location)
 
     def _party_moved(self, party_location: GlobalLocation):
-        self.log(f"DEBUG: Propogating event 'party_moved' to {len(self._dark_event_listeners)} listeners: {self._party_location} -> {party_location}")
-        for listener in self._dark_event_listeners:
-            listener.party_moved(party_location)
+        self.debug("Propogating event 'party_moved' to %d listeners: %s -> %s", len(self._handlers["party_moved"]), self._party_location, party_location)
+        self._dispatch("party_moved", party_location)
 
     def quit(self):
-        self.log(f"DEBUG: Propogating event 'quit' to {len(self._dark_event_listeners)} listeners")
-        for listener in self._dark_event_listeners:
-            listener.quit()
+        self.debug("Propogating event 'quit' to %d listeners", len(self._handlers["quit"]))
+        self._dispatch("quit")
 
 
 
@@ -0,0 +1,177 @@
+#
+# The LZW flavour used by U5's compressed files (e.g. TILES.16):
+#
+#   - codes are packed least significant bit first.
+#   - 256 clears the dictionary, 257 ends the stream, and new entries start at 258.
+#   - codes start at 9 bits wide and grow (up to 12) as soon as the dictionary fills the current width.
+#
+LZW_CLEAR_CODE = 256
+LZW_END_CODE   = 257
+
+_FIRST_FREE_CODE = 258
+_MIN_CODE_SIZE   = 9
+_MAX_CODE_SIZE   = 12
+_MAX_CODES       = 1 << _MAX_CODE_SIZE
+
+def lzw_decompress(data: bytes, expected_length: int = None) -> bytes:
+    #
+    # Every dictionary entry is some earlier code's string plus one more byte, and that string has already been written
+    # to the output.  So rather than building the strings, the tables just remember where in the output each entry
+    # can be copied from, and every code becomes a single slice copy into a preallocated buffer.
+    #
+    offsets = [0] * _MAX_CODES
+    lengths = [0] * _MAX_CODES
+
+    out = bytearray(expected_length if expected_length else max(len(data) * 4, 256))
+    view = memoryview(out)
+    capacity = len(out)
+    out_pos = 0
+
+    data_len = len(data)
+    data_pos = 0
+    data_bits = 0
+    bit_count = 0
+
+    code_size = _MIN_CODE_SIZE
+    next_code = _FIRST_FREE_CODE
+    code_mask = (1 << code_size) - 1
+
+    # where the previous code's string was written, prev_len == 0 meaning there is no previous code.
+    prev_pos = 0
+    prev_len = 0
+
+    while True:
+
+        while bit_count < code_size:
+            if data_pos >= data_len:
+                if bit_count <= 0:
+                    raise ValueError("Truncated LZW data")
+                # Let a final, short code through with its missing high bits as zero.
+                break
+            data_bits |= data[data_pos] << bit_count
+            bit_count += 8
+            data_pos += 1
+
+        code = data_bits & code_mask
+        data_bits >>= code_size
+        bit_count -= code_size
+
+        if code < LZW_CLEAR_CODE:
+            length = 1
+            if out_pos >= capacity:
+                view.release()
+                out.extend(bytes(capacity))
+                view = memoryview(out)
+                capacity = len(out)
+            out[out_pos] = code
+
+        elif code > LZW_END_CODE:
+            if code < next_code:
+                length = lengths[code]
+                source = offsets[code]
+            elif code == next_code and prev_len > 0:
+                # The entry being defined right now: the previous string plus its own first byte.
+                length = prev_len + 1
+                source = prev_pos
+            else:
+                raise ValueError("Bad LZW code")
+
+            if out_pos + length > capacity:
+                view.release()
+                out.extend(bytes(max(capacity, length)))
+                view = memoryview(out)
+                capacity = len(out)
+
+            if code < next_code:
+                view[out_pos:out_pos + length] = view[source:source + length]
+            else:
+                view[out_pos:out_pos + prev_len] = view[prev_pos:out_pos]
+                out[out_pos + prev_len] = out[prev_pos]
+
+        elif code == LZW_CLEAR_CODE:
+            code_size = _MIN_CODE_SIZE
+            code_mask = (1 << code_size) - 1
+            next_code = _FIRST_FREE_CODE
+            prev_len = 0
+            continue
+
+        else:
+            break
+
+        if prev_len > 0 and next_code < _MAX_CODES:
+            # previous string + first byte of this one, which sit next to each other in the output.
+            offsets[next_code] = prev_pos
+            lengths[next_code] = prev_len + 1
+            next_code += 1
+            if next_code == (1 << code_size) and code_size < _MAX_CODE_SIZE:
+                code_size += 1
+                code_mask = (1 << code_size) - 1
+
+        prev_pos = out_pos
+        prev_len = length
+        out_pos += length
+
+    view.release()
+    del out[out_pos:]
+    return bytes(out)
+
+def lzw_compress(data: bytes) -> bytes:
+    #
+    # Produces streams that lzw_decompress (and U5) can read.  Not used by the game itself, but handy for building
+    # test data.  When the dictionary fills up, it is cleared and started over.
+    #
+    out = bytearray()
+    out_bits = 0
+    out_bit_count = 0
+
+    def emit(code: int, code_size: int):
+        nonlocal out_bits, out_bit_count
+        out_bits |= code << out_bit_count
+        out_bit_count += code_size
+        while out_bit_count >= 8:
+            out.append(out_bits & 0xFF)
+            out_bits >>= 8
+            out_bit_count -= 8
+
+    def decoder_code_size(codes_emitted: int) -> int:
+        # The decoder adds its first entry on the second code, so it runs one entry behind us.
+        decoder_next_code = _FIRST_FREE_CODE + max(0, codes_emitted - 1)
+        code_size = _MIN_CODE_SIZE
+        while code_size < _MAX_CODE_SIZE and decoder_next_code >= (1 << code_size):
+            code_size += 1
+        return code_size
+
+    dictionary = {bytes([i]): i for i in range(256)}
+    next_code = _FIRST_FREE_CODE
+    codes_emitted = 0
+
+    current = b""
+    for byte in data:
+        candidate = current + bytes([byte])
+        if candidate in dictionary:
+            current = candidate
+            continue
+
+        emit(dictionary[current], decoder_code_size(codes_emitted))
+        codes_emitted += 1
+
+        if next_code < _MAX_CODES:
+            dictionary[candidate] = next_code
+            next_code += 1
+        else:
+            emit(LZW_CLEAR_CODE, decoder_code_size(codes_emitted))
+            dictionary = {bytes([i]): i for i in range(256)}
+            next_code = _FIRST_FREE_CODE
+            codes_emitted = 0
+
+        current = bytes([byte])
+
+    if current:
+        emit(dictionary[current], decoder_code_size(codes_emitted))
+        codes_emitted += 1
+
+    emit(LZW_END_CODE, decoder_code_size(codes_emitted))
+    if out_bit_count > 0:
+        out.append(out_bits & 0xFF)
+
+    return bytes(out)
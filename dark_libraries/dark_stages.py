@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, NamedTuple
+
+from dark_libraries.logging import LoggerMixin
+
+#
+# Runs a list of stages that each declare what they read and what they write, e.g. loaders declaring the registries
+# they fill in, as a dependency graph.
+#
+# A stage waits for every earlier stage that writes something it reads or writes, and for every earlier stage that
+# reads something it writes.  So the results are the same as running the stages one after the other in the order
+# given, as long as the declarations are honest.
+#
+# Stages that must run on the main thread (e.g. anything creating pygame surfaces) are run there, in order, whilst
+# the rest run on a pool of worker threads.  With max_workers = 0 everything runs on the main thread, in order.
+#
+class Stage(NamedTuple):
+    name:        str
+    run:         Callable[[], None]
+    reads:       tuple[str, ...] = ()
+    writes:      tuple[str, ...] = ()
+    main_thread: bool = False
+
+class StageTiming(NamedTuple):
+    name:    str
+    thread:  str
+    started: float   # seconds after the graph started running
+    seconds: float
+
+class StageGraph(LoggerMixin):
+
+    def __init__(self, stages: Iterable[Stage]):
+        super().__init__()
+        self.stages = list(stages)
+
+        names = [stage.name for stage in self.stages]
+        assert len(names) == len(set(names)), f"Stage names must be unique: {names}"
+
+        # stage name -> names of the stages it has to wait for.
+        self.dependencies = dict[str, set[str]]()
+        for index, stage in enumerate(self.stages):
+            self.dependencies[stage.name] = {
+                earlier.name
+                for earlier in self.stages[:index]
+                if not set(earlier.writes).isdisjoint(stage.reads + stage.writes)
+                or not set(earlier.reads).isdisjoint(stage.writes)
+            }
+
+    def _run_stage(self, stage: Stage, graph_start: float) -> StageTiming:
+        start = time.perf_counter()
+        stage.run()
+        return StageTiming(stage.name, threading.current_thread().name, start - graph_start, time.perf_counter() - start)
+
+    def run(self, max_workers: int) -> list[StageTiming]:
+        graph_start = time.perf_counter()
+
+        if max_workers == 0:
+            return [self._run_stage(stage, graph_start) for stage in self.stages]
+
+        waiting_on = {name: set(dependencies) for name, dependencies in self.dependencies.items()}
+        dependents = {stage.name: list[Stage]() for stage in self.stages}
+        for stage in self.stages:
+            for dependency in self.dependencies[stage.name]:
+                dependents[dependency].append(stage)
+
+        ready_main    = deque(stage for stage in self.stages if not waiting_on[stage.name] and stage.main_thread)
+        ready_workers = deque(stage for stage in self.stages if not waiting_on[stage.name] and not stage.main_thread)
+
+        timings = list[StageTiming]()
+        running = dict[Future, Stage]()
+
+        def finished(timing: StageTiming):
+            timings.append(timing)
+            for dependent in dependents[timing.name]:
+                waiting_on[dependent.name].discard(timing.name)
+                if not waiting_on[dependent.name]:
+                    (ready_main if dependent.main_thread else ready_workers).append(dependent)
+
+        def collect(futures: Iterable[Future]):
+            for future in list(futures):
+                del running[future]
+                finished(future.result())
+
+        with ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "stage") as executor:
+            try:
+                while len(timings) < len(self.stages):
+                    while ready_workers:
+                        stage = ready_workers.popleft()
+                        running[executor.submit(self._run_stage, stage, graph_start)] = stage
+
+                    if ready_main:
+                        finished(self._run_stage(ready_main.popleft(), graph_start))
+                        # whatever the workers finished meanwhile may have freed up more work for them.
+                        collect(future for future in running if future.done())
+                        continue
+
+                    assert running, f"Stages can never run: {[name for name, waits in waiting_on.items() if waits]}"
+                    collect(wait(running, return_when = FIRST_COMPLETED).done)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+
+        return timings
+
+    def log_timings(self, timings: list[StageTiming]):
+        self.info("%-22s %-10s %9s %9s", "Stage", "Thread", "Started", "Took")
+        for timing in sorted(timings, key = lambda timing: timing.started):
+            self.info("%-22s %-10s %7.1fms %7.1fms", timing.name, timing.thread, timing.started * 1000, timing.seconds * 1000)
+
+        wall_seconds  = max(timing.started + timing.seconds for timing in timings) if timings else 0.0
+        stage_seconds = sum(timing.seconds for timing in timings)
+        self.info("%d stages took %.1fms, in %.1fms", len(timings), stage_seconds * 1000, wall_seconds * 1000)
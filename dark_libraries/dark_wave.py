@@ -48,6 +48,72 @@ def am_modulator(
     return carrier * gain
 
 
+#
+# Block IIR engine
+#
+# Recursive filters are worked out a block of samples at a time rather than a sample at a time: the coefficient is held
+# constant across each block, so every block's response can be found with a handful of whole-array passes, and only
+# the filter state is carried from one block to the next in Python.
+#
+# block_size is the accuracy/speed knob for time-varying filters (e.g. a phaser's sweep): 1 updates the coefficient
+# every sample, exactly like a sample-by-sample loop (and about as slow), while larger blocks step the coefficient less
+# often, which is faster and, for a slow LFO, inaudible.
+#
+DEFAULT_FILTER_BLOCK_SIZE = 32
+
+def one_pole_recurrence(
+    u:          DarkWaveFloatArray,  # Drive signal, shape (n,).
+    a:          DarkWaveFloatArray,  # Feedback coefficient for each block, shape (ceil(n / block_size),), each in (-1, 1).
+    block_size: int,                 # Samples per block.
+    y_initial:  float = 0.0          # y[-1], i.e. the state carried in from whatever came before.
+
+) -> DarkWaveFloatArray:             # y[n] = a * y[n-1] + u[n], shape (n,).
+
+    n = len(u)
+    number_blocks = -(-n // block_size)
+    assert len(a) == number_blocks, f"Expected {number_blocks} coefficients for {n} samples in blocks of {block_size}, got {len(a)}"
+
+    z = np.zeros(number_blocks * block_size, dtype=np.float64)
+    z[:n] = u
+    z = z.reshape(number_blocks, block_size)
+    a_column = np.asarray(a, dtype=np.float64)[:, None]
+
+    # Each block's response from a standing start.  After the pass with stride s, z[k] = sum(a^d * u[k-d]) for d < 2s,
+    # so log2(block_size) passes cover the whole block.
+    stride, a_stride = 1, a_column
+    while stride < block_size:
+        z[:, stride:] += a_stride * z[:, :-stride]
+        stride, a_stride = stride * 2, a_stride * a_stride
+
+    # Then carry the state across: y at the end of the previous block dies away as a^(k+1) through this one.
+    decay = a_column ** np.arange(1, block_size + 1)
+    carried = np.empty(number_blocks, dtype=np.float64)
+    y_end = y_initial
+    for index, (block_decay, block_end) in enumerate(zip(decay[:, -1].tolist(), z[:, -1].tolist())):
+        carried[index] = y_end
+        y_end = block_decay * y_end + block_end
+
+    return (z + decay * carried[:, None]).reshape(-1)[:n]
+
+def one_pole_allpass(
+    x:          DarkWaveFloatArray,  # Input signal, shape (n,).
+    a:          DarkWaveFloatArray,  # Coefficient for each block, as for one_pole_recurrence.
+    block_size: int
+
+) -> DarkWaveFloatArray:             # y[n] = -a*x[n] + x[n-1] + a*y[n-1], shape (n,).
+
+    a_per_sample = np.repeat(a, block_size)[:len(x)]
+    x_previous = np.concatenate(([0.0], x[:-1]))
+    return one_pole_recurrence(-a_per_sample * x + x_previous, a, block_size)
+
+# Hold a per-sample coefficient constant across each block, at its average over the block.
+def block_coefficients(per_sample: DarkWaveFloatArray, block_size: int) -> DarkWaveFloatArray:
+    n = len(per_sample)
+    number_blocks = -(-n // block_size)
+    padded = np.pad(per_sample, (0, number_blocks * block_size - n), mode="edge")
+    return padded.reshape(number_blocks, block_size).mean(axis=1)
+
+
 HarmonicSpec = tuple[int, float, float]  # (multiplier, amplitude, phase)
 
 class HarmonicSpec(NamedTuple):
@@ -349,16 +415,11 @@ class DarkWave:
         fm_wave = fm_modulator(base_hz, modulator_wave, deviation_hz)
         return self._dark_wave(fm_wave)
 
-    def _one_pole_allpass(self, x: DarkWaveFloatArray, a: float) -> Self:
+    def _one_pole_allpass(self, x: DarkWaveFloatArray, a: float) -> DarkWaveFloatArray:
         # y[n] = -a*x[n] + x[n-1] + a*y[n-1]
-        y = np.zeros_like(x, dtype=np.float64)
-        xn1 = 0.0
-        yn1 = 0.0
-        for n in range(len(x)):
-            y[n] = -a * x[n] + xn1 + a * yn1
-            xn1 = x[n]
-            yn1 = y[n]
-        return y
+        # (a fixed coefficient, so the block size only affects speed)
+        number_blocks = -(-len(x) // DEFAULT_FILTER_BLOCK_SIZE)
+        return one_pole_allpass(x, np.full(number_blocks, a), DEFAULT_FILTER_BLOCK_SIZE)
 
     def _a_from_fc(self, fc: float) -> float:
         # Bilinear transform mapping (Tustin). fc normalized to Hz.
@@ -373,7 +434,8 @@ class DarkWave:
             max_fc:    float = 1500.0, # sweep range (Hz)
             feedback:  float = 0.0,    # 0.0–0.7 to intensify notches
             mix:       float = 0.7,    # wet/dry mix
-            lfo_phase: float = 0.0     # phase offset in radians
+            lfo_phase: float = 0.0,    # phase offset in radians
+            block_size: int  = DEFAULT_FILTER_BLOCK_SIZE  # samples per sweep step: 1 is exact, larger is faster
 
     ) -> Self:
         number_frequency_samples = len(self.wave_data)
@@ -385,23 +447,15 @@ class DarkWave:
         # Precompute a(t) per sample
         a_t = (1.0 - np.tan(np.pi * fc / frequency_sample_rate)) / (1.0 + np.tan(np.pi * fc / frequency_sample_rate))
 
+        # Step the sweep once per block
+        a_blocks = block_coefficients(a_t, block_size)
+
         y = self.wave_data.copy()
         fb = 0.0
         for _ in range(stages):
-            # Per-sample varying a: apply as time‑varying filter
-            # Loop for clarity; vectorized versions exist but are less readable
-            out = np.zeros_like(y)
-            xn1 = 0.0
-            yn1 = 0.0
-            for i in range(number_frequency_samples):
-                xi = y[i] + feedback * fb
-                ai = a_t[i]
-                yi = -ai * xi + xn1 + ai * yn1
-                out[i] = yi
-                xn1 = xi
-                yn1 = yi
-            fb = out[-1]
-            y = out
+            # each stage is fed the previous stage's final output as feedback
+            y = one_pole_allpass(y + feedback * fb, a_blocks, block_size)
+            fb = y[-1]
 
         # Wet/dry mix
         return self._dark_wave((1.0 - mix) * self.wave_data + mix * y)
@@ -1,14 +1,182 @@
+import atexit
+import queue
 import re
 import colorama
 import sys
+import threading
+import time
 
+from collections import deque
 from datetime import datetime
-from typing import Callable
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, NamedTuple, Protocol
 
 type SuffixFunc = Callable[[], str]
 
 MESSAGE_COLUMN_OFFSET = 54 # you better have a wide screen !
 
+class LogLevel(IntEnum):
+    DEBUG = 10
+    INFO  = 20
+    WARN  = 30
+    ERROR = 40
+
+class LogRecord(NamedTuple):
+    created: float      # time.time()
+    level:   LogLevel
+    prefix:  str
+    message: str
+
+def format_log_record(record: LogRecord) -> str:
+    time_prefix = datetime.fromtimestamp(record.created).time().isoformat(timespec="milliseconds")
+    entire_prefix = f"[{time_prefix} {record.prefix}]".ljust(MESSAGE_COLUMN_OFFSET)
+    return entire_prefix + record.message
+
+#
+# SINKS
+#
+# Loggers hand finished LogRecords to every sink.  Sinks that are slow (consoles, files) can be pushed onto their own
+# thread by wrapping them in a BackgroundLogSink.
+#
+class LogSink(Protocol):
+    def write(self, record: LogRecord): ...
+    def flush(self): ...
+
+class ConsoleLogSink:
+
+    def write(self, record: LogRecord):
+        ascii_control_code_prefix = colorama.Style.RESET_ALL
+
+        # Make 3rd party messages stand out
+        ascii_control_code_suffix = colorama.Style.BRIGHT + colorama.Fore.CYAN
+
+        if record.level >= LogLevel.ERROR:
+            ascii_control_code_prefix = colorama.Style.BRIGHT + colorama.Fore.RED
+
+        elif record.level >= LogLevel.WARN:
+            ascii_control_code_prefix = colorama.Style.BRIGHT + colorama.Fore.YELLOW
+
+        elif record.level >= LogLevel.INFO:
+            # the "default" level.
+            if get_log_level() <= LogLevel.DEBUG:
+                ascii_control_code_prefix = colorama.Style.BRIGHT + colorama.Fore.WHITE
+
+        print(ascii_control_code_prefix + format_log_record(record) + ascii_control_code_suffix)
+
+    def flush(self):
+        sys.stdout.flush()
+
+# Keeps the last few records in memory, e.g. for showing in game or dumping after a failure.
+class RingBufferLogSink:
+
+    def __init__(self, capacity: int = 1000):
+        self._records = deque[LogRecord](maxlen = capacity)
+
+    def write(self, record: LogRecord):
+        self._records.append(record)
+
+    def flush(self):
+        pass
+
+    def get_records(self) -> list[LogRecord]:
+        return list(self._records)
+
+    def get_lines(self) -> list[str]:
+        return [format_log_record(record) for record in self._records]
+
+class FileLogSink:
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents = True, exist_ok = True)
+        self._file = open(path, "a", encoding = "utf-8")
+
+    def write(self, record: LogRecord):
+        self._file.write(format_log_record(record) + "\n")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# Does the wrapped sink's writing on a thread of its own, so that logging never waits on a console or disk.
+class BackgroundLogSink:
+
+    # flush() gives up after this long, rather than hanging the game (or its exit) on a stuck sink.
+    FLUSH_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self, sink: LogSink):
+        self._sink = sink
+        self._queue = queue.Queue[LogRecord]()
+        self._thread = threading.Thread(target = self._run, name = f"{sink.__class__.__name__}Writer", daemon = True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                self._sink.write(record)
+            except Exception as e:
+                # drop the record, but keep the thread alive for the next one.
+                print(f"(logging) {self._sink.__class__.__name__} failed to write a record: {e!r}", file = sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def write(self, record: LogRecord):
+        self._queue.put(record)
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT_SECONDS):
+        # waits for everything written so far, for a while anyway.
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"(logging) Gave up waiting for {self._queue.unfinished_tasks} record(s) to be written", file = sys.stderr)
+                    break
+                self._queue.all_tasks_done.wait(remaining)
+        self._sink.flush()
+
+class FileWriterLogSink(BackgroundLogSink):
+    def __init__(self, path: Path):
+        super().__init__(FileLogSink(path))
+
+#
+# CONFIGURATION
+#
+# Shared by every Logger.  "-debug" turns on the DEBUG level, and moves console printing onto a background thread so
+# that the extra output doesn't hold up the game loop.
+#
+class _LogConfig:
+    level = LogLevel.DEBUG if "-debug" in sys.argv else LogLevel.INFO
+    sinks = list[LogSink]([BackgroundLogSink(ConsoleLogSink()) if "-debug" in sys.argv else ConsoleLogSink()])
+
+def get_log_level() -> LogLevel:
+    return _LogConfig.level
+
+def set_log_level(level: LogLevel):
+    _LogConfig.level = level
+
+def get_log_sinks() -> list[LogSink]:
+    return list(_LogConfig.sinks)
+
+def set_log_sinks(sinks: list[LogSink]):
+    _LogConfig.sinks = list(sinks)
+
+def add_log_sink(sink: LogSink):
+    _LogConfig.sinks.append(sink)
+
+def remove_log_sink(sink: LogSink):
+    _LogConfig.sinks.remove(sink)
+
+def flush_logs():
+    for sink in _LogConfig.sinks:
+        sink.flush()
+
+atexit.register(flush_logs)
+
 class Logger:
 
     @classmethod
@@ -27,7 +195,6 @@ class Logger:
             class_prefix         = __class__._to_snake_case(instance.__class__.__name__),
             instance_suffix_func = __class__._objectid_suffix_func(instance) if use_object_id_suffix else None
         )
-        self.show_debug = "-debug" in sys.argv
 
     def set_prefix_mode(self, class_prefix: str, instance_suffix_func: SuffixFunc):
 
@@ -36,35 +203,62 @@ class Logger:
         else:
             self.prefix = f"{class_prefix}:{instance_suffix_func()}"
 
-    def log(self, msg):
-        ascii_control_code_prefix = colorama.Style.RESET_ALL
+    @property
+    def show_debug(self) -> bool:
+        return _LogConfig.level <= LogLevel.DEBUG
 
-        # Make 3rd party messages stand out
-        ascii_control_code_suffix = colorama.Style.BRIGHT + colorama.Fore.CYAN
+    def is_enabled(self, level: LogLevel) -> bool:
+        return level >= _LogConfig.level
 
-        if "ERROR" in msg:
-            ascii_control_code_prefix = colorama.Style.BRIGHT + colorama.Fore.RED
+    def _emit(self, level: LogLevel, msg: str, args: tuple):
+        record = LogRecord(time.time(), level, self.prefix, msg % args if args else msg)
+        for sink in _LogConfig.sinks:
+            sink.write(record)
 
-        elif "WARN" in msg:
-            ascii_control_code_prefix = colorama.Style.BRIGHT + colorama.Fore.YELLOW
+    #
+    # Leveled logging: msg is only %-formatted with args once the level check has passed, so a disabled debug()
+    # costs a call and a comparison.  Messages come out tagged just like the log() equivalents, e.g.
+    #
+    #   self.debug("Moving from %s to %s", self.coord, next_move_coord)
+    #
+    def debug(self, msg: str, *args):
+        if _LogConfig.level <= LogLevel.DEBUG:
+            self._emit(LogLevel.DEBUG, "DEBUG: " + msg, args)
 
-        elif "DEBUG" in msg:
-            if self.show_debug == False:
-                return
+    def info(self, msg: str, *args):
+        if _LogConfig.level <= LogLevel.INFO:
+            self._emit(LogLevel.INFO, msg, args)
 
+    def warn(self, msg: str, *args):
+        if _LogConfig.level <= LogLevel.WARN:
+            self._emit(LogLevel.WARN, "WARNING: " + msg, args)
+
+    def error(self, msg: str, *args):
+        if _LogConfig.level <= LogLevel.ERROR:
+            self._emit(LogLevel.ERROR, "ERROR: " + msg, args)
+
+    # The original API, where the level comes from the message itself ("DEBUG: ...", "WARNING: ...", "ERROR: ...").
+    def log(self, msg):
+        if "ERROR" in msg:
+            level = LogLevel.ERROR
+        elif "WARN" in msg:
+            level = LogLevel.WARN
+        elif "DEBUG" in msg:
+            level = LogLevel.DEBUG
         else:
-            # the "default" level.  consider it the INFO level.
-            if self.show_debug == True:
-                ascii_control_code_prefix = colorama.Style.BRIGHT + colorama.Fore.WHITE
+            level = LogLevel.INFO
+
+        if level >= _LogConfig.level:
+            self._emit(level, msg, ())
 
-        time_prefix = datetime.now().time().isoformat(timespec="milliseconds")
-        entire_prefix = f"[{time_prefix} {self.prefix}]".ljust(MESSAGE_COLUMN_OFFSET)
-        print(ascii_control_code_prefix + entire_prefix + msg + ascii_control_code_suffix)
-        
 class LoggerMixin:
     def __init__(self):
         self._logger = Logger(self)
-        self.log = self._logger.log
+        self.log   = self._logger.log
+        self.debug = self._logger.debug
+        self.info  = self._logger.info
+        self.warn  = self._logger.warn
+        self.error = self._logger.error
         super().__init__()
 
     # ---------------------------------------------------------------------------------------
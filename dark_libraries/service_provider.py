@@ -1,19 +1,31 @@
 # file: dark_libraries/service_provider.py
-import inspect, typing, sys
+import inspect, time, typing, sys
 
 from dark_libraries.logging import LoggerMixin
 
+type InjectionPlan = tuple[tuple[str, typing.Any], ...]
+
 class ServiceProvider(LoggerMixin):
 
     _instance: typing.Self = None
 
+    # Shared by every provider, so that booting the graph again (e.g. once per test) doesn't redo the reflection:
+    # classes whose constructors have been checked, and class -> the (name, type) of each property that might be injected.
+    _checked_classes = set[type]()
+    _injection_plans = dict[type, InjectionPlan]()
+
     @classmethod
     def get_provider(cls):
         if cls._instance is None:
             return cls()
         return cls._instance
 
-    def __init__(self):
+    #
+    # lazy: registered services are only constructed (and injected) when something first resolves them, rather than
+    #       when they are registered.  Services nothing asks for are never built at all, which includes any that
+    #       only exist to react to something (e.g. dark event listeners that subscribe themselves in _after_inject).
+    #
+    def __init__(self, lazy = False):
         assert self.__class__._instance is None, "Cannot instantiate multiple ServiceProvider roots."
 
         super().__init__()
@@ -21,22 +33,30 @@ class ServiceProvider(LoggerMixin):
         self._mappings = {}
         self.__class__._instance = self
 
+        self._lazy = lazy
+        self._pending = {}             # registered, but not built yet (lazy mode only).  Used as an ordered set.
+        self._injected = False         # once inject_all() has run, anything built from then on is injected straight away.
+        self._injecting = 0
+        self._after_inject_queue = []
+
     def _assert_is_class(self, cls, needs_empty_constructor=True):
         assert inspect.isclass(cls), f"cls is not a class object, but instead is an instance of {type(cls)!r}"
 
-        if needs_empty_constructor:
+        if needs_empty_constructor and not cls in __class__._checked_classes:
             param_count = len(inspect.signature(cls).parameters)
             assert param_count == 0, f"Constructor has {param_count} parameters, needs 0: {cls!r}"
+            __class__._checked_classes.add(cls)
 
     def _assert_is_instance(self, obj):
         assert not inspect.isclass(obj), f"obj is not an instance, but instead is a class object ({obj!r})"
 
     def register(self, cls):
         self._assert_is_class(cls)
-        instance = cls()
-        self._instances[cls] = instance
-        self.log(f"DEBUG: Registered {cls.__name__} as new instance")
-        return instance
+        if self._lazy:
+            self._pending[cls] = None
+            self.debug("Registered %s, to be built when first resolved", cls.__name__)
+            return None
+        return self._build(cls)
 
     def register_instance(self, obj, as_type=None):
         self._assert_is_instance(obj)
@@ -44,43 +64,38 @@ class ServiceProvider(LoggerMixin):
             self._assert_is_class(as_type)
         key = as_type or type(obj)
         self._instances[key] = obj
-        self.log(f"DEBUG: Registered pre-instantiated singleton: {key.__name__}")
+        self._pending.pop(key, None)
+        self.debug("Registered pre-instantiated singleton: %s", key.__name__)
 
     def register_mapping(self, abstract, concrete):
         self._assert_is_class(abstract, needs_empty_constructor=False)
         self._assert_is_class(concrete)
         self.register(concrete)
         self._mappings[abstract] = concrete
-        self.log(f"DEBUG: Mapped {abstract.__name__} → {concrete.__name__}")
-
-    def _is_property_injectable(self, instance: object, name: str, anno_type, use_logging = True) -> bool:
-
-        if use_logging:
-            log = self.log
-        else:
-            log = lambda x: None
-
-        # 1. Skip private
-        if name.startswith("_"):
-            log(f"Skipping private property: {instance.__class__.__name__}.{name}")
-            return False
-
-        # 2. Skip pre-initialized
-        current_val = getattr(instance, name, None)
-        if current_val is not None:
-            log(f"Skipping pre-initialized property: {instance.__class__.__name__}.{name} = {current_val!r}"[:100])
-            return False
-
-        # 3. Skip non-resolvable.
-        dep = self._resolve_type(anno_type)
-        if dep is None:
-            log(f"WARNING: No matching dependency for {instance.__class__.__name__}.{name} on type {anno_type.__name__} (skipped)")
-            return False
-        
-        #
-        # PROPERTY IS INJECTABLE
-        #
-        return True
+        self.debug("Mapped %s → %s", abstract.__name__, concrete.__name__)
+
+    def _build(self, cls):
+        instance = cls()
+        self._instances[cls] = instance
+        self._pending.pop(cls, None)
+        self.debug("Registered %s as new instance", cls.__name__)
+
+        if self._injected:
+            self._inject_late(instance)
+        return instance
+
+    @classmethod
+    def _injection_plan(cls, target: type) -> InjectionPlan:
+        plan = cls._injection_plans.get(target)
+        if plan is None:
+            try:
+                annotations = typing.get_type_hints(target, globalns=sys.modules[target.__module__].__dict__)
+            except NameError as e:
+                raise RuntimeError(f"Failed to resolve type hints for {target.__name__}: {e}")
+            # private properties are never injected.
+            plan = tuple((name, anno_type) for name, anno_type in annotations.items() if not name.startswith("_"))
+            cls._injection_plans[target] = plan
+        return plan
 
     def _resolve_type(self, type_) -> typing.Any:
         if type_ in self._instances:
@@ -88,43 +103,76 @@ class ServiceProvider(LoggerMixin):
         if type_ in self._mappings:
             concrete = self._mappings[type_]
             if concrete not in self._instances:
-                self.register(concrete)
+                self._build(concrete)
             return self._instances[concrete]
-        
+        if type_ in self._pending:
+            return self._build(type_)
+
         # not registered
         return None
 
+    def _inject(self, instance: object):
+        cls = instance.__class__
+        for name, anno_type in __class__._injection_plan(cls):
+
+            # Skip pre-initialized
+            current_val = getattr(instance, name, None)
+            if current_val is not None:
+                self.debug("Skipping pre-initialized property: %s.%s", cls.__name__, name)
+                continue
+
+            # Skip non-resolvable.
+            dep = self._resolve_type(anno_type)
+            if dep is None:
+                self.warn("No matching dependency for %s.%s on type %s (skipped)", cls.__name__, name, getattr(anno_type, "__name__", anno_type))
+                continue
+
+            setattr(instance, name, dep)
+            self.debug("Injected %s into %s.%s", anno_type.__name__, cls.__name__, name)
+
+    def _inject_late(self, instance: object):
+        # Whatever gets built whilst injecting this instance is injected too, and only once all of them are injected do
+        # their _after_inject handlers run - same as inject_all().
+        self._after_inject_queue.append(instance)
+        self._injecting += 1
+        try:
+            self._inject(instance)
+        finally:
+            self._injecting -= 1
+        if self._injecting == 0:
+            self._run_after_inject_handlers()
+
+    def _run_after_inject_handlers(self):
+        while self._after_inject_queue:
+            queue, self._after_inject_queue = self._after_inject_queue, []
+            for instance in queue:
+                if hasattr(instance, '_after_inject'):
+                    self.debug("Found _after_inject handler for %s, invoking...", instance.__class__.__name__)
+                    instance._after_inject()
+
     def inject_all(self):
-        for instance in self._instances.values():
-            cls = instance.__class__
-            try:
-                annotations = typing.get_type_hints(cls, globalns=sys.modules[cls.__module__].__dict__)
-            except NameError as e:
-                raise RuntimeError(f"Failed to resolve type hints for {cls.__name__}: {e}")
-            for name, anno_type in annotations.items():
-                if self._is_property_injectable(instance, name, anno_type):
-                    # Resolve and inject
-                    dep = self._resolve_type(anno_type)
-                    setattr(instance, name, dep)
-                    self.log(f"DEBUG: Injected {anno_type.__name__} into {instance.__class__.__name__}.{name}")
+        start = time.perf_counter()
+        instances = list(self._instances.values())
+
+        self._injected = True
+        self._after_inject_queue.extend(instances)
+        self._injecting += 1
+        try:
+            for instance in instances:
+                self._inject(instance)
+        finally:
+            self._injecting -= 1
 
         self.log("Injection complete. Calling _after_inject handlers.")
-        for instance in self._instances.values():
-            if hasattr(instance, '_after_inject'):
-                self.log(f"DEBUG: Found _after_inject handler for {instance.__class__.__name__}, invoking...")
-                instance._after_inject()
+        self._run_after_inject_handlers()
+        self.debug(
+            "Injected %d services in %.1fms, %d left to build when first resolved.",
+            len(self._instances), (time.perf_counter() - start) * 1000, len(self._pending)
+        )
 
     def resolve(self, type_):
         """Fetch an instance manually, honoring mappings and singletons."""
-        # Direct instance
-        if type_ in self._instances:
-            return self._instances[type_]
-
-        # Abstract → concrete mapping
-        if type_ in self._mappings:
-            concrete = self._mappings[type_]
-            if concrete not in self._instances:
-                self.register(concrete)
-            return self._instances[concrete]
-
-        raise KeyError(f"No instance or mapping found for {type_.__name__}")
+        instance = self._resolve_type(type_)
+        if instance is None:
+            raise KeyError(f"No instance or mapping found for {type_.__name__}")
+        return instance
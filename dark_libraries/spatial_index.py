@@ -0,0 +1,96 @@
+from typing import Iterable
+
+from dark_libraries.dark_math import Coord, Rect
+
+#
+# coord -> item, kept up to date as items move rather than rebuilt for every query.
+#
+# Coords are bucketed into square chunks as well, so that a rect query (e.g. whatever's in the view port) only looks
+# at the chunks the rect overlaps, rather than at every item.
+#
+# Several items can share a coord (briefly, anyway).  Lookups return whichever got there last.
+#
+class SpatialIndex[T]:
+
+    CHUNK_SIZE = 16
+
+    def __init__(self):
+        self._cells  = dict[Coord[int], list[T]]()
+        self._chunks = dict[tuple[int, int], set[Coord[int]]]()
+        self._count  = 0
+
+    @classmethod
+    def _chunk_key(cls, coord: Coord[int]) -> tuple[int, int]:
+        return coord[0] // cls.CHUNK_SIZE, coord[1] // cls.CHUNK_SIZE
+
+    def add(self, coord: Coord[int], item: T):
+        # nowhere (e.g. a party member outside of combat) isn't indexed.
+        if coord is None:
+            return
+        cell = self._cells.get(coord)
+        if cell is None:
+            cell = list[T]()
+            self._cells[coord] = cell
+            self._chunks.setdefault(__class__._chunk_key(coord), set()).add(coord)
+        cell.append(item)
+        self._count += 1
+
+    def remove(self, coord: Coord[int], item: T) -> bool:
+        # False if the item wasn't indexed at coord.
+        cell = self._cells.get(coord) if not coord is None else None
+        if cell is None:
+            return False
+        for index, other in enumerate(cell):
+            if other is item:
+                del cell[index]
+                break
+        else:
+            return False
+
+        self._count -= 1
+        if not cell:
+            del self._cells[coord]
+            chunk_key = __class__._chunk_key(coord)
+            chunk = self._chunks[chunk_key]
+            chunk.discard(coord)
+            if not chunk:
+                del self._chunks[chunk_key]
+        return True
+
+    def move(self, item: T, old_coord: Coord[int], new_coord: Coord[int]):
+        # Items that aren't in this index (any more) are left alone.
+        if self.remove(old_coord, item):
+            self.add(new_coord, item)
+
+    def clear(self):
+        self._cells.clear()
+        self._chunks.clear()
+        self._count = 0
+
+    def get(self, coord: Coord[int]) -> T | None:
+        cell = self._cells.get(coord)
+        return None if cell is None else cell[-1]
+
+    def __contains__(self, coord: Coord[int]) -> bool:
+        return coord in self._cells
+
+    def __len__(self) -> int:
+        return self._count
+
+    def coords(self) -> Iterable[Coord[int]]:
+        return self._cells.keys()
+
+    def items(self) -> Iterable[tuple[Coord[int], T]]:
+        for coord, cell in self._cells.items():
+            yield coord, cell[-1]
+
+    def items_in_rect(self, rect: Rect[int]) -> Iterable[tuple[Coord[int], T]]:
+        if rect.w <= 0 or rect.h <= 0:
+            return
+        min_chunk_x, min_chunk_y = __class__._chunk_key(rect.minimum_corner)
+        max_chunk_x, max_chunk_y = __class__._chunk_key((rect.x + rect.w - 1, rect.y + rect.h - 1))
+        for chunk_y in range(min_chunk_y, max_chunk_y + 1):
+            for chunk_x in range(min_chunk_x, max_chunk_x + 1):
+                for coord in self._chunks.get((chunk_x, chunk_y), ()):
+                    if rect.is_in_bounds(coord):
+                        yield coord, self._cells[coord][-1]
@@ -0,0 +1,71 @@
+import heapq
+import random
+from typing import Any, Callable
+
+#
+# Whose turn is it next: a heap of items ordered on key(item), lowest first.
+#
+# Items are re-keyed (O(log n)) whenever update() is called for them, which is expected whenever their key changes.
+# Entries left behind by re-keying or removal are skipped when they come to the top, rather than searched for.  As a
+# safety net, an item whose key has changed without an update() is re-keyed when it comes to the top too - though
+# until then it may be served a little late, if its key went down.
+#
+# Items with equal keys are ordered by a tiebreak drawn from rng every time they're keyed, so that nobody always goes
+# first, and the order is reproducible from the rng's seed.
+#
+class TurnQueue[T]:
+
+    def __init__(self, key: Callable[[T], Any], rng: random.Random):
+        self._key = key
+        self._rng = rng
+
+        # [key, tiebreak, sequence, item].  Sequence numbers are unique, so items themselves are never compared.
+        self._heap = list[list]()
+        self._sequence = 0
+
+        # id(item) -> sequence of the item's live entry.
+        self._live = dict[int, int]()
+
+    def _push(self, item: T):
+        self._sequence += 1
+        self._live[id(item)] = self._sequence
+        heapq.heappush(self._heap, [self._key(item), self._rng.random(), self._sequence, item])
+
+        # don't let dead entries pile up.
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._heap = [entry for entry in self._heap if self._live.get(id(entry[3])) == entry[2]]
+            heapq.heapify(self._heap)
+
+    def add(self, item: T):
+        self._push(item)
+
+    def update(self, item: T):
+        # Items that aren't queued (any more) are left alone.
+        if id(item) in self._live:
+            self._push(item)
+
+    def remove(self, item: T):
+        self._live.pop(id(item), None)
+
+    def clear(self):
+        self._heap.clear()
+        self._live.clear()
+
+    def __contains__(self, item: T) -> bool:
+        return id(item) in self._live
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def peek(self) -> T | None:
+        while self._heap:
+            key, _, sequence, item = self._heap[0]
+            if self._live.get(id(item)) != sequence:
+                heapq.heappop(self._heap)
+                continue
+            if key != self._key(item):
+                heapq.heappop(self._heap)
+                self._push(item)
+                continue
+            return item
+        return None
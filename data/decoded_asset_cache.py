@@ -0,0 +1,214 @@
+import ast, hashlib, os, pickle, shutil, threading, time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from dark_libraries.logging import LoggerMixin
+
+# Bump this if the layout of anything stored in the cache changes.
+DECODED_ASSET_CACHE_VERSION = 1
+
+ENGINE_ROOT = Path(__file__).resolve().parent.parent
+
+#
+# Decoding the U5 files (decompressing TILES.16, stitching the overworld chunks together, parsing the NPC and TLK files)
+# gives the same answer every launch, so the decoded, palette-independent results are kept on disk and hydrated from
+# there instead.
+#
+# Everything for one set of game files lives in a directory named after a hash of those files, the engine code that
+# decodes them, and DECODED_ASSET_CACHE_VERSION.  Change any of those and the old directory is simply never looked at
+# again.  Each directory records which game directory it was decoded from, and only the stale directories from that
+# same game directory are tidied away, so that e.g. a run against the synthetic test files leaves the real game's
+# cache alone.
+#
+# Arrays come back memory-mapped, so hydrating them costs next to nothing until they're actually read.  Anything that
+# isn't an array is pickled.
+#
+# Until open() has been called (or if the cache can't be written to), nothing is cached and every asset is just built.
+#
+# Loaders can ask for assets from several threads at once (see GlobalRegistryLoader), each asset from just one.
+#
+class DecodedAssetCache(LoggerMixin):
+
+    SOURCE_FILES = (
+        "DATA.OVL",
+        "TILES.16",
+        "BRIT.DAT",
+        "UNDER.DAT",
+        "TOWNE.DAT", "DWELLING.DAT", "CASTLE.DAT", "KEEP.DAT",
+        "TOWNE.NPC", "DWELLING.NPC", "CASTLE.NPC", "KEEP.NPC",
+        "TOWNE.TLK", "DWELLING.TLK", "CASTLE.TLK", "KEEP.TLK",
+    )
+
+    # The code that turns SOURCE_FILES into cached assets.
+    ENGINE_SOURCES = (
+        "dark_libraries/dark_lzw.py",
+        "data/decoded_asset_cache.py",
+        "data/loaders/flame_sprite_loader.py",
+        "data/loaders/tileset_loader.py",
+        "data/loaders/u5_map_loader.py",
+    )
+
+    # The modules of the classes that get pickled.  These, and every engine module they import (e.g. the enums a
+    # TlkFile refers to), are added to ENGINE_SOURCES by get_engine_sources(), so that a change to anything a pickle
+    # might contain can't leave a stale one looking warm.
+    PICKLED_MODULES = (
+        "models.npc_file",
+        "models.tlk_file",
+    )
+
+    # Kept in each digest's directory: the game directory its assets were decoded from.
+    SOURCE_FILE_NAME = "source.txt"
+
+    def __init__(self):
+        super().__init__()
+        self.cache_path = ENGINE_ROOT / "log" / "decoded_assets"
+        self._asset_path: Path = None
+
+        self.hits   = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+        self.load_seconds  = 0.0
+        self._stats_lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        return not self._asset_path is None
+
+    def is_warm(self) -> bool:
+        # i.e. everything asked for so far came off disk.
+        return self.hits > 0 and self.misses == 0
+
+    def _hash_file(self, content_hash, path: Path):
+        content_hash.update(path.name.encode())
+        if path.exists():
+            content_hash.update(path.read_bytes())
+        else:
+            content_hash.update(b"<missing>")
+
+    @classmethod
+    def _module_source(cls, module_name: str) -> str | None:
+        # relative to ENGINE_ROOT, or None if it isn't one of ours (e.g. the standard library).
+        relative_path = module_name.replace(".", "/") + ".py"
+        return relative_path if (ENGINE_ROOT / relative_path).exists() else None
+
+    @classmethod
+    def get_engine_sources(cls) -> list[str]:
+        pickled_sources = set[str]()
+        pending = [cls._module_source(module_name) for module_name in cls.PICKLED_MODULES]
+        while pending:
+            source = pending.pop()
+            if source is None or source in pickled_sources:
+                continue
+            pickled_sources.add(source)
+            for node in ast.walk(ast.parse((ENGINE_ROOT / source).read_text(encoding = "utf-8"))):
+                if isinstance(node, ast.Import):
+                    imported = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and not node.module is None:
+                    # "from package import module" as well as "from module import name".
+                    imported = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+                else:
+                    continue
+                pending.extend(cls._module_source(module_name) for module_name in imported)
+        return sorted(pickled_sources.union(cls.ENGINE_SOURCES))
+
+    def content_digest(self, u5_path: Path) -> str:
+        content_hash = hashlib.blake2b(digest_size = 16)
+        content_hash.update(DECODED_ASSET_CACHE_VERSION.to_bytes(4, "little"))
+        for engine_source in __class__.get_engine_sources():
+            content_hash.update(engine_source.encode())
+            self._hash_file(content_hash, ENGINE_ROOT / engine_source)
+        for source_file in __class__.SOURCE_FILES:
+            self._hash_file(content_hash, u5_path / source_file)
+        return content_hash.hexdigest()
+
+    @classmethod
+    def _source_id(cls, u5_path: Path) -> str:
+        return str(Path(u5_path).resolve())
+
+    def _read_source(self, asset_path: Path) -> str | None:
+        try:
+            return (asset_path / __class__.SOURCE_FILE_NAME).read_text(encoding = "utf-8")
+        except OSError:
+            return None
+
+    def open(self, u5_path: Path):
+        self._asset_path = None
+        digest = self.content_digest(u5_path)
+        source_id = __class__._source_id(u5_path)
+
+        asset_path = self.cache_path / digest
+        try:
+            if self.cache_path.exists():
+                for stale_path in self.cache_path.iterdir():
+                    if stale_path.is_dir() and stale_path.name != digest and self._read_source(stale_path) == source_id:
+                        shutil.rmtree(stale_path, ignore_errors = True)
+                        self.log(f"DEBUG: Removed stale decoded assets {stale_path}")
+
+            asset_path.mkdir(parents = True, exist_ok = True)
+            if self._read_source(asset_path) != source_id:
+                self._write_atomically(asset_path / __class__.SOURCE_FILE_NAME, lambda f: f.write(source_id.encode("utf-8")))
+        except OSError as e:
+            self.log(f"WARNING: Could not create decoded asset cache {asset_path}, running uncached: {e}")
+            return
+
+        self._asset_path = asset_path
+        self.log(f"DEBUG: Decoded assets cached in {self._asset_path}")
+
+    def _write_atomically(self, path: Path, write: Callable[[object], None]):
+        # A half-written file must never be mistaken for a cached asset.
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+
+    def _get[T](self, path: Path, build: Callable[[], T], load: Callable[[Path], T], save: Callable[[object, T], None]) -> T:
+
+        if not self.is_open():
+            return build()
+
+        if path.exists():
+            start = time.perf_counter()
+            try:
+                asset = load(path)
+                with self._stats_lock:
+                    self.hits += 1
+                    self.load_seconds += time.perf_counter() - start
+                return asset
+            except Exception as e:
+                self.log(f"WARNING: Could not load decoded asset {path}, rebuilding it: {e!r}")
+
+        start = time.perf_counter()
+        asset = build()
+        with self._stats_lock:
+            self.misses += 1
+            self.build_seconds += time.perf_counter() - start
+
+        try:
+            self._write_atomically(path, lambda f: save(f, asset))
+        except OSError as e:
+            self.log(f"WARNING: Could not write decoded asset {path}: {e}")
+        return asset
+
+    # writeable arrays are copy-on-write, the cache itself is never modified.
+    def get_array(self, name: str, build: Callable[[], np.ndarray], writeable: bool = False) -> np.ndarray:
+        return self._get(
+            self._asset_path / f"{name}.npy" if self.is_open() else None,
+            build,
+            lambda path: np.load(path, mmap_mode = "c" if writeable else "r", allow_pickle = False),
+            lambda f, array: np.save(f, array, allow_pickle = False)
+        )
+
+    def get_object[T](self, name: str, build: Callable[[], T]) -> T:
+        return self._get(
+            self._asset_path / f"{name}.pickle" if self.is_open() else None,
+            build,
+            lambda path: pickle.loads(path.read_bytes()),
+            lambda f, asset: pickle.dump(asset, f, protocol = pickle.HIGHEST_PROTOCOL)
+        )
+
+    def log_summary(self):
+        self.log(
+            f"DEBUG: Decoded assets: {self.hits} loaded in {self.load_seconds * 1000:.1f}ms, "
+            f"{self.misses} built in {self.build_seconds * 1000:.1f}ms"
+        )
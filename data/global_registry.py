@@ -53,7 +53,7 @@ class GlobalRegistry:
         self.scroll_border_glyphs: BorderGlyphs = None
 
         self.unbaked_light_maps     = Registry[int,             LightMap]()               # radius
-        self.baked_light_level_maps = Registry[tuple[int,int],  dict[Coord, LightMap]]()  # location, level -> coord, lightmap
+        self.baked_light_level_maps = Registry[tuple[int,int],  dict[Coord, LightMap]](can_be_empty=True)  # location, level -> coord, lightmap (baked on arrival)
 
         # soundtracks.
         self.location_soundtracks  = Registry[int, str](can_be_empty=True) # location_index
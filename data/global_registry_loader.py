@@ -1,6 +1,9 @@
+import os, time
 from pathlib import Path
+from dark_libraries.dark_stages import Stage, StageGraph
 from dark_libraries.logging import LoggerMixin
 
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 
 from data.loaders.blue_border_glyph_factory import BlueBorderGlyphFactory
@@ -42,8 +45,13 @@ from services.light_map_level_baker  import LightMapLevelBaker
 
 class GlobalRegistryLoader(LoggerMixin):
 
+    # Worker threads for the stages that can run off the main thread, 0 to run everything in order on the main thread.
+    # The main thread is busy with its own stages, so a single CPU is better off without any.
+    LOADER_WORKERS = int(os.environ.get("UPV_LOADER_WORKERS", min(4, (os.process_cpu_count() or 1) - 1)))
+
     # Injectable
     global_registry: GlobalRegistry
+    decoded_asset_cache: DecodedAssetCache
 
     data_ovl_loader: DataOVLLoader
 
@@ -98,61 +106,89 @@ class GlobalRegistryLoader(LoggerMixin):
 
         return all_registries_loaded
 
-    def load(self, u5_path: Path):
+    def _stages(self, u5_path: Path) -> list[Stage]:
+        #
+        # In the order they'd run one at a time.  reads/writes name registries (or the like) so that the loader can
+        # run as a dependency graph, and anything creating surfaces stays on the main thread.
+        #
+        return [
+            Stage("decoded_asset_cache", lambda: self.decoded_asset_cache.open(u5_path), writes = ("decoded_asset_cache",)),
+
+            Stage("data_ovl", lambda: self.data_ovl_loader.load(u5_path), writes = ("data_ovl",)),
+            Stage("colors",   self.color_loader.load,                     writes = ("colors",), main_thread = True),
+
+            # Map
+            Stage("tile_indexes",   lambda: self.tile_loader.load_tile_indexes(u5_path),                 reads = ("decoded_asset_cache",),             writes = ("tile_indexes",)),
+            Stage("tiles",          lambda: self.tile_loader.register_tile_indexes(self.tile_loader.tile_indexes), reads = ("tile_indexes", "colors"), writes = ("tiles",), main_thread = True),
+            Stage("terrains",       self.terrain_loader.register_terrains,                                                                              writes = ("terrains",)),
+            Stage("maps",           lambda: self.u5map_loader.register_maps(u5_path),                    reads = ("data_ovl", "decoded_asset_cache"),  writes = ("maps", "location_metadata")),
+            Stage("entry_triggers", self.entry_trigger_loader.load,                                      reads = ("data_ovl", "maps", "terrains"),     writes = ("entry_triggers",)),
+
+            Stage("animated_sprites", self.animated_tile_loader.register_sprites, reads = ("tiles",),                        writes = ("sprites",), main_thread = True),
+            Stage("flame_sprites",    self.flame_sprite_loader.register_sprites,  reads = ("tiles", "decoded_asset_cache"), writes = ("sprites",), main_thread = True),
+
+            Stage("combat_maps", lambda: self.combat_map_loader.load(u5_path), writes = ("combat_maps", "dungeon_rooms")),
+
+            # font
+            Stage("fonts",  lambda: self.u5_font_loader.register_fonts(u5_path), writes = ("fonts",)),
+            Stage("glyphs", self._load_glyphs, reads = ("fonts", "colors"), writes = ("font_glyphs", "blue_border_glyphs", "scroll_border_glyphs"), main_thread = True),
+
+            Stage("item_types", self._load_item_types, reads = ("data_ovl",), writes = ("item_types",)),
 
-        self.data_ovl_loader.load(u5_path)
-        self.color_loader.load()
+            # display
+            Stage("light_maps", self.light_map_builder.build_light_maps, writes = ("unbaked_light_maps",)),
+            Stage("cursors",    self.cursor_loader.load,                 writes = ("cursors",), main_thread = True),
 
-        # Map
-        self.tile_loader.load_tiles(u5_path)
-        self.terrain_loader.register_terrains()
-        self.u5map_loader.register_maps(u5_path)
-        self.entry_trigger_loader.load()
+            # npc
+            Stage("npc_sprites",  self.npc_sprite_builder.register_npc_sprites, reads = ("tiles",), writes = ("sprites",), main_thread = True),
+            Stage("npc_metadata", self.npc_metadata_loader.load, writes = ("npc_metadata",)),
+            Stage("npc_files",    lambda: self.npc_file_loader.load(u5_path, self.u5map_loader.metadata),
+                reads = ("location_metadata", "decoded_asset_cache"), writes = ("npc_sections",)),
+            Stage("tlk_files",    lambda: self.tlk_file_loader.load(u5_path, self.u5map_loader.metadata),
+                reads = ("data_ovl", "location_metadata", "npc_sections", "decoded_asset_cache"), writes = ("npc_dialogs",)),
+            Stage("shoppes",      lambda: self.shoppe_dat_loader.load(u5_path), reads = ("data_ovl",), writes = ("shoppe_strings",)),
 
-        self.animated_tile_loader.register_sprites()
-        self.flame_sprite_loader.register_sprites()
+            # magic
+            Stage("spells", self._load_spells, reads = ("data_ovl",), writes = ("runes", "spell_types")),
 
-        self.combat_map_loader.load(u5_path)
+            Stage("projectile_sprites", self.projectile_sprite_loader.load, reads = ("font_glyphs", "colors"), writes = ("projectile_sprites",), main_thread = True),
 
-        # font
-        self.u5_font_loader.register_fonts(u5_path)
+            Stage("saved_game", lambda: self.saved_game_loader.load_existing(u5_path)),
+        ]
+
+    def _load_glyphs(self):
         self.u5_glyph_loader.register_glyphs()
         self.blue_border_glyph_factory.load()
         self.scroll_border_glyph_factory.load()
 
+    def _load_item_types(self):
         self.equipable_item_type_loader.build()
         self.consumable_item_type_loader.register_item_types()
 
-        # display
-        self.light_map_builder.build_light_maps()
-        self.cursor_loader.load()
-
-        # npc
-        self.npc_sprite_builder.register_npc_sprites()
-        self.npc_metadata_loader.load()
-        self.npc_file_loader.load(u5_path, self.u5map_loader.metadata)
-        self.tlk_file_loader.load(u5_path, self.u5map_loader.metadata)
-        self.shoppe_dat_loader.load(u5_path)
-
-        # magic
+    def _load_spells(self):
         self.spell_rune_loader.load()
         self.spell_type_loader.load()
 
-        self.projectile_sprite_loader.load()
+    def load(self, u5_path: Path):
+
+        start = time.perf_counter()
 
-        self.saved_game_loader.load_existing(u5_path)
+        graph = StageGraph(self._stages(u5_path))
+        self.stage_timings = graph.run(__class__.LOADER_WORKERS)
+
+        # How long each stage of the load took, in the order they started (see benchmarks/).
+        self.stage_seconds = {timing.name: timing.seconds for timing in sorted(self.stage_timings, key = lambda timing: timing.started)}
 
         #
         # TODO: LOAD REGISTRY SPECIFIC MODS AFTER EACH OG REGISTRY IS LOADED.
         #
 #        self.modding.load_mods()
 
+        self.decoded_asset_cache.log_summary()
+        graph.log_timings(self.stage_timings)
+        start_kind = "warm" if self.decoded_asset_cache.is_warm() else "cold"
+
         if self._post_load_check():
-            self.log("All registries loaded.")
+            self.log(f"All registries loaded in {time.perf_counter() - start:.2f}s ({start_kind} start).")
         else:
             self.log("WARNING: Some registries did not load.")
-
-
-        
-                
-
@@ -44,13 +44,11 @@ class CombatMapLoader(LoggerMixin):
 
     def _load_map(self, map_index: int, data: bytes, is_dungeon_room: bool) -> CombatMap:
         map_byte_offset = __class__._to_map_byte_offset(map_index)
-        map_tile_ids = dict[Coord, int]()
-        # Load basic tile info
+        map_tile_ids = bytearray()
+        # Load basic tile info (the rows are padded, so strip the padding off)
         for row_index in range(NUM_ROWS):
             row_offset = map_byte_offset + (row_index * ROW_BYTES_PADDED)
-            for col_index in range(NUM_COLS):
-                tile_id = int(data[row_offset + col_index])
-                map_tile_ids[Coord(col_index, row_index)] = tile_id
+            map_tile_ids += data[row_offset : row_offset + NUM_COLS]
 
         def _to_row_extra_offset(row_index: int) -> int:
             return __class__._to_map_byte_offset(map_index) + (row_index * ROW_BYTES_PADDED) + NUM_COLS
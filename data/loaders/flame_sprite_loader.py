@@ -1,9 +1,11 @@
 # file: animation/flames.py
 import pygame
-import random
 from typing import Optional, Iterator
 
+import numpy as np
+
 from dark_libraries.logging import LoggerMixin
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 from view.display_config import DisplayConfig
 from models.tile import Tile
@@ -28,18 +30,21 @@ FLAME_OVERLAY_INDEX = NORMAL_TILE_INDEX + 16
 
 FLAME_FRAME_DURATION = 0.15
 FLAME_FRAME_COUNT    = 23   # Arbitrary prime number
+FLAME_RANDOM_SEED    = 1974 # Any fixed value will do, it just keeps the flames the same from one launch to the next.
 
 class FlameSpriteLoader(LoggerMixin):
 
     # Injectable
     display_config: DisplayConfig
     global_registry: GlobalRegistry
+    decoded_asset_cache: DecodedAssetCache
 
     def _after_inject(self):
 
         self._flame_animatable = [
             176,177,178,222,179,188,189,190,191
         ]
+        self.random_seed = FLAME_RANDOM_SEED
 
     def _has_flame_animation(self, tile_index: int):
         return tile_index in self._flame_animatable
@@ -53,33 +58,43 @@ class FlameSpriteLoader(LoggerMixin):
         
         return tile_index + 16
 
-    def _build_frames(self, original_tile_id: int) -> Iterator[Tile]:
+    def _build_frame_pixels(self, original_tile_id: int) -> np.ndarray:
         assert self._has_flame_animation(original_tile_id), f"Tile id={original_tile_id} is not flame-animatable."
 
         original_tile: Tile = self.global_registry.tiles.get(original_tile_id)
         overlay_tile:  Tile = self.global_registry.tiles.get(self._get_flame_overlay_index(original_tile_id))
 
-        # Apply overlay mask
-        for _ in range(FLAME_FRAME_COUNT):
-            composed_surface = original_tile.get_surface().copy()
-            for y, row in enumerate(overlay_tile.pixels):
-                for x, mask_val in enumerate(row):
-                    composed_value = original_tile.pixels[y][x]
-                    for bit_ix in range(8):
-                        bit_selector = 1 << bit_ix
-                        if bit_selector & mask_val:
-                            # RANDOMLY TOGGLE ORIGINAL
-                            if random.choice([True, False]):
-                                composed_value ^= bit_selector   # XOR function - i.e. for every bit in the following values: e.g. 1010
-                                                                 #                          if bit_selector is 1, then: 
-                                                                 #                              if mask_val is 1, set to 0, and vice-versa
-                        else:
-                            # leave original alone
-                            pass
-
-                    composed_surface.set_at((x, y), self.display_config.EGA_PALETTE[composed_value])
-
-            composed_tile = Tile(None)
+        original_pixels = np.asarray(original_tile.pixels, dtype=np.uint8)
+        overlay_mask    = np.asarray(overlay_tile.pixels,  dtype=np.uint8)
+
+        # Seeded per tile, so a sprite's flames don't depend on which other sprites were built before it.
+        rng = np.random.default_rng((self.random_seed, original_tile_id))
+
+        # Every bit that is set in the overlay gets randomly toggled (XOR) in the original, independently for each
+        # frame and pixel.  Returns (frame, y, x) palette indexes.
+        random_bits = rng.integers(0, 256, size = (FLAME_FRAME_COUNT,) + original_pixels.shape, dtype=np.uint8)
+        return original_pixels ^ (random_bits & overlay_mask)
+
+    def _build_frames(self, original_tile_id: int) -> Iterator[Tile]:
+
+        frame_pixels = self.decoded_asset_cache.get_array(
+            f"flame_frames_{original_tile_id}_{self.random_seed}",
+            lambda: self._build_frame_pixels(original_tile_id)
+        )
+
+        original_surface = self.global_registry.tiles.get(original_tile_id).get_surface()
+        palette = np.array(
+            [original_surface.map_rgb(self.display_config.EGA_PALETTE[index]) for index in range(len(self.display_config.EGA_PALETTE))],
+            dtype=np.uint32
+        )
+
+        for pixels in frame_pixels:
+            composed_surface = original_surface.copy()
+
+            # surfarray is indexed [x, y]
+            pygame.surfarray.blit_array(composed_surface, palette[pixels].T)
+
+            composed_tile = Tile(None, pixels)
             composed_tile.set_surface(composed_surface)
             yield composed_tile
 
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from dark_libraries.dark_math import Vector2
 
 from dark_libraries.logging import LoggerMixin
@@ -15,18 +17,19 @@ class LightMapBuilder(LoggerMixin):
     
     # Builds an unbaked lightmap of specified radius
     def _build_light_map(self, radius: int, light_emitter_view_offset: Vector2[int]) -> LightMap:
-        light_map_centre = 0,0
-        light_map = LightMap()
-        for view_coord in self.display_config.VIEW_PORT_SIZE.__iter__():
-            light_map_offset: Vector2[int] = view_coord.to_offset() - light_emitter_view_offset
-
-            # This tweak makes the lightmaps the right shape
-            biblically_accurate_radius_offset = 0.5
-
-            distance = int(light_map_offset.pythagorean_distance(light_map_centre) + biblically_accurate_radius_offset)
-            if distance <= radius:
-                light_map.light(light_map_offset)
-        return light_map
+        view_w, view_h = self.display_config.VIEW_PORT_SIZE.to_tuple()
+        dy, dx = np.mgrid[0:view_h, 0:view_w]
+        dx -= light_emitter_view_offset.x
+        dy -= light_emitter_view_offset.y
+
+        # This tweak makes the lightmaps the right shape
+        biblically_accurate_radius_offset = 0.5
+
+        distance = (np.sqrt(dx * dx + dy * dy) + biblically_accurate_radius_offset).astype(int)
+        return LightMap(
+            mask   = distance <= radius,
+            origin = -light_emitter_view_offset
+        )
 
     # all unbaked light maps are built in coords relative to the light emitter.
     def build_light_maps(self):
@@ -2,62 +2,18 @@
 import pygame, struct
 from pathlib import Path
 
-from dark_libraries.dark_math import Coord
+import numpy as np
+
+from dark_libraries.dark_lzw import lzw_decompress
+from dark_libraries.dark_math import Size
 from dark_libraries.logging import LoggerMixin
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 from models.enums.ega_palette_values import EgaPaletteValues
-from models.tile import Tile, TileData
+from models.tile import Tile
 from services.surface_factory import SurfaceFactory
 from view.display_config import DisplayConfig
 
-# --- LZW decompression ---
-def lzw_decompress(data: bytes) -> bytes:
-    CLEAR, EOI = 256, 257
-    code_size = 9
-    dict_size = 258
-    dictionary = {i: bytes([i]) for i in range(256)}
-    result = bytearray()
-    data_bits = 0
-    bit_count = 0
-    pos = 0
-
-    def get_code():
-        nonlocal data_bits, bit_count, pos
-        while bit_count < code_size and pos < len(data):
-            data_bits |= data[pos] << bit_count
-            bit_count += 8
-            pos += 1
-        code = data_bits & ((1 << code_size) - 1)
-        data_bits >>= code_size
-        bit_count -= code_size
-        return code
-
-    prev = None
-    while True:
-        code = get_code()
-        if code == CLEAR:
-            dictionary = {i: bytes([i]) for i in range(256)}
-            dict_size = 258
-            code_size = 9
-            prev = None
-            continue
-        if code == EOI:
-            break
-        if code in dictionary:
-            entry = dictionary[code]
-        elif code == dict_size and prev is not None:
-            entry = dictionary[prev] + dictionary[prev][:1]
-        else:
-            raise ValueError("Bad LZW code")
-        result.extend(entry)
-        if prev is not None:
-            dictionary[dict_size] = dictionary[prev] + entry[:1]
-            dict_size += 1
-            if dict_size == (1 << code_size) and code_size < 12:
-                code_size += 1
-        prev = code
-    return bytes(result)
-
 class TileLoader(LoggerMixin):
 
     TOTAL_TILES = 512
@@ -65,65 +21,60 @@ class TileLoader(LoggerMixin):
     display_config: DisplayConfig
     global_registry: GlobalRegistry
     surface_factory: SurfaceFactory
- 
-    def tile_from_bytes(self, tile_id: int, data:bytes) -> Tile:
+    decoded_asset_cache: DecodedAssetCache
 
+    def decode_tile_indexes(self, data: bytes) -> np.ndarray:
+        # Two 4-bit palette indexes per byte, high nibble first.  Returns (tile_id, y, x) palette indexes.
         TILE_SIZE = self.display_config.TILE_SIZE
-
-        pixels: TileData = []
-        ROW_BYTES = TILE_SIZE.w // 2
-
-        base_offset = tile_id * ROW_BYTES * TILE_SIZE.h
-        for y in range(TILE_SIZE.h):
-            row = data[base_offset + y * ROW_BYTES : base_offset + (y + 1) * ROW_BYTES]
-            pixel_row = []
-            for x in range(TILE_SIZE.w):
-                shift = 4 if (x % 2) == 0 else 0
-                val = (row[x // 2] >> shift) & 0x0F
-                pixel_row.append(val)
-            pixels.append(pixel_row)
-
-        tile = Tile(tile_id, pixels)
-        surf = self._create_surface(tile)
-        tile.set_surface(surf)
-        return tile
-
-    def _create_surface(self, tile: Tile) -> pygame.Surface:
-        assert tile.surface is None, "Surface already created !"
-
-        #
-        # TODO: use SurfaceFactory
-        #
-        surface = self.surface_factory.create_surface(tile._get_size())
-        surface_pixels = pygame.PixelArray(surface)
-        self._draw_onto_pixel_array(tile, surface_pixels)
-        del surface_pixels
+        packed = np.frombuffer(data, dtype=np.uint8, count = __class__.TOTAL_TILES * TILE_SIZE.h * (TILE_SIZE.w // 2))
+        packed = packed.reshape((__class__.TOTAL_TILES, TILE_SIZE.h, TILE_SIZE.w // 2))
+
+        indexes = np.empty((__class__.TOTAL_TILES, TILE_SIZE.h, TILE_SIZE.w), dtype=np.uint8)
+        indexes[:, :, 0::2] = packed >> 4
+        indexes[:, :, 1::2] = packed & 0x0F
+        return indexes
+
+    def _build_palette(self) -> np.ndarray:
+        # palette index -> mapped rgb, as understood by surfaces from our surface_factory.
+        return np.array(
+            [self.global_registry.colors.get(EgaPaletteValues.from_index(index)) for index in range(len(EgaPaletteValues))],
+            dtype=np.uint32
+        )
+
+    def _create_surface(self, mapped_pixels: np.ndarray) -> pygame.Surface:
+        height, width = mapped_pixels.shape
+        surface = self.surface_factory.create_surface(Size[int](width, height))
+
+        # surfarray is indexed [x, y]
+        pygame.surfarray.blit_array(surface, mapped_pixels.T)
         return surface
 
-    def _draw_onto_pixel_array(self, tile: Tile, surface_pixels : pygame.PixelArray, target_pixel_offset: Coord[int] = Coord[int](0,0)):
-
-        for pixel_coord in tile._get_size():
-
-            # Get the pixel color from the tile
-            u5_color = tile.pixels[pixel_coord.y][pixel_coord.x]
-            ega_color = EgaPaletteValues.from_index(u5_color)
-            rgb_color = self.global_registry.colors.get(ega_color)
-            
-            # Set the pixel color on the rendered surface
-            surface_pixels[pixel_coord.add(target_pixel_offset).to_tuple()] = rgb_color
-
-    def load_tiles(self, u5_path: Path):
-        path = u5_path.joinpath("TILES.16")
+    def _decode_tiles_file(self, path: Path) -> np.ndarray:
         raw = path.read_bytes()
         (uncomp_len,) = struct.unpack("<I", raw[:4])
-        data = lzw_decompress(raw[4:])
+        data = lzw_decompress(raw[4:], uncomp_len)
         assert len(data) == uncomp_len, f"Expected {uncomp_len} bytes after decompressing, but got {len(data)} bytes."
+        return self.decode_tile_indexes(data)
 
-        for tile_id in range(512):
-            tile = self.tile_from_bytes(tile_id, data)
-            self.global_registry.tiles.register(tile_id, tile)
+    # Decoding needs no pygame, so can happen off the main thread ahead of register_tile_indexes.
+    def load_tile_indexes(self, u5_path: Path) -> np.ndarray:
+        path = u5_path.joinpath("TILES.16")
+        self.tile_indexes = self.decoded_asset_cache.get_array("tile_indexes", lambda: self._decode_tiles_file(path))
+        return self.tile_indexes
 
-        self.log(f"Loaded {len(self.global_registry.tiles)} tiles from {path}")
-    
+    def load_tiles(self, u5_path: Path):
+        self.register_tile_indexes(self.load_tile_indexes(u5_path))
+        self.log(f"Loaded {len(self.global_registry.tiles)} tiles from {u5_path.joinpath('TILES.16')}")
+
+    def register_tiles(self, data: bytes):
+        self.register_tile_indexes(self.decode_tile_indexes(data))
 
+    def register_tile_indexes(self, indexes: np.ndarray):
+        indexes.flags.writeable = False
+        mapped_pixels = self._build_palette()[indexes]
 
+        for tile_id in range(__class__.TOTAL_TILES):
+            # Tile.pixels is a read-only (y, x) view of the palette indexes, for the likes of FlameSpriteLoader.
+            tile = Tile(tile_id, indexes[tile_id])
+            tile.set_surface(self._create_surface(mapped_pixels[tile_id]))
+            self.global_registry.tiles.register(tile_id, tile)
@@ -3,6 +3,7 @@ from typing  import Iterable
 
 from dark_libraries.logging import LoggerMixin
 
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 from models.location_metadata import LocationMetadata
 from models.tlk_file import CompressedWords, NpcDialog, TlkFile
@@ -12,6 +13,7 @@ class TlkFileLoader(LoggerMixin):
 
     # Injectable
     global_registry: GlobalRegistry
+    decoded_asset_cache: DecodedAssetCache
 
     FILES = (
         "TOWNE.TLK",
@@ -29,7 +31,7 @@ class TlkFileLoader(LoggerMixin):
             if not path.exists():
                 self.log(f"WARN: {filename} not found at {path}")
                 continue
-            parsed[files_index] = TlkFile(path, compressed_words)
+            parsed[files_index] = self.decoded_asset_cache.get_object(filename, lambda: TlkFile(path, compressed_words))
             self.log(f"DEBUG: Loaded {filename}")
 
         registered = 0
@@ -1,7 +1,11 @@
 from pathlib import Path
+
+import numpy as np
+
 from dark_libraries.dark_math import Size
 from dark_libraries.logging import LoggerMixin
 
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 
 from models.location_metadata import ordinal_to_level_key
@@ -15,6 +19,9 @@ class U5MapLoader(LoggerMixin):
     # Injectable
     builder: LocationMetadataBuilder
     global_registry: GlobalRegistry
+    decoded_asset_cache: DecodedAssetCache
+
+    WORLD_SIZE = Size(256, 256)
 
     FILES = [
         "TOWNE.DAT",
@@ -28,12 +35,9 @@ class U5MapLoader(LoggerMixin):
 
     @classmethod
     def convert_tilearray_to_map_level(cls, tiledata: bytearray, map_size: Size) -> U5MapLevel:
-        tiles_dict = {
-            coord : tiledata[(map_size.w * coord.y) + coord.x]
-            for coord in map_size
-        }
+        # Zero-copy: the map level becomes a view over tiledata.
         return U5MapLevel(
-            data = tiles_dict,
+            data = tiledata,
             size = map_size
         )
     
@@ -72,7 +76,7 @@ class U5MapLoader(LoggerMixin):
             location_metadata = meta
         )
 
-    def load_britannia(self) -> U5MapLevel:
+    def _decode_britannia(self) -> np.ndarray:
 
         # === CONSTANTS ===
         GRID_DIM    = 16
@@ -98,11 +102,9 @@ class U5MapLoader(LoggerMixin):
                     src = cy * CHUNK_DIM
                     tiles[dst:dst+CHUNK_DIM] = chunk[src:src+CHUNK_DIM]
         
-        # Convert to U5MapLevel compatible format.                    
-        map_size = Size(MAP_DIM, MAP_DIM)
-        return __class__.convert_tilearray_to_map_level(tiles, map_size)
+        return np.frombuffer(tiles, dtype=np.uint8)
 
-    def load_underworld(self) -> U5MapLevel:
+    def _decode_underworld(self) -> np.ndarray:
 
         # === CONSTANTS ===
         GRID_DIM   = 16       # 16×16 chunks
@@ -121,10 +123,17 @@ class U5MapLoader(LoggerMixin):
                     src = cy * CHUNK_DIM
                     tiles[dst:dst+CHUNK_DIM] = chunk[src:src+CHUNK_DIM]
 
-                # Convert to U5MapLevel compatible format.                    
-        map_size = Size(MAP_DIM, MAP_DIM)
-        return __class__.convert_tilearray_to_map_level(tiles, map_size)
-    
+        return np.frombuffer(tiles, dtype=np.uint8)
+
+    # Maps get edited during play (doors, dropped items etc.), so these are copy-on-write.
+    def load_britannia(self) -> U5MapLevel:
+        tiles = self.decoded_asset_cache.get_array("britannia", self._decode_britannia, writeable = True)
+        return __class__.convert_tilearray_to_map_level(tiles, __class__.WORLD_SIZE)
+
+    def load_underworld(self) -> U5MapLevel:
+        tiles = self.decoded_asset_cache.get_array("underworld", self._decode_underworld, writeable = True)
+        return __class__.convert_tilearray_to_map_level(tiles, __class__.WORLD_SIZE)
+
     def build_world_map(self):
 
         levels: dict[int, U5MapLevel] = {}
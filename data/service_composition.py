@@ -1,6 +1,7 @@
 # file: display/service_composition.py
 from dark_libraries.service_provider import ServiceProvider
 
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 from data.global_registry_loader import GlobalRegistryLoader
 
@@ -10,5 +11,6 @@ def compose(provider: ServiceProvider):
     
     provider.register(GlobalRegistry)
     provider.register(GlobalRegistryLoader)
+    provider.register(DecodedAssetCache)
 
     compose_loaders(provider)
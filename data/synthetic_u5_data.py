@@ -0,0 +1,680 @@
+"""
+Writes synthetic, structurally valid stand-ins for the Ultima V game files, so
+that the loaders, the gameplay harness and the benchmarks can run at full scale
+without a game install.
+
+    python -m data.synthetic_u5_data <directory> [--seed N]
+
+    from data.synthetic_u5_data import write_synthetic_u5_data
+    u5_path = write_synthetic_u5_data(tmp_path)
+
+Every file has the layout and size of the original (TILES.16 is LZW compressed,
+the overworld is chunked with its empty ocean left out, the NPC and TLK files
+have a section/entry per location, and so on), but the content is generated:
+a noise-shaped Britannia with every town, dwelling, castle, keep and dungeon on
+it, walled towns with buildings and ladders between floors, townsfolk with
+schedules and something to say, and a party of four standing outside Britain.
+
+Only what the engine actually reads is filled in.  The same seed always gives
+the same files.
+"""
+import argparse
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from dark_libraries.dark_lzw import lzw_compress
+from data.loaders.location_metadata_builder import LocationMetadataBuilder
+from models.tlk_file import _COMPRESSED_LOOKUP, _MIN_LABEL, TalkCommand
+
+SYNTHETIC_U5_FILES = (
+    "TILES.16",
+    "DATA.OVL",
+    "BRIT.DAT", "UNDER.DAT",
+    "TOWNE.DAT", "DWELLING.DAT", "CASTLE.DAT", "KEEP.DAT",
+    "TOWNE.NPC", "DWELLING.NPC", "CASTLE.NPC", "KEEP.NPC",
+    "TOWNE.TLK", "DWELLING.TLK", "CASTLE.TLK", "KEEP.TLK",
+    "BRIT.CBT", "DUNGEON.CBT",
+    "SHOPPE.DAT",
+    "IBM.CH", "RUNES.CH",
+    "SAVED.GAM",
+)
+
+DAT_FILES = ("TOWNE.DAT", "DWELLING.DAT", "CASTLE.DAT", "KEEP.DAT")
+NPC_FILES = ("TOWNE.NPC", "DWELLING.NPC", "CASTLE.NPC", "KEEP.NPC")
+TLK_FILES = ("TOWNE.TLK", "DWELLING.TLK", "CASTLE.TLK", "KEEP.TLK")
+
+# Big enough for every region models.data_ovl.DataOVL slices.
+DATA_OVL_SIZE  = 0x9300
+SAVED_GAM_SIZE = 0x1060
+
+WORLD_DIM    = 256
+CHUNK_DIM    = 16
+LOCATION_DIM = 32
+
+NUM_TILES         = 512
+NUM_LOCATIONS     = 32
+NUM_DUNGEONS      = 8
+NUM_COMBAT_MAPS   = 16
+NUM_DUNGEON_ROOMS = 112
+
+# Tile ids, see data/loaders/terrain_loader.py
+DEEP_WATER, WATER, SHALLOWS = 1, 2, 3
+SWAMP, GRASS, SCRUB, DESERT = 4, 5, 6, 7
+FOREST, DEEP_FOREST, HILLS, MOUNTAINS = 9, 10, 11, 12
+HUT, KEEP, VILLAGE, TOWN, CASTLE = 16, 18, 19, 20, 21
+DUNGEON_ENTRANCES = (22, 23, 24)
+FLOOR, ROCK_WALL, WALL = 68, 77, 79
+DOOR = 184
+LADDER_UP, LADDER_DOWN = 200, 201
+VOID = 255
+
+# CharacterType bytes for the .NPC files, i.e. NpcTileId - 0x100.
+TOWNSFOLK_TYPES = (64, 68, 72, 80, 84, 88, 92, 104, 108, 112)
+
+LOCATION_NAMES = (
+    "MOONGLOW", "BRITAIN", "JHELOM", "YEW", "MINOC", "TRINSIC", "SKARA BRAE", "NEW MAGINCIA",
+    "FOGSBANE", "STORMCROW", "GREYHAVEN", "WAVEGUIDE", "IOLO'S HUT",
+    "WEST BRITANNY", "NORTH BRITANNY", "EAST BRITANNY", "PAWS", "COVE", "BUCCANEER'S DEN",
+    "ARARAT", "BORDERMARCH", "FARTHING", "WINDEMERE", "STONEGATE", "THE LYCAEUM", "EMPATH ABBEY", "SERPENT'S HOLD",
+)
+
+# The ones LocationMetadataBuilder adds itself.
+EXTRA_LOCATION_NAMES = ("LORD BRITISH'S CASTLE", "BLACKTHORN'S CASTLE", "SPEKTRAN", "SIN'VRAAL'S HUT", "GRENDEL'S HUT")
+
+# The spells data/loaders/spell_type_loader.py knows about, and the runes they're made of.
+SPELL_NAMES = (
+    "An Nox", "Mani", "An Zu", "In Lor", "An Ylem", "Grav Por", "In Wis",
+    "In Xen Mani", "Rel Hur", "An Sanct", "Kal Xen", "An Xen Corp", "In Ex Por", "In Zu",
+)
+
+# Conversation files refer to these by number (see models.tlk_file.CompressedWords).
+COMPRESSED_WORDS = (
+    "thee", "thou", "thy", "thine", "the", "and", "that", "have", "with", "this", "from", "what", "know",
+    "shall", "would", "there", "their", "town", "work", "name", "friend", "gold", "good", "here", "where",
+    "travel", "watch", "guard", "trade", "food", "night", "days", "many", "been", "some", "lord", "castle",
+)
+
+FIRST_SYLLABLES = ("Al", "Bel", "Cor", "Dar", "El", "Fen", "Gar", "Hal", "Is", "Jor", "Kel", "Lor", "Mar", "Nel", "Or", "Per", "Ros", "Syl", "Tam", "Wen")
+LAST_SYLLABLES  = ("dric", "wen", "ana", "ric", "wyn", "iel", "ton", "mir", "eth", "ard", "ina", "ek", "ald", "ia", "ous")
+# (keyword, description, job, answer)
+JOBS = (
+    ("watch", "a watchful guard",     "I keep watch over {town}.",        "The watch keeps the peace, friend."),
+    ("trade", "a busy merchant",      "I trade in cloth and rope.",       "Good trade needs good roads."),
+    ("farm",  "a tired farmer",       "I work the fields outside {town}.", "The harvest was thin this year."),
+    ("smith", "a burly smith",        "I am the smith of {town}.",        "A blade is only as good as its steel."),
+    ("heal",  "a gentle healer",      "I tend to the sick and the hurt.", "Rest, and thy wounds shall mend."),
+    ("fish",  "a weathered fisher",   "I fish the waters near {town}.",   "The sea gives, and the sea takes."),
+    ("sing",  "a cheerful bard",      "I sing for my supper.",            "Shall I sing thee a song of the lord?"),
+    ("beg",   "a ragged beggar",      "I have no work, only need.",       "Some gold for the poor?"),
+)
+
+SHOP_STRINGS = {
+    "time_of_day_strings":     ("morning", "afternoon", "evening"),
+    "shop_farewells":          ("Good-bye...", "Another time...", "Safe travels...", "Farewell..."),
+    "shop_buy_sell_greetings": ("Hail, friend! Wilt thou buy or sell?", "Greetings! Buy or sell?"),
+    "shop_affirmations":       ("Very good!", "Excellent!", "Fine, fine!", "Of course!"),
+    "shop_list_prefaces":      ("We have:", "We stock:", "Thou canst buy:", "On offer:"),
+    "shop_buy_pick_prompts":   ("What may I show thee?", "Which wouldst thou see?", "What is thine interest?", "Which one?"),
+    "shop_sell_pick_prompts":  ("What wouldst thou sell?", "What dost thou wish to sell?", "Show me thy wares.", "What hast thou?"),
+    "shop_welcome_template":   ("Good @, and welcome to #!",),
+    "shop_name_says_template": ("$ says,",),
+}
+
+# Where DataOVL finds each region: name -> (offset, length).
+DATA_OVL_REGIONS = {
+    "spell_names":             (0x709,  0x1bb),
+    "spell_runes":             (0x941,  0x64),
+    "city_names_caps":         (0xa4d,  0x111),
+    "store_names":             (0xbfe,  0x2fc),
+    "barkeeper_names":         (0xefa,  0x152),
+    "compressed_words":        (0x104c, 0x24e),
+    "map_index_towne":         (0x1e2a, 0x8),
+    "map_index_dwelling":      (0x1e32, 0x8),
+    "map_index_castle":        (0x1e3a, 0x8),
+    "map_index_keep":          (0x1e42, 0x8),
+    "attack_values":           (0x160c, 0x37),
+    "defense_values":          (0x1644, 0x2f),
+    "range_values":            (0x1674, 0x37),
+    "location_x_coords":       (0x1e9a, 0x28),
+    "location_y_coords":       (0x1ec2, 0x28),
+    "britannia_chunking_info": (0x3886, 0x100),
+    "base_prices_awr":         (0x3a92, 0x60),
+    "merchant_weapon_lists":   (0x3af2, 0x48),
+    "time_of_day_strings":     (0x7836, 0x1a),
+    "shop_buy_pick_prompts":   (0x7bf2, 0x66),
+    "shop_sell_pick_prompts":  (0x7dc4, 0x80),
+    "shop_farewells":          (0x7e44, 0x42),
+    "shop_buy_sell_greetings": (0x7f58, 0x6a),
+    "shop_affirmations":       (0x7fc2, 0x36),
+    "shop_list_prefaces":      (0x7ff8, 0x30),
+    "shop_welcome_template":   (0x8028, 0x1e),
+    "shop_name_says_template": (0x8046, 0x10),
+}
+
+# SHOPPE.DAT: item descriptions start at string 8, and 49..56 are the sell offers (see ShopkeeperController).
+NUM_PRICED_ITEMS  = 41
+SELL_OFFER_STRINGS = 8
+NUM_SHOPPE_STRINGS = 200
+
+PARTY = (
+    ("Avatar",  "A"),
+    ("Shamino", "F"),
+    ("Iolo",    "B"),
+    ("Mariah",  "M"),
+)
+
+# equipment item ids, as registered by EquipableItemTypeLoader.
+LEATHER_HELM   = 0
+SMALL_SHIELD   = 4
+LEATHER_ARMOUR = 10
+SHORT_SWORD    = 23
+
+# item id -> (defence, attack, range), for what the party wears; everything else is worthless.
+EQUIPMENT_STATS = {
+    LEATHER_HELM:   (1, 0, 0),
+    SMALL_SHIELD:   (2, 0, 0),
+    LEATHER_ARMOUR: (3, 0, 0),
+    SHORT_SWORD:    (0, 4, 1),
+}
+
+
+# dictionary word -> the TLK byte that stands for it.
+WORD_BYTES = {
+    COMPRESSED_WORDS[index]: byte for byte, index in _COMPRESSED_LOOKUP.items() if 0 <= index < len(COMPRESSED_WORDS)
+}
+
+
+def _strings(strings) -> bytes:
+    return b"".join(text.encode("ascii") + b"\0" for text in strings)
+
+
+def _text_bytes(text: str) -> bytes:
+    # TLK plain characters are stored with the high bit set.
+    assert all(ch == " " or ch == "!" or "%" <= ch <= "Z" or "a" <= ch <= "z" for ch in text), f"Can't store {text!r} in a TLK file"
+    return bytes(ord(ch) + 0x80 for ch in text)
+
+
+def _value_noise(rng: np.random.Generator, size: int, cells: int) -> np.ndarray:
+    # smoothly interpolated random lattice, values in 0..1
+    lattice = rng.random((cells + 1, cells + 1))
+    t = np.linspace(0, cells, size, endpoint = False)
+    i = t.astype(int)
+    f = t - i
+    f = f * f * (3 - 2 * f)
+
+    top    = lattice[np.ix_(i, i)]     + (lattice[np.ix_(i, i + 1)]     - lattice[np.ix_(i, i)])     * f[None, :]
+    bottom = lattice[np.ix_(i + 1, i)] + (lattice[np.ix_(i + 1, i + 1)] - lattice[np.ix_(i + 1, i)]) * f[None, :]
+    return top + (bottom - top) * f[:, None]
+
+
+def _fractal_noise(rng: np.random.Generator, size: int) -> np.ndarray:
+    return 0.6 * _value_noise(rng, size, 8) + 0.3 * _value_noise(rng, size, 16) + 0.1 * _value_noise(rng, size, 32)
+
+
+class SyntheticU5Data:
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.rng  = np.random.default_rng(seed)
+
+        # (name_index, files_index, num_levels), in trigger order.
+        self.locations = LocationMetadataBuilder.LOCATION_METADATA
+
+        self.britannia     = self._build_britannia()
+        self.entrances     = self._place_entrances()
+        self.location_maps = [self._build_location(trigger_index) for trigger_index in range(NUM_LOCATIONS)]
+
+    #
+    # Britannia
+    #
+    def _build_britannia(self) -> np.ndarray:
+        elevation = _fractal_noise(self.rng, WORLD_DIM)
+        moisture  = _fractal_noise(self.rng, WORLD_DIM)
+
+        # an island continent: sink everything towards the edges.
+        axis = np.linspace(-1, 1, WORLD_DIM)
+        distance = np.sqrt(axis[None, :] ** 2 + axis[:, None] ** 2)
+        elevation = elevation - 0.6 * distance ** 2
+
+        sea_level = np.quantile(elevation, 0.62)
+        tiles = np.full((WORLD_DIM, WORLD_DIM), GRASS, dtype = np.uint8)
+
+        tiles[moisture > 0.62] = FOREST
+        tiles[moisture > 0.70] = DEEP_FOREST
+        tiles[moisture < 0.38] = SCRUB
+        tiles[moisture < 0.30] = DESERT
+        tiles[(moisture > 0.58) & (elevation < sea_level + 0.03)] = SWAMP
+
+        land = elevation[elevation > sea_level]
+        tiles[elevation > np.quantile(land, 0.88)] = HILLS
+        tiles[elevation > np.quantile(land, 0.94)] = MOUNTAINS
+
+        tiles[elevation <= sea_level]        = SHALLOWS
+        tiles[elevation <= sea_level - 0.03] = WATER
+        tiles[elevation <= sea_level - 0.08] = DEEP_WATER
+        return tiles
+
+    def _place_entrances(self) -> list[tuple[int, int]]:
+        # somewhere dry and walkable for every town, dwelling, castle, keep and dungeon, spread out.
+        candidates = np.argwhere(np.isin(self.britannia[2:-2, 2:-2], (GRASS, SCRUB, DESERT))) + 2
+        self.rng.shuffle(candidates)
+
+        entrances = list[tuple[int, int]]()
+        min_distance = 16
+        while len(entrances) < NUM_LOCATIONS + NUM_DUNGEONS:
+            for y, x in candidates:
+                if all(abs(x - ex) + abs(y - ey) >= min_distance for ex, ey in entrances):
+                    entrances.append((int(x), int(y)))
+                    if len(entrances) == NUM_LOCATIONS + NUM_DUNGEONS:
+                        break
+            min_distance -= 2
+
+        for trigger_index, (x, y) in enumerate(entrances):
+            self.britannia[y - 1:y + 2, x - 1:x + 2] = GRASS
+            self.britannia[y, x] = self._entrance_tile(trigger_index)
+        return entrances
+
+    def _entrance_tile(self, trigger_index: int) -> int:
+        if trigger_index >= NUM_LOCATIONS:
+            return DUNGEON_ENTRANCES[trigger_index % len(DUNGEON_ENTRANCES)]
+        name_index, files_index, _ = self.locations[trigger_index]
+        if files_index == 0:
+            return TOWN
+        if files_index == 1:
+            return VILLAGE if name_index < 12 else HUT
+        if files_index == 2:
+            return CASTLE if name_index in (27, 28) else VILLAGE
+        return KEEP
+
+    def _build_underworld(self) -> np.ndarray:
+        noise = _fractal_noise(self.rng, WORLD_DIM)
+        tiles = np.full((WORLD_DIM, WORLD_DIM), SCRUB, dtype = np.uint8)
+        tiles[noise < 0.40] = DESERT
+        tiles[noise > 0.58] = SWAMP
+        tiles[noise > 0.66] = MOUNTAINS
+        tiles[noise < 0.30] = WATER
+        return tiles
+
+    def build_brit_dat(self) -> tuple[bytes, bytes]:
+        # -> (BRIT.DAT, chunking info).  Chunks that are nothing but ocean aren't stored.
+        chunks = list[bytes]()
+        chunking_info = bytearray()
+        grid = WORLD_DIM // CHUNK_DIM
+        for gy in range(grid):
+            for gx in range(grid):
+                chunk = self.britannia[gy * CHUNK_DIM:(gy + 1) * CHUNK_DIM, gx * CHUNK_DIM:(gx + 1) * CHUNK_DIM]
+                if (chunk == DEEP_WATER).all():
+                    chunking_info.append(0xFF)
+                else:
+                    chunking_info.append(len(chunks))
+                    chunks.append(chunk.tobytes())
+        return b"".join(chunks), bytes(chunking_info)
+
+    def build_under_dat(self) -> bytes:
+        tiles = self._build_underworld()
+        grid = WORLD_DIM // CHUNK_DIM
+        return b"".join(
+            tiles[gy * CHUNK_DIM:(gy + 1) * CHUNK_DIM, gx * CHUNK_DIM:(gx + 1) * CHUNK_DIM].tobytes()
+            for gy in range(grid) for gx in range(grid)
+        )
+
+    #
+    # Towns, dwellings, castles and keeps
+    #
+    def _has_basement(self, trigger_index: int) -> bool:
+        return trigger_index + 1 in LocationMetadataBuilder.BASEMENT_LOCATIONS
+
+    def _default_ordinal(self, trigger_index: int) -> int:
+        return 1 if self._has_basement(trigger_index) else 0
+
+    def _build_location(self, trigger_index: int) -> list[np.ndarray]:
+        _, _, num_levels = self.locations[trigger_index]
+
+        # a walled town with a gate in the middle of the south wall, and a street up from it.
+        buildings = list[tuple[int, int, int, int]]()
+        for _ in range(40):
+            w, h = self.rng.integers(5, 10), self.rng.integers(4, 8)
+            x, y = self.rng.integers(5, 27 - w), self.rng.integers(5, 26 - h)
+            overlaps_street = x <= 17 and x + w >= 14
+            overlaps = any(x <= bx + bw and bx <= x + w and y <= by + bh and by <= y + h for bx, by, bw, bh in buildings)
+            if not (overlaps_street or overlaps):
+                buildings.append((int(x), int(y), int(w), int(h)))
+            if len(buildings) == 6:
+                break
+
+        ground = self._default_ordinal(trigger_index)
+        levels = list[np.ndarray]()
+        for ordinal in range(num_levels):
+            outside = GRASS if ordinal == ground else (ROCK_WALL if ordinal < ground else VOID)
+            level = np.full((LOCATION_DIM, LOCATION_DIM), outside, dtype = np.uint8)
+
+            if ordinal == ground:
+                level[3, 3:29] = level[28, 3:29] = WALL
+                level[3:29, 3] = level[3:29, 28] = WALL
+                level[4:28, 4:28] = GRASS
+                level[5:29, 15:17] = FLOOR
+
+            for x, y, w, h in buildings:
+                level[y:y + h, x:x + w] = WALL
+                level[y + 1:y + h - 1, x + 1:x + w - 1] = FLOOR
+                if ordinal == ground:
+                    # doors face the street.
+                    level[y + h // 2, x + w - 1 if x < 15 else x] = DOOR
+
+            # ladders between consecutive floors, inside the first building.
+            if buildings and num_levels > 1:
+                x, y, _, _ = buildings[0]
+                if ordinal + 1 < num_levels:
+                    level[y + 1, x + 1] = LADDER_UP
+                if ordinal > 0:
+                    level[y + 1, x + 2] = LADDER_DOWN
+            levels.append(level)
+        return levels
+
+    def build_location_dat(self, files_index: int) -> bytes:
+        return b"".join(
+            level.tobytes()
+            for trigger_index, (_, location_files_index, _) in enumerate(self.locations) if location_files_index == files_index
+            for level in self.location_maps[trigger_index]
+        )
+
+    def _map_index_table(self, files_index: int) -> bytes:
+        # which level of the .DAT file each location starts on.
+        table = bytearray()
+        map_index_offset = 0
+        for trigger_index, (_, location_files_index, num_levels) in enumerate(self.locations):
+            if location_files_index == files_index:
+                table.append(map_index_offset + self._default_ordinal(trigger_index))
+                map_index_offset += num_levels
+        return bytes(table)
+
+    #
+    # Townsfolk
+    #
+    def _name(self) -> str:
+        return str(self.rng.choice(FIRST_SYLLABLES)) + str(self.rng.choice(LAST_SYLLABLES))
+
+    def _location_name(self, trigger_index: int) -> str:
+        name = (LOCATION_NAMES + EXTRA_LOCATION_NAMES)[self.locations[trigger_index][0]]
+        return " ".join(word.capitalize() for word in name.split(" "))
+
+    def _walkable_coords(self, trigger_index: int) -> np.ndarray:
+        level = self.location_maps[trigger_index][self._default_ordinal(trigger_index)]
+        coords = np.argwhere(np.isin(level[4:28, 4:28], (GRASS, FLOOR))) + 4
+        return coords[:, ::-1]
+
+    def build_npc_file(self, files_index: int) -> tuple[bytes, list[tuple[int, int]]]:
+        # -> (.NPC file, [(dialog number, trigger index)]).  Slot 0 of every section is unused.
+        sections = list[bytes]()
+        dialogs = list[tuple[int, int]]()
+        dialog_number = 1
+        for trigger_index, (_, location_files_index, _) in enumerate(self.locations):
+            if location_files_index != files_index:
+                continue
+
+            schedules, types, dialog_numbers = bytearray(16), bytearray(1), bytearray(1)
+            npc_count = 24 if files_index in (0, 2) else 10
+            coords = self._walkable_coords(trigger_index)
+            for _ in range(1, 32):
+                if len(types) > npc_count:
+                    schedules += bytes(16)
+                    types.append(0)
+                    dialog_numbers.append(0)
+                    continue
+
+                positions = coords[self.rng.choice(len(coords), 3, replace = False)]
+                times = sorted(int(t) for t in self.rng.choice(np.arange(5, 23), 4, replace = False))
+                schedules += bytes(
+                    [int(a) for a in self.rng.integers(0, 4, 3)]
+                    + [int(x) for x in positions[:, 0]]
+                    + [int(y) for y in positions[:, 1]]
+                    + [0, 0, 0]
+                    + times
+                )
+                types.append(int(self.rng.choice(TOWNSFOLK_TYPES)))
+                dialog_numbers.append(dialog_number)
+                dialogs.append((dialog_number, trigger_index))
+                dialog_number += 1
+
+            sections.append(bytes(schedules) + bytes(types) + bytes(dialog_numbers))
+
+        sections += [bytes(576)] * (8 - len(sections))
+        return b"".join(sections), dialogs
+
+    def _encode_line(self, text: str) -> bytes:
+        # words that are in the dictionary are stored as a single byte, like the originals.
+        out = bytearray()
+        previous_was_text = False
+        for token in text.split(" "):
+            if token in WORD_BYTES:
+                out.append(WORD_BYTES[token])
+                previous_was_text = False
+            else:
+                if previous_was_text:
+                    out += _text_bytes(" ")
+                out += _text_bytes(token)
+                previous_was_text = True
+        return bytes(out) + b"\0"
+
+    def build_tlk_file(self, dialogs: list[tuple[int, int]]) -> bytes:
+        blocks = list[tuple[int, bytes]]()
+        for dialog_number, trigger_index in dialogs:
+            town = self._location_name(trigger_index)
+            keyword, description, job, answer = JOBS[int(self.rng.integers(len(JOBS)))]
+            lines = [
+                self._encode_line(self._name()),
+                self._encode_line(description),
+                self._encode_line("Well met, traveller!"),
+                self._encode_line(job.format(town = town)),
+                self._encode_line("Fare thee well."),
+                self._encode_line(keyword[:4]), self._encode_line(answer),
+                self._encode_line("town"), self._encode_line(f"{town} is my home."),
+            ]
+            label_section = bytes()
+
+            # like the originals, some NPCs ask the Avatar's name back, and some greet via a goto into their labels.
+            if dialog_number % 3 == 1:
+                lines[0] = lines[0][:-1] + bytes([TalkCommand.ASK_NAME, 0])
+            elif dialog_number % 3 == 2:
+                lines[2] = bytes([_MIN_LABEL, 0])
+                label_section = bytes([TalkCommand.START_LABEL_DEFINITION, _MIN_LABEL]) + self._encode_line("Hail, stranger!")
+
+            block = b"".join(lines) + label_section
+            block += bytes([TalkCommand.START_LABEL_DEFINITION, TalkCommand.END_SCRIPT, 0])
+            blocks.append((dialog_number, block))
+
+        header_length = 2 + 4 * len(blocks)
+        header = bytearray(struct.pack("<H", len(blocks)))
+        offset = header_length
+        for dialog_number, block in blocks:
+            header += struct.pack("<HH", dialog_number, offset)
+            offset += len(block)
+        return bytes(header) + b"".join(block for _, block in blocks)
+
+    #
+    # Combat
+    #
+    def _build_combat_map(self, is_dungeon_room: bool) -> bytes:
+        # 11 rows of 32 bytes: 11 tiles, then 21 bytes of spawn (and dungeon trigger) data.
+        if is_dungeon_room:
+            tiles = np.full((11, 11), ROCK_WALL, dtype = np.uint8)
+            tiles[1:10, 1:10] = FLOOR
+        else:
+            tiles = np.where(self.rng.random((11, 11)) < 0.1, FOREST, GRASS).astype(np.uint8)
+
+        extra = np.zeros((11, 21), dtype = np.uint8)
+        # party spawns, (6 x, 6 y) for arriving from the east, west, south and north.
+        columns = np.arange(2, 8)
+        extra[1, :12] = np.concatenate([np.full(6, 9), columns])
+        extra[2, :12] = np.concatenate([np.full(6, 1), columns])
+        extra[3, :12] = np.concatenate([columns, np.full(6, 9)])
+        extra[4, :12] = np.concatenate([columns, np.full(6, 1)])
+
+        # 16 monster spawns around the middle.
+        middle = np.array([(x, y) for y in range(3, 8) for x in range(3, 8)])
+        monsters = middle[self.rng.choice(len(middle), 16, replace = False)]
+        extra[6, :16] = monsters[:, 0]
+        extra[7, :16] = monsters[:, 1]
+
+        return np.concatenate([tiles, extra], axis = 1).tobytes()
+
+    def build_cbt(self, count: int, is_dungeon_room: bool) -> bytes:
+        return b"".join(self._build_combat_map(is_dungeon_room) for _ in range(count))
+
+    #
+    # Graphics
+    #
+    def build_tiles16(self) -> bytes:
+        # 512 16x16 tiles, two 4-bit EGA palette indexes per byte, LZW compressed behind the uncompressed length.
+        tiles = np.empty((NUM_TILES, 16, 16), dtype = np.uint8)
+        palettes = {
+            DEEP_WATER: (1, 1, 9), WATER: (1, 9, 9), SHALLOWS: (9, 11, 9),
+            SWAMP: (2, 6, 2), GRASS: (2, 2, 10), SCRUB: (2, 6, 10), DESERT: (14, 6, 14),
+            FOREST: (2, 10, 0), DEEP_FOREST: (0, 2, 2), HILLS: (6, 2, 8), MOUNTAINS: (7, 8, 15),
+            FLOOR: (6, 6, 8), ROCK_WALL: (8, 7, 0), WALL: (7, 8, 8), DOOR: (6, 6, 0), VOID: (0, 0, 0),
+        }
+        for tile_id in range(NUM_TILES):
+            palette = palettes.get(tile_id)
+            if palette is None:
+                palette = tuple(int(c) for c in self.rng.integers(0, 16, 3))
+            tiles[tile_id] = np.array(palette, dtype = np.uint8)[self.rng.integers(0, 3, (16, 16))]
+
+        packed = (tiles[:, :, 0::2] << 4) | tiles[:, :, 1::2]
+        data = packed.tobytes()
+        return struct.pack("<I", len(data)) + lzw_compress(data)
+
+    def build_font(self) -> bytes:
+        # 256 8x8 one-bit glyphs, with a blank column and row between characters.
+        glyphs = self.rng.integers(0, 256, (256, 8), dtype = np.uint8) & 0xFE
+        glyphs[:, 7] = 0
+        glyphs[0] = glyphs[32] = 0
+        return glyphs.tobytes()
+
+    #
+    # DATA.OVL and friends
+    #
+    def build_data_ovl(self, chunking_info: bytes) -> bytes:
+        raw = bytearray(DATA_OVL_SIZE)
+
+        def put(name: str, data: bytes):
+            offset, length = DATA_OVL_REGIONS[name]
+            assert len(data) <= length, f"{name} is {len(data)} bytes, but DATA.OVL only has room for {length}"
+            raw[offset:offset + len(data)] = data
+
+        runes = sorted({rune for spell_name in SPELL_NAMES for rune in spell_name.upper().split(" ")})
+        put("spell_names",     _strings(SPELL_NAMES))
+        put("spell_runes",     _strings(runes))
+        put("city_names_caps", _strings(LOCATION_NAMES))
+        put("compressed_words", _strings(COMPRESSED_WORDS))
+
+        for files_index, name in enumerate(("map_index_towne", "map_index_dwelling", "map_index_castle", "map_index_keep")):
+            put(name, self._map_index_table(files_index))
+
+        put("location_x_coords", bytes(x for x, _ in self.entrances))
+        put("location_y_coords", bytes(y for _, y in self.entrances))
+        put("britannia_chunking_info", chunking_info)
+
+        for name, stat in (("defense_values", 0), ("attack_values", 1), ("range_values", 2)):
+            values = bytearray(DATA_OVL_REGIONS[name][1])
+            for item_id, stats in EQUIPMENT_STATS.items():
+                values[item_id] = stats[stat]
+            put(name, bytes(values))
+
+        # shops: Britain's arms seller first, 41 of the 48 armour/weapon/ring slots for sale.
+        put("store_names",     _strings(["Iolo's Bows"] + [f"The {self._name()} Arms" for _ in range(8)] + [f"{self._name()}'s Inn" for _ in range(6)]))
+        put("barkeeper_names", _strings(self._name() for _ in range(16)))
+        prices = [int(p) * 5 for p in self.rng.integers(2, 200, 48)]
+        for unpriced in self.rng.choice(48, 48 - NUM_PRICED_ITEMS, replace = False):
+            prices[unpriced] = 0
+        put("base_prices_awr", struct.pack("<48H", *prices))
+        priced = [index for index, price in enumerate(prices) if price > 0]
+        put("merchant_weapon_lists", b"".join(
+            bytes(sorted(int(i) for i in self.rng.choice(priced, 6, replace = False))) + b"\xff\xff" for _ in range(9)
+        ))
+        for name, strings in SHOP_STRINGS.items():
+            put(name, _strings(strings))
+
+        return bytes(raw)
+
+    def build_shoppe_dat(self) -> bytes:
+        strings = [f"Welcome to {self._name()}'s, good @!" for _ in range(8)]
+        strings += ["A fine piece, yours for % gold." for _ in range(NUM_PRICED_ITEMS)]
+        strings += ["For thy &, I'll give thee % gold." for _ in range(SELL_OFFER_STRINGS)]
+        while len(strings) < NUM_SHOPPE_STRINGS:
+            strings.append(f"$ nods. {self._name()} would like that.")
+        return _strings(strings)
+
+    def build_saved_gam(self) -> bytes:
+        raw = bytearray(SAVED_GAM_SIZE)
+
+        for index, (name, char_class) in enumerate(PARTY):
+            record = 0x02 + index * 32
+            raw[record:record + 9] = name.encode("ascii")[:8].ljust(9, b"\0")
+            raw[record + 0x09] = index % 2
+            raw[record + 0x0A] = ord(char_class)
+            raw[record + 0x0B] = ord("G")
+            raw[record + 0x0C:record + 0x10] = bytes(int(v) for v in self.rng.integers(12, 25, 4))
+            if index == 0:
+                # the Avatar is the quickest, so takes the first turn in combat.
+                raw[record + 0x0D] = 30
+            struct.pack_into("<HHH", raw, record + 0x10, 150, 150, 400)
+            raw[record + 0x16] = 3
+            # the engine expects everyone to wear armour; no ring or amulet.
+            raw[record + 0x19:record + 0x1F] = bytes([LEATHER_HELM, LEATHER_ARMOUR, SMALL_SHIELD, SHORT_SWORD, 0xFF, 0xFF])
+
+        struct.pack_into("<HH", raw, 0x0202, 300, 250)     # food, gold
+        raw[0x0206:0x0209] = bytes([5, 2, 10])              # keys, gems, torches
+        raw[0x02AA:0x02B2] = bytes([10] * 8)                # reagents
+        raw[0x02B5] = len(PARTY)
+
+        # 4th of the 5th, 139, nine in the morning.
+        raw[0x02CE] = 139
+        raw[0x02D7], raw[0x02D8], raw[0x02D9], raw[0x02DB] = 5, 4, 9, 0
+
+        # outside Britain.
+        x, y = self.entrances[1]
+        raw[0x02ED], raw[0x02EF], raw[0x02F0], raw[0x02F1] = 0, 0, x, y + 1
+        return bytes(raw)
+
+    def write(self, u5_path: Path) -> Path:
+        u5_path = Path(u5_path)
+        u5_path.mkdir(parents = True, exist_ok = True)
+
+        brit_dat, chunking_info = self.build_brit_dat()
+        files = {
+            "TILES.16":    self.build_tiles16(),
+            "BRIT.DAT":    brit_dat,
+            "UNDER.DAT":   self.build_under_dat(),
+            "DATA.OVL":    self.build_data_ovl(chunking_info),
+            "BRIT.CBT":    self.build_cbt(NUM_COMBAT_MAPS,   is_dungeon_room = False),
+            "DUNGEON.CBT": self.build_cbt(NUM_DUNGEON_ROOMS, is_dungeon_room = True),
+            "SHOPPE.DAT":  self.build_shoppe_dat(),
+            "IBM.CH":      self.build_font(),
+            "RUNES.CH":    self.build_font(),
+            "SAVED.GAM":   self.build_saved_gam(),
+        }
+        for files_index, (dat_file, npc_file, tlk_file) in enumerate(zip(DAT_FILES, NPC_FILES, TLK_FILES)):
+            npc_data, dialogs = self.build_npc_file(files_index)
+            files[dat_file] = self.build_location_dat(files_index)
+            files[npc_file] = npc_data
+            files[tlk_file] = self.build_tlk_file(dialogs)
+
+        for name, data in files.items():
+            (u5_path / name).write_bytes(data)
+        return u5_path
+
+
+def write_synthetic_u5_data(u5_path: Path, seed: int = 0) -> Path:
+    return SyntheticU5Data(seed).write(u5_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Write synthetic U5 game files.")
+    parser.add_argument("directory", type = Path)
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args()
+
+    write_synthetic_u5_data(args.directory, args.seed)
+    print(f"Wrote synthetic U5 game files to {args.directory}")
@@ -34,7 +34,9 @@ class CombatAgent(NpcAgent):
     
     @coord.setter
     def coord(self, value: Coord[int]):
+        old_coord = self._coord
         self._coord = value
+        self._coord_changed(old_coord, value)
 
     @property
     def slept(self) -> bool:
@@ -1,6 +1,6 @@
 import random
 
-from typing import Iterable
+from typing import Callable, Iterable
 
 from dark_libraries.dark_math import Coord, Rect
 from dark_libraries.logging import LoggerMixin
@@ -12,6 +12,14 @@ class NpcAgent(LoggerMixin):
     def __init__(self):
         super().__init__()
 
+        # Told (agent, old_coord, new_coord) whenever coord changes, e.g. so that whoever is indexing agents by coord
+        # can keep up.
+        self._coord_listener: Callable[['NpcAgent', Coord[int], Coord[int]], None] = None
+
+        # Told (agent) whenever spent action points change, e.g. so that whoever is queueing agents for their turns
+        # can keep up.
+        self._turn_listener: Callable[['NpcAgent'], None] = None
+
         # for deciding who has the next turn
         self._spent_action_points = 0
 
@@ -30,6 +38,11 @@ class NpcAgent(LoggerMixin):
     @coord.setter
     def coord(self, value: Coord[int]): ...
 
+    # Implementations of the coord setter call this.
+    def _coord_changed(self, old_coord: Coord[int], new_coord: Coord[int]):
+        if not self._coord_listener is None and old_coord != new_coord:
+            self._coord_listener(self, old_coord, new_coord)
+
     @property
     def dexterity(self) -> int: ...
 
@@ -37,6 +50,17 @@ class NpcAgent(LoggerMixin):
     def spent_action_points(self) -> float:
         return self._spent_action_points
 
+    # Plenty of things set this directly (e.g. entering combat), so the turn listener is told from here.
+    @property
+    def _spent_action_points(self) -> float:
+        return self.__spent_action_points
+
+    @_spent_action_points.setter
+    def _spent_action_points(self, value: float):
+        self.__spent_action_points = value
+        if not self._turn_listener is None:
+            self._turn_listener(self)
+
     @property
     def slept(self) -> bool: ...
 
@@ -47,9 +71,12 @@ class NpcAgent(LoggerMixin):
     #
     # AI Moves
     #
-    def _move_generator(self, target_coord: Coord[int]) -> Iterable[Coord[int]]:
+    def _move_generator(self, target_coord: Coord[int], path_steps: Iterable[Coord[int]] = ()) -> Iterable[Coord[int]]:
+
+        # Whatever a pathfinder suggested (if anything) goes first.
+        yield from path_steps
 
-        # First of all, try the obvious move.
+        # Then try the obvious move.
         yield self.coord + self.coord.normal_4way(target_coord)
 
         # OK, strike out in a random direction then
@@ -60,10 +87,11 @@ class NpcAgent(LoggerMixin):
     def _find_next_move(self, 
                             target_coord:      Coord[int], 
                             forbidden_coords:  set[Coord[int]],
-                            boundary_rect:     Rect[int] | None
+                            boundary_rect:     Rect[int] | None,
+                            path_steps:        Iterable[Coord[int]] = ()
                         ) -> Coord[int]:
      
-        for next_move_coord in self._move_generator(target_coord):
+        for next_move_coord in self._move_generator(target_coord, path_steps):
 
             is_forbidden      = next_move_coord in forbidden_coords
             is_in_outer_world = boundary_rect is None
@@ -72,20 +100,22 @@ class NpcAgent(LoggerMixin):
             if (not is_forbidden) and (is_in_outer_world or (not is_out_of_bounds)):
                 return next_move_coord
             else:
-                self.log(f"DEBUG: Rejecting proposed next_move_coord={next_move_coord} (is_forbidden={is_forbidden}, is_in_outer_world={is_in_outer_world}, is_out_of_bounds={is_out_of_bounds})")
+                self.debug("Rejecting proposed next_move_coord=%s (is_forbidden=%s, is_in_outer_world=%s, is_out_of_bounds=%s)", next_move_coord, is_forbidden, is_in_outer_world, is_out_of_bounds)
 
         return None
     
     def move_towards(self, 
                         target_coord:      Coord[int], 
                         forbidden_coords:  set[Coord[int]],
-                        boundary_rect:     Rect[int]
+                        boundary_rect:     Rect[int],
+                        path_steps:        Iterable[Coord[int]] = ()
                      ):
 
         next_move_coord = self._find_next_move(
             target_coord,
             forbidden_coords, 
-            boundary_rect 
+            boundary_rect,
+            path_steps
         )
 
         if next_move_coord is None:
@@ -94,6 +124,6 @@ class NpcAgent(LoggerMixin):
 
         assert self.coord.taxi_distance(next_move_coord) == 1, f"Cannot move directly from {self.coord} to {next_move_coord}"
 
-        self.log(f"DEBUG: {self.name} moving from {self.coord} to {next_move_coord} with {self.spent_action_points} spent action points.")
+        self.debug("%s moving from %s to %s with %s spent action points.", self.name, self.coord, next_move_coord, self.spent_action_points)
         self.coord = next_move_coord
     
\ No newline at end of file
@@ -44,7 +44,9 @@ class TownNpcAgent(NpcAgent):
 
     @coord.setter
     def coord(self, value: Coord[int]):
+        old_coord = self._coord
         self._coord = value
+        self._coord_changed(old_coord, value)
 
     @property
     def dexterity(self) -> int:
@@ -12,7 +12,7 @@ NESWSpawnCoordinateTuple = tuple[
 ]
 
 class CombatMap(U5MapLevel):
-    def __init__(self, data: dict[Coord[int], int], size: Size[int], party_spawn_coords: NESWSpawnCoordinateTuple, monster_spawn_coords: SpawnCoordinates):
+    def __init__(self, data: bytearray, size: Size[int], party_spawn_coords: NESWSpawnCoordinateTuple, monster_spawn_coords: SpawnCoordinates):
         super().__init__(data, size)
 
         self._party_spawn_coords   = party_spawn_coords    
@@ -27,7 +27,7 @@ class DungeonRoomTileTrigger:
 
 class DungeonRoom(CombatMap):
     
-    def __init__(self, data: dict[Coord[int], int], size: Size[int], party_spawn_coords: NESWSpawnCoordinateTuple, monster_spawn_coords: SpawnCoordinates):
+    def __init__(self, data: bytearray, size: Size[int], party_spawn_coords: NESWSpawnCoordinateTuple, monster_spawn_coords: SpawnCoordinates):
         super().__init__(data, size, party_spawn_coords, monster_spawn_coords)
 
         self._static_monster_tile_ids = dict[int, int]() # black magic lives here.
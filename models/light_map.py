@@ -1,46 +1,79 @@
-from typing import Self
+from typing import Iterable, Self
 
-from dark_libraries.dark_math import Coord, Vector2
+import numpy as np
 
+from dark_libraries.dark_math import Coord, Rect, Size, Vector2
+
+#
+# A fixed-size boolean mask, anchored at an origin.
+#
+# Unbaked light maps are anchored relative to the light emitter (so the origin is a negative offset), baked light maps
+# and FOV masks are anchored in world coords.  Either way, mask[y, x] describes the coord origin + (x, y).
+#
+# The mask is never modified once the LightMap is built, so translating only moves the origin, and masks can be shared.
+#
 class LightMap:
 
-    def __init__(self):
-        self.coords_or_offsets: dict[Coord[int] | Vector2[int], int] = {}
+    def __init__(self, mask: np.ndarray = None, origin: tuple[int, int] = (0, 0)):
+        self.mask = np.zeros((0, 0), dtype=np.bool_) if mask is None else mask
+        self.origin = Vector2[int](origin[0], origin[1])
 
     def __str__(self):
-        return f"LightMap=" + list(self.coords_or_offsets.keys()).__str__()
-    
+        return f"LightMap=" + list(self).__str__()
+
     def __repr__(self):
-        return f"LightMap=" + list(self.coords_or_offsets.keys()).__str__()
+        return f"LightMap=" + list(self).__str__()
 
-    def __iter__(self):
-        return self.coords_or_offsets.__iter__()
+    def __iter__(self) -> Iterable[Coord[int]]:
+        for y, x in np.argwhere(self.mask):
+            yield Coord[int](int(x) + self.origin.x, int(y) + self.origin.y)
 
     def __len__(self):
-        return self.coords_or_offsets.__len__()
+        return int(np.count_nonzero(self.mask))
+
+    def get_rect(self) -> Rect[int]:
+        height, width = self.mask.shape
+        return Rect[int](self.origin, Size[int](width, height))
 
     def copy(self) -> Self:
-        clone = self.__class__()
-        clone.coords_or_offsets = self.coords_or_offsets.copy()
-        return clone
+        return self.__class__(self.mask.copy(), self.origin)
 
     def is_lit(self, coord: Coord[int]) -> bool:
-        return coord in self.coords_or_offsets.keys()
-
-    def light(self, coord: Coord[int]):
-        # will silently ignore duplicate coords, which is perfect.
-        self.coords_or_offsets[coord] = 1
+        x, y = coord[0] - self.origin.x, coord[1] - self.origin.y
+        height, width = self.mask.shape
+        return 0 <= x < width and 0 <= y < height and bool(self.mask[y, x])
 
     def translate(self, centre_coord: Coord[int]) -> Self:
-        translated = LightMap()
-        for offset in self.coords_or_offsets.keys():
-            translated_coord: Coord[int] = centre_coord + offset
-            translated.coords_or_offsets[translated_coord] = 1
-        return translated
-
-    def intersect(self, other_coords_or_offsets: set[Coord[int] | Vector2[int]]) -> Self:
-        intersected = LightMap()
-        for coord_or_offset in self.coords_or_offsets.keys():
-            if coord_or_offset in other_coords_or_offsets:
-                intersected.coords_or_offsets[coord_or_offset] = 1
-        return intersected
\ No newline at end of file
+        return self.__class__(self.mask, self.origin + centre_coord)
+
+    def _overlap(self, rect: Rect[int]) -> tuple[tuple[slice, slice], tuple[slice, slice]] | None:
+        # Returns the (own slice, rect slice) of the overlapping region, or None if they don't overlap.
+        own = self.get_rect()
+        x0, y0 = max(own.x, rect.x), max(own.y, rect.y)
+        x1, y1 = min(own.x + own.w, rect.x + rect.w), min(own.y + own.h, rect.y + rect.h)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (
+            (slice(y0 - own.y,  y1 - own.y),  slice(x0 - own.x,  x1 - own.x)),
+            (slice(y0 - rect.y, y1 - rect.y), slice(x0 - rect.x, x1 - rect.x))
+        )
+
+    def intersect(self, other: Self) -> Self:
+        # The result covers only the region both light maps cover.
+        overlap = self._overlap(other.get_rect())
+        if overlap is None:
+            return self.__class__()
+        own_slice, other_slice = overlap
+
+        origin_x = self.origin.x + own_slice[1].start
+        origin_y = self.origin.y + own_slice[0].start
+        return self.__class__(self.mask[own_slice] & other.mask[other_slice], (origin_x, origin_y))
+
+    def union_into(self, target_mask: np.ndarray, target_origin: tuple[int, int]):
+        # ORs this light map into target_mask (anchored at target_origin), clipping whatever doesn't fit.
+        height, width = target_mask.shape
+        overlap = self._overlap(Rect[int](target_origin, (width, height)))
+        if overlap is None:
+            return
+        own_slice, target_slice = overlap
+        target_mask[target_slice] |= self.mask[own_slice]
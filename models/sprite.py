@@ -1,6 +1,9 @@
 import pygame
 import random
 
+from bisect import bisect_right
+from itertools import accumulate
+
 from dark_libraries.logging import LoggerMixin
 
 DEFAULT_FRAME_DURATION_SECONDS: float = 0.5
@@ -25,21 +28,26 @@ class Sprite[TFrame](LoggerMixin):
             self.frame_duration_ranges.append(frame_range)
             frame_duration_accumulator += frame_duration
 
+        # Where each range stops, for bisecting.  Randomized sprites have 18 ranges per frame, so a linear scan adds up.
+        self._frame_duration_stops = list(accumulate(self.frame_durations))
+
     @classmethod
-    def _seconds_since_init(cls) -> float:
+    def get_current_seconds(cls) -> float:
         return pygame.time.get_ticks() / 1000
 
-    def _get_current_frame_index(self, time_offset_seconds) -> int:
-        total_seconds_elapsed:          float = __class__._seconds_since_init() + time_offset_seconds
-        seconds_since_last_cycle_start: float = total_seconds_elapsed % self.frame_cycle_duration
+    def _get_frame_index_at(self, seconds: float, time_offset_seconds: float) -> int:
+        seconds_since_last_cycle_start: float = (seconds + time_offset_seconds) % self.frame_cycle_duration
+
+        # i.e. the first range with frame_start <= seconds_since_last_cycle_start < frame_stop
+        range_index = bisect_right(self._frame_duration_stops, seconds_since_last_cycle_start)
+
+        # A safety fallback for rounding right at the end of the cycle.  Shouldn't really get here.
+        range_index = min(range_index, len(self._frame_duration_stops) - 1)
+
+        return range_index % len(self.frames)
 
-        for frame_index, frame_duration_range in enumerate(self.frame_duration_ranges):
-            frame_start, frame_stop = frame_duration_range
-            if frame_start <= seconds_since_last_cycle_start < frame_stop:
-                return frame_index % len(self.frames)
-            
-        # A safety fallback.  Shouldn't really get here.
-        return frame_index % len(self.frames)
+    def _get_current_frame_index(self, time_offset_seconds) -> int:
+        return self._get_frame_index_at(__class__.get_current_seconds(), time_offset_seconds)
 
     #
     # PUBLIC METHODS
@@ -64,9 +72,6 @@ class Sprite[TFrame](LoggerMixin):
         frame_index = self._get_current_frame_index(time_offset_seconds)
         return self.frames[frame_index]
 
-
-
-
-
-
+    def get_frame_at(self, seconds: float, time_offset_seconds: float) -> TFrame:
+        return self.frames[self._get_frame_index_at(seconds, time_offset_seconds)]
 
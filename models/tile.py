@@ -7,7 +7,8 @@ from dark_libraries.dark_surface import DarkSurface
 TILE_ID_GRASS = 5
 TILE_ID_BLACK = 255
 
-type TileData = list[list[int]]
+# (y, x) palette indexes.  TileLoader provides a numpy view, anything indexable as [y][x] will do.
+type TileData = list[list[int]] | np.ndarray
 
 class Tile(DarkSurface):
 
@@ -1,21 +1,57 @@
 import colorsys
+import numpy as np
 import pygame
-from dark_libraries.dark_math import Coord, Size
+from dark_libraries.dark_math import Coord, Rect, Size
 from dark_libraries.registry import Registry
-from models.tile import TILE_ID_GRASS, Tile
+from models.tile import TILE_ID_BLACK, TILE_ID_GRASS, Tile
 
+#
+# Tile ids are stored row-major (y, x) in a contiguous uint8 buffer, exactly as they are laid out in
+# BRIT.DAT/UNDER.DAT/TOWNE.DAT etc.  The numpy array is a zero-copy view over that same buffer, so scalar
+# access (via the flat buffer) and bulk access (via the array) always agree.
+#
 class U5MapLevel:
-    def __init__(self, data: dict[Coord[int], int], size: Size[int]):
+    def __init__(self, data: bytearray | np.ndarray, size: Size[int]):
 
-        self._data = data
-        self._size = size
+        tile_ids = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data.astype(np.uint8, copy=False)
+        assert tile_ids.size == size.w * size.h, f"Expected {size.w * size.h} tile ids but got {tile_ids.size}"
+
+        if not tile_ids.flags.writeable:
+            # e.g. an immutable bytes object was passed in.
+            tile_ids = tile_ids.copy()
+
+        self._tile_ids = tile_ids.reshape(size.h, size.w)
+        self._buffer   = memoryview(self._tile_ids).cast("B")
+        self._size     = size
+
+    @property
+    def tile_ids(self) -> np.ndarray:
+        # shape is (h, w), so index with [y, x].
+        return self._tile_ids
 
     def get_tile_id(self, coord: Coord[int]):
         # Allow out-of-bounds queries.
-        return self._data.get(coord, None)
+        x, y = coord[0], coord[1]
+        if 0 <= x < self._size[0] and 0 <= y < self._size[1]:
+            return self._buffer[y * self._size[0] + x]
+        return None
 
     def set_tile_id(self, coord: Coord[int], tile_id: int):
-        self._data[coord] = tile_id
+        assert self._size.is_in_bounds(coord), f"Cannot set tile_id on out-of-bounds coord {coord}"
+        self._buffer[coord[1] * self._size[0] + coord[0]] = tile_id
+
+    def get_tile_ids(self, rect: Rect[int], out_of_bounds_tile_id: int = TILE_ID_BLACK) -> np.ndarray:
+        # Returns a (h, w) copy of the tile ids covered by rect.  Parts of rect that fall outside the level are padded.
+        x0, y0 = max(rect.x, 0), max(rect.y, 0)
+        x1, y1 = min(rect.x + rect.w, self._size.w), min(rect.y + rect.h, self._size.h)
+
+        if x0 == rect.x and y0 == rect.y and x1 == rect.x + rect.w and y1 == rect.y + rect.h:
+            return self._tile_ids[y0:y1, x0:x1].copy()
+
+        result = np.full((rect.h, rect.w), out_of_bounds_tile_id, dtype=np.uint8)
+        if x0 < x1 and y0 < y1:
+            result[y0 - rect.y:y1 - rect.y, x0 - rect.x:x1 - rect.x] = self._tile_ids[y0:y1, x0:x1]
+        return result
 
     def get_size(self):
         return self._size
@@ -26,7 +62,11 @@ class U5MapLevel:
                 yield Coord[int](x,y)
 
     def __iter__(self):
-        return self._data.items().__iter__()
+        width = self._size.w
+        for y in range(self._size.h):
+            row = self._buffer[y * width : (y + 1) * width]
+            for x in range(width):
+                yield Coord[int](x, y), row[x]
 
     def render_to_surface(self, tiles: Registry[int, Tile]) -> pygame.Surface:
 
@@ -10,6 +10,7 @@ u5_path = get_u5_path()
 import math
 import pygame
 
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 from data.loaders.tileset_loader import TileLoader
 
@@ -36,11 +37,14 @@ surface_factory = SurfaceFactoryImplementation()
 data_ovl = DataOVL(u5_path)
 global_registry = GlobalRegistry()
 
+decoded_asset_cache = DecodedAssetCache()
+decoded_asset_cache.open(u5_path)
 
 tile_loader = TileLoader()
 tile_loader.display_config  = display_config
 tile_loader.global_registry = global_registry
 tile_loader.surface_factory = surface_factory
+tile_loader.decoded_asset_cache = decoded_asset_cache
 
 color_loader = ColorLoader()
 color_loader.surface_factory = surface_factory
@@ -267,6 +267,7 @@ class MapViewerProfile(ViewerProfile[tuple[str,int], U5MapLevel]):
 
         loader = U5MapLoader()
         loader.global_registry = self.global_registry
+        loader.decoded_asset_cache = tile_loader.decoded_asset_cache
         loader.builder = LocationMetadataBuilder()
         loader.builder.global_registry = self.global_registry
         loader.builder.init()
@@ -347,6 +348,5 @@ class MapViewerProfile(ViewerProfile[tuple[str,int], U5MapLevel]):
         level_index, map_ = self.map_levels[object_index]
         map_level = map_.get_map_level(level_index)
 
-        data = map_level._data
-        flat_bytes = bytes(color for color in data.values())
+        flat_bytes = map_level.tile_ids.tobytes()
         return base64.b64encode(flat_bytes).decode("ascii")
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Boots the full game headless, with scripted input, the way main.py boots it
+for real: dummy SDL drivers, and the given ScriptedInputService (sub)class in
+place of the real input service, mapped after compose() but before
+inject_all() so that every service wired with `input_service` gets it.
+
+Shared by the gameplay tests (tests/test_gameplay_harness.py and friends) and
+the benchmarks (benchmarks/harness.py), so that both boot the same game.
+
+    provider = boot_scripted_game(u5_dir)
+    provider.resolve(InputService).queue_keys(pygame.K_UP)
+    provider.resolve(PartyController).run()
+
+Each boot resets pygame, the ServiceProvider singleton and PartyAgent's
+class-level location_stack / party_members (a pre-existing codebase wart),
+so boots in the same process don't leak state into each other.
+"""
+import os
+import time
+from pathlib import Path
+
+import pygame
+
+from service_implementations.scripted_input_service import ScriptedInputService
+
+
+NPC_FILE_NAMES = ("TOWNE.NPC", "DWELLING.NPC", "CASTLE.NPC", "KEEP.NPC")
+
+
+def find_u5_dir() -> Path | None:
+    # as configured, else a u5/ directory in the repo, else None.
+    try:
+        from configure import get_u5_path
+        return get_u5_path()
+    except AssertionError:
+        pass
+    repo_local = Path(__file__).resolve().parent / "u5"
+    if all((repo_local / name).exists() for name in NPC_FILE_NAMES):
+        return repo_local
+    return None
+
+
+def boot_scripted_game(
+        u5_dir:              Path,
+        input_service_class: type[ScriptedInputService] = ScriptedInputService,
+        cache_root:          Path = None,   # somewhere other than log/ for the disk caches, e.g. for synthetic game files.
+        timings:             dict = None    # if given, gets perf_counter() readings for "started", "composed" and "initialised".
+    ):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ.pop("UPV_CONSOLE_SCRIPT", None)
+
+    timings = {} if timings is None else timings
+    timings["started"] = time.perf_counter()
+
+    from dark_libraries.service_provider import ServiceProvider
+    ServiceProvider._instance = None
+
+    from models.agents.party_agent import PartyAgent
+    PartyAgent.location_stack = []
+    PartyAgent.party_members  = []
+
+    # (a second SCALED set_mode() on a display that's still up fails to create its renderer)
+    pygame.quit()
+    pygame.init()
+
+    from service_composition import compose
+    from services.input_service import InputService
+    from service_implementations.input_service_implementation import InputServiceImplementation
+
+    provider = ServiceProvider()
+    compose(provider)
+
+    # Drop the default input service and map the abstract onto the scripted one.
+    provider._instances.pop(InputServiceImplementation, None)
+    provider._mappings.pop(InputService, None)
+    provider.register_mapping(InputService, input_service_class)
+
+    provider.inject_all()
+
+    # e.g. synthetic game files have no business in (or pruning) the real game's caches.
+    if not cache_root is None:
+        from data.decoded_asset_cache       import DecodedAssetCache
+        from services.light_map_level_baker import LightMapLevelBaker
+        provider.resolve(DecodedAssetCache).cache_path  = Path(cache_root) / "decoded_assets"
+        provider.resolve(LightMapLevelBaker).cache_path = Path(cache_root) / "baked_light_maps"
+
+    timings["composed"] = time.perf_counter()
+
+    from controllers.initialisation_controller import InitialisationController
+    provider.resolve(InitialisationController).init(u5_dir)
+
+    timings["initialised"] = time.perf_counter()
+
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+
+    return provider
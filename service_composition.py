@@ -1,3 +1,5 @@
+import time
+
 from dark_libraries.service_provider import ServiceProvider
 
 import dark_libraries.service_composition
@@ -7,11 +9,19 @@ import models.service_composition
 import services.service_composition
 import view.service_composition
 
-def compose(provider: ServiceProvider):
+def compose(provider: ServiceProvider) -> dict[str, float]:
+
+    # module name -> seconds spent registering it (which, unless the provider is lazy, includes constructing its services).
+    compose_seconds = dict[str, float]()
 
     for module in [dark_libraries, controllers, data, models, services, view]:
         print(f"(root compose) Pre-registering {module.__name__.upper()}")
+        start = time.perf_counter()
         module.service_composition.compose(provider)
+        compose_seconds[module.__name__] = time.perf_counter() - start
 
     print("(root compose) Pre-registration COMPLETE")
-    
\ No newline at end of file
+    for module_name, seconds in sorted(compose_seconds.items(), key = lambda item: item[1], reverse = True):
+        print(f"(root compose) {module_name:<16} {seconds * 1000:6.1f}ms")
+
+    return compose_seconds
@@ -34,6 +34,8 @@ class DisplayServiceImplementation(LoggerMixin):
         )
         self.clock = pygame.time.Clock()
         self._last_caption_update_ms = 0
+        self._last_caption_frame_count = 0
+        self._last_caption_blit_count = 0
         self.set_window_title("Initialising....")
 
         self.log(f"Initialised {__class__.__name__}(id={hex(id(self))})")
@@ -44,6 +46,14 @@ class DisplayServiceImplementation(LoggerMixin):
     def set_window_title(self, window_title: str):
         self._window_title = window_title
 
+    def _log_render_stats(self):
+        frames = self.view_port_service.frame_count - self._last_caption_frame_count
+        blits  = self.view_port_service.blit_count  - self._last_caption_blit_count
+        self._last_caption_frame_count = self.view_port_service.frame_count
+        self._last_caption_blit_count  = self.view_port_service.blit_count
+        if frames > 0:
+            self.log(f"DEBUG: fps={self.clock.get_fps():.1f}, view port blits/frame={blits / frames:.1f}")
+
     def render(self):
 
         #
@@ -53,6 +63,7 @@ class DisplayServiceImplementation(LoggerMixin):
         if now_ms - self._last_caption_update_ms >= 1000:
             pygame.display.set_caption(self._window_title + f", fps={self.clock.get_fps():.0f}")
             self._last_caption_update_ms = now_ms
+            self._log_render_stats()
 
         scaled_border_thiccness = self.display_config.FONT_SIZE.w * self.display_config.SCALE_FACTOR
 
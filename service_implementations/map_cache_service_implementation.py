@@ -1,18 +1,28 @@
+import random
 from typing import Any
+
+import numpy as np
+
 from dark_libraries.dark_events import DarkEventListenerMixin
-from dark_libraries.dark_math import Coord
+from dark_libraries.dark_math import Coord, Rect
 from dark_libraries.logging   import LoggerMixin
 
 from data.global_registry import GlobalRegistry
 
 from models.enums.transport_mode import TransportMode
 from models.global_location import GlobalLocation
+from models.sprite  import Sprite
+from models.tile    import Tile
 from models.u5_map  import U5Map
 
 from models.u5_map_level import U5MapLevel
+from services.map_cache.blocked_coords     import BlockedCoords
 from services.map_cache.coord_contents     import CoordContents
 from services.map_cache.map_level_contents import MapLevelContents
 
+# Map files store one byte per tile.
+MAP_TILE_ID_COUNT = 256
+
 class MapCacheServiceImplementation(LoggerMixin, DarkEventListenerMixin):
 
     # Injectable
@@ -21,28 +31,76 @@ class MapCacheServiceImplementation(LoggerMixin, DarkEventListenerMixin):
     def __init__(self):
         super().__init__()
         self._map_level_content_dict = dict[tuple[int,int], MapLevelContents]()
+        self._tiles: list[Tile] = None
+
+        # (location_index, level_index, transport_mode) -> bool array, True where traversable.  Built on demand.
+        self._passability_grids = dict[tuple[int,int,TransportMode], np.ndarray]()
+
+        # (location_index, level_index) -> bumped whenever anything on the level might have changed passability.
+        self._passability_revisions = dict[tuple[int,int], int]()
+
+    def _build_lookup_tables(self):
+        self._tiles    = [self.global_registry.tiles.get(tile_id)    for tile_id in range(MAP_TILE_ID_COUNT)]
+        self._terrains = [self.global_registry.terrains.get(tile_id) for tile_id in range(MAP_TILE_ID_COUNT)]
+        self._sprites  = [self.global_registry.sprites.get(tile_id)  for tile_id in range(MAP_TILE_ID_COUNT)]
+
+        self._sprite_cycle_durations: np.ndarray = np.array([
+            0.0 if sprite is None else sprite.frame_cycle_duration
+            for sprite in self._sprites
+        ])
+
+        # tile_id -> can_traverse, one table per transport mode.
+        self._traversable_lookups = {
+            transport_mode : np.array([
+                not terrain is None and terrain.can_traverse(transport_mode)
+                for terrain in self._terrains
+            ])
+            for transport_mode in TransportMode
+        }
+        self._passability_grids.clear()
 
     # Call this AFTER mods have loaded.
     def init(self):
 
+        # mods may have changed the registries, so always rebuild.
+        self._build_lookup_tables()
+
         # cache every map
         for u5_map in self.global_registry.maps.values():
             self.cache_u5map(u5_map)
         self.log(f"Cached {len(self._map_level_content_dict)} maps")
 
+    def _create_sprite_time_offset(self, tile_id: int) -> float:
+        sprite: Sprite[Tile] = self._sprites[tile_id]
+        if sprite is None:
+            return 0.0
+        return sprite.create_random_time_offset()
+
     def _cache_u5_map_level(self, cache_key: Any, u5_map_level: U5MapLevel):
-        coord_contents_dict = dict[Coord[int], MapLevelContents]()            
-        for coord, tile_id in u5_map_level:
-            coord_contents_dict[coord] = CoordContents(
-                tile    = self.global_registry.tiles.get(tile_id),
-                terrain = self.global_registry.terrains.get(tile_id),
-                sprite  = self.global_registry.sprites.get(tile_id)
-            )
+        if self._tiles is None:
+            self._build_lookup_tables()
+
+        # Take a copy, the cache is only updated via refresh_coord.
+        tile_ids = u5_map_level.tile_ids.copy()
+
+        assert all(not self._tiles[tile_id] is None for tile_id in np.unique(tile_ids)), "Cannot cache an empty or out-of-bounds tile."
 
-            assert not coord_contents_dict[coord].tile is None, "Cannot cache an empty or out-of-bounds tile."
+        # Seeded from the random module so that random.seed() still makes things reproducible.
+        rng = np.random.default_rng(random.getrandbits(64))
+        sprite_time_offsets = rng.random(tile_ids.shape) * self._sprite_cycle_durations[tile_ids]
 
-        self._map_level_content_dict[cache_key] = MapLevelContents(coord_contents_dict)
-        self.log(f"DEBUG: Cached map level; key={cache_key}, type={u5_map_level.__class__.__name__}, size={len(coord_contents_dict)}")
+        # e.g. a new combat map being cached over the top of the old one.
+        self._drop_passability_grids(cache_key)
+        self._bump_passability_revision(cache_key)
+
+        self._map_level_content_dict[cache_key] = MapLevelContents(
+            tile_ids            = tile_ids,
+            tiles               = self._tiles,
+            terrains            = self._terrains,
+            sprites             = self._sprites,
+            sprite_time_offsets = sprite_time_offsets
+        )
+        self.debug("Cached map level; key=%s, type=%s, size=%d", cache_key, u5_map_level.__class__.__name__, tile_ids.size)
 
     def cache_u5map(self, u5_map: U5Map):
         for level_index, u5_map_level in u5_map:
@@ -61,17 +119,50 @@ class MapCacheServiceImplementation(LoggerMixin, DarkEventListenerMixin):
         u5_map = self.global_registry.maps.get(location_index)
         tile_id = u5_map.get_tile_id(level_index, coord)
         map_level_contents = self._map_level_content_dict[(location_index, level_index)]
-        map_level_contents._coord_contents_dict[coord] = CoordContents(
-            tile    = self.global_registry.tiles.get(tile_id),
-            terrain = self.global_registry.terrains.get(tile_id),
-            sprite  = self.global_registry.sprites.get(tile_id)
-        )
+        map_level_contents.set_tile_id(coord, tile_id, self._create_sprite_time_offset(tile_id))
 
-    def get_blocked_coords(self, location_index: int, level_index: int, transport_mode: TransportMode) -> set[Coord[int]]:
-        map_level_contents: MapLevelContents = self.get_map_level_contents(location_index, level_index)
-        blocked_coords = {
-            coord
-            for coord, coord_content in map_level_contents
-            if not coord_content.get_terrain().can_traverse(transport_mode)
-        }
-        return blocked_coords
+        # Keep any passability grids for this level in step (e.g. a door opening or closing)
+        for transport_mode in TransportMode:
+            grid = self._passability_grids.get((location_index, level_index, transport_mode), None)
+            if not grid is None:
+                grid[coord[1], coord[0]] = self._traversable_lookups[transport_mode][tile_id]
+        self._bump_passability_revision((location_index, level_index))
+
+    #
+    # PASSABILITY
+    #
+
+    def _drop_passability_grids(self, cache_key: tuple[int,int]):
+        for transport_mode in TransportMode:
+            self._passability_grids.pop((*cache_key, transport_mode), None)
+
+    def _bump_passability_revision(self, cache_key: tuple[int,int]):
+        self._passability_revisions[cache_key] = self._passability_revisions.get(cache_key, 0) + 1
+
+    def get_passability_revision(self, location_index: int, level_index: int) -> int:
+        return self._passability_revisions.get((location_index, level_index), 0)
+
+    def get_passability_grid(self, location_index: int, level_index: int, transport_mode: TransportMode) -> np.ndarray:
+        grid_key = location_index, level_index, transport_mode
+        grid = self._passability_grids.get(grid_key, None)
+        if grid is None:
+            map_level_contents = self.get_map_level_contents(location_index, level_index)
+            grid = self._traversable_lookups[transport_mode][map_level_contents.tile_ids]
+            self._passability_grids[grid_key] = grid
+        return grid
+
+    def get_passability_rect(self, location_index: int, level_index: int, transport_mode: TransportMode, rect: Rect[int]) -> np.ndarray:
+        # Returns a (h, w) copy.  Anything outside the level is reported as impassable.
+        grid = self.get_passability_grid(location_index, level_index, transport_mode)
+        height, width = grid.shape
+
+        x0, y0 = max(rect.x, 0), max(rect.y, 0)
+        x1, y1 = min(rect.x + rect.w, width), min(rect.y + rect.h, height)
+
+        result = np.zeros((rect.h, rect.w), dtype=np.bool_)
+        if x0 < x1 and y0 < y1:
+            result[y0 - rect.y:y1 - rect.y, x0 - rect.x:x1 - rect.x] = grid[y0:y1, x0:x1]
+        return result
+
+    def get_blocked_coords(self, location_index: int, level_index: int, transport_mode: TransportMode) -> BlockedCoords:
+        return BlockedCoords(self.get_passability_grid(location_index, level_index, transport_mode))
@@ -2,9 +2,11 @@ import datetime
 import random
 
 import pygame
-from dark_libraries.dark_math   import Coord
+from dark_libraries.dark_math   import Coord, Rect
 from dark_libraries.logging     import LoggerMixin
 from dark_libraries.dark_events import DarkEventListenerMixin
+from dark_libraries.spatial_index import SpatialIndex
+from dark_libraries.turn_queue    import TurnQueue
 
 from models.agents.monster_agent import MonsterAgent
 from models.agents.party_agent import PartyAgent
@@ -15,6 +17,10 @@ from models.agents.npc_agent   import NpcAgent
 
 from services.map_cache.map_cache_service import MapCacheService
 
+def _turn_order_key(npc_agent: NpcAgent) -> tuple[float, int]:
+    # least spent action points first, then the most dextrous.
+    return npc_agent.spent_action_points, -npc_agent.dexterity
+
 class NpcServiceImplementation(LoggerMixin, DarkEventListenerMixin):
 
     # Injectable
@@ -26,6 +32,18 @@ class NpcServiceImplementation(LoggerMixin, DarkEventListenerMixin):
         self._active_npcs: list[NpcAgent] = []
         self._frozen_npcs: list[NpcAgent] = []
 
+        # coord -> npc for each of the above (not including the party, which goes by _party_location).  Every npc
+        # tells the index it's in when it moves, so these are never rebuilt, just swapped along with the lists.
+        self._active_index = SpatialIndex[NpcAgent]()
+        self._frozen_index = SpatialIndex[NpcAgent]()
+
+        # Likewise, who's up next out of each of the above.  The active queue also has the party in it, whenever
+        # the party is shown.  Ties are settled by _turn_rng, seeded from the random module so that random.seed()
+        # still makes things reproducible (or see seed_turn_order).
+        self._turn_rng = random.Random(random.getrandbits(64))
+        self._active_turns = TurnQueue[NpcAgent](_turn_order_key, self._turn_rng)
+        self._frozen_turns = TurnQueue[NpcAgent](_turn_order_key, self._turn_rng)
+
         self._party_location: GlobalLocation = None
         self._attacking_npc: NpcAgent = None
 
@@ -33,15 +51,23 @@ class NpcServiceImplementation(LoggerMixin, DarkEventListenerMixin):
         self.log(f"Freezing {len(self._active_npcs)} NPCs.")
         self._frozen_npcs = self._active_npcs
         self._active_npcs = []
+        self._frozen_index = self._active_index
+        self._active_index = SpatialIndex[NpcAgent]()
+        self._frozen_turns = self._active_turns
+        self._active_turns = TurnQueue[NpcAgent](_turn_order_key, self._turn_rng)
 
     def _unfreeze_active_npcs(self):
         self.log(f"Unfreezing {len(self._frozen_npcs)} NPCs.")
         self._active_npcs = self._frozen_npcs
         self._frozen_npcs = []
+        self._active_index = self._frozen_index
+        self._frozen_index = SpatialIndex[NpcAgent]()
+        self._active_turns = self._frozen_turns
+        self._frozen_turns = TurnQueue[NpcAgent](_turn_order_key, self._turn_rng)
 
     # IMPLEMENTATION START: DarkEventListenerMixin
     def loaded(self, party_location: GlobalLocation):
-        self._party_location = party_location
+        self._set_party_location(party_location)
 
     def level_changed(self, party_location: GlobalLocation):
 
@@ -57,23 +83,56 @@ class NpcServiceImplementation(LoggerMixin, DarkEventListenerMixin):
         # TODO: Changing town/dungeon levels.
         #
 
-        self._party_location = party_location
+        self._set_party_location(party_location)
 
     def party_moved(self, party_location: GlobalLocation):
-        self._party_location = party_location
+        self._set_party_location(party_location)
     # IMPLEMENTATION END: DarkEventListenerMixin
 
+    def _set_party_location(self, party_location: GlobalLocation):
+        self._party_location = party_location
+
+        # The party takes turns whenever it's shown, and only then.
+        if self._is_party_shown() != (self.party_agent in self._active_turns):
+            self._frozen_turns.remove(self.party_agent)
+            self._active_turns.remove(self.party_agent)
+            self.party_agent._turn_listener = None
+            if self._is_party_shown():
+                self._active_turns.add(self.party_agent)
+                self.party_agent._turn_listener = self._active_turns.update
+
+    def seed_turn_order(self, seed: int):
+        # e.g. for replays: who goes first out of npcs with equal claims to the next turn.
+        self._turn_rng.seed(seed)
+
+    def _is_party_shown(self) -> bool:
+        return self._party_location.location_index != COMBAT_MAP_LOCATION_INDEX
+
     def get_npcs(self) -> dict[Coord[int], NpcAgent]:
-        registered = {npc.coord: npc for npc in self._active_npcs}
-        if self._party_location.location_index != COMBAT_MAP_LOCATION_INDEX:
+        registered = dict(self._active_index.items())
+        if self._is_party_shown():
+            registered[self._party_location.coord] = self.party_agent
+        return registered
+
+    def get_npcs_in_rect(self, rect: Rect[int]) -> dict[Coord[int], NpcAgent]:
+        registered = dict(self._active_index.items_in_rect(rect))
+        if self._is_party_shown() and rect.is_in_bounds(self._party_location.coord):
             registered[self._party_location.coord] = self.party_agent
         return registered
 
     def add_npc(self, npc_agent: NpcAgent):
         self._active_npcs.append(npc_agent)
+        self._active_index.add(npc_agent.coord, npc_agent)
+        npc_agent._coord_listener = self._active_index.move
+        self._active_turns.add(npc_agent)
+        npc_agent._turn_listener = self._active_turns.update
 
     def remove_npc(self, npc_agent: NpcAgent):
         self._active_npcs.remove(npc_agent)
+        self._active_index.remove(npc_agent.coord, npc_agent)
+        npc_agent._coord_listener = None
+        self._active_turns.remove(npc_agent)
+        npc_agent._turn_listener = None
 
     def get_attacking_npc(self) -> NpcAgent:
         return self._attacking_npc
@@ -82,47 +141,40 @@ class NpcServiceImplementation(LoggerMixin, DarkEventListenerMixin):
         self._attacking_npc = npc_agent
 
     def get_npc_at(self, coord: Coord) -> NpcAgent | None:
-        return self.get_npcs().get(coord, None)
+        if self._is_party_shown() and coord == self._party_location.coord:
+            return self.party_agent
+        return self._active_index.get(coord)
+
+    def is_occupied(self, coord: Coord) -> bool:
+        return coord in self._active_index or (self._is_party_shown() and coord == self._party_location.coord)
 
     def get_occupied_coords(self) -> set[Coord]:
-        return {coord for coord in self.get_npcs().keys()}
+        occupied = set(self._active_index.coords())
+        if self._is_party_shown():
+            occupied.add(self._party_location.coord)
+        return occupied
 
     def get_next_moving_npc(self) -> NpcAgent | None:
         if not any(self._active_npcs):
             return None
 
-        candidates = self.get_npcs().values()
-
-        min_spent_action_points = min(npc.spent_action_points for npc in candidates)
-        ap_candidates = [npc for npc in candidates if npc.spent_action_points == min_spent_action_points]
+        while True:
+            next_npc = self._active_turns.peek()
+            self.debug(
+                "Choosing %s at %s with %s spent action points for next turn, out of %d candidates.",
+                next_npc.name, next_npc.coord, next_npc.spent_action_points, len(self._active_turns)
+            )
+            if not next_npc.slept:
+                return next_npc
 
-        if not any(ap_candidates):
-            return None
-        
-        max_dexterity = max(npc.dexterity for npc in ap_candidates)
-        dex_candidates = [npc for npc in ap_candidates if npc.dexterity == max_dexterity]
-
-        if not any(dex_candidates):
-            return None
-        
-        final_choice = random.choice(dex_candidates)
-        self.log(
-            f"DEBUG: Choosing {final_choice.name} at {final_choice.coord} with {final_choice.spent_action_points} spent action points for next turn"
-            +
-            f", out of {len(ap_candidates)} action candidates and {len(dex_candidates)} DEX candidates."
-        )
-
-        if final_choice.slept:
             if random.randint(0,100) < 2:
-                self.log(f"awakening eepy-deepy ({final_choice.name}), but still choosing next npc for an action")
-                final_choice.awake()
+                self.log(f"awakening eepy-deepy ({next_npc.name}), but still choosing next npc for an action")
+                next_npc.awake()
             else:
-                self.log(f"eepy-deepy detected ({final_choice.name}), choosing next npc for an action")
+                self.log(f"eepy-deepy detected ({next_npc.name}), choosing next npc for an action")
 
-            final_choice.spend_action_quanta()
-            return self.get_next_moving_npc()
-        else:
-            return final_choice
+            # which sends them back down the queue.
+            next_npc.spend_action_quanta()
 
     def get_party_members(self) -> list[PartyMemberAgent]:
         return [npc for npc in self._active_npcs if isinstance(npc, PartyMemberAgent)]
@@ -1,3 +1,5 @@
+import numpy as np
+
 from dark_libraries.dark_math import Coord, Rect
 
 from dark_libraries.logging import LoggerMixin
@@ -6,6 +8,7 @@ from data.global_registry import GlobalRegistry
 from models.agents.npc_agent import NpcAgent
 from models.agents.party_agent import PartyAgent
 from models.enums.combat_map_location_index import COMBAT_MAP_LOCATION_INDEX
+from models.sprite import Sprite
 from models.tile import Tile
 
 from models.u5_map_level import U5MapLevel
@@ -38,17 +41,19 @@ class ViewPortDataProviderImplementation(LoggerMixin):
 
         party_location = self.party_agent.get_current_location()
 
-        lighting_map = self._get_lighting_map(world_view_rect)
+        viewable_mask = self._get_lighting_mask(world_view_rect)
         terrain_map = self._get_terrain_map(party_location.location_index, party_location.level_index, world_view_rect)
 
         # apply lighting to terrain
         viewable_terrain_map = ViewPortData()
+        viewable_rows = viewable_mask.tolist()
+        black_tile = self.global_registry.tiles.get(255) # Black, for being unlit or behind a wall
 
         for coord in world_view_rect:
-            if coord in lighting_map:
+            if viewable_rows[coord.y - world_view_rect.y][coord.x - world_view_rect.x]:
                 viewable_terrain_map[coord] = terrain_map[coord]
             else:
-                viewable_terrain_map[coord] = self.global_registry.tiles.get(255) # Black, for being unlit or behind a wall
+                viewable_terrain_map[coord] = black_tile
 
         return viewable_terrain_map
 
@@ -69,44 +74,47 @@ class ViewPortDataProviderImplementation(LoggerMixin):
         u5_map: U5Map = self.global_registry.maps.get(location_index)
         map_level: U5MapLevel = u5_map.get_map_level(level_index)
 
-        npcs = self.npc_service.get_npcs()
+        npcs = self.npc_service.get_npcs_in_rect(world_view_rect)
         assert len(npcs) > 0, "Must have at least 1 NPC (the player) to draw"
 
-        def get_frame(world_coord: Coord[int]) -> Tile:
-            
-            if not map_level.get_size().is_in_bounds(world_coord):
-                return self._default_tile
-            
+        terrain_map = ViewPortData()
+        terrain_coords = list[Coord[int]]()
+        map_size = map_level.get_size()
+
+        for world_coord in world_view_rect:
+            if not map_size.is_in_bounds(world_coord):
+                terrain_map[world_coord] = self._default_tile
+                continue
+
             npc: NpcAgent = npcs.get(world_coord, None)
             if not npc is None:
-                return npc.current_tile
-
-            coord_contents = map_level_contents.get_coord_contents(world_coord)
-            if coord_contents:
-                return coord_contents.get_renderable_frame()
-            return None
-        
-        return {
-            world_coord:
-            get_frame(world_coord)
-            for world_coord in world_view_rect
-        }
+                terrain_map[world_coord] = npc.current_tile
+                continue
+
+            # filled in below, but reserve the slot so the map stays in view order.
+            terrain_map[world_coord] = None
+            terrain_coords.append(world_coord)
+
+        terrain_frames = map_level_contents.get_renderable_frames(terrain_coords, Sprite.get_current_seconds())
+        for world_coord, frame in zip(terrain_coords, terrain_frames):
+            terrain_map[world_coord] = frame
+
+        return terrain_map
     
-    def _get_lighting_map(self, world_view_rect: Rect[int]) -> set[Coord[int]]:
+    def _get_lighting_mask(self, world_view_rect: Rect[int]) -> np.ndarray:
 
         party_location = self.party_agent.get_current_location()
 
-        visible_coords: set[Coord[int]] = self.field_of_view_calculator.calculate_fov_visibility(
+        fov_mask: np.ndarray = self.field_of_view_calculator.calculate_fov_mask(
             fov_centre_location = party_location,
             view_rect           = world_view_rect
         )
 
-        lit_coords = self.lighting_service.calculate_lighting(
+        viewable_mask = self.lighting_service.calculate_lighting(
             party_location,
+            world_view_rect,
             self.lighting_service.get_player_light_radius(),
-            visible_coords
+            fov_mask
         )
 
-        viewable_coords = visible_coords.intersection(lit_coords)
-
-        return viewable_coords    
+        return viewable_mask
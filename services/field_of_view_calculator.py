@@ -1,59 +1,162 @@
+import numpy as np
+
 from dark_libraries.dark_math import Coord, Rect
 
 from data.global_registry import GlobalRegistry
 from models.global_location import GlobalLocation
 from services.map_cache.map_cache_service import MapCacheService
+from services.map_cache.map_level_contents import MapLevelContents
+
+# Plenty for the view port plus whatever the lighting wants, without hoarding every light emitter's FOV from baking.
+FOV_CACHE_SIZE = 32
+
+# Map files store one byte per tile.
+MAP_TILE_ID_COUNT = 256
+
+class _FovCacheEntry:
+
+    def __init__(self, map_level_contents: MapLevelContents, generation: int, mask: np.ndarray):
+        self.map_level_contents = map_level_contents
+        self.generation = generation
+        self.mask = mask
+        self.coords: frozenset[Coord[int]] = None
 
 class FieldOfViewCalculator:
 
     map_cache_service: MapCacheService
     global_registry:   GlobalRegistry
 
-    def calculate_fov_visibility(
-        self, 
-        fov_centre_location: GlobalLocation,
-        view_rect: Rect[int]          # must be in world co-ordinates.
-    ) -> set[Coord[int]]:
+    def __init__(self):
+        self._fov_cache = dict[tuple[int, int, Coord[int], Rect[int]], _FovCacheEntry]()
+        self._blocks_light: np.ndarray = None
+
+    def _build_lookup_tables(self):
+        self._blocks_light = np.zeros(MAP_TILE_ID_COUNT, dtype=np.bool_)
+        self._windowed     = np.zeros(MAP_TILE_ID_COUNT, dtype=np.bool_)
+        for tile_id in range(MAP_TILE_ID_COUNT):
+            terrain = self.global_registry.terrains.get(tile_id)
+            if not terrain is None:
+                self._blocks_light[tile_id] = terrain.blocks_light
+                self._windowed[tile_id]     = terrain.windowed
+
+    def _get_transmits_light(self, map_level_contents: MapLevelContents, centre: Coord[int], view_rect: Rect[int]) -> np.ndarray:
+
+        tile_ids = map_level_contents.tile_ids
+        height, width = tile_ids.shape
+
+        x0, y0 = max(view_rect.x, 0), max(view_rect.y, 0)
+        x1, y1 = min(view_rect.x + view_rect.w, width), min(view_rect.y + view_rect.h, height)
+
+        #
+        # TODO: Review this bullshit
+        #
+        # Anything off the edge of the map lets light through (it used to block, which was wrong)
+        transmits = np.ones((view_rect.h, view_rect.w), dtype=np.bool_)
+        windowed  = np.zeros((view_rect.h, view_rect.w), dtype=np.bool_)
+
+        if x0 < x1 and y0 < y1:
+            in_bounds_tile_ids = tile_ids[y0:y1, x0:x1]
+            view_slice = (slice(y0 - view_rect.y, y1 - view_rect.y), slice(x0 - view_rect.x, x1 - view_rect.x))
+            transmits[view_slice] = ~self._blocks_light[in_bounds_tile_ids]
+            windowed[view_slice]  =  self._windowed[in_bounds_tile_ids]
 
         # these are the coords you can be on to make windows transparent to light.
-        windowed_coords = fov_centre_location.coord.get_4way_neighbours()
+        centre_x, centre_y = centre.x - view_rect.x, centre.y - view_rect.y
+        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            x, y = centre_x + dx, centre_y + dy
+            if 0 <= x < view_rect.w and 0 <= y < view_rect.h and windowed[y, x]:
+                transmits[y, x] = True
+
+        # You can always see out from where you are standing.
+        transmits[centre_y, centre_x] = True
+
+        return transmits
+
+    @staticmethod
+    def _flood_fill(transmits: np.ndarray, seed_x: int, seed_y: int) -> np.ndarray:
+        #
+        # 8-way flood fill.  Every cell reached is visible, but only cells that transmit light spread the fill.
+        # Each pass grows the whole frontier at once, rather than visiting cells one at a time.
+        #
+        height, width = transmits.shape
+        visible = np.zeros((height, width), dtype=np.bool_)
+        visible[seed_y, seed_x] = True
+
+        frontier = visible.copy()
+        spreading = np.zeros((height + 2, width + 2), dtype=np.bool_)
 
-        # I'm pretty sure set.copy() is broken af.
-        queued:  set[Coord[int]] = {fov_centre_location.coord}
-        visited: set[Coord[int]] = {fov_centre_location.coord}
-        result:  set[Coord[int]] = set()
+        while True:
+            spreading[1:-1, 1:-1] = frontier & transmits
+
+            grown = np.zeros((height, width), dtype=np.bool_)
+            for dy in (0, 1, 2):
+                for dx in (0, 1, 2):
+                    grown |= spreading[dy:dy + height, dx:dx + width]
+
+            frontier = grown & ~visible
+            if not frontier.any():
+                return visible
+            visible |= frontier
+
+    def _get_cache_entry(self, fov_centre_location: GlobalLocation, view_rect: Rect[int]) -> _FovCacheEntry:
 
         map_level_contents = self.map_cache_service.get_map_level_contents(fov_centre_location.location_index, fov_centre_location.level_index)
 
-        while len(queued):
-            world_coord = queued.pop()
-
-            result.add(world_coord)
-
-            #
-            # Calculate allows_light
-            #
-
-            coord_contents = map_level_contents.get_coord_contents(world_coord)
-            if coord_contents is None:
-                #
-                # TODO: Review this bullshit
-                #
-                allows_light = True # was False, which is wrong
-            else:
-                terrain = coord_contents.get_terrain()
-                allows_light = not terrain.blocks_light or (world_coord in windowed_coords and terrain.windowed)
-
-            if allows_light or world_coord == fov_centre_location.coord:
-                #
-                # Propogate the fill algorithm
-                #
-                for neighbour_coord in world_coord.get_8way_neighbours():
-                    if view_rect.is_in_bounds(neighbour_coord) and not neighbour_coord in visited:
-
-                        # this square is in view, and has a neighbour that is visible, and doesn't block light.
-                        queued.add(neighbour_coord)
-
-                        # this is an infinite loop unless we track this.
-                        visited.add(neighbour_coord)
-        return result
\ No newline at end of file
+        cache_key = (fov_centre_location.location_index, fov_centre_location.level_index, fov_centre_location.coord, view_rect)
+        entry = self._fov_cache.get(cache_key, None)
+
+        if not entry is None:
+            if entry.map_level_contents is map_level_contents:
+                if entry.generation == map_level_contents.generation:
+                    return entry
+
+                # Something changed on the level, but we only care if it happened inside the view rect.
+                # (None means too much has changed to keep track of, so start again.)
+                refreshed_coords = map_level_contents.get_refreshed_coords_since(entry.generation)
+                if not refreshed_coords is None and not any(view_rect.is_in_bounds(coord) for coord in refreshed_coords):
+                    entry.generation = map_level_contents.generation
+                    return entry
+
+            del self._fov_cache[cache_key]
+
+        if self._blocks_light is None:
+            self._build_lookup_tables()
+
+        transmits = self._get_transmits_light(map_level_contents, fov_centre_location.coord, view_rect)
+        mask = __class__._flood_fill(
+            transmits,
+            fov_centre_location.coord.x - view_rect.x,
+            fov_centre_location.coord.y - view_rect.y
+        )
+
+        if len(self._fov_cache) >= FOV_CACHE_SIZE:
+            # dicts remember insertion order, so this evicts the oldest entry.
+            del self._fov_cache[next(iter(self._fov_cache))]
+
+        entry = _FovCacheEntry(map_level_contents, map_level_contents.generation, mask)
+        self._fov_cache[cache_key] = entry
+        return entry
+
+    def calculate_fov_mask(
+        self,
+        fov_centre_location: GlobalLocation,
+        view_rect: Rect[int]          # must be in world co-ordinates.
+    ) -> np.ndarray:
+        # Returns a (h, w) boolean array relative to view_rect.  It is cached, so do NOT modify it.
+        assert view_rect.is_in_bounds(fov_centre_location.coord), f"FOV centre {fov_centre_location.coord} must be inside {view_rect}"
+        return self._get_cache_entry(fov_centre_location, view_rect).mask
+
+    def calculate_fov_visibility(
+        self,
+        fov_centre_location: GlobalLocation,
+        view_rect: Rect[int]          # must be in world co-ordinates.
+    ) -> frozenset[Coord[int]]:
+
+        assert view_rect.is_in_bounds(fov_centre_location.coord), f"FOV centre {fov_centre_location.coord} must be inside {view_rect}"
+        entry = self._get_cache_entry(fov_centre_location, view_rect)
+        if entry.coords is None:
+            entry.coords = frozenset(
+                Coord[int](int(x) + view_rect.x, int(y) + view_rect.y)
+                for y, x in np.argwhere(entry.mask)
+            )
+        return entry.coords
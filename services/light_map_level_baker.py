@@ -1,17 +1,37 @@
+import hashlib
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dark_libraries.dark_events import DarkEventListenerMixin
 from dark_libraries.dark_math import Coord, Rect, Vector2
 
 from dark_libraries.logging import LoggerMixin
 from data.global_registry import GlobalRegistry
 
+from models.enums.combat_map_location_index import COMBAT_MAP_LOCATION_INDEX
 from models.global_location import GlobalLocation
-from models.terrain         import Terrain
-from models.u5_map          import U5Map
 from models.light_map       import LightMap
 
 from services.field_of_view_calculator import FieldOfViewCalculator
+from services.map_cache.map_cache_service import MapCacheService
+from services.map_cache.map_level_contents import MapLevelContents
 from view.display_config import DisplayConfig
 
-class LightMapLevelBaker(LoggerMixin):
+# Bump this whenever the baking algorithm changes, so stale bakes on disk get ignored.
+BAKE_CACHE_VERSION = 1
+
+# Map files store one byte per tile.
+MAP_TILE_ID_COUNT = 256
+
+ENGINE_ROOT = Path(__file__).resolve().parent.parent
+
+#
+# Levels are baked the first time the party arrives on them, and the results are kept on disk so that
+# later launches only need to read them back in.
+#
+class LightMapLevelBaker(LoggerMixin, DarkEventListenerMixin):
 
     FIXED_LIGHT_RADIUS = 3
 
@@ -19,49 +39,165 @@ class LightMapLevelBaker(LoggerMixin):
     display_config:     DisplayConfig
     global_registry:    GlobalRegistry
     fov_calculator:     FieldOfViewCalculator
+    map_cache_service:  MapCacheService
+
+    def __init__(self):
+        super().__init__()
+        self.cache_path = ENGINE_ROOT / "log" / "baked_light_maps"
+
+        # (location_index, level_index) -> the MapLevelContents that was baked.
+        # Combat maps get re-cached under the same location_index for every fight, hence remembering the instance.
+        self._baked_contents = dict[tuple[int, int], MapLevelContents]()
+        self._terrain_digest: bytes = None
 
-    def _get_fov_visible_coords(self, light_emitter_location: GlobalLocation) -> set[Coord[int]]:
+        self.levels_baked = 0
+        self.levels_loaded = 0
+        self.bake_seconds = 0.0
+        self.load_seconds = 0.0
+
+    # DarkEventListenerMixin: start
+    def loaded(self, party_location: GlobalLocation):
+        self.ensure_level_baked(party_location.location_index, party_location.level_index)
+
+    def level_changed(self, party_location: GlobalLocation):
+        self.ensure_level_baked(party_location.location_index, party_location.level_index)
+    # DarkEventListenerMixin: end
+
+    def _get_fov_light_map(self, light_emitter_location: GlobalLocation) -> LightMap:
 
         radius_offset = Vector2[int](__class__.FIXED_LIGHT_RADIUS, __class__.FIXED_LIGHT_RADIUS)
         centre_thiccness = (1,1)
 
         # Calculate which tiles are visible from the light emitter's field of view.
         view_rect = Rect[int](
-            light_emitter_location.coord - radius_offset, 
+            light_emitter_location.coord - radius_offset,
             size = (radius_offset * 2) + centre_thiccness
         )
-        return self.fov_calculator.calculate_fov_visibility(light_emitter_location, view_rect)
+        fov_mask = self.fov_calculator.calculate_fov_mask(light_emitter_location, view_rect)
+        return LightMap(fov_mask, view_rect.minimum_corner)
 
     def _bake_light_map(self, light_emitter_location: GlobalLocation) -> LightMap:
-        visible_world_coords = self._get_fov_visible_coords(light_emitter_location)
-        return self.default_light_map.translate(light_emitter_location.coord).intersect(visible_world_coords)
+        fov_light_map = self._get_fov_light_map(light_emitter_location)
+        return self.default_light_map.translate(light_emitter_location.coord).intersect(fov_light_map)
+
+    def _build_terrain_tables(self):
+        self._emits_light = np.zeros(MAP_TILE_ID_COUNT, dtype=np.bool_)
+        blocks_light      = np.zeros(MAP_TILE_ID_COUNT, dtype=np.bool_)
+        windowed          = np.zeros(MAP_TILE_ID_COUNT, dtype=np.bool_)
+        for tile_id, terrain in self.global_registry.terrains.items():
+            self._emits_light[tile_id] = terrain.emits_light
+            blocks_light[tile_id]      = terrain.blocks_light
+            windowed[tile_id]          = terrain.windowed
+
+        # Everything that can change a bake, other than the map itself.
+        terrain_hash = hashlib.sha256()
+        terrain_hash.update(BAKE_CACHE_VERSION.to_bytes(4, "little"))
+        for table in (self._emits_light, blocks_light, windowed, self.default_light_map.mask):
+            terrain_hash.update(np.ascontiguousarray(table).tobytes())
+        terrain_hash.update(repr(self.default_light_map.origin).encode())
+        self._terrain_digest = terrain_hash.digest()
+
+    def _get_level_digest(self, map_level_contents: MapLevelContents) -> str:
+        tile_ids = map_level_contents.tile_ids
+        level_hash = hashlib.sha256(self._terrain_digest)
+        level_hash.update(repr(tile_ids.shape).encode())
+        level_hash.update(np.ascontiguousarray(tile_ids).tobytes())
+        return level_hash.hexdigest()
+
+    def _get_cache_file(self, location_index: int, level_index: int) -> Path | None:
+        # A combat map is laid out afresh for every fight, so a bake on disk would almost never be used again.
+        if location_index == COMBAT_MAP_LOCATION_INDEX:
+            return None
+        return self.cache_path / f"{location_index}_{level_index}.npz"
 
-    def _bake_level(self, u5_map: U5Map, level_index: int) -> int:
+    def _bake_level(self, location_index: int, level_index: int, map_level_contents: MapLevelContents) -> dict[Coord[int], LightMap]:
         baked_dict = dict[Coord[int], LightMap]()
-        for map_coord in u5_map.get_coord_iteration():
-            tile_id = u5_map.get_tile_id(level_index, map_coord)
-            terrain: Terrain = self.global_registry.terrains.get(tile_id)
-            if terrain.emits_light:
-                baked_dict[map_coord] = self._bake_light_map(
-                    GlobalLocation(
-                        u5_map.location_index, 
-                        level_index, 
-                        map_coord
-                    )
+
+        # Let numpy find the light emitters rather than visiting every coord.
+        for y, x in np.argwhere(self._emits_light[map_level_contents.tile_ids]):
+            map_coord = Coord[int](int(x), int(y))
+            baked_dict[map_coord] = self._bake_light_map(
+                GlobalLocation(
+                    location_index,
+                    level_index,
+                    map_coord
                 )
-        key = (u5_map.location_index, level_index)
-        self.global_registry.baked_light_level_maps.register(key, baked_dict)
-        return len(baked_dict)
-    
-    # all baked level light maps are built in coords relative to the level map
-    def bake_level_light_maps(self):
+            )
+        return baked_dict
+
+    def _read_cache_file(self, cache_file: Path, digest: str) -> dict[Coord[int], LightMap] | None:
+        if not cache_file.exists():
+            return None
+        try:
+            with np.load(cache_file) as cached:
+                if str(cached["digest"]) != digest:
+                    return None
+                coords, origins, shapes, bits = cached["coords"], cached["origins"], cached["shapes"], cached["bits"]
+        except (OSError, ValueError, KeyError) as e:
+            self.log(f"WARNING: Ignoring unreadable baked light map cache {cache_file}: {e}")
+            return None
+
+        baked_dict = dict[Coord[int], LightMap]()
+        offset = 0
+        for (x, y), origin, (height, width) in zip(coords.tolist(), origins.tolist(), shapes.tolist()):
+            mask = bits[offset:offset + height * width].reshape((height, width))
+            offset += height * width
+            baked_dict[Coord[int](x, y)] = LightMap(mask, origin)
+        return baked_dict
+
+    def _write_cache_file(self, cache_file: Path, digest: str, baked_dict: dict[Coord[int], LightMap]):
+        # Plain arrays (no pickles), with all the masks flattened end to end.
+        light_maps = list(baked_dict.values())
+        try:
+            cache_file.parent.mkdir(parents = True, exist_ok = True)
+            with open(cache_file, "wb") as f:
+                np.savez(
+                    f,
+                    digest  = np.array(digest),
+                    coords  = np.array(list(baked_dict.keys()), dtype=np.int32).reshape((-1, 2)),
+                    origins = np.array([light_map.origin for light_map in light_maps], dtype=np.int32).reshape((-1, 2)),
+                    shapes  = np.array([light_map.mask.shape for light_map in light_maps], dtype=np.int32).reshape((-1, 2)),
+                    bits    = np.concatenate([light_map.mask.ravel() for light_map in light_maps] + [np.zeros(0, dtype=np.bool_)])
+                )
+        except OSError as e:
+            self.log(f"WARNING: Could not write baked light map cache {cache_file}: {e}")
 
-        self.default_light_map: LightMap = self.global_registry.unbaked_light_maps.get(__class__.FIXED_LIGHT_RADIUS)
+    def ensure_level_baked(self, location_index: int, level_index: int):
 
-        for location_index, u5_map in self.global_registry.maps.items():
-            num_lights = 0
-            for level_index in u5_map.get_level_indexes():
-                num_lights += self._bake_level(u5_map, level_index)
+        # all baked level light maps are built in coords relative to the level map
+        map_level_contents = self.map_cache_service.get_map_level_contents(location_index, level_index)
 
-            self.log(f"DEBUG: Baked {num_lights} fixed lights for {u5_map.name} (location_index={location_index})")            
-        self.log(f"DEBUG: Baked {len(self.global_registry.unbaked_light_maps)} light level maps.")
\ No newline at end of file
+        key = (location_index, level_index)
+        if self._baked_contents.get(key, None) is map_level_contents:
+            return
+
+        if self._terrain_digest is None:
+            self.default_light_map: LightMap = self.global_registry.unbaked_light_maps.get(__class__.FIXED_LIGHT_RADIUS)
+            self._build_terrain_tables()
+
+        digest = self._get_level_digest(map_level_contents)
+        cache_file = self._get_cache_file(location_index, level_index)
+
+        start = time.perf_counter()
+        baked_dict = None if cache_file is None else self._read_cache_file(cache_file, digest)
+        if baked_dict is None:
+            baked_dict = self._bake_level(location_index, level_index, map_level_contents)
+            if not cache_file is None:
+                self._write_cache_file(cache_file, digest, baked_dict)
+            elapsed = time.perf_counter() - start
+            self.levels_baked += 1
+            self.bake_seconds += elapsed
+            self.log(f"DEBUG: Baked {len(baked_dict)} fixed lights for location_index={location_index}, level_index={level_index} in {elapsed * 1000:.1f}ms")
+        else:
+            elapsed = time.perf_counter() - start
+            self.levels_loaded += 1
+            self.load_seconds += elapsed
+            self.log(f"DEBUG: Loaded {len(baked_dict)} baked fixed lights for location_index={location_index}, level_index={level_index} in {elapsed * 1000:.1f}ms")
+
+        self.global_registry.baked_light_level_maps.register(key, baked_dict)
+        self._baked_contents[key] = map_level_contents
+
+        self.log(
+            f"DEBUG: Light map levels baked={self.levels_baked} ({self.bake_seconds * 1000:.1f}ms), "
+            f"loaded from cache={self.levels_loaded} ({self.load_seconds * 1000:.1f}ms)"
+        )
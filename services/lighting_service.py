@@ -1,9 +1,10 @@
-from dark_libraries.dark_math import Coord
+import numpy as np
+
+from dark_libraries.dark_math import Rect
 
 from data.global_registry import GlobalRegistry
 from models.global_location import GlobalLocation
 from models.agents.party_agent import PartyAgent
-from services.light_map_level_baker import LightMapLevelBaker
 from services.world_clock import WorldClock
 
 from models.light_map import LightMap
@@ -14,11 +15,12 @@ class LightingService:
     world_clock: WorldClock
     party_state: PartyAgent
     global_registry: GlobalRegistry
-    light_map_level_baker: LightMapLevelBaker
 
-    def init(self):
-        # Needs FOV calculator, which needs map_cache.
-        self.light_map_level_baker.bake_level_light_maps()
+    def __init__(self):
+        # Lighting only changes when the party moves, the light radius changes (clock or torch), or the FOV changes.
+        self._cache_key: tuple = None
+        self._cache_fov_mask: np.ndarray = None
+        self._cache_viewable_mask: np.ndarray = None
 
     def get_player_light_radius(self):
         current_radius = self.world_clock.get_current_light_radius()
@@ -31,25 +33,35 @@ class LightingService:
 
         return viewable_radius
 
-
-    def calculate_lighting(self, fov_centre_location: GlobalLocation, player_light_radius: int, fov_visible_coords: set[Coord[int]]) -> set[Coord[int]]:
+    def calculate_lighting(self, fov_centre_location: GlobalLocation, view_rect: Rect[int], player_light_radius: int, fov_mask: np.ndarray) -> np.ndarray:
 
         #
         # TODO: Since this service already accesses party_state, do we actually need to pass in party_location ?  
         # ANSWER: No not really, but we currently need to pass it into FovCalculator, so we do it anyway.
         #
 
-#        player_light_radius = self.get_player_light_radius()
+        # Returns a (h, w) mask relative to view_rect of everything that is both visible and lit.
+        # It is cached, so do NOT modify it.
 
-        baked_player_light_map: LightMap = self.global_registry.unbaked_light_maps.get(player_light_radius).translate(fov_centre_location.coord).intersect(fov_visible_coords)
-        baked_level_light_maps = self.global_registry.baked_light_level_maps.get((fov_centre_location.location_index, fov_centre_location.level_index))
+        cache_key = (fov_centre_location, view_rect, player_light_radius)
+        if cache_key == self._cache_key and fov_mask is self._cache_fov_mask:
+            return self._cache_viewable_mask
 
-        # Make a set of lit coords in the view_rect
-        lit_world_coords: set[Coord[int]] = set(baked_player_light_map.coords_or_offsets.keys())
+        lit_mask = np.zeros(fov_mask.shape, dtype=np.bool_)
+
+        player_light_map: LightMap = self.global_registry.unbaked_light_maps.get(player_light_radius)
+        player_light_map.translate(fov_centre_location.coord).union_into(lit_mask, view_rect.minimum_corner)
+
+        # Fixed lights only count if you can see the light emitter itself.
+        baked_level_light_maps = self.global_registry.baked_light_level_maps.get((fov_centre_location.location_index, fov_centre_location.level_index))
         if not baked_level_light_maps is None:
             for light_emitter_coord, baked_level_light_map in baked_level_light_maps.items():
+                if view_rect.is_in_bounds(light_emitter_coord) and fov_mask[light_emitter_coord.y - view_rect.y, light_emitter_coord.x - view_rect.x]:
+                    baked_level_light_map.union_into(lit_mask, view_rect.minimum_corner)
 
-                if light_emitter_coord in fov_visible_coords:
-                    lit_world_coords.update(baked_level_light_map.coords_or_offsets.keys())
+        lit_mask &= fov_mask
 
-        return lit_world_coords
\ No newline at end of file
+        self._cache_key = cache_key
+        self._cache_fov_mask = fov_mask
+        self._cache_viewable_mask = lit_mask
+        return lit_mask
@@ -0,0 +1,57 @@
+from typing import Iterable
+
+import numpy as np
+
+from dark_libraries.dark_math import Coord
+
+#
+# A set-like view over a passability grid.  Membership is an O(1) array lookup, so callers that only ever ask
+# "is this coord blocked ?" no longer pay for materialising a set of every blocked coord on the level.
+#
+# Coords outside the grid are NOT blocked (the overworld wraps, and callers do their own bounds checking).
+#
+# Supports the handful of set operations callers actually use: in, |, union, add, discard.
+#
+class BlockedCoords:
+
+    def __init__(self, passable: np.ndarray, extra_blocked: Iterable[Coord[int]] = (), unblocked: Iterable[Coord[int]] = ()):
+        self._passable = passable
+        self._height, self._width = passable.shape
+        self._extra_blocked = set(extra_blocked)
+        self._unblocked     = set(unblocked)
+
+    def _is_blocked_by_grid(self, coord: Coord[int]) -> bool:
+        x, y = coord[0], coord[1]
+        return 0 <= x < self._width and 0 <= y < self._height and not self._passable[y, x]
+
+    def __contains__(self, coord: Coord[int]) -> bool:
+        if coord in self._unblocked:
+            return False
+        return coord in self._extra_blocked or self._is_blocked_by_grid(coord)
+
+    def union(self, *others: Iterable[Coord[int]]) -> 'BlockedCoords':
+        extra_blocked = self._extra_blocked.union(*others)
+        unblocked = self._unblocked.difference(*others)
+        return __class__(self._passable, extra_blocked, unblocked)
+
+    __or__ = union
+
+    def add(self, coord: Coord[int]):
+        self._unblocked.discard(coord)
+        self._extra_blocked.add(coord)
+
+    def discard(self, coord: Coord[int]):
+        self._extra_blocked.discard(coord)
+        self._unblocked.add(coord)
+
+    def __iter__(self) -> Iterable[Coord[int]]:
+        for y, x in np.argwhere(~self._passable):
+            coord = Coord[int](int(x), int(y))
+            if not coord in self._unblocked and not coord in self._extra_blocked:
+                yield coord
+        for coord in self._extra_blocked:
+            if not coord in self._unblocked:
+                yield coord
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
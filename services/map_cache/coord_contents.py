@@ -1,16 +1,23 @@
+
 from models.tile    import Tile
 from models.sprite  import Sprite
 from models.terrain import Terrain
 
+#
+# A lightweight, read-only snapshot of a single coord.  MapLevelContents keeps the real data in arrays and only
+# builds one of these when asked for it.
+#
 class CoordContents:
 
-    def __init__(self, tile: Tile, terrain: Terrain, sprite: Sprite[Tile]):
+    def __init__(self, tile: Tile, terrain: Terrain, sprite: Sprite[Tile], sprite_time_offset: float = None):
 
         self.tile = tile
         self.terrain = terrain
         self.terrain_sprite = sprite
         if not sprite is None:
-            self.terrain_sprite_time_offset = sprite.create_random_time_offset()
+            if sprite_time_offset is None:
+                sprite_time_offset = sprite.create_random_time_offset()
+            self.terrain_sprite_time_offset = sprite_time_offset
 
     def get_terrain(self) -> Terrain:
         return self.terrain
@@ -1,10 +1,14 @@
 from typing import Protocol
-from dark_libraries.dark_math import Coord
+
+import numpy as np
+
+from dark_libraries.dark_math import Coord, Rect
 
 from models.enums.transport_mode import TransportMode
 from models.global_location import GlobalLocation
 from models.u5_map  import U5Map
 
+from services.map_cache.blocked_coords     import BlockedCoords
 from services.map_cache.coord_contents     import CoordContents
 from services.map_cache.map_level_contents import MapLevelContents
 
@@ -16,5 +20,13 @@ class MapCacheService(Protocol):
     def cache_u5map(self, u5_map: U5Map): ...
     def get_location_contents(self, global_location: GlobalLocation) -> CoordContents: ...
     def get_map_level_contents(self, location_index: int, level_index: int) -> MapLevelContents: ...
-    def get_blocked_coords(self, location_index: int, level_index: int, transport_mode: TransportMode) -> set[Coord[int]]: ...
     def refresh_coord(self, location_index: int, level_index: int, coord: Coord[int]): ...
+    def get_blocked_coords(self, location_index: int, level_index: int, transport_mode: TransportMode) -> BlockedCoords: ...
+
+    # True where traversable, shape is (h, w) so index with [y, x].  Kept up to date by refresh_coord.
+    def get_passability_grid(self, location_index: int, level_index: int, transport_mode: TransportMode) -> np.ndarray: ...
+    # Changes whenever the level's passability might have (refresh_coord, or the level being cached again), so that
+    # anything derived from the grid (e.g. distance fields) knows when to rebuild.
+    def get_passability_revision(self, location_index: int, level_index: int) -> int: ...
+
+    def get_passability_rect(self, location_index: int, level_index: int, transport_mode: TransportMode, rect: Rect[int]) -> np.ndarray: ...
@@ -1,16 +1,134 @@
+from collections import deque
 from typing import Iterable
 
-from dark_libraries.dark_math import Coord
+import numpy as np
+
+from dark_libraries.dark_math import Coord, Size
+
+from models.sprite  import Sprite
+from models.terrain import Terrain
+from models.tile    import Tile
 
 from services.map_cache.coord_contents import CoordContents
 
+#
+# Everything about a coord (tile, terrain, sprite) depends only on its tile_id, so rather than holding an object per coord
+# we hold a tile_id array for the level, and share per-tile-id lookup tables between every level.
+#
+# The only genuinely per-coord state is the sprite time offset, which stops every animated tile on screen from
+# animating in lock-step.  That lives in a parallel float array.
+#
 class MapLevelContents:
 
-    def __init__(self, coord_contents_dict: dict[Coord[int], CoordContents]):
-        self._coord_contents_dict = coord_contents_dict
+    # How many of the latest set_tile_id coords are remembered for get_refreshed_coords_since.
+    REFRESHED_COORDS_KEPT = 256
+
+    def __init__(self, tile_ids: np.ndarray, tiles: list[Tile], terrains: list[Terrain], sprites: list[Sprite[Tile]], sprite_time_offsets: np.ndarray):
+        assert tile_ids.shape == sprite_time_offsets.shape, f"Shape mismatch: tile_ids={tile_ids.shape}, sprite_time_offsets={sprite_time_offsets.shape}"
+
+        self._tile_ids = tile_ids
+        self._buffer   = memoryview(tile_ids).cast("B")
+        self._height, self._width = tile_ids.shape
+
+        self._tiles    = tiles
+        self._terrains = terrains
+        self._sprites  = sprites
+
+        self._sprite_time_offsets = sprite_time_offsets
+
+        # Bumped by every set_tile_id, so that anything derived from this level (e.g. FOV) can tell if it is stale.
+        self._generation = 0
+        # the coord set at generation g is _refreshed_coords[g - _refreshed_coords_base].
+        self._refreshed_coords = deque[Coord[int]](maxlen = __class__.REFRESHED_COORDS_KEPT)
+        self._refreshed_coords_base = 0
+
+    def _to_index(self, coord: Coord[int]) -> int | None:
+        x, y = coord[0], coord[1]
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return y * self._width + x
+        return None
+
+    @property
+    def tile_ids(self) -> np.ndarray:
+        # shape is (h, w), so index with [y, x].
+        return self._tile_ids
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    # None if that's too long ago to say, i.e. assume anything could have changed.
+    def get_refreshed_coords_since(self, generation: int) -> list[Coord[int]] | None:
+        start = generation - self._refreshed_coords_base
+        if start < 0:
+            return None
+        return list(self._refreshed_coords)[start:]
+
+    def get_size(self) -> Size[int]:
+        return Size[int](self._width, self._height)
+
+    def get_tile_id(self, coord: Coord[int]) -> int | None:
+        index = self._to_index(coord)
+        if index is None:
+            return None
+        return self._buffer[index]
+
+    def get_terrain(self, coord: Coord[int]) -> Terrain | None:
+        index = self._to_index(coord)
+        if index is None:
+            return None
+        return self._terrains[self._buffer[index]]
+
+    def get_renderable_frame(self, coord: Coord[int]) -> Tile | None:
+        index = self._to_index(coord)
+        if index is None:
+            return None
+        tile_id = self._buffer[index]
+        sprite = self._sprites[tile_id]
+        if sprite is None:
+            return self._tiles[tile_id]
+        return sprite.get_current_frame(float(self._sprite_time_offsets[coord[1], coord[0]]))
+
+    # The batch version of get_renderable_frame, with every animated tile resolved against the same clock reading.
+    def get_renderable_frames(self, coords: Iterable[Coord[int]], seconds: float) -> list[Tile | None]:
+        frames = list[Tile | None]()
+        for coord in coords:
+            index = self._to_index(coord)
+            if index is None:
+                frames.append(None)
+                continue
+            tile_id = self._buffer[index]
+            sprite = self._sprites[tile_id]
+            if sprite is None:
+                frames.append(self._tiles[tile_id])
+            else:
+                frames.append(sprite.get_frame_at(seconds, float(self._sprite_time_offsets[coord[1], coord[0]])))
+        return frames
+
+    def set_tile_id(self, coord: Coord[int], tile_id: int, sprite_time_offset: float):
+        index = self._to_index(coord)
+        assert not index is None, f"Cannot set tile_id on out-of-bounds coord {coord}"
+        self._buffer[index] = tile_id
+        self._sprite_time_offsets[coord[1], coord[0]] = sprite_time_offset
+        if len(self._refreshed_coords) == self._refreshed_coords.maxlen:
+            self._refreshed_coords_base += 1
+        self._refreshed_coords.append(coord)
+        self._generation += 1
 
     def get_coord_contents(self, coord: Coord[int]) -> CoordContents:
-        return self._coord_contents_dict.get(coord, None)
+        index = self._to_index(coord)
+        if index is None:
+            return None
+        tile_id = self._buffer[index]
+        return CoordContents(
+            tile    = self._tiles[tile_id],
+            terrain = self._terrains[tile_id],
+            sprite  = self._sprites[tile_id],
+            sprite_time_offset = float(self._sprite_time_offsets[coord[1], coord[0]])
+        )
 
     def __iter__(self) -> Iterable[tuple[Coord[int], CoordContents]]:
-        return self._coord_contents_dict.items().__iter__()
+        for y in range(self._height):
+            for x in range(self._width):
+                coord = Coord[int](x, y)
+                yield coord, self.get_coord_contents(coord)
@@ -22,6 +22,7 @@ from services.info_panel_service          import InfoPanelService
 from services.input_service               import InputService
 from services.npc_service                 import NpcService
 from services.map_cache.map_cache_service import MapCacheService
+from services.pathfinding.pathfinding_service import PathfindingService
 from services.sfx_library_service         import SfxLibraryService
 
 RANGED_ATTACK_CHANCE = 0.20
@@ -29,6 +30,9 @@ DO_NOTHING_CHANCE    = 0.05
 
 MONSTER_THOUGHT_SECS = 0.25
 
+# Monsters further away than this (in steps) from the party just head straight for them, rather than path.
+MONSTER_CHASE_RADIUS = 16
+
 class MonsterService(LoggerMixin, DarkEventListenerMixin):
 
     # Injectable
@@ -36,6 +40,7 @@ class MonsterService(LoggerMixin, DarkEventListenerMixin):
 
     console_service:     ConsoleService
     map_cache_service:   MapCacheService
+    pathfinding_service: PathfindingService
     npc_service:         NpcService
     display_service:     DisplayService
     input_service:       InputService
@@ -109,8 +114,12 @@ class MonsterService(LoggerMixin, DarkEventListenerMixin):
             #
             forbidden_coords = self.map_cache_service.get_blocked_coords(COMBAT_MAP_LOCATION_INDEX, 0, transport_mode = TransportMode.WALK) | self.npc_service.get_occupied_coords()
 
+            # Route around everyone else on the field too, not just the terrain.
+            path = self.pathfinding_service.find_path(COMBAT_MAP_LOCATION_INDEX, 0, monster_agent.coord, closest_party_member.coord, forbidden_coords)
+            path_steps = path[:1] if path else []
+
             combat_map: U5Map = self.global_registry.maps.get(COMBAT_MAP_LOCATION_INDEX)
-            monster_agent.move_towards(closest_party_member.coord, forbidden_coords, combat_map.get_size().to_rect(Coord[int](0, 0)))
+            monster_agent.move_towards(closest_party_member.coord, forbidden_coords, combat_map.get_size().to_rect(Coord[int](0, 0)), path_steps)
 
 
         if closest_party_member.hitpoints == 0:
@@ -161,10 +170,19 @@ class MonsterService(LoggerMixin, DarkEventListenerMixin):
                 #
                 # TODO: Monster Party might attempt a ranged attack
                 #
+                # Every monster chasing the party this turn shares the one distance field.
+                path_steps = self.pathfinding_service.get_steps_towards(
+                    party_location.location_index,
+                    party_location.level_index,
+                    start        = monster_agent.coord,
+                    target       = party_location.coord,
+                    max_distance = MONSTER_CHASE_RADIUS
+                )
                 monster_agent.move_towards(
                     target_coord     = party_location.coord,
                     forbidden_coords = blocked_coords.union(occupied_coords),
-                    boundary_rect    = current_boundary_rect
+                    boundary_rect    = current_boundary_rect,
+                    path_steps       = path_steps
                 )
 
             new_coord = monster_agent.coord
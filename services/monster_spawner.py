@@ -65,7 +65,7 @@ class MonsterSpawner(LoggerMixin, DarkEventListenerMixin):
 
         monster_coord = None
         num_iterations = 0
-        while monster_coord is None or monster_coord in blocked_coords.union(occupied_coords):
+        while monster_coord is None or monster_coord in blocked_coords or monster_coord in occupied_coords:
             num_iterations += 1
             assert num_iterations < 100, "Infinite loop detected"
             monster_coord = self._party_location.coord.translate_polar(__class__.MONSTER_SPAWN_RADIUS, random.uniform(-math.pi, math.pi))
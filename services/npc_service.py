@@ -1,5 +1,5 @@
 from typing import Protocol
-from dark_libraries.dark_math   import Coord
+from dark_libraries.dark_math   import Coord, Rect
 
 from models.agents.monster_agent import MonsterAgent
 from models.agents.party_member_agent import PartyMemberAgent
@@ -8,13 +8,16 @@ from models.agents.npc_agent   import NpcAgent
 class NpcService(Protocol):
 
     def get_npcs(self) -> dict[Coord[int], NpcAgent]: ...
+    def get_npcs_in_rect(self, rect: Rect[int]) -> dict[Coord[int], NpcAgent]: ...
     def add_npc(self, npc_agent: NpcAgent): ...
     def remove_npc(self, npc_agent: NpcAgent): ...
     def get_attacking_npc(self) -> NpcAgent: ...
     def set_attacking_npc(self, npc_agent: NpcAgent): ...
     def get_npc_at(self, coord: Coord) -> NpcAgent | None: ...
+    def is_occupied(self, coord: Coord) -> bool: ...
     def get_occupied_coords(self) -> set[Coord]: ...
     def get_next_moving_npc(self) -> NpcAgent | None: ...
+    def seed_turn_order(self, seed: int): ...
     def get_party_members(self) -> list[PartyMemberAgent]: ...
     def get_party_member_count(self) -> int: ...
     def get_monsters(self) -> list[MonsterAgent]: ...
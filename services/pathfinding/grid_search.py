@@ -0,0 +1,209 @@
+import heapq
+from typing import Container
+
+import numpy as np
+
+from dark_libraries.dark_math import Coord
+
+#
+# Searches over a passability grid (True where traversable, shape (h, w) so index with [y, x]), moving 4-way.
+#
+# wrap: the grid is a globe (e.g. the overworld), so stepping off one edge arrives at the opposite one.
+#
+# The target/goal tile itself is always allowed, even when it isn't traversable: it's where the mover means to end
+# up (a merchant's counter, or a party member standing in the way).
+#
+
+_STEPS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+class DistanceField:
+
+    #
+    # distances: (h, w) int array of steps to the target, -1 where unreachable.
+    # origin:    the map coord of distances[0, 0], which is a window of the level when the field is bounded.
+    #
+    def __init__(self, target: Coord[int], distances: np.ndarray, origin: Coord[int], wrap_size: tuple[int, int] | None):
+        self.target = target
+        self._distances = distances
+        self._origin = origin
+        self._height, self._width = distances.shape
+        self._wrap_size = wrap_size
+
+    def get_distance(self, coord: tuple[int, int]) -> int | None:
+        x, y = coord[0] - self._origin[0], coord[1] - self._origin[1]
+        if self._wrap_size is not None:
+            x, y = x % self._wrap_size[0], y % self._wrap_size[1]
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        distance = int(self._distances[y, x])
+        return None if distance < 0 else distance
+
+    def _offset_to_target(self, coord: tuple[int, int]) -> tuple[int, int]:
+        dx, dy = self.target[0] - coord[0], self.target[1] - coord[1]
+        if self._wrap_size is not None:
+            width, height = self._wrap_size
+            dx = (dx + width  // 2) % width  - width  // 2
+            dy = (dy + height // 2) % height - height // 2
+        return dx, dy
+
+    def get_steps_towards(self, coord: Coord[int]) -> list[Coord[int]]:
+        #
+        # The neighbours of coord that are closer to the target, best first.  Where several are equally close, the
+        # one along the axis with further to go comes first, so that movers still walk the "obvious" way.
+        #
+        # Anything that wanders off the field (or stands somewhere the field can't reach, like on a bed) is just
+        # offered every neighbour the field does reach.
+        #
+        current = self.get_distance(coord)
+        dx, dy = self._offset_to_target(coord)
+
+        ranked = list[tuple[int, int, Coord[int]]]()
+        for step_x, step_y in _STEPS:
+            neighbour = Coord[int](coord[0] + step_x, coord[1] + step_y)
+            distance = self.get_distance(neighbour)
+            if distance is None or (current is not None and distance >= current):
+                continue
+            still_to_go = abs(dx) if step_x else abs(dy)
+            ranked.append((distance, -still_to_go, neighbour))
+
+        ranked.sort(key = lambda entry: entry[:2])
+        return [neighbour for _, _, neighbour in ranked]
+
+def _dilate(frontier: np.ndarray, wrap: bool) -> np.ndarray:
+    if wrap:
+        return np.roll(frontier, 1, 0) | np.roll(frontier, -1, 0) | np.roll(frontier, 1, 1) | np.roll(frontier, -1, 1)
+    grown = np.zeros_like(frontier)
+    grown[1:,  :] |= frontier[:-1, :]
+    grown[:-1, :] |= frontier[1:,  :]
+    grown[:,  1:] |= frontier[:, :-1]
+    grown[:, :-1] |= frontier[:, 1:]
+    return grown
+
+def build_distance_field(passable: np.ndarray, target: Coord[int], max_distance: int | None = None, wrap: bool = False) -> DistanceField:
+    #
+    # Breadth first from the target, a whole ring of the frontier at a time.
+    #
+    # max_distance: only search that many steps out.  Every such path stays within max_distance of the target on
+    #               both axes, so only that window of the level needs searching.
+    #
+    height, width = passable.shape
+    tx, ty = target[0], target[1]
+    if wrap:
+        tx, ty = tx % width, ty % height
+    wrap_size = (width, height) if wrap else None
+
+    if not wrap and not (0 <= tx < width and 0 <= ty < height):
+        return DistanceField(target, np.full((0, 0), -1, dtype = np.int32), Coord[int](0, 0), None)
+
+    # wrapped windows only actually wrap when they're narrower than the level.
+    window_wrap = False
+    if max_distance is None:
+        x0, y0, window = 0, 0, passable
+        window_wrap = wrap
+    elif wrap:
+        window_width, window_height = min(2 * max_distance + 1, width), min(2 * max_distance + 1, height)
+        x0 = tx - max_distance if window_width  < width  else 0
+        y0 = ty - max_distance if window_height < height else 0
+        xs = np.arange(x0, x0 + window_width)  % width
+        ys = np.arange(y0, y0 + window_height) % height
+        window = passable[np.ix_(ys, xs)]
+        window_wrap = window_width == width and window_height == height
+    else:
+        x0, y0 = max(tx - max_distance, 0), max(ty - max_distance, 0)
+        x1, y1 = min(tx + max_distance + 1, width), min(ty + max_distance + 1, height)
+        window = passable[y0:y1, x0:x1]
+
+    local_x, local_y = tx - x0, ty - y0
+    if wrap:
+        local_x, local_y = local_x % width, local_y % height
+
+    distances = np.full(window.shape, -1, dtype = np.int32)
+    distances[local_y, local_x] = 0
+    reached = np.zeros(window.shape, dtype = np.bool_)
+    reached[local_y, local_x] = True
+    frontier = reached.copy()
+
+    distance = 0
+    while max_distance is None or distance < max_distance:
+        distance += 1
+        frontier = _dilate(frontier, window_wrap) & window & ~reached
+        if not frontier.any():
+            break
+        distances[frontier] = distance
+        reached |= frontier
+
+    return DistanceField(target, distances, Coord[int](x0, y0), wrap_size)
+
+def find_path(
+        passable:         np.ndarray,
+        start:            Coord[int],
+        goal:             Coord[int],
+        forbidden_coords: Container[tuple[int, int]] = (),
+        wrap:             bool = False,
+        max_nodes:        int | None = None
+    ) -> list[Coord[int]] | None:
+    #
+    # A*, returning the coords to step through from start to goal (start excluded, goal included), or None if there
+    # is no way through (or max_nodes were expanded without finding one).  Coords are wrapped when the grid is.
+    #
+    height, width = passable.shape
+    if wrap:
+        start = Coord[int](start[0] % width, start[1] % height)
+        goal  = Coord[int](goal[0]  % width, goal[1]  % height)
+    elif not (0 <= start[0] < width and 0 <= start[1] < height and 0 <= goal[0] < width and 0 <= goal[1] < height):
+        return None
+
+    goal_x, goal_y = goal[0], goal[1]
+
+    def heuristic(x: int, y: int) -> int:
+        dx, dy = abs(x - goal_x), abs(y - goal_y)
+        if wrap:
+            dx, dy = min(dx, width - dx), min(dy, height - dy)
+        return dx + dy
+
+    start_key = (start[0], start[1])
+    came_from = dict[tuple[int, int], tuple[int, int]]()
+    cost_so_far = {start_key: 0}
+
+    # (estimated total, cost so far, insertion order, coord) - insertion order keeps ties first-in-first-out.
+    open_heap = [(heuristic(*start_key), 0, 0, start_key)]
+    pushed = 1
+    expanded = 0
+
+    while open_heap:
+        _, cost, _, current = heapq.heappop(open_heap)
+        if current == (goal_x, goal_y):
+            path = list[Coord[int]]()
+            while current != start_key:
+                path.append(Coord[int](*current))
+                current = came_from[current]
+            path.reverse()
+            return path
+
+        if cost > cost_so_far[current]:
+            # stale entry, a cheaper way here was found after it was pushed.
+            continue
+
+        expanded += 1
+        if max_nodes is not None and expanded > max_nodes:
+            return None
+
+        for step_x, step_y in _STEPS:
+            x, y = current[0] + step_x, current[1] + step_y
+            if wrap:
+                x, y = x % width, y % height
+            elif not (0 <= x < width and 0 <= y < height):
+                continue
+
+            neighbour = (x, y)
+            if neighbour != (goal_x, goal_y) and (not passable[y, x] or neighbour in forbidden_coords):
+                continue
+
+            new_cost = cost + 1
+            if new_cost < cost_so_far.get(neighbour, new_cost + 1):
+                cost_so_far[neighbour] = new_cost
+                came_from[neighbour] = current
+                heapq.heappush(open_heap, (new_cost + heuristic(x, y), new_cost, pushed, neighbour))
+                pushed += 1
+
+    return None
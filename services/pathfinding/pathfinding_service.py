@@ -0,0 +1,98 @@
+from typing import Container
+
+from dark_libraries.dark_events import DarkEventListenerMixin
+from dark_libraries.dark_math   import Coord
+from dark_libraries.logging     import LoggerMixin
+
+from models.enums.transport_mode import TransportMode
+from models.global_location      import GlobalLocation
+
+from services.map_cache.map_cache_service import MapCacheService
+from services.pathfinding.grid_search     import DistanceField, build_distance_field, find_path
+
+# The overworld and underworld are globes.
+WRAPPED_LOCATION_INDEX = 0
+
+type DistanceFieldKey = tuple[int, int, TransportMode, Coord[int], int | None]
+
+class PathfindingService(LoggerMixin, DarkEventListenerMixin):
+
+    MAXIMUM_CACHED_DISTANCE_FIELDS = 64
+
+    # Injectable
+    map_cache_service: MapCacheService
+
+    def __init__(self):
+        super().__init__()
+
+        #
+        # Distance fields are shared by everything heading to the same target, e.g. every monster chasing the party
+        # this turn, or every townsperson walking to the same spot, so there's one search per target rather than one
+        # per mover.  Each remembers the passability revision of the level it was built from, so that a door opening
+        # (or any other tile change) means it gets rebuilt next time it's asked for.
+        #
+        self._distance_fields = dict[DistanceFieldKey, tuple[int, DistanceField]]()
+
+        self.distance_fields_built  = 0
+        self.distance_fields_reused = 0
+
+    # DarkEventListenerMixin: start
+    def level_changed(self, party_location: GlobalLocation):
+        # nothing will be heading anywhere on the old level now.
+        self._distance_fields.clear()
+    # DarkEventListenerMixin: end
+
+    def get_distance_field(self,
+            location_index: int,
+            level_index:    int,
+            target:         Coord[int],
+            transport_mode: TransportMode = TransportMode.WALK,
+            max_distance:   int | None = None
+        ) -> DistanceField:
+
+        key = location_index, level_index, transport_mode, target, max_distance
+        revision = self.map_cache_service.get_passability_revision(location_index, level_index)
+
+        cached = self._distance_fields.get(key, None)
+        if not cached is None and cached[0] == revision:
+            self.distance_fields_reused += 1
+            return cached[1]
+
+        passable = self.map_cache_service.get_passability_grid(location_index, level_index, transport_mode)
+        distance_field = build_distance_field(passable, target, max_distance, wrap = location_index == WRAPPED_LOCATION_INDEX)
+        self.distance_fields_built += 1
+
+        # oldest first, so once full drop whichever was built longest ago.
+        self._distance_fields.pop(key, None)
+        if len(self._distance_fields) >= __class__.MAXIMUM_CACHED_DISTANCE_FIELDS:
+            del self._distance_fields[next(iter(self._distance_fields))]
+        self._distance_fields[key] = revision, distance_field
+
+        self.debug("Built distance field to %s on %d/%d (revision %d, max_distance=%s)", target, location_index, level_index, revision, max_distance)
+        return distance_field
+
+    def get_steps_towards(self,
+            location_index: int,
+            level_index:    int,
+            start:          Coord[int],
+            target:         Coord[int],
+            transport_mode: TransportMode = TransportMode.WALK,
+            max_distance:   int | None = None
+        ) -> list[Coord[int]]:
+        # The neighbours of start that get closer to target, best first.  Empty if target can't be reached (within
+        # max_distance).  It's up to the caller to skip any that are occupied.
+        distance_field = self.get_distance_field(location_index, level_index, target, transport_mode, max_distance)
+        return distance_field.get_steps_towards(start)
+
+    def find_path(self,
+            location_index:   int,
+            level_index:      int,
+            start:            Coord[int],
+            goal:             Coord[int],
+            forbidden_coords: Container[tuple[int, int]] = (),
+            transport_mode:   TransportMode = TransportMode.WALK,
+            max_nodes:        int | None = None
+        ) -> list[Coord[int]] | None:
+        # A* for a single mover, avoiding forbidden_coords (e.g. everyone else on the map) as well as the terrain.
+        passable = self.map_cache_service.get_passability_grid(location_index, level_index, transport_mode)
+        return find_path(passable, start, goal, forbidden_coords, wrap = location_index == WRAPPED_LOCATION_INDEX, max_nodes = max_nodes)
@@ -0,0 +1,6 @@
+# file: display/service_composition.py
+from dark_libraries.service_provider import ServiceProvider
+from services.pathfinding.pathfinding_service import PathfindingService
+
+def compose(provider: ServiceProvider):
+    provider.register(PathfindingService)
@@ -25,6 +25,7 @@ from .monster_service import MonsterService
 from .monster_spawner     import MonsterSpawner
 from .town_npc_spawner    import TownNpcSpawner
 from .town_npc_scheduler  import TownNpcScheduler
+from .town_npc_schedule_simulator import TownNpcScheduleSimulator
 from .combat_map_service import CombatMapService
 from .npc_service import NpcService
 
@@ -41,6 +42,7 @@ from .world_clock import WorldClock
 from service_implementations.npc_service_implementation import NpcServiceImplementation
 
 from .map_cache.service_composition  import compose as compose_map_cache
+from .pathfinding.service_composition import compose as compose_pathfinding
 from .world_loot.service_composition import compose as compose_world_loot
 
 def compose(provider: ServiceProvider):
@@ -75,6 +77,7 @@ def compose(provider: ServiceProvider):
 
     provider.register(ViewPortService)
     provider.register(MonsterService)
+    provider.register(TownNpcScheduleSimulator)
     provider.register(TownNpcSpawner)
     provider.register(TownNpcScheduler)
     provider.register(InfoPanelService)
@@ -82,5 +85,6 @@ def compose(provider: ServiceProvider):
     provider.register(SfxLibraryService)
 
     compose_map_cache(provider)
+    compose_pathfinding(provider)
     compose_world_loot(provider)
 
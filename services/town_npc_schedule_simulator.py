@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from dark_libraries.dark_math import Coord
+from dark_libraries.logging   import LoggerMixin
+
+from data.global_registry  import GlobalRegistry
+from models.npc_file       import NpcSchedule
+
+from services.map_cache.map_cache_service     import MapCacheService
+from services.pathfinding.pathfinding_service import PathfindingService
+
+
+class NpcPlacement(NamedTuple):
+    level_index: int
+    coord:       Coord[int]
+    arrived:     bool
+
+
+# Plenty for a town level; any further and they've given up and gone straight there.
+_PATH_MAX_NODES = 4096
+
+
+class TownNpcScheduleSimulator(LoggerMixin):
+    #
+    # Works out where a town NPC is at any time, without stepping them there a minute at a time.
+    #
+    # Whenever their schedule moves them on, an NPC walks (one tile per minute, the same pace as TownNpcScheduler)
+    # from where the last slot had them to where the new one does.  So all it takes is the slot they're in, how many
+    # minutes ago it began, and the path between the two spots - which is worked out once and cached.
+    #
+    # Stairs and ladders aren't modelled: an NPC whose new spot is on another level is simply there.
+    #
+
+    # Injectable
+    global_registry:     GlobalRegistry
+    map_cache_service:   MapCacheService
+    pathfinding_service: PathfindingService
+
+    def __init__(self):
+        super().__init__()
+        # (location_index, level_index, start, goal) -> (passability revision, path or None)
+        self._paths = dict[tuple[int, int, Coord[int], Coord[int]], tuple[int, list[Coord[int]] | None]]()
+
+    @classmethod
+    def _slot_coord(cls, schedule: NpcSchedule, slot: int) -> Coord[int]:
+        return Coord[int](schedule.x_coords[slot], schedule.y_coords[slot])
+
+    @classmethod
+    def get_slot_history(cls, schedule: NpcSchedule, natural_time: datetime) -> tuple[int, int, int | None]:
+        #
+        # (current slot, previous slot, minutes since the current slot began), where minutes is None if the schedule
+        # never moves them on.  Slots change on the hour, so this looks back at most a day's worth of hours.
+        #
+        slot = schedule.slot_for_hour(natural_time.hour)
+        for hours_back in range(1, 25):
+            earlier_slot = schedule.slot_for_hour((natural_time.hour - hours_back) % 24)
+            if earlier_slot != slot:
+                return slot, earlier_slot, (hours_back - 1) * 60 + natural_time.minute
+        return slot, slot, None
+
+    def _get_path(self, location_index: int, level_index: int, start: Coord[int], goal: Coord[int]) -> list[Coord[int]] | None:
+        key = location_index, level_index, start, goal
+        revision = self.map_cache_service.get_passability_revision(location_index, level_index)
+
+        cached = self._paths.get(key, None)
+        if not cached is None and cached[0] == revision:
+            return cached[1]
+
+        path = self.pathfinding_service.find_path(location_index, level_index, start, goal, max_nodes = _PATH_MAX_NODES)
+        self._paths[key] = revision, path
+        return path
+
+    def get_placement(self, location_index: int, schedule: NpcSchedule, natural_time: datetime) -> NpcPlacement:
+        slot, previous_slot, minutes = __class__.get_slot_history(schedule, natural_time)
+
+        level_index = schedule.z_coords[slot]
+        goal = __class__._slot_coord(schedule, slot)
+        start = __class__._slot_coord(schedule, previous_slot)
+
+        if minutes is None or schedule.z_coords[previous_slot] != level_index or start == goal:
+            return NpcPlacement(level_index, goal, arrived = True)
+
+        path = self._get_path(location_index, level_index, start, goal)
+        if path is None or minutes >= len(path):
+            # (no way through, they'd have been teleported there by now)
+            return NpcPlacement(level_index, goal, arrived = True)
+
+        coord = start if minutes == 0 else path[minutes - 1]
+        return NpcPlacement(level_index, coord, arrived = False)
+
+    def get_placements(self, location_index: int, natural_time: datetime, level_index: int = None) -> dict[int, NpcPlacement]:
+        # slot_index -> placement for every scheduled NPC in the location, or just those on level_index.
+        section = self.global_registry.npc_sections.get(location_index)
+        if section is None:
+            return {}
+
+        placements = dict[int, NpcPlacement]()
+        for slot_index, schedule in enumerate(section.schedules):
+            if schedule.is_empty():
+                continue
+            placement = self.get_placement(location_index, schedule, natural_time)
+            if level_index is None or placement.level_index == level_index:
+                placements[slot_index] = placement
+        return placements
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 from dark_libraries.dark_events import DarkEventListenerMixin
 from dark_libraries.dark_math   import Coord
 from dark_libraries.logging     import LoggerMixin
@@ -9,41 +11,66 @@ from models.global_location import GlobalLocation
 
 from services.map_cache.map_cache_service import MapCacheService
 from services.npc_service                  import NpcService
+from services.pathfinding.pathfinding_service import PathfindingService
 from services.town_npc_spawner             import TownNpcSpawner
 from services.world_clock                  import WorldClock
 
 
 # How many ticks (game minutes) an NPC is allowed to make zero progress
-# toward its scheduled target before we give up and teleport it. Greedy
-# axis-aligned stepping cannot route around complex obstacles (e.g. an
-# armoury counter blocked from three sides), so this is the safety net
-# that ensures merchants always end up at their station.
+# toward its scheduled target before we give up and teleport it. NPCs path
+# around the terrain, but can still be held up indefinitely by other NPCs
+# (or have a target the terrain doesn't let them reach at all), so this is
+# the safety net that ensures merchants always end up at their station.
 _STUCK_TELEPORT_THRESHOLD = 8
 
+# One tick's worth of game time. Any more than that between ticks and the
+# clock has jumped (e.g. waiting), so everyone is put straight where their
+# schedule has them by now rather than walked there.
+_TICK = timedelta(minutes=1)
+
 
 class TownNpcScheduler(LoggerMixin, DarkEventListenerMixin):
 
     # Injectable
-    global_registry:   GlobalRegistry
-    map_cache_service: MapCacheService
-    npc_service:       NpcService
-    town_npc_spawner:  TownNpcSpawner
-    world_clock:       WorldClock
+    global_registry:     GlobalRegistry
+    map_cache_service:   MapCacheService
+    npc_service:         NpcService
+    pathfinding_service: PathfindingService
+    town_npc_spawner:    TownNpcSpawner
+    world_clock:         WorldClock
 
     def __init__(self):
         super().__init__()
         # slot_index -> (last_target_coord, consecutive_failed_steps)
         self._stuck: dict[int, tuple[Coord[int], int]] = {}
+        # (location_index, level_index, natural time) of the last tick.
+        self._last_tick: tuple[int, int, datetime] = None
+
+    # DarkEventListenerMixin: start
+    def level_changed(self, party_location: GlobalLocation):
+        # The spawner has just placed everyone for the new level, so the next tick isn't a jump in time.
+        self._last_tick = None
+    # DarkEventListenerMixin: end
 
     def pass_time(self, party_location: GlobalLocation):
         if party_location.location_index == 0:
+            self._last_tick = None
             return
 
         section = self.global_registry.npc_sections.get(party_location.location_index)
         if section is None:
+            # e.g. the combat map.
+            self._last_tick = None
             return
 
-        hour = self.world_clock.get_natural_time().hour
+        now = self.world_clock.get_natural_time()
+        if self._has_time_jumped(party_location, now):
+            self.log(f"Time jumped from {self._last_tick[2]} to {now}, placing NPCs")
+            self.town_npc_spawner.respawn(party_location)
+            self._stuck.clear()
+        self._last_tick = party_location.location_index, party_location.level_index, now
+
+        hour = now.hour
         spawned = self.town_npc_spawner.get_spawned()
 
         blocked_coords = self.map_cache_service.get_blocked_coords(
@@ -87,7 +114,19 @@ class TownNpcScheduler(LoggerMixin, DarkEventListenerMixin):
             forbidden.discard(npc.coord)
             forbidden.discard(target_coord)
 
-            moved = self._step_towards(npc, target_coord, forbidden, boundary_rect)
+            # Schedule targets only change on the hour, so the distance field
+            # each NPC walks down gets reused every tick until then.
+            path_steps = self.pathfinding_service.get_steps_towards(
+                party_location.location_index,
+                party_location.level_index,
+                start  = npc.coord,
+                target = target_coord,
+            )
+            if any(path_steps):
+                moved = self._step_along(npc, path_steps, forbidden, boundary_rect)
+            else:
+                # The terrain doesn't connect them to their target at all.
+                moved = self._step_towards(npc, target_coord, forbidden, boundary_rect)
 
             prev_target, prev_stuck = self._stuck.get(slot_index, (target_coord, 0))
             if prev_target != target_coord:
@@ -105,6 +144,33 @@ class TownNpcScheduler(LoggerMixin, DarkEventListenerMixin):
             else:
                 self._stuck[slot_index] = (target_coord, stuck)
 
+    def _has_time_jumped(self, party_location: GlobalLocation, now: datetime) -> bool:
+        # Arriving somewhere new is the spawner's business.
+        if self._last_tick is None:
+            return False
+        last_location_index, last_level_index, last_time = self._last_tick
+        if (last_location_index, last_level_index) != (party_location.location_index, party_location.level_index):
+            return False
+        return now - last_time > _TICK or now < last_time
+
+    def _step_along(
+        self,
+        npc: TownNpcAgent,
+        path_steps: list[Coord[int]],
+        forbidden_coords: set[Coord[int]],
+        boundary_rect,
+    ) -> bool:
+        # Take the best step that nobody is standing on. If they're all
+        # taken, wait rather than step away from the target.
+        for next_coord in path_steps:
+            if next_coord in forbidden_coords:
+                continue
+            if not boundary_rect.is_in_bounds(next_coord):
+                continue
+            npc.coord = next_coord
+            return True
+        return False
+
     def _step_towards(
         self,
         npc: TownNpcAgent,
@@ -1,5 +1,4 @@
 from dark_libraries.dark_events import DarkEventListenerMixin
-from dark_libraries.dark_math   import Coord
 from dark_libraries.logging     import LoggerMixin
 
 from data.global_registry        import GlobalRegistry
@@ -8,6 +7,7 @@ from models.global_location      import GlobalLocation
 from models.npc_file              import NpcMapSection
 
 from services.npc_service  import NpcService
+from services.town_npc_schedule_simulator import TownNpcScheduleSimulator
 from services.world_clock  import WorldClock
 
 
@@ -17,6 +17,7 @@ class TownNpcSpawner(LoggerMixin, DarkEventListenerMixin):
     global_registry: GlobalRegistry
     npc_service:     NpcService
     world_clock:     WorldClock
+    town_npc_schedule_simulator: TownNpcScheduleSimulator
 
     def __init__(self):
         super().__init__()
@@ -50,7 +51,9 @@ class TownNpcSpawner(LoggerMixin, DarkEventListenerMixin):
         # Exit is handled automatically: NpcServiceImplementation's unfreeze
         # replaces _active_npcs with the frozen overworld set, discarding our town NPCs.
 
-        # TODO: respawn when changing floors within the same location.
+        # Changing floors within the same location: swap this floor's NPCs for the new one's.
+        if not was_outer and party_location.location_index == self._party_location.location_index:
+            self.respawn(party_location)
 
         self._party_location = party_location
 
@@ -72,9 +75,13 @@ class TownNpcSpawner(LoggerMixin, DarkEventListenerMixin):
         if section.dialog_numbers[slot_index] in recruited_dialog_numbers:
             return None
 
-        hour = self.world_clock.get_natural_time().hour
-        slot = schedule.slot_for_hour(hour)
-        if schedule.z_coords[slot] != party_location.level_index:
+        # Wherever the schedule has them by now, which may be part way to their next spot.
+        placement = self.town_npc_schedule_simulator.get_placement(
+            party_location.location_index,
+            schedule,
+            self.world_clock.get_natural_time()
+        )
+        if placement.level_index != party_location.level_index:
             return None
 
         type_byte = section.types[slot_index]
@@ -84,9 +91,8 @@ class TownNpcSpawner(LoggerMixin, DarkEventListenerMixin):
             self.log(f"WARN: No sprite for tile_id={tile_id} (type_byte={type_byte}) at slot={slot_index}")
             return None
 
-        coord = Coord[int](schedule.x_coords[slot], schedule.y_coords[slot])
         npc = TownNpcAgent(
-            coord=coord,
+            coord=placement.coord,
             sprite=sprite,
             tile_id=tile_id,
             name=f"NPC#{slot_index}",
@@ -102,6 +108,13 @@ class TownNpcSpawner(LoggerMixin, DarkEventListenerMixin):
             return
         self.npc_service.remove_npc(npc)
 
+    def respawn(self, party_location: GlobalLocation):
+        # Put everyone back where their schedules say they are now, e.g. after
+        # changing floors or a jump in time.
+        for slot_index in list(self._spawned.keys()):
+            self.despawn_slot(slot_index)
+        self._spawn_for(party_location)
+
     def _spawn_for(self, party_location: GlobalLocation):
         section = self.global_registry.npc_sections.get(party_location.location_index)
         if section is None:
@@ -21,6 +21,10 @@ from services.view_port_data_provider import ViewPortData, ViewPortDataProvider
 
 ActiveCursor = tuple[Coord[int], Sprite[Tile]]
 
+# One entry per view coord: the tile, or a tuple of tiles (bottom first) when something is overlaid on it.
+type ViewPortCell  = Tile | tuple[Tile, ...]
+type ViewPortFrame = list[ViewPortCell]
+
 BIBLICALLY_ACCURATE_PROJECTILE_OFFSET       = (0.25,  0.0)
 
 # TODO: Assumes casting north.  OK for east/west but south will look cooked.
@@ -50,8 +54,18 @@ class ViewPortService(LoggerMixin):
         self._mode: int = None
         self._magic_ray_set: MagicRaySet = None
 
+        # What is currently on the view port, so that render only has to blit the difference.
+        self._last_frame: ViewPortFrame = None
+        self._last_frame_inverted = False
+
+        # Render stats.
+        self.frame_count = 0
+        self.blit_count = 0
+        self.last_frame_blit_count = 0
+
     def _after_inject(self):
         self._combat_view_rect = Rect(Coord(-3,-3), self.display_config.VIEW_PORT_SIZE)
+        self._view_coords = list(Rect[int](Coord[int](0, 0), self.display_config.VIEW_PORT_SIZE))
 
     #
     # VISUAL SFX
@@ -110,46 +124,103 @@ class ViewPortService(LoggerMixin):
 
     def render(self):
 
-        self.view_port.clear()
+        view_rect = self.view_rect
 
-        self.draw_map()
+        frame = self._get_map_frame(view_rect)
 
         #
-        # draw overlays e.g. cursors
+        # overlays e.g. cursors
         #
 
         if self._damage_blast_coord:
-            self.draw_world_tile(self._damage_blast_coord, self.global_registry.tiles.get(0))
-
-        if self._projectile:
-            self.draw_projectile()
+            self._add_overlay(frame, view_rect, self._damage_blast_coord, self.global_registry.tiles.get(0))
 
         for active_cursor in self._cursors.values():
             cursor_coord, cursor_sprite = active_cursor
-            self.draw_world_tile( 
-                cursor_coord,
-                cursor_sprite.get_current_frame(0.0)
-            )
+            self._add_overlay(frame, view_rect, cursor_coord, cursor_sprite.get_current_frame(0.0))
+
+        self.draw_map(frame)
+
+        #
+        # freeform overlays, which don't line up with the tile grid.
+        #
+
+        if self._projectile:
+            self.draw_projectile(view_rect)
 
         if self._magic_ray_set:
-            self._draw_magic_rays()
+            self._draw_magic_rays(view_rect)
+
+        self.frame_count += 1
 
-    def draw_map(self) -> None:
+    def _get_map_frame(self, view_rect: Rect[int]) -> ViewPortFrame:
 
         if self._mode == ViewPortMode.PartyMode:
-            view_port_data: ViewPortData = self.view_port_data_provider.get_party_map_data(self.view_rect)
+            view_port_data: ViewPortData = self.view_port_data_provider.get_party_map_data(view_rect)
+        else:
+            view_port_data: ViewPortData = self.view_port_data_provider.get_combat_map_data(view_rect)
+
+        # Rect iterates row by row, so this lines up with view coord (x, y) at index y * w + x.
+        return [view_port_data[world_coord] for world_coord in view_rect]
+
+    def _add_overlay(self, frame: ViewPortFrame, view_rect: Rect[int], world_coord: Coord[int], tile: Tile):
+        if not view_rect.is_in_bounds(world_coord):
+            return
+        index = (world_coord.y - view_rect.y) * view_rect.w + (world_coord.x - view_rect.x)
+        under = frame[index]
+        frame[index] = (*under, tile) if isinstance(under, tuple) else (under, tile)
+
+    def _invalidate(self):
+        self._last_frame = None
+
+    def _invalidate_unscaled_rect(self, unscaled_rect: pygame.Rect):
+        # Whatever got drawn over these cells has to be painted out next frame.
+        if self._last_frame is None:
+            return
+        tile_w, tile_h = self.display_config.TILE_SIZE.w, self.display_config.TILE_SIZE.h
+        view_w, view_h = self.display_config.VIEW_PORT_SIZE.w, self.display_config.VIEW_PORT_SIZE.h
+        x0, y0 = max(unscaled_rect.left // tile_w, 0), max(unscaled_rect.top // tile_h, 0)
+        x1, y1 = min((unscaled_rect.right - 1) // tile_w, view_w - 1), min((unscaled_rect.bottom - 1) // tile_h, view_h - 1)
+        for view_y in range(y0, y1 + 1):
+            for view_x in range(x0, x1 + 1):
+                self._last_frame[view_y * view_w + view_x] = None
+
+    def draw_map(self, frame: ViewPortFrame) -> None:
+
+        #
+        # Only cells that look different to last frame get blitted, so if nothing changed, nothing gets drawn.
+        #
+        if self._last_frame is None or self._last_frame_inverted != self._invert_colors:
+            self.view_port.clear()
+            last_frame = [None] * len(frame)
         else:
-            view_port_data: ViewPortData = self.view_port_data_provider.get_combat_map_data(self.view_rect)
-            
-        for world_coord in self.view_rect:
-            tile = view_port_data[world_coord]
-            self.draw_world_tile(world_coord, tile)
+            last_frame = self._last_frame
+
+        view_coords = self._view_coords
+        inverted = self._invert_colors
+
+        changed = list[tuple[Coord[int], Tile]]()
+        for index, cell in enumerate(frame):
+            if cell == last_frame[index]:
+                continue
+            if isinstance(cell, tuple):
+                view_coord = view_coords[index]
+                changed.extend((view_coord, tile) for tile in cell)
+            else:
+                changed.append((view_coords[index], cell))
+
+        # All in one Surface.blits call.
+        with self.view_port.batched_blits():
+            self.view_port.draw_tiles_to_view_coords(changed, inverted)
+        blit_count = len(changed)
+
+        self._last_frame = frame
+        self._last_frame_inverted = inverted
 
-    def draw_world_tile(self, world_coord: Coord[int], tile: Tile):
-        view_coord = world_coord - self.view_rect.minimum_corner
-        self.view_port.draw_tile_to_view_coord(view_coord, tile, self._invert_colors)
+        self.last_frame_blit_count = blit_count
+        self.blit_count += blit_count
 
-    def draw_projectile(self):
+    def draw_projectile(self, view_rect: Rect[int]):
         # Coords are in unscaled pixels.
         current_ticks = pygame.time.get_ticks()
 
@@ -159,13 +230,16 @@ class ViewPortService(LoggerMixin):
         else:
             glyph = self._projectile.sprite.get_current_frame(current_ticks)
             projectile_world_coord = self._projectile.get_current_position()
-            projectile_unscaled_pixel_coord =  (projectile_world_coord - self.view_rect.minimum_corner + BIBLICALLY_ACCURATE_PROJECTILE_OFFSET) * self.display_config.TILE_SIZE 
-            self.view_port.draw_object_at_unscaled_coord(projectile_unscaled_pixel_coord, glyph, self._invert_colors)
+            projectile_unscaled_pixel_coord =  (projectile_world_coord - view_rect.minimum_corner + BIBLICALLY_ACCURATE_PROJECTILE_OFFSET) * self.display_config.TILE_SIZE 
+            drawn_rect = self.view_port.draw_object_at_unscaled_coord(projectile_unscaled_pixel_coord, glyph, self._invert_colors)
+            self._invalidate_unscaled_rect(drawn_rect)
+            self.blit_count += 1
 
-    def _draw_magic_rays(self):
+    def _draw_magic_rays(self, view_rect: Rect[int]):
 
-        unscaled_origin = (self._magic_ray_set.origin - self.view_rect.minimum_corner) * self.display_config.TILE_SIZE
+        unscaled_origin = (self._magic_ray_set.origin - view_rect.minimum_corner) * self.display_config.TILE_SIZE
         biblically_accurate_unscaled_ray_origin_offset = (BIBLICALLY_ACCURATE_MAGIC_RAY_ORIGIN_OFFSET * self.display_config.TILE_SIZE)
+        rgb_mapped_color = self.global_registry.colors.get(self._magic_ray_set.color)
 
         for end_point in self._magic_ray_set.end_points:
 
@@ -174,17 +248,19 @@ class ViewPortService(LoggerMixin):
             # yes. 
             #
             ray_start = biblically_accurate_unscaled_ray_origin_offset + unscaled_origin
-            ray_end   = biblically_accurate_unscaled_ray_origin_offset + ((end_point - self.view_rect.minimum_corner) * self.display_config.TILE_SIZE)
+            ray_end   = biblically_accurate_unscaled_ray_origin_offset + ((end_point - view_rect.minimum_corner) * self.display_config.TILE_SIZE)
 
-            self.view_port.draw_unscaled_line(
+            drawn_rect = self.view_port.draw_unscaled_line(
                 start_coord = ray_start,
                 end_coord   = ray_end,
-                rgb_mapped_color = self.global_registry.colors.get(self._magic_ray_set.color)
+                rgb_mapped_color = rgb_mapped_color
             )
+            self._invalidate_unscaled_rect(drawn_rect)
 
     def _set_mode(self, value: int, default_tile_id: int):
         self.log(f"Setting mode to {value}")
         self._mode = value
+        self._invalidate()
         self.view_port_data_provider.set_default_tile(
             self.global_registry.tiles.get(default_tile_id)
         )
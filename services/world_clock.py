@@ -89,6 +89,12 @@ class WorldClock(LoggerMixin, DarkEventListenerMixin):
         self.world_time += timedelta(minutes=1)
         self.daylight_savings_time += timedelta(minutes=1)
 
+    # For jumps in time (e.g. waiting), without a pass_time event for every minute of it.
+    def skip_time(self, minutes: int):
+        self.turns_passed += minutes
+        self.world_time += timedelta(minutes=minutes)
+        self.daylight_savings_time += timedelta(minutes=minutes)
+
     def set_world_time(self, dt: datetime):
         self.world_time = dt + timedelta(hours = -1)
         self.daylight_savings_time = dt
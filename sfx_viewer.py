@@ -6,6 +6,7 @@ from configure import get_u5_path
 from dark_libraries.dark_math import Coord, Rect, Size, Vector2
 from dark_libraries.service_provider import ServiceProvider
 
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry import GlobalRegistry
 from data.loaders.color_loader import ColorLoader
 from data.loaders.projectile_sprite_loader import ProjectileSpriteLoader
@@ -28,6 +29,7 @@ from services.surface_factory import SurfaceFactory
 from services.view_port_data_provider import ViewPortData, ViewPortDataProvider
 from services.view_port_service import ViewPortService
 from view.display_config import DisplayConfig
+from view.scaled_surface_cache import ScaledSurfaceCache
 from view.view_port import ViewPort
 
 class ProgrammableInputService:
@@ -108,6 +110,7 @@ provider.register_instance(sfx_library_service)
 
 provider.register(DisplayConfig)
 provider.register(GlobalRegistry)
+provider.register(DecodedAssetCache)
 
 provider.register_mapping(InputService, ProgrammableInputService)
 provider.register_mapping(SoundService, SoundServiceImplementation)
@@ -130,6 +133,7 @@ provider.register_mapping(ViewPortDataProvider, ProgrammableViewPortDataProvider
 #
 
 provider.register_mapping(SurfaceFactory, SurfaceFactoryImplementation)
+provider.register(ScaledSurfaceCache)
 
 #
 # LOADERS
@@ -189,7 +193,7 @@ view_port_data_provider: ProgrammableViewPortDataProvider = provider.resolve(Vie
 sound_service: SoundService = provider.resolve(SoundService)
 
 blank_tile = Tile(255, None, None)
-blank_tile_surface = surface_factory.create_surface(TILE_SIZE * SCALE_FACTOR)
+blank_tile_surface = surface_factory.create_surface(TILE_SIZE)
 blank_tile_surface.fill((0,0,0))
 blank_tile.set_surface(blank_tile_surface)
 view_port_data_provider.set_default_tile(blank_tile)
@@ -199,6 +203,7 @@ dummy_display_service._configure(screen, view_port, view_port_service)
 sound_service.init()
 
 u5_path = get_u5_path()
+provider.resolve(DecodedAssetCache).open(u5_path)
 u5_font_loader.register_fonts(u5_path)
 
 color_loader.load()
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+
+from data.synthetic_u5_data import write_synthetic_u5_data
+from scripted_game import find_u5_dir
+
+
+#
+# The U5 game files for the tests that read or boot from them: the real ones if they're installed, otherwise
+# synthetic ones from data/synthetic_u5_data.py, so that those tests run anywhere.
+#
+# Tests that check specific original content (a particular NPC's dialogue, say) ask for original_u5_dir instead, and
+# are skipped without a real install.
+#
+
+@pytest.fixture(scope="session")
+def original_u5_dir() -> Path:
+    path = find_u5_dir()
+    if path is None:
+        pytest.skip("U5 game files not found")
+    return path
+
+
+@pytest.fixture(scope="session")
+def u5_dir(tmp_path_factory) -> Path:
+    path = find_u5_dir()
+    if path is None:
+        path = write_synthetic_u5_data(tmp_path_factory.mktemp("u5"), seed = 0)
+    return path
+
+
+@pytest.fixture(scope="session")
+def u5_cache_root(u5_dir, tmp_path_factory) -> Path | None:
+    # Where a game booted from u5_dir keeps its disk caches: the usual log/ for a real install, somewhere of its own
+    # for synthetic files, so that they never touch (or prune) the real game's.
+    if u5_dir == find_u5_dir():
+        return None
+    return tmp_path_factory.mktemp("caches")
@@ -0,0 +1,85 @@
+import pygame
+
+from benchmarks.harness import BenchmarkInputService, SampleTimer, percentiles, time_calls
+from benchmarks.scenarios import SCENARIOS
+
+
+class _FakeDisplayService:
+    def __init__(self):
+        self.frames = 0
+
+    def render(self):
+        self.frames += 1
+
+
+class _FakeDarkEventService:
+    def quit(self):
+        pass
+
+
+def _input_service() -> BenchmarkInputService:
+    service = BenchmarkInputService()
+    service.display_service = _FakeDisplayService()
+    service.dark_event_service = _FakeDarkEventService()
+    service._has_quit = False
+    return service
+
+
+def test_percentiles_are_nearest_rank():
+    result = percentiles([float(i) for i in range(1, 101)])
+    assert (result["p50"], result["p90"], result["p99"], result["max"]) == (50.0, 90.0, 99.0, 100.0)
+    assert percentiles([]) == {}
+
+
+def test_time_calls_records_every_call():
+    timer = SampleTimer()
+    double = time_calls(lambda x: x * 2, timer)
+    assert double(4) == 8
+    assert timer.summary()["count"] == 1
+
+
+def test_frames_are_rendered_for_each_event():
+    service = _input_service()
+    service.frames_per_event = 3
+    service.queue_keys(pygame.K_UP, pygame.K_UP)
+    service.get_next_event()
+    service.get_next_event()
+    assert service.display_service.frames == 6
+
+
+def test_only_turns_where_time_passed_are_counted():
+    service = _input_service()
+    service.queue_keys(pygame.K_BACKQUOTE, pygame.K_UP, pygame.K_UP)
+
+    service.get_next_event()    # console, no time passes
+    service.get_next_event()
+    service.time_passed()
+    service.get_next_event()
+    service.time_passed()
+    service.get_next_event()    # queue drained
+
+    assert len(service.turn_timer.samples_ms) == 2
+
+
+def test_combat_rounds_are_timed_separately():
+    service = _input_service()
+    service.queue_keys(pygame.K_UP, pygame.K_SPACE, pygame.K_SPACE, pygame.K_SPACE)
+
+    service.get_next_event()
+    service.time_passed()           # into combat
+    service.combat_turn_started()
+    service.get_next_event()
+    service.combat_turn_started()
+    service.get_next_event()
+    service.combat_turn_started()
+    service.get_next_event()
+
+    assert len(service.turn_timer.samples_ms) == 1
+    assert len(service.combat_turn_timer.samples_ms) == 2
+
+
+def test_scenarios_queue_input():
+    for queue in SCENARIOS.values():
+        service = _input_service()
+        queue(service)
+        assert len(service._queued_events) > 0
@@ -5,71 +5,22 @@ Pattern: teleport into a town, inject a TownNpcAgent adjacent to the party
 on the party_moved event (fires right after teleport), queue the Talk + keyword
 keys, and read back what hit the console service.
 """
-from pathlib import Path
-
 import pygame
 import pytest
 
-
-TLK_FILE_NAMES = ("TOWNE.TLK", "CASTLE.TLK", "KEEP.TLK", "DWELLING.TLK")
-
-
-def _find_u5_dir() -> Path | None:
-    try:
-        from configure import get_u5_path
-        return get_u5_path()
-    except AssertionError:
-        pass
-    repo_local = Path(__file__).resolve().parents[1] / "u5"
-    if all((repo_local / name).exists() for name in TLK_FILE_NAMES):
-        return repo_local
-    return None
-
-
-@pytest.fixture
-def u5_dir() -> Path:
-    path = _find_u5_dir()
-    if path is None:
-        pytest.skip("U5 game files not found")
-    return path
+from scripted_game import boot_scripted_game
 
 
 @pytest.fixture
-def harness(u5_dir, monkeypatch):
+def harness(u5_dir, u5_cache_root, monkeypatch):
     monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
     monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.delenv("UPV_CONSOLE_SCRIPT", raising=False)
 
-    from dark_libraries.service_provider import ServiceProvider
-    ServiceProvider._instance = None
-
-    from models.agents.party_agent import PartyAgent
-    PartyAgent.location_stack = []
-    PartyAgent.party_members  = []
-
-    pygame.init()
-
-    from service_composition import compose
-    from services.input_service import InputService
-    from service_implementations.input_service_implementation import InputServiceImplementation
-    from service_implementations.scripted_input_service       import ScriptedInputService
-
-    provider = ServiceProvider()
-    compose(provider)
-    provider._instances.pop(InputServiceImplementation, None)
-    provider._mappings.pop(InputService, None)
-    provider.register_mapping(InputService, ScriptedInputService)
-    provider.inject_all()
-
-    from controllers.initialisation_controller import InitialisationController
-    from controllers.party_controller          import PartyController
-
-    init = provider.resolve(InitialisationController)
-    init.init(u5_dir)
+    provider = boot_scripted_game(u5_dir, cache_root = u5_cache_root)
 
-    try:
-        pygame.mixer.init()
-    except pygame.error:
-        pass
+    from controllers.party_controller import PartyController
+    from services.input_service       import InputService
 
     # Capture every print_ascii call so tests can assert on what the
     # conversation controller printed, without reaching into glyph/view state.
@@ -404,7 +355,7 @@ def _find_npc_by_name(registry, target_name: str, location_index: int | None = N
     return None
 
 
-def test_jeremy_keyword_keys_increments_party_keys_by_five(harness):
+def test_jeremy_keyword_keys_increments_party_keys_by_five(original_u5_dir, harness):
     # Jeremy the locksmith (Yew npc#20) hands over five keys when the Avatar
     # says "key". Doubles as a regression test for Yew's basement remap:
     # Yew has has_basement=True, so its U5Map._levels are keyed {0, 255}.
@@ -445,7 +396,7 @@ def test_jeremy_keyword_keys_increments_party_keys_by_five(harness):
     )
 
 
-def test_justin_keyword_mutton_y_increments_party_food(harness):
+def test_justin_keyword_mutton_y_increments_party_food(original_u5_dir, harness):
     # Playtest: Justin (Britain npc#7) sells mutton chops. The Avatar says
     # "mutt" to enter label0 ("Wouldst thou like to try a bite?"), then "y"
     # to accept — the label-scoped 'y' response fires CHANGE op=0x41 (FOOD).
@@ -485,7 +436,7 @@ def test_justin_keyword_mutton_y_increments_party_food(harness):
     )
 
 
-def test_justin_full_mutton_purchase_deducts_three_gold(harness):
+def test_justin_full_mutton_purchase_deducts_three_gold(original_u5_dir, harness):
     # Justin's full transaction: free taste (mutt → y) bumps FOOD by 1, then
     # the follow-up label1 ("Didst thou enjoy it?") → y → label2 ("...wouldst
     # thou pay me 3 gold coins...") → y deducts 3 gold via opcode 0x85.
@@ -526,7 +477,7 @@ def test_justin_full_mutton_purchase_deducts_three_gold(harness):
     assert party_inventory.read(InventoryOffset.FOOD) == 1
 
 
-def test_justin_purchase_with_insufficient_gold_refuses(harness):
+def test_justin_purchase_with_insufficient_gold_refuses(original_u5_dir, harness):
     # Avatar can't afford the 3-gold mutton. The renderer should print a
     # refusal and NOT deduct gold or fire the trailing CHANGE bytes (none in
     # Justin's case, but the gold balance must stay put either way).
@@ -567,7 +518,7 @@ def test_justin_purchase_with_insufficient_gold_refuses(harness):
     assert any("not the gold" in line.lower() for line in lines), lines
 
 
-def test_geoffrey_join_keyword_recruits_into_party(harness):
+def test_geoffrey_join_keyword_recruits_into_party(original_u5_dir, harness):
     # Geoffrey (CASTLE.TLK#40) — typing "join" jumps to label 3, whose 'y'
     # branch ends in <0x84> JOIN_PARTY. The handler should: surface the
     # canonical "<Name> doth join thy party!" line, increment
@@ -615,7 +566,7 @@ def test_geoffrey_join_keyword_recruits_into_party(harness):
     )
 
 
-def test_gwenno_description_emits_spoken_intro_separately(harness):
+def test_gwenno_description_emits_spoken_intro_separately(original_u5_dir, harness):
     # Gwenno (TOWNE.TLK#11) packs her spoken greeting into the description
     # ScriptLine itself, separated by START_NEW_SECTION (0xA2). The renderer
     # should emit "You see a charming woman." on its own line, then quote
@@ -657,7 +608,7 @@ def test_gwenno_description_emits_spoken_intro_separately(harness):
     )
 
 
-def test_description_render_does_not_apply_change(harness):
+def test_description_render_does_not_apply_change(original_u5_dir, harness):
     # Description previews ('You see ...') run through _render_text_only,
     # which must NOT mutate party state even though Justin's keyword
     # responses contain CHANGE bytes. We verify by talking past the greeting
@@ -0,0 +1,105 @@
+from dark_libraries.dark_math import Coord
+from dark_libraries.dark_events import DarkEventListenerMixin, DarkEventService
+from models.global_location import GlobalLocation
+
+
+HERE  = GlobalLocation(1, 0, Coord[int](3, 4))
+THERE = GlobalLocation(1, 0, Coord[int](3, 5))
+UPSTAIRS = GlobalLocation(1, 1, Coord[int](3, 5))
+
+
+class _TimeListener(DarkEventListenerMixin):
+    def __init__(self):
+        self.calls = list[str]()
+
+    def pass_time(self, party_location):
+        self.calls.append("pass_time")
+
+
+class _MoveListener(DarkEventListenerMixin):
+    def __init__(self):
+        self.calls = list[str]()
+
+    def party_moved(self, party_location):
+        self.calls.append("party_moved")
+
+    def level_changed(self, party_location):
+        self.calls.append("level_changed")
+
+
+class _DuckListener:
+    def __init__(self):
+        self.calls = list[str]()
+
+    def loaded(self, loc):        self.calls.append("loaded")
+    def pass_time(self, loc):     self.calls.append("pass_time")
+    def level_changed(self, loc): self.calls.append("level_changed")
+    def party_moved(self, loc):   self.calls.append("party_moved")
+    def quit(self):               self.calls.append("quit")
+
+
+def _service(*listeners) -> DarkEventService:
+    service = DarkEventService()
+    for listener in listeners:
+        if isinstance(listener, DarkEventListenerMixin):
+            listener.dark_event_service = service
+            listener._after_inject()
+        else:
+            service.subscribe(listener)
+    return service
+
+
+def test_listeners_only_get_the_events_they_override():
+    time_listener, move_listener = _TimeListener(), _MoveListener()
+    service = _service(time_listener, move_listener)
+
+    service.loaded(HERE)
+    service.pass_time(THERE)
+    service.pass_time(UPSTAIRS)
+
+    assert time_listener.calls == ["pass_time", "pass_time"]
+    assert move_listener.calls == ["party_moved", "level_changed", "party_moved"]
+    assert [name for name, _ in service._handlers["pass_time"]] == ["_TimeListener"]
+
+
+def test_listeners_without_the_mixin_get_everything():
+    duck = _DuckListener()
+    service = _service(duck)
+
+    service.loaded(HERE)
+    service.pass_time(THERE)
+    service.quit()
+    assert duck.calls == ["loaded", "party_moved", "pass_time", "quit"]
+
+
+def test_everyone_hears_quit():
+    time_listener = _TimeListener()
+    service = _service(time_listener)
+    service.quit()
+    assert time_listener._has_quit
+
+
+def test_timing_is_opt_in():
+    service = _service(_TimeListener())
+    service.loaded(HERE)
+    service.pass_time(HERE)
+    assert service.get_timings() == {}
+    assert service.get_timing_report() == []
+
+
+def test_timing_records_each_listener_and_event():
+    service = _service(_TimeListener(), _MoveListener())
+    service.set_timing_enabled(True)
+
+    service.loaded(HERE)
+    service.pass_time(THERE)
+    service.pass_time(THERE)
+
+    timings = service.get_timings()
+    assert set(timings.keys()) == {("_TimeListener", "pass_time"), ("_MoveListener", "party_moved")}
+    assert timings[("_TimeListener", "pass_time")].count == 2
+    assert timings[("_MoveListener", "party_moved")].count == 1
+    assert len(service.get_timing_report()) == 2
+
+    service.reset_timings()
+    assert service.get_timings() == {}
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from dark_libraries.dark_lzw import LZW_CLEAR_CODE, LZW_END_CODE, lzw_compress, lzw_decompress
+
+
+# The dictionary-of-bytes decoder that TileLoader used to use, kept as the reference the table decoder must match.
+def _reference_lzw_decompress(data: bytes) -> bytes:
+    CLEAR, EOI = 256, 257
+    code_size = 9
+    dict_size = 258
+    dictionary = {i: bytes([i]) for i in range(256)}
+    result = bytearray()
+    data_bits = 0
+    bit_count = 0
+    pos = 0
+
+    def get_code():
+        nonlocal data_bits, bit_count, pos
+        while bit_count < code_size and pos < len(data):
+            data_bits |= data[pos] << bit_count
+            bit_count += 8
+            pos += 1
+        code = data_bits & ((1 << code_size) - 1)
+        data_bits >>= code_size
+        bit_count -= code_size
+        return code
+
+    prev = None
+    while True:
+        code = get_code()
+        if code == CLEAR:
+            dictionary = {i: bytes([i]) for i in range(256)}
+            dict_size = 258
+            code_size = 9
+            prev = None
+            continue
+        if code == EOI:
+            break
+        if code in dictionary:
+            entry = dictionary[code]
+        elif code == dict_size and prev is not None:
+            entry = dictionary[prev] + dictionary[prev][:1]
+        else:
+            raise ValueError("Bad LZW code")
+        result.extend(entry)
+        if prev is not None:
+            dictionary[dict_size] = dictionary[prev] + entry[:1]
+            dict_size += 1
+            if dict_size == (1 << code_size) and code_size < 12:
+                code_size += 1
+        prev = code
+    return bytes(result)
+
+
+def _pack_codes(codes: list[tuple[int, int]]) -> bytes:
+    # (code, code_size) pairs, least significant bit first.
+    bits = 0
+    bit_count = 0
+    for code, code_size in codes:
+        bits |= code << bit_count
+        bit_count += code_size
+    return bits.to_bytes((bit_count + 7) // 8, "little")
+
+
+def _tile_like_data(size: int, seed: int = 5) -> bytes:
+    # Runs of a few nibble-pair values, roughly what TILES.16 looks like.
+    rng = random.Random(seed)
+    out = bytearray()
+    while len(out) < size:
+        out.extend(bytes([rng.choice((0x00, 0x11, 0x12, 0x21, 0x66, 0x6E, 0xE6))]) * rng.randint(1, 12))
+    return bytes(out[:size])
+
+
+SAMPLES = {
+    "empty":      b"",
+    "one byte":   b"A",
+    "kwkwk":      b"A" * 100,
+    "text":       b"TOBEORNOTTOBEORTOBEORNOT#" * 20,
+    "random":     random.Random(1).randbytes(20_000),
+    "tile like":  _tile_like_data(64 * 1024),
+}
+
+
+@pytest.mark.parametrize("name", SAMPLES.keys())
+def test_round_trip(name):
+    data = SAMPLES[name]
+    assert lzw_decompress(lzw_compress(data)) == data
+
+
+@pytest.mark.parametrize("name", SAMPLES.keys())
+def test_matches_reference_decoder(name):
+    compressed = lzw_compress(SAMPLES[name])
+    assert lzw_decompress(compressed) == _reference_lzw_decompress(compressed)
+
+
+def test_random_data_fills_the_dictionary_and_clears_it():
+    # incompressible input runs through every code size and past 4096 entries.
+    compressed = lzw_compress(SAMPLES["random"])
+    assert len(compressed) > len(SAMPLES["random"])
+    assert lzw_decompress(compressed, len(SAMPLES["random"])) == SAMPLES["random"]
+
+
+def test_expected_length_is_only_a_hint():
+    data = SAMPLES["tile like"]
+    compressed = lzw_compress(data)
+    assert lzw_decompress(compressed, 10) == data
+    assert lzw_decompress(compressed, len(data) * 2) == data
+
+
+def test_clear_code_mid_stream():
+    compressed = _pack_codes([
+        (ord("A"), 9), (ord("B"), 9), (258, 9),     # A, B, AB
+        (LZW_CLEAR_CODE, 9),
+        (ord("C"), 9), (258, 9),                    # C, CC (258 is being defined)
+        (LZW_END_CODE, 9)
+    ])
+    assert lzw_decompress(compressed) == b"ABABCCC"
+    assert _reference_lzw_decompress(compressed) == b"ABABCCC"
+
+
+def test_bad_code_raises():
+    with pytest.raises(ValueError):
+        lzw_decompress(_pack_codes([(ord("A"), 9), (300, 9), (LZW_END_CODE, 9)]))
+
+
+def test_truncated_data_raises():
+    with pytest.raises(ValueError):
+        lzw_decompress(_pack_codes([(ord("A"), 9), (ord("B"), 9)]))
+
+
+#
+# Micro-benchmark, run with:
+#    python -m tests.test_dark_lzw
+#
+if __name__ == "__main__":
+    import timeit
+
+    data = SAMPLES["tile like"]
+    compressed = lzw_compress(data)
+    for name, decompress in (("reference", _reference_lzw_decompress), ("table", lzw_decompress)):
+        runs = 20
+        seconds = timeit.timeit(lambda: decompress(compressed), number = runs) / runs
+        print(f"{name:>10}: {seconds * 1000:.2f}ms to decompress {len(compressed)} bytes to {len(data)} bytes")
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from dark_libraries.dark_stages import Stage, StageGraph
+
+
+def _recorder():
+    ran = list[tuple[str, str]]()
+    def stage(name: str, seconds: float = 0.0):
+        def run():
+            time.sleep(seconds)
+            ran.append((name, threading.current_thread().name))
+        return run
+    return ran, stage
+
+
+def test_dependencies_follow_reads_and_writes():
+    graph = StageGraph([
+        Stage("ovl",     None, writes = ("data_ovl",)),
+        Stage("colors",  None, writes = ("colors",)),
+        Stage("tiles",   None, reads = ("colors",), writes = ("tiles",)),
+        Stage("items",   None, reads = ("data_ovl",), writes = ("item_types",)),
+        Stage("flames",  None, reads = ("tiles",), writes = ("sprites",)),
+        Stage("npcs",    None, reads = ("tiles",), writes = ("sprites",)),
+        Stage("recolor", None, writes = ("colors",)),
+    ])
+    assert graph.dependencies == {
+        "ovl":     set(),
+        "colors":  set(),
+        "tiles":   {"colors"},
+        "items":   {"ovl"},
+        "flames":  {"tiles"},
+        "npcs":    {"tiles", "flames"},   # both write sprites, so they keep their order.
+        "recolor": {"colors", "tiles"},   # tiles must have read the colors before they change.
+    }
+
+
+def test_sequential_runs_in_order_on_the_main_thread():
+    ran, stage = _recorder()
+    graph = StageGraph([Stage(name, stage(name), writes = (name,)) for name in "abc"])
+    timings = graph.run(max_workers = 0)
+    assert ran == [("a", "MainThread"), ("b", "MainThread"), ("c", "MainThread")]
+    assert [timing.name for timing in timings] == ["a", "b", "c"]
+
+
+def test_main_thread_stages_stay_there():
+    ran, stage = _recorder()
+    graph = StageGraph([
+        Stage("parse",   stage("parse", 0.02), writes = ("parsed",)),
+        Stage("surface", stage("surface"),     reads = ("parsed",), writes = ("surfaces",), main_thread = True),
+        Stage("other",   stage("other"),       writes = ("other",)),
+    ])
+    graph.run(max_workers = 2)
+
+    threads = dict(ran)
+    assert threads["surface"] == "MainThread"
+    assert threads["parse"] != "MainThread" and threads["other"] != "MainThread"
+    assert [name for name, _ in ran].index("parse") < [name for name, _ in ran].index("surface")
+
+
+def test_independent_stages_overlap():
+    ran, stage = _recorder()
+    graph = StageGraph([Stage(name, stage(name, 0.05), writes = (name,)) for name in "abcd"])
+    timings = graph.run(max_workers = 4)
+    wall = max(timing.started + timing.seconds for timing in timings)
+    assert wall < 0.15
+
+
+def test_failures_propagate():
+    def broken():
+        raise ValueError("bad file")
+    ran, stage = _recorder()
+    graph = StageGraph([
+        Stage("broken", broken,         writes = ("x",)),
+        Stage("after",  stage("after"), reads = ("x",)),
+    ])
+    with pytest.raises(ValueError):
+        graph.run(max_workers = 2)
+    assert ran == []
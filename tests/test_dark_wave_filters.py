@@ -0,0 +1,112 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from dark_libraries import dark_wave
+from dark_libraries.dark_wave import DarkWave, one_pole_allpass, one_pole_recurrence
+
+
+SAMPLE_RATE = 44100
+DURATION_S = 1.0
+FREQ_HZ = 220
+
+
+@pytest.fixture(autouse=True)
+def sample_rate(monkeypatch):
+    monkeypatch.setattr(dark_wave, "frequency_sample_rate", SAMPLE_RATE)
+
+
+def _sawtooth() -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * DURATION_S)) / SAMPLE_RATE
+    return 2.0 * ((FREQ_HZ * t) % 1.0) - 1.0
+
+
+# The sample-by-sample phaser the block engine replaced.
+def _reference_phaser(x, stages=4, lfo_hz=0.3, min_fc=300.0, max_fc=1500.0, feedback=0.0, mix=0.7, lfo_phase=0.0):
+    n = len(x)
+    t = np.arange(n) / SAMPLE_RATE
+    lfo = 0.5 * (1.0 + np.sin(2 * np.pi * lfo_hz * t + lfo_phase))
+    fc = min_fc + (max_fc - min_fc) * lfo
+    a_t = (1.0 - np.tan(np.pi * fc / SAMPLE_RATE)) / (1.0 + np.tan(np.pi * fc / SAMPLE_RATE))
+
+    y = x.copy()
+    fb = 0.0
+    for _ in range(stages):
+        out = np.zeros_like(y)
+        xn1 = 0.0
+        yn1 = 0.0
+        for i in range(n):
+            xi = y[i] + feedback * fb
+            ai = a_t[i]
+            yi = -ai * xi + xn1 + ai * yn1
+            out[i] = yi
+            xn1 = xi
+            yn1 = yi
+        fb = out[-1]
+        y = out
+    return (1.0 - mix) * x + mix * y
+
+
+def test_recurrence_carries_state_across_blocks():
+    rng = np.random.default_rng(5)
+    u = rng.standard_normal(100)
+    a = rng.uniform(-0.95, 0.95, 100)
+
+    expected = np.empty_like(u)
+    y = 0.5
+    for n in range(100):
+        y = a[n] * y + u[n]
+        expected[n] = y
+
+    # one coefficient per sample, so any block size is exact.
+    assert np.allclose(one_pole_recurrence(u, a, 1, y_initial = 0.5), expected)
+
+    a_blocks = a[::8]
+    expected = np.empty_like(u)
+    y = 0.0
+    for n in range(100):
+        y = a_blocks[n // 8] * y + u[n]
+        expected[n] = y
+    assert np.allclose(one_pole_recurrence(u, a_blocks, 8), expected)
+
+
+def test_fixed_allpass_passes_every_frequency_at_unity_gain():
+    impulse = np.zeros(4096)
+    impulse[0] = 1.0
+    response = one_pole_allpass(impulse, np.full(4096 // 32, 0.8), 32)
+    assert np.allclose(np.abs(np.fft.rfft(response)), 1.0, atol = 1e-6)
+
+
+def test_phaser_matches_sample_by_sample_reference():
+    x = _sawtooth()
+    expected = _reference_phaser(x, stages = 4, feedback = 0.4, lfo_phase = 1.0)
+
+    exact = DarkWave(x).phaser(stages = 4, feedback = 0.4, lfo_phase = 1.0, block_size = 1).wave_data
+    assert np.allclose(exact, expected, atol = 1e-9)
+
+    # a slow sweep barely moves within a block.
+    blocked = DarkWave(x).phaser(stages = 4, feedback = 0.4, lfo_phase = 1.0).wave_data
+    assert np.max(np.abs(blocked - expected)) < 1e-3
+
+
+def test_default_phaser_stays_close_to_reference():
+    x = _sawtooth()
+    assert np.max(np.abs(DarkWave(x).phaser().wave_data - _reference_phaser(x))) < 1e-3
+
+
+# Wall-clock timing flakes on a loaded machine, so only on request.
+@pytest.mark.skipif(not os.environ.get("UPV_TIMING_TESTS"), reason = "timing test, set UPV_TIMING_TESTS=1 to run")
+def test_phaser_benchmark():
+    x = _sawtooth()
+
+    started = time.perf_counter()
+    _reference_phaser(x)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    DarkWave(x).phaser()
+    block_seconds = time.perf_counter() - started
+
+    assert block_seconds * 5 < reference_seconds
@@ -0,0 +1,147 @@
+import shutil
+
+import numpy as np
+
+from data.decoded_asset_cache import DecodedAssetCache
+
+
+def _u5_dir(tmp_path, name = "u5"):
+    u5_path = tmp_path / name
+    u5_path.mkdir()
+    (u5_path / "TILES.16").write_bytes(b"tiles")
+    (u5_path / "BRIT.DAT").write_bytes(b"brit")
+    return u5_path
+
+
+def _cache(tmp_path, u5_path) -> DecodedAssetCache:
+    cache = DecodedAssetCache()
+    cache.cache_path = tmp_path / "decoded_assets"
+    cache.open(u5_path)
+    return cache
+
+
+class _Builder:
+    def __init__(self, asset):
+        self.asset = asset
+        self.builds = 0
+
+    def __call__(self):
+        self.builds += 1
+        return self.asset
+
+
+def test_unopened_cache_just_builds(tmp_path):
+    cache = DecodedAssetCache()
+    cache.cache_path = tmp_path / "decoded_assets"
+    build = _Builder(np.arange(4, dtype=np.uint8))
+
+    cache.get_array("tiles", build)
+    cache.get_array("tiles", build)
+    assert build.builds == 2
+    assert not cache.cache_path.exists()
+
+
+def test_second_launch_hydrates_arrays_from_disk(tmp_path):
+    u5_path = _u5_dir(tmp_path)
+    expected = np.arange(256, dtype=np.uint8).reshape(16, 16)
+
+    cold = _cache(tmp_path, u5_path)
+    assert (cold.get_array("tiles", _Builder(expected)) == expected).all()
+    assert cold.misses == 1 and not cold.is_warm()
+
+    warm = _cache(tmp_path, u5_path)
+    build = _Builder(expected)
+    hydrated = warm.get_array("tiles", build)
+    assert build.builds == 0
+    assert warm.is_warm()
+    assert isinstance(hydrated, np.memmap)
+    assert (hydrated == expected).all()
+
+
+def test_read_only_and_copy_on_write_arrays(tmp_path):
+    u5_path = _u5_dir(tmp_path)
+    _cache(tmp_path, u5_path).get_array("brit", _Builder(np.zeros(8, dtype=np.uint8)))
+
+    warm = _cache(tmp_path, u5_path)
+    assert not warm.get_array("brit", _Builder(None)).flags.writeable
+
+    edited = warm.get_array("brit", _Builder(None), writeable = True)
+    edited[0] = 7
+
+    # the edit never makes it back into the cache.
+    assert _cache(tmp_path, u5_path).get_array("brit", _Builder(None))[0] == 0
+
+
+def test_objects_round_trip(tmp_path):
+    u5_path = _u5_dir(tmp_path)
+    _cache(tmp_path, u5_path).get_object("TOWNE.NPC", _Builder({1: ("a", (2, 3))}))
+
+    build = _Builder(None)
+    assert _cache(tmp_path, u5_path).get_object("TOWNE.NPC", build) == {1: ("a", (2, 3))}
+    assert build.builds == 0
+
+
+def test_changed_game_files_are_rebuilt_and_stale_assets_removed(tmp_path):
+    u5_path = _u5_dir(tmp_path)
+    first = _cache(tmp_path, u5_path)
+    first.get_array("tiles", _Builder(np.zeros(4, dtype=np.uint8)))
+
+    (u5_path / "TILES.16").write_bytes(b"modded tiles")
+    second = _cache(tmp_path, u5_path)
+    build = _Builder(np.ones(4, dtype=np.uint8))
+    assert (second.get_array("tiles", build) == 1).all()
+    assert build.builds == 1
+    assert [path.name for path in second.cache_path.iterdir()] == [second._asset_path.name]
+
+
+def test_other_game_directories_keep_their_assets(tmp_path):
+    # e.g. the synthetic test files, next to the real game's.
+    real_path = _u5_dir(tmp_path, "real")
+    _cache(tmp_path, real_path).get_array("tiles", _Builder(np.zeros(4, dtype=np.uint8)))
+
+    synthetic_path = _u5_dir(tmp_path, "synthetic")
+    (synthetic_path / "TILES.16").write_bytes(b"synthetic tiles")
+    _cache(tmp_path, synthetic_path).get_array("tiles", _Builder(np.ones(4, dtype=np.uint8)))
+
+    build = _Builder(None)
+    assert (_cache(tmp_path, real_path).get_array("tiles", build) == 0).all()
+    assert build.builds == 0
+
+
+def test_unwritable_cache_runs_uncached(tmp_path):
+    u5_path = _u5_dir(tmp_path)
+    cache = DecodedAssetCache()
+    cache.cache_path = tmp_path / "not_a_directory"
+    cache.cache_path.write_bytes(b"")
+    cache.open(u5_path)
+    assert not cache.is_open()
+
+    build = _Builder(np.arange(4, dtype=np.uint8))
+    assert (cache.get_array("tiles", build) == np.arange(4)).all()
+
+
+def test_failed_writes_still_return_the_asset(tmp_path):
+    cache = _cache(tmp_path, _u5_dir(tmp_path))
+    shutil.rmtree(cache._asset_path)
+
+    build = _Builder(np.arange(4, dtype=np.uint8))
+    assert (cache.get_array("tiles", build) == np.arange(4)).all()
+    assert build.builds == 1
+
+
+def test_corrupt_asset_is_rebuilt(tmp_path):
+    u5_path = _u5_dir(tmp_path)
+    cache = _cache(tmp_path, u5_path)
+    (cache._asset_path / "tiles.npy").write_bytes(b"not an array")
+
+    build = _Builder(np.arange(4, dtype=np.uint8))
+    assert (cache.get_array("tiles", build) == np.arange(4)).all()
+    assert build.builds == 1
+
+
+def test_digest_covers_what_the_pickled_classes_import():
+    # a TlkFile refers to InventoryOffset, so a change to that enum has to invalidate the cached TLK files.
+    sources = DecodedAssetCache.get_engine_sources()
+    assert "models/tlk_file.py" in sources
+    assert "models/enums/inventory_offset.py" in sources
+    assert "dark_libraries/dark_lzw.py" in sources
@@ -0,0 +1,212 @@
+import random
+
+import numpy as np
+import pytest
+
+from dark_libraries.dark_math import Coord, Rect, Size
+from data.global_registry import GlobalRegistry
+from models.global_location import GlobalLocation
+from models.terrain import Terrain
+from services.field_of_view_calculator import FieldOfViewCalculator
+from services.map_cache.map_level_contents import MapLevelContents
+
+
+LOC = 1
+LVL = 0
+
+TILE_FLOOR  = 0
+TILE_WALL   = 1
+TILE_WINDOW = 2
+
+
+def _terrains() -> list[Terrain]:
+    terrains = [Terrain() for _ in range(256)]
+    terrains[TILE_WALL].blocks_light = True
+    terrains[TILE_WINDOW].blocks_light = True
+    terrains[TILE_WINDOW].windowed = True
+    return terrains
+
+
+class _FakeMapCacheService:
+    def __init__(self, contents: MapLevelContents):
+        self.contents = contents
+
+    def get_map_level_contents(self, _location_index, _level_index):
+        return self.contents
+
+
+def _contents(rows: list[str]) -> MapLevelContents:
+    lookup = {".": TILE_FLOOR, "#": TILE_WALL, "w": TILE_WINDOW}
+    tile_ids = np.array([[lookup[ch] for ch in row] for row in rows], dtype=np.uint8)
+    return MapLevelContents(
+        tile_ids            = tile_ids,
+        tiles               = [None] * 256,
+        terrains            = _terrains(),
+        sprites             = [None] * 256,
+        sprite_time_offsets = np.zeros(tile_ids.shape)
+    )
+
+
+def _calculator(contents: MapLevelContents) -> FieldOfViewCalculator:
+    registry = GlobalRegistry()
+    for tile_id, terrain in enumerate(_terrains()):
+        registry.terrains.register(tile_id, terrain)
+
+    calculator = FieldOfViewCalculator()
+    calculator.global_registry = registry
+    calculator.map_cache_service = _FakeMapCacheService(contents)
+    return calculator
+
+
+# The original set-based flood fill, kept as an oracle.
+def _reference_fov(contents: MapLevelContents, centre: Coord[int], view_rect: Rect[int]) -> set[Coord[int]]:
+    windowed_coords = centre.get_4way_neighbours()
+    queued = {centre}
+    visited = {centre}
+    result = set()
+    while queued:
+        world_coord = queued.pop()
+        result.add(world_coord)
+        terrain = contents.get_terrain(world_coord)
+        if terrain is None:
+            allows_light = True
+        else:
+            allows_light = not terrain.blocks_light or (world_coord in windowed_coords and terrain.windowed)
+        if allows_light or world_coord == centre:
+            for neighbour in world_coord.get_8way_neighbours():
+                if view_rect.is_in_bounds(neighbour) and not neighbour in visited:
+                    queued.add(neighbour)
+                    visited.add(neighbour)
+    return result
+
+
+ROOM = [
+    "..........",
+    ".####.....",
+    ".#..w.....",
+    ".#..#.....",
+    ".####.....",
+    "..........",
+]
+
+
+def test_walls_hide_what_is_behind_them():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    centre = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    visible = calculator.calculate_fov_visibility(centre, Rect[int](Coord[int](0, 0), Size[int](10, 6)))
+
+    assert Coord[int](4, 3) in visible       # the wall itself is visible
+    assert Coord[int](2, 3) not in visible   # the room behind it is not
+
+
+def test_window_is_transparent_only_when_adjacent():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    rect = Rect[int](Coord[int](0, 0), Size[int](10, 6))
+
+    far = calculator.calculate_fov_visibility(GlobalLocation(LOC, LVL, Coord[int](8, 2)), rect)
+    assert Coord[int](3, 2) not in far
+
+    near = calculator.calculate_fov_visibility(GlobalLocation(LOC, LVL, Coord[int](5, 2)), rect)
+    assert Coord[int](3, 2) in near
+
+
+def test_off_map_coords_are_visible():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    visible = calculator.calculate_fov_visibility(GlobalLocation(LOC, LVL, Coord[int](0, 0)), Rect[int](Coord[int](-2, -2), Size[int](5, 5)))
+    assert Coord[int](-2, -2) in visible
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_flood_fill(seed):
+    rng = random.Random(seed)
+    rows = ["".join(rng.choice("...#w") for _ in range(24)) for _ in range(20)]
+    contents = _contents(rows)
+    calculator = _calculator(contents)
+
+    centre = Coord[int](rng.randrange(24), rng.randrange(20))
+    view_rect = Rect[int](centre - (8, 8), Size[int](17, 17))
+
+    expected = _reference_fov(contents, centre, view_rect)
+    assert calculator.calculate_fov_visibility(GlobalLocation(LOC, LVL, centre), view_rect) == expected
+
+
+def test_mask_matches_visibility():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    location = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    rect = Rect[int](Coord[int](1, 0), Size[int](9, 6))
+
+    mask = calculator.calculate_fov_mask(location, rect)
+    visible = calculator.calculate_fov_visibility(location, rect)
+    assert mask.shape == (6, 9)
+    assert {Coord[int](int(x) + 1, int(y)) for y, x in np.argwhere(mask)} == visible
+
+
+def test_results_are_cached():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    location = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    rect = Rect[int](Coord[int](0, 0), Size[int](10, 6))
+
+    assert calculator.calculate_fov_visibility(location, rect) is calculator.calculate_fov_visibility(location, rect)
+
+
+def test_refresh_outside_rect_keeps_cache():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    location = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    rect = Rect[int](Coord[int](6, 0), Size[int](4, 6))
+
+    first = calculator.calculate_fov_visibility(location, rect)
+    contents.set_tile_id(Coord[int](0, 0), TILE_WALL, 0.0)
+    assert calculator.calculate_fov_visibility(location, rect) is first
+
+
+def test_refresh_inside_rect_invalidates_cache():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    location = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    rect = Rect[int](Coord[int](0, 0), Size[int](10, 6))
+
+    assert Coord[int](2, 3) not in calculator.calculate_fov_visibility(location, rect)
+
+    # open a door in the room's east wall.
+    contents.set_tile_id(Coord[int](4, 3), TILE_FLOOR, 0.0)
+    assert Coord[int](2, 3) in calculator.calculate_fov_visibility(location, rect)
+
+
+def test_recached_level_invalidates_cache():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    location = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    rect = Rect[int](Coord[int](0, 0), Size[int](10, 6))
+
+    assert Coord[int](2, 3) not in calculator.calculate_fov_visibility(location, rect)
+
+    calculator.map_cache_service.contents = _contents([row.replace("#", ".") for row in ROOM])
+    assert Coord[int](2, 3) in calculator.calculate_fov_visibility(location, rect)
+
+
+def test_refresh_history_is_bounded():
+    contents = _contents(ROOM)
+    calculator = _calculator(contents)
+    location = GlobalLocation(LOC, LVL, Coord[int](8, 3))
+    rect = Rect[int](Coord[int](6, 0), Size[int](4, 6))
+
+    first = calculator.calculate_fov_visibility(location, rect)
+    generation = contents.generation
+
+    # a long session of doors opening and closing, all of it outside the rect.
+    for _ in range(MapLevelContents.REFRESHED_COORDS_KEPT + 1):
+        contents.set_tile_id(Coord[int](0, 0), TILE_WALL, 0.0)
+    assert len(contents._refreshed_coords) == MapLevelContents.REFRESHED_COORDS_KEPT
+    assert contents.get_refreshed_coords_since(generation) is None
+    assert contents.get_refreshed_coords_since(contents.generation - 1) == [Coord[int](0, 0)]
+
+    # too far back to tell what changed, so it's worked out again.
+    again = calculator.calculate_fov_visibility(location, rect)
+    assert again is not first
+    assert again == first
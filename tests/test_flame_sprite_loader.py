@@ -0,0 +1,91 @@
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from data.decoded_asset_cache import DecodedAssetCache
+from data.global_registry import GlobalRegistry
+from data.loaders.flame_sprite_loader import FLAME_FRAME_COUNT, FlameSpriteLoader
+from models.tile import Tile
+from view.display_config import DisplayConfig
+
+
+TORCH   = 176
+OVERLAY = 192
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    # Tile.set_surface converts surfaces, which needs a display mode.
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def _tile(tile_id: int, pixels: np.ndarray) -> Tile:
+    surface = pygame.Surface((16, 16)).convert()
+    return Tile(tile_id, pixels, surface)
+
+
+def _loader(decoded_asset_cache: DecodedAssetCache = None) -> FlameSpriteLoader:
+    rng = random.Random(0)
+    registry = GlobalRegistry()
+    for tile_id in range(256):
+        pixels = np.array([[rng.randrange(16) for _ in range(16)] for _ in range(16)], dtype=np.uint8)
+        registry.tiles.register(tile_id, _tile(tile_id, pixels))
+
+    loader = FlameSpriteLoader()
+    loader.display_config = DisplayConfig()
+    loader.global_registry = registry
+    loader.decoded_asset_cache = DecodedAssetCache() if decoded_asset_cache is None else decoded_asset_cache
+    loader._after_inject()
+    return loader
+
+
+def _frame_pixels(loader: FlameSpriteLoader) -> np.ndarray:
+    return np.array([frame.pixels for frame in loader._build_sprite(TORCH).frames])
+
+
+def test_only_overlay_bits_are_toggled():
+    loader = _loader()
+    original = loader.global_registry.tiles.get(TORCH).pixels
+    overlay  = loader.global_registry.tiles.get(OVERLAY).pixels
+
+    frames = _frame_pixels(loader)
+    assert frames.shape == (FLAME_FRAME_COUNT, 16, 16)
+    assert ((frames ^ original) & ~overlay == 0).all()
+
+    # and they actually flicker.
+    assert len({frame.tobytes() for frame in frames}) == FLAME_FRAME_COUNT
+
+
+def test_surfaces_show_the_frame_pixels():
+    loader = _loader()
+    frame = loader._build_sprite(TORCH).frames[0]
+    for (x, y) in ((0, 0), (5, 9), (15, 15)):
+        expected = DisplayConfig.EGA_PALETTE[int(frame.pixels[y][x])]
+        assert tuple(frame.get_surface().get_at((x, y)))[:3] == expected
+
+
+def test_same_seed_gives_the_same_flames():
+    assert (_frame_pixels(_loader()) == _frame_pixels(_loader())).all()
+
+    reseeded = _loader()
+    reseeded.random_seed = 99
+    assert not (_frame_pixels(reseeded) == _frame_pixels(_loader())).all()
+
+
+def test_flames_are_hydrated_from_the_asset_cache(tmp_path):
+    def _cache() -> DecodedAssetCache:
+        cache = DecodedAssetCache()
+        cache.cache_path = tmp_path / "decoded_assets"
+        cache.open(tmp_path)
+        return cache
+
+    built = _frame_pixels(_loader(_cache()))
+
+    warm = _cache()
+    assert (_frame_pixels(_loader(warm)) == built).all()
+    assert warm.is_warm()
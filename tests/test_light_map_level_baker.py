@@ -0,0 +1,147 @@
+import numpy as np
+
+from dark_libraries.dark_math import Coord
+from data.global_registry import GlobalRegistry
+from data.loaders.light_map_builder import LightMapBuilder
+from models.enums.combat_map_location_index import COMBAT_MAP_LOCATION_INDEX
+from models.global_location import GlobalLocation
+from models.terrain import Terrain
+from services.field_of_view_calculator import FieldOfViewCalculator
+from services.light_map_level_baker import LightMapLevelBaker
+from services.map_cache.map_level_contents import MapLevelContents
+from view.display_config import DisplayConfig
+
+
+LOC = 3
+LVL = 1
+
+TILE_FLOOR  = 0
+TILE_WALL   = 1
+TILE_BRAZIER = 2
+
+
+ROOM = [
+    "..........",
+    ".####.....",
+    ".#*.#..*..",
+    ".#..#.....",
+    ".####.....",
+    "..........",
+]
+
+
+def _contents(rows: list[str]) -> MapLevelContents:
+    lookup = {".": TILE_FLOOR, "#": TILE_WALL, "*": TILE_BRAZIER}
+    tile_ids = np.array([[lookup[ch] for ch in row] for row in rows], dtype=np.uint8)
+    return MapLevelContents(
+        tile_ids            = tile_ids,
+        tiles               = [None] * 256,
+        terrains            = [None] * 256,
+        sprites             = [None] * 256,
+        sprite_time_offsets = np.zeros(tile_ids.shape)
+    )
+
+
+class _FakeMapCacheService:
+    def __init__(self, contents: MapLevelContents):
+        self.contents = contents
+
+    def get_map_level_contents(self, _location_index, _level_index):
+        return self.contents
+
+
+def _baker(contents: MapLevelContents, cache_path) -> LightMapLevelBaker:
+    registry = GlobalRegistry()
+    for tile_id in range(256):
+        registry.terrains.register(tile_id, Terrain())
+    registry.terrains.get(TILE_WALL).blocks_light = True
+    registry.terrains.get(TILE_BRAZIER).emits_light = True
+
+    builder = LightMapBuilder()
+    builder.display_config = DisplayConfig()
+    builder.global_registry = registry
+    builder.build_light_maps()
+
+    map_cache_service = _FakeMapCacheService(contents)
+
+    fov_calculator = FieldOfViewCalculator()
+    fov_calculator.global_registry = registry
+    fov_calculator.map_cache_service = map_cache_service
+
+    baker = LightMapLevelBaker()
+    baker.global_registry = registry
+    baker.fov_calculator = fov_calculator
+    baker.map_cache_service = map_cache_service
+    baker.cache_path = cache_path
+    return baker
+
+
+def _baked(baker: LightMapLevelBaker, location_index: int = LOC, level_index: int = LVL) -> dict[Coord[int], set[Coord[int]]]:
+    baked = baker.global_registry.baked_light_level_maps.get((location_index, level_index))
+    return {coord: set(light_map) for coord, light_map in baked.items()}
+
+
+def test_nothing_is_baked_until_the_party_arrives(tmp_path):
+    baker = _baker(_contents(ROOM), tmp_path)
+    assert baker.global_registry.baked_light_level_maps.get((LOC, LVL)) is None
+
+    baker.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    assert set(_baked(baker).keys()) == {Coord[int](2, 2), Coord[int](7, 2)}
+    assert baker.levels_baked == 1
+
+
+def test_walls_clip_the_baked_light(tmp_path):
+    baker = _baker(_contents(ROOM), tmp_path)
+    baker.loaded(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    baked = _baked(baker)
+
+    assert Coord[int](3, 3) in baked[Coord[int](2, 2)]
+    assert Coord[int](5, 2) not in baked[Coord[int](2, 2)]
+    assert Coord[int](5, 2) in baked[Coord[int](7, 2)]
+
+
+def test_revisiting_a_level_does_not_rebake(tmp_path):
+    baker = _baker(_contents(ROOM), tmp_path)
+    baker.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    baker.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    assert baker.levels_baked == 1
+
+
+def test_later_launches_load_the_bake_from_disk(tmp_path):
+    first = _baker(_contents(ROOM), tmp_path)
+    first.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+
+    second = _baker(_contents(ROOM), tmp_path)
+    second.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    assert second.levels_baked == 0
+    assert second.levels_loaded == 1
+    assert _baked(second) == _baked(first)
+
+
+def test_changed_map_ignores_the_stale_bake(tmp_path):
+    first = _baker(_contents(ROOM), tmp_path)
+    first.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+
+    # knock a hole in the wall.
+    second = _baker(_contents([row.replace(".#*.#", ".#*..") for row in ROOM]), tmp_path)
+    second.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    assert second.levels_baked == 1
+    assert Coord[int](5, 2) in _baked(second)[Coord[int](2, 2)]
+
+
+def test_recached_level_is_rebaked(tmp_path):
+    baker = _baker(_contents(ROOM), tmp_path)
+    baker.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+
+    # e.g. a new combat map, cached under the same location.
+    baker.map_cache_service.contents = _contents(["*........."])
+    baker.level_changed(GlobalLocation(LOC, LVL, Coord[int](0, 0)))
+    assert set(_baked(baker).keys()) == {Coord[int](0, 0)}
+
+
+def test_combat_maps_are_not_cached_on_disk(tmp_path):
+    baker = _baker(_contents(ROOM), tmp_path)
+    baker.level_changed(GlobalLocation(COMBAT_MAP_LOCATION_INDEX, 0, Coord[int](0, 0)))
+    assert baker.levels_baked == 1
+    assert Coord[int](2, 2) in _baked(baker, COMBAT_MAP_LOCATION_INDEX, 0)
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,133 @@
+import numpy as np
+
+from dark_libraries.dark_math import Coord, Rect, Size, Vector2
+from data.global_registry import GlobalRegistry
+from data.loaders.light_map_builder import LightMapBuilder
+from models.global_location import GlobalLocation
+from models.light_map import LightMap
+from services.lighting_service import LightingService
+from view.display_config import DisplayConfig
+
+
+LOC = 1
+LVL = 0
+
+
+def _square(size: int, origin: tuple[int, int]) -> LightMap:
+    return LightMap(np.ones((size, size), dtype=np.bool_), origin)
+
+
+# LightMap -------------------------------------------------------------------
+
+def test_translate_only_moves_the_origin():
+    light_map = _square(3, (-1, -1))
+    translated = light_map.translate(Coord[int](10, 20))
+    assert translated.mask is light_map.mask
+    assert set(translated) == {Coord[int](x, y) for x in (9, 10, 11) for y in (19, 20, 21)}
+
+
+def test_is_lit():
+    light_map = _square(3, (5, 5))
+    assert light_map.is_lit(Coord[int](5, 5))
+    assert light_map.is_lit(Coord[int](7, 7))
+    assert not light_map.is_lit(Coord[int](8, 7))
+    assert not light_map.is_lit(Coord[int](4, 5))
+
+
+def test_intersect_covers_only_the_overlap():
+    a = _square(4, (0, 0))
+    b = _square(4, (2, 1))
+    assert set(a.intersect(b)) == set(a) & set(b)
+    assert a.intersect(b).get_rect() == Rect[int](Coord[int](2, 1), Size[int](2, 3))
+
+
+def test_intersect_without_overlap_is_empty():
+    assert len(_square(2, (0, 0)).intersect(_square(2, (5, 5)))) == 0
+
+
+def test_union_into_clips_to_target():
+    target = np.zeros((3, 3), dtype=np.bool_)
+    _square(2, (-1, 2)).union_into(target, (0, 0))
+    assert target.tolist() == [
+        [False, False, False],
+        [False, False, False],
+        [True,  False, False],
+    ]
+
+
+# LightMapBuilder ------------------------------------------------------------
+
+def _reference_light_map(radius: int, emitter_offset: Vector2[int]) -> set[Vector2[int]]:
+    lit = set()
+    for view_coord in DisplayConfig.VIEW_PORT_SIZE:
+        offset = view_coord.to_offset() - emitter_offset
+        if int(offset.pythagorean_distance((0, 0)) + 0.5) <= radius:
+            lit.add(offset)
+    return lit
+
+
+def test_builder_matches_reference_shapes():
+    builder = LightMapBuilder()
+    builder.display_config = DisplayConfig()
+    builder.global_registry = GlobalRegistry()
+    builder.build_light_maps()
+
+    emitter_offset = Vector2[int](DisplayConfig.VIEW_PORT_SIZE.w // 2, DisplayConfig.VIEW_PORT_SIZE.h // 2)
+    for radius, light_map in builder.global_registry.unbaked_light_maps.items():
+        assert set(light_map) == _reference_light_map(radius, emitter_offset)
+
+
+# LightingService ------------------------------------------------------------
+
+def _service(baked: dict[Coord[int], LightMap] = None) -> LightingService:
+    registry = GlobalRegistry()
+    registry.unbaked_light_maps.register(1, LightMap(np.array([[False, True, False], [True, True, True], [False, True, False]]), (-1, -1)))
+    registry.baked_light_level_maps.register((LOC, LVL), baked or {})
+
+    service = LightingService()
+    service.global_registry = registry
+    return service
+
+
+VIEW_RECT = Rect[int](Coord[int](0, 0), Size[int](7, 7))
+CENTRE = GlobalLocation(LOC, LVL, Coord[int](3, 3))
+
+
+def _lit_coords(mask: np.ndarray) -> set[Coord[int]]:
+    return {Coord[int](int(x), int(y)) for y, x in np.argwhere(mask)}
+
+
+def test_player_light_is_clipped_by_fov():
+    fov_mask = np.ones((7, 7), dtype=np.bool_)
+    fov_mask[2, 3] = False
+    lit = _service().calculate_lighting(CENTRE, VIEW_RECT, 1, fov_mask)
+    assert _lit_coords(lit) == {Coord[int](3, 3), Coord[int](3, 4), Coord[int](2, 3), Coord[int](4, 3)}
+
+
+def test_fixed_light_only_counts_when_emitter_is_visible():
+    emitter = Coord[int](5, 5)
+    baked = {emitter: _square(2, (5, 5))}
+
+    fov_mask = np.ones((7, 7), dtype=np.bool_)
+    lit = _service(baked).calculate_lighting(CENTRE, VIEW_RECT, 1, fov_mask)
+    assert Coord[int](6, 6) in _lit_coords(lit)
+
+    hidden = fov_mask.copy()
+    hidden[emitter.y, emitter.x] = False
+    lit = _service(baked).calculate_lighting(CENTRE, VIEW_RECT, 1, hidden)
+    assert Coord[int](6, 6) not in _lit_coords(lit)
+
+
+def test_result_is_cached_until_inputs_change():
+    service = _service()
+    fov_mask = np.ones((7, 7), dtype=np.bool_)
+
+    first = service.calculate_lighting(CENTRE, VIEW_RECT, 1, fov_mask)
+    assert service.calculate_lighting(CENTRE, VIEW_RECT, 1, fov_mask) is first
+
+    moved = GlobalLocation(LOC, LVL, Coord[int](3, 4))
+    second = service.calculate_lighting(moved, VIEW_RECT, 1, fov_mask)
+    assert second is not first
+
+    # a recalculated FOV is a new array, even if the party hasn't moved.
+    assert service.calculate_lighting(moved, VIEW_RECT, 1, fov_mask.copy()) is not second
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+from dark_libraries.logging import (
+    BackgroundLogSink, FileWriterLogSink, LoggerMixin, LogLevel, RingBufferLogSink,
+    get_log_level, get_log_sinks, set_log_level, set_log_sinks
+)
+
+
+class _Service(LoggerMixin):
+    pass
+
+
+class _CountsFormatting:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "formatted"
+
+
+@pytest.fixture
+def ring():
+    # swap the real console out for a ring buffer, and put things back afterwards.
+    level, sinks = get_log_level(), get_log_sinks()
+    ring = RingBufferLogSink(capacity = 3)
+    set_log_sinks([ring])
+    set_log_level(LogLevel.INFO)
+    yield ring
+    set_log_level(level)
+    set_log_sinks(sinks)
+
+
+def test_disabled_debug_never_formats(ring):
+    arg = _CountsFormatting()
+    _Service().debug("moving %s", arg)
+    assert arg.formatted == 0
+    assert ring.get_records() == []
+
+
+def test_enabled_debug_formats_once(ring):
+    set_log_level(LogLevel.DEBUG)
+    arg = _CountsFormatting()
+    _Service().debug("moving %s", arg)
+    assert arg.formatted == 1
+    assert ring.get_records()[0].message == "DEBUG: moving formatted"
+    assert ring.get_records()[0].prefix == "_service"
+
+
+def test_levels_are_tagged_like_the_old_messages(ring):
+    service = _Service()
+    service.info("hello %d", 1)
+    service.warn("careful")
+    service.error("broken")
+    assert [(record.level, record.message) for record in ring.get_records()] == [
+        (LogLevel.INFO,  "hello 1"),
+        (LogLevel.WARN,  "WARNING: careful"),
+        (LogLevel.ERROR, "ERROR: broken"),
+    ]
+
+
+def test_old_style_log_takes_its_level_from_the_message(ring):
+    service = _Service()
+    service.log("DEBUG: hidden")
+    service.log("WARNING: shown")
+    service.log("plain")
+    assert [record.level for record in ring.get_records()] == [LogLevel.WARN, LogLevel.INFO]
+
+
+def test_ring_buffer_keeps_only_the_latest(ring):
+    service = _Service()
+    for i in range(5):
+        service.info("line %d", i)
+    assert [record.message for record in ring.get_records()] == ["line 2", "line 3", "line 4"]
+    assert ring.get_lines()[-1].endswith("line 4")
+
+
+def test_file_writer_thread(ring, tmp_path):
+    path = tmp_path / "logs" / "game.log"
+    file_sink = FileWriterLogSink(path)
+    set_log_sinks([ring, file_sink])
+
+    service = _Service()
+    for i in range(100):
+        service.info("line %d", i)
+    file_sink.flush()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 100
+    assert lines[-1].endswith("line 99")
+
+
+class _BrokenSink:
+    def __init__(self):
+        self.written = list()
+
+    def write(self, record):
+        if "bad" in record.message:
+            raise UnicodeEncodeError("ascii", record.message, 0, 1, "can't print that")
+        self.written.append(record.message)
+
+    def flush(self):
+        pass
+
+
+def test_background_sink_survives_a_failing_write(ring):
+    sink = BackgroundLogSink(_BrokenSink())
+    set_log_sinks([sink])
+
+    service = _Service()
+    service.info("bad line")
+    service.info("good line")
+    sink.flush(timeout = 5.0)
+    assert sink._sink.written == ["good line"]
+
+
+def test_background_sink_flush_gives_up_on_a_stuck_sink(ring):
+    class _StuckSink(_BrokenSink):
+        def write(self, record):
+            time.sleep(1.0)
+
+    sink = BackgroundLogSink(_StuckSink())
+    set_log_sinks([sink])
+    _Service().info("slow")
+
+    started = time.monotonic()
+    sink.flush(timeout = 0.1)
+    assert time.monotonic() - started < 0.9
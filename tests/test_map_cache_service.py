@@ -0,0 +1,185 @@
+import random
+
+from dark_libraries.dark_math import Coord, Rect, Size
+from data.global_registry import GlobalRegistry
+from models.enums.transport_mode import TransportMode
+from models.global_location import GlobalLocation
+from models.location_metadata import LocationMetadata
+from models.sprite import Sprite
+from models.terrain import Terrain
+from models.tile import Tile
+from models.u5_map import U5Map
+from models.u5_map_level import U5MapLevel
+from service_implementations.map_cache_service_implementation import MapCacheServiceImplementation
+from services.map_cache.blocked_coords import BlockedCoords
+
+
+LOC = 7
+LVL = 0
+SIZE = Size[int](4, 3)
+
+TILE_GRASS = 5
+TILE_WALL  = 79
+TILE_WATER = 3   # animated
+
+
+def _metadata() -> LocationMetadata:
+    return LocationMetadata(
+        location_index = LOC, name = "TEST", name_index = None, files_index = None,
+        group_index = None, map_index_offset = None, num_levels = 1, default_level = LVL,
+        has_basement = False, trigger_index = None, sound_track = None
+    )
+
+
+def _build() -> tuple[MapCacheServiceImplementation, U5MapLevel]:
+    registry = GlobalRegistry()
+    for tile_id in range(256):
+        registry.tiles.register(tile_id, Tile(tile_id))
+        registry.terrains.register(tile_id, Terrain(walk = tile_id != TILE_WALL))
+
+    water_frames = [Tile(1000), Tile(1001)]
+    registry.sprites.register(TILE_WATER, Sprite[Tile](water_frames))
+
+    raw = bytearray([TILE_GRASS] * (SIZE.w * SIZE.h))
+    raw[1] = TILE_WALL
+    raw[6] = TILE_WATER
+    map_level = U5MapLevel(raw, SIZE)
+    registry.maps.register(LOC, U5Map({LVL: map_level}, _metadata()))
+
+    service = MapCacheServiceImplementation()
+    service.global_registry = registry
+    service.init()
+    return service, map_level
+
+
+def test_coord_contents_come_from_lookup_tables():
+    service, _ = _build()
+    contents = service.get_location_contents(GlobalLocation(LOC, LVL, Coord[int](1, 0)))
+    assert contents.tile.tile_id == TILE_WALL
+    assert contents.get_terrain().walk is False
+
+
+def test_tiles_and_terrains_are_shared_between_coords():
+    service, _ = _build()
+    level_contents = service.get_map_level_contents(LOC, LVL)
+    assert level_contents.get_terrain(Coord[int](0, 0)) is level_contents.get_terrain(Coord[int](3, 2))
+
+
+def test_out_of_bounds_is_none():
+    service, _ = _build()
+    level_contents = service.get_map_level_contents(LOC, LVL)
+    assert level_contents.get_coord_contents(Coord[int](-1, 0)) is None
+    assert level_contents.get_terrain(Coord[int](4, 0)) is None
+    assert level_contents.get_renderable_frame(Coord[int](0, 3)) is None
+
+
+def test_animated_tile_renders_a_sprite_frame():
+    service, _ = _build()
+    level_contents = service.get_map_level_contents(LOC, LVL)
+    frame = level_contents.get_renderable_frame(Coord[int](2, 1))
+    assert frame.tile_id in (1000, 1001)
+    assert level_contents.get_renderable_frame(Coord[int](0, 0)).tile_id == TILE_GRASS
+
+
+def test_sprite_time_offsets_are_within_cycle_and_reproducible():
+    random.seed(3)
+    first, _ = _build()
+    random.seed(3)
+    second, _ = _build()
+
+    coord = Coord[int](2, 1)
+    offset_a = first.get_map_level_contents(LOC, LVL).get_coord_contents(coord).terrain_sprite_time_offset
+    offset_b = second.get_map_level_contents(LOC, LVL).get_coord_contents(coord).terrain_sprite_time_offset
+    assert offset_a == offset_b
+    assert 0.0 <= offset_a < 1.0   # two frames of the default 0.5s
+
+
+def test_cache_is_a_snapshot_until_refreshed():
+    service, map_level = _build()
+    coord = Coord[int](0, 0)
+    map_level.set_tile_id(coord, TILE_WALL)
+
+    level_contents = service.get_map_level_contents(LOC, LVL)
+    assert level_contents.get_tile_id(coord) == TILE_GRASS
+
+    service.refresh_coord(LOC, LVL, coord)
+    assert level_contents.get_tile_id(coord) == TILE_WALL
+    assert level_contents.get_terrain(coord).walk is False
+
+
+def test_iteration_yields_every_coord():
+    service, _ = _build()
+    items = list(service.get_map_level_contents(LOC, LVL))
+    assert len(items) == SIZE.w * SIZE.h
+    assert items[1][0] == Coord[int](1, 0)
+    assert items[1][1].tile.tile_id == TILE_WALL
+
+
+def test_blocked_coords():
+    service, _ = _build()
+    blocked = service.get_blocked_coords(LOC, LVL, TransportMode.WALK)
+    assert Coord[int](1, 0) in blocked
+    assert Coord[int](0, 0) not in blocked
+
+
+def test_blocked_coords_is_a_view_not_a_set():
+    service, _ = _build()
+    blocked = service.get_blocked_coords(LOC, LVL, TransportMode.WALK)
+    assert isinstance(blocked, BlockedCoords)
+    assert list(blocked) == [Coord[int](1, 0)]
+
+
+def test_blocked_coords_out_of_bounds_is_not_blocked():
+    service, _ = _build()
+    blocked = service.get_blocked_coords(LOC, LVL, TransportMode.WALK)
+    assert Coord[int](-1, 0) not in blocked
+    assert Coord[int](SIZE.w, 0) not in blocked
+
+
+def test_blocked_coords_union_and_discard():
+    service, _ = _build()
+    occupied = {Coord[int](0, 0)}
+    forbidden = service.get_blocked_coords(LOC, LVL, TransportMode.WALK) | occupied
+    assert Coord[int](0, 0) in forbidden
+    assert Coord[int](1, 0) in forbidden
+
+    forbidden.discard(Coord[int](1, 0))
+    forbidden.discard(Coord[int](0, 0))
+    assert Coord[int](1, 0) not in forbidden
+    assert Coord[int](0, 0) not in forbidden
+
+    # the original view is untouched.
+    assert Coord[int](1, 0) in service.get_blocked_coords(LOC, LVL, TransportMode.WALK)
+
+
+def test_passability_grid_is_built_once_per_mode():
+    service, _ = _build()
+    grid = service.get_passability_grid(LOC, LVL, TransportMode.WALK)
+    assert grid.shape == (SIZE.h, SIZE.w)
+    assert grid[0, 1] == False and grid[0, 0] == True
+    assert service.get_passability_grid(LOC, LVL, TransportMode.WALK) is grid
+    assert not service.get_passability_grid(LOC, LVL, TransportMode.SHIP).any()
+
+
+def test_refresh_coord_updates_passability_grid():
+    service, map_level = _build()
+    grid = service.get_passability_grid(LOC, LVL, TransportMode.WALK)
+    door = Coord[int](2, 2)
+
+    map_level.set_tile_id(door, TILE_WALL)
+    service.refresh_coord(LOC, LVL, door)
+    assert grid[door.y, door.x] == False
+    assert door in service.get_blocked_coords(LOC, LVL, TransportMode.WALK)
+
+    map_level.set_tile_id(door, TILE_GRASS)
+    service.refresh_coord(LOC, LVL, door)
+    assert grid[door.y, door.x] == True
+
+
+def test_passability_rect_pads_out_of_bounds_as_impassable():
+    service, _ = _build()
+    rect = Rect[int](Coord[int](-1, -1), Size[int](3, 2))
+    assert service.get_passability_rect(LOC, LVL, TransportMode.WALK, rect).tolist() == [
+        [False, False, False],
+        [False, True,  False],
+    ]
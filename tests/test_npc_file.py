@@ -8,28 +8,6 @@ from models.npc_file import NpcFile, NpcSchedule
 NPC_FILE_NAMES = ("TOWNE.NPC", "DWELLING.NPC", "CASTLE.NPC", "KEEP.NPC")
 
 
-def _find_u5_dir() -> Path | None:
-    # Prefer the project's configured lookup (dev install / GOG / Mac app).
-    try:
-        from configure import get_u5_path
-        return get_u5_path()
-    except AssertionError:
-        pass
-    # Fallback: repo-local u5/ (gitignored; present in this dev container).
-    repo_local = Path(__file__).resolve().parents[1] / "u5"
-    if all((repo_local / name).exists() for name in NPC_FILE_NAMES):
-        return repo_local
-    return None
-
-
-@pytest.fixture(scope="module")
-def u5_dir() -> Path:
-    path = _find_u5_dir()
-    if path is None:
-        pytest.skip("U5 game files not found")
-    return path
-
-
 @pytest.fixture(scope="module", params=NPC_FILE_NAMES)
 def npc_file(request, u5_dir: Path) -> NpcFile:
     return NpcFile(u5_dir / request.param)
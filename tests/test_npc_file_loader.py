@@ -1,36 +1,12 @@
 from pathlib import Path
 
-import pytest
-
+from data.decoded_asset_cache import DecodedAssetCache
 from data.global_registry    import GlobalRegistry
 from data.loaders.npc_file_loader import NpcFileLoader
 from models.location_metadata import LocationMetadata
 from models.npc_file import NpcMapSection
 
 
-NPC_FILE_NAMES = ("TOWNE.NPC", "DWELLING.NPC", "CASTLE.NPC", "KEEP.NPC")
-
-
-def _find_u5_dir() -> Path | None:
-    try:
-        from configure import get_u5_path
-        return get_u5_path()
-    except AssertionError:
-        pass
-    repo_local = Path(__file__).resolve().parents[1] / "u5"
-    if all((repo_local / name).exists() for name in NPC_FILE_NAMES):
-        return repo_local
-    return None
-
-
-@pytest.fixture(scope="module")
-def u5_dir() -> Path:
-    path = _find_u5_dir()
-    if path is None:
-        pytest.skip("U5 game files not found")
-    return path
-
-
 def _meta(location_index: int, files_index: int | None, group_index: int | None) -> LocationMetadata:
     return LocationMetadata(
         location_index   = location_index,
@@ -51,6 +27,7 @@ def _run_loader(u5_dir: Path, metadata: list[LocationMetadata]) -> GlobalRegistr
     registry = GlobalRegistry()
     loader = NpcFileLoader()
     loader.global_registry = registry
+    loader.decoded_asset_cache = DecodedAssetCache()
     loader.load(u5_dir, metadata)
     return registry
 
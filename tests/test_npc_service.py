@@ -0,0 +1,160 @@
+import random
+
+from dark_libraries.dark_math import Coord, Rect
+from models.agents.monster_agent import MonsterAgent
+from models.agents.town_npc_agent import TownNpcAgent
+from models.enums.combat_map_location_index import COMBAT_MAP_LOCATION_INDEX
+from models.global_location import GlobalLocation
+from service_implementations.npc_service_implementation import NpcServiceImplementation
+
+
+class _FakeSprite:
+    def create_random_time_offset(self):
+        return 0.0
+
+    def get_current_frame(self, _offset):
+        return None
+
+
+class _FakePartyAgent:
+    name = "Avatar"
+    coord = None
+    dexterity = 15
+    slept = False
+    spent_action_points = 0
+    _turn_listener = None
+
+
+PARTY_COORD = Coord[int](10, 10)
+
+
+def _npc(x: int, y: int) -> TownNpcAgent:
+    return TownNpcAgent(Coord[int](x, y), _FakeSprite(), tile_id = 0x150, name = f"NPC@{x},{y}", dialog_number = 1)
+
+
+def _build(location_index: int = 2) -> NpcServiceImplementation:
+    npc_service = NpcServiceImplementation()
+    npc_service.party_agent = _FakePartyAgent()
+    npc_service.loaded(GlobalLocation(location_index, 0, PARTY_COORD))
+    return npc_service
+
+
+def test_lookups_follow_npcs_as_they_move():
+    npc_service = _build()
+    npc = _npc(3, 3)
+    npc_service.add_npc(npc)
+
+    npc.coord = Coord[int](3, 4)
+
+    assert npc_service.get_npc_at(Coord[int](3, 3)) is None
+    assert npc_service.get_npc_at(Coord[int](3, 4)) is npc
+    assert npc_service.is_occupied(Coord[int](3, 4))
+    assert npc_service.get_occupied_coords() == {Coord[int](3, 4), PARTY_COORD}
+    assert npc_service.get_npcs() == {Coord[int](3, 4): npc, PARTY_COORD: npc_service.party_agent}
+
+
+def test_removed_npcs_stop_being_tracked():
+    npc_service = _build()
+    npc = _npc(3, 3)
+    npc_service.add_npc(npc)
+    npc_service.remove_npc(npc)
+
+    npc.coord = Coord[int](4, 4)
+    assert npc_service.get_occupied_coords() == {PARTY_COORD}
+
+
+def test_rect_query_includes_the_party_when_shown():
+    npc_service = _build()
+    inside, outside = _npc(8, 8), _npc(30, 30)
+    npc_service.add_npc(inside)
+    npc_service.add_npc(outside)
+
+    view_rect = Rect[int](Coord[int](5, 5), (11, 11))
+    assert npc_service.get_npcs_in_rect(view_rect) == {Coord[int](8, 8): inside, PARTY_COORD: npc_service.party_agent}
+
+    # no party marker on the combat map.
+    npc_service.party_moved(GlobalLocation(COMBAT_MAP_LOCATION_INDEX, 0, PARTY_COORD))
+    assert npc_service.get_npcs_in_rect(view_rect) == {Coord[int](8, 8): inside}
+    assert not npc_service.is_occupied(PARTY_COORD)
+
+
+def test_frozen_npcs_keep_their_place():
+    npc_service = _build(location_index = 0)
+    monster = _npc(3, 3)
+    npc_service.add_npc(monster)
+
+    npc_service.level_changed(GlobalLocation(2, 0, PARTY_COORD))
+    assert npc_service.get_npc_at(Coord[int](3, 3)) is None
+
+    # moving whilst frozen still updates the frozen index.
+    monster.coord = Coord[int](3, 5)
+    townsperson = _npc(3, 5)
+    npc_service.add_npc(townsperson)
+
+    npc_service.level_changed(GlobalLocation(0, 0, PARTY_COORD))
+    assert npc_service.get_npc_at(Coord[int](3, 5)) is monster
+    assert npc_service.get_occupied_coords() == {Coord[int](3, 5), PARTY_COORD}
+
+
+class _FakeMetadata:
+    name = "orc"
+    npc_tile_id = 0x1D0
+    hitpoints = 10
+
+    def __init__(self, dexterity: int):
+        self.dexterity = dexterity
+
+
+def _monster(x: int, y: int, dexterity: int) -> MonsterAgent:
+    return MonsterAgent(Coord[int](x, y), _FakeSprite(), _FakeMetadata(dexterity))
+
+
+def _turn_order(npc_service: NpcServiceImplementation, turns: int) -> list[str]:
+    order = list[str]()
+    for _ in range(turns):
+        npc = npc_service.get_next_moving_npc()
+        order.append(npc.name if npc is not npc_service.party_agent else "party")
+        if npc is npc_service.party_agent:
+            npc.spent_action_points += 2
+            npc._turn_listener(npc)
+        else:
+            npc.spend_action_quanta()
+    return order
+
+
+def test_least_spent_then_most_dextrous_goes_next():
+    npc_service = _build(location_index = 0)
+    slow, quick = _monster(1, 1, dexterity = 10), _monster(2, 2, dexterity = 20)
+    slow._npc_metadata.name, quick._npc_metadata.name = "slow", "quick"
+    npc_service.add_npc(slow)
+    npc_service.add_npc(quick)
+
+    # quick and the party spend 2 per turn, slow spends 3.  quick and the party tie on points, so dexterity decides.
+    assert _turn_order(npc_service, 7) == ["quick", "party", "slow", "quick", "party", "slow", "quick"]
+
+
+def test_sleepers_are_skipped():
+    npc_service = _build(location_index = 0)
+    sleeper = _monster(1, 1, dexterity = 30)
+    sleeper.sleep()
+    npc_service.add_npc(sleeper)
+
+    random.seed(1)
+    assert npc_service.get_next_moving_npc() is npc_service.party_agent
+    assert sleeper.spent_action_points > 0
+
+
+def test_ties_are_settled_the_same_way_for_the_same_seed():
+    def order(seed: int) -> list[str]:
+        npc_service = _build(location_index = 0)
+        npc_service.seed_turn_order(seed)
+        npc_service.party_moved(GlobalLocation(COMBAT_MAP_LOCATION_INDEX, 0, PARTY_COORD))
+        for n in range(6):
+            monster = _monster(n, 0, dexterity = 10)
+            monster._npc_metadata = _FakeMetadata(10)
+            monster._npc_metadata.name = f"orc{n}"
+            npc_service.add_npc(monster)
+        return _turn_order(npc_service, 12)
+
+    assert order(3) == order(3)
+    assert sorted(order(3)[:6]) == [f"orc{n}" for n in range(6)]
@@ -0,0 +1,153 @@
+import numpy as np
+
+from dark_libraries.dark_math import Coord, Size
+from data.global_registry import GlobalRegistry
+from models.location_metadata import LocationMetadata
+from models.sprite import Sprite
+from models.terrain import Terrain
+from models.tile import Tile
+from models.u5_map import U5Map
+from models.u5_map_level import U5MapLevel
+from service_implementations.map_cache_service_implementation import MapCacheServiceImplementation
+from services.pathfinding.grid_search import build_distance_field, find_path
+from services.pathfinding.pathfinding_service import PathfindingService
+
+
+LOC = 7
+LVL = 0
+
+TILE_GRASS = 5
+TILE_WALL  = 79
+
+#
+# . . . . . .
+# . # # # # .
+# . # . . # .
+# . # . # # .
+# . . . . . .
+#
+MAZE = [
+    "......",
+    ".####.",
+    ".#..#.",
+    ".#.##.",
+    "......",
+]
+
+
+def _grid(rows: list[str]) -> np.ndarray:
+    return np.array([[cell != "#" for cell in row] for row in rows])
+
+
+def _metadata() -> LocationMetadata:
+    return LocationMetadata(
+        location_index = LOC, name = "TEST", name_index = None, files_index = None,
+        group_index = None, map_index_offset = None, num_levels = 1, default_level = LVL,
+        has_basement = False, trigger_index = None, sound_track = None
+    )
+
+
+def _build(rows: list[str]) -> tuple[PathfindingService, MapCacheServiceImplementation, U5MapLevel]:
+    registry = GlobalRegistry()
+    for tile_id in range(256):
+        registry.tiles.register(tile_id, Tile(tile_id))
+        registry.terrains.register(tile_id, Terrain(walk = tile_id != TILE_WALL))
+    registry.sprites.register(TILE_GRASS, Sprite[Tile]([Tile(TILE_GRASS)]))
+
+    raw = bytearray(TILE_WALL if cell == "#" else TILE_GRASS for row in rows for cell in row)
+    map_level = U5MapLevel(raw, Size[int](len(rows[0]), len(rows)))
+    registry.maps.register(LOC, U5Map({LVL: map_level}, _metadata()))
+
+    map_cache_service = MapCacheServiceImplementation()
+    map_cache_service.global_registry = registry
+    map_cache_service.init()
+
+    pathfinding_service = PathfindingService()
+    pathfinding_service.map_cache_service = map_cache_service
+    return pathfinding_service, map_cache_service, map_level
+
+
+def test_distance_field_counts_steps_around_walls():
+    field = build_distance_field(_grid(MAZE), Coord[int](2, 2))
+    assert field.get_distance(Coord[int](2, 2)) == 0
+    assert field.get_distance(Coord[int](2, 3)) == 1
+    assert field.get_distance(Coord[int](2, 4)) == 2
+    # round the outside of the box.
+    assert field.get_distance(Coord[int](3, 0)) == 11
+    assert field.get_distance(Coord[int](1, 1)) is None
+    assert field.get_distance(Coord[int](-1, 0)) is None
+
+
+def test_bounded_field_agrees_with_unbounded_field_within_range():
+    passable = _grid(MAZE)
+    target = Coord[int](0, 0)
+    unbounded = build_distance_field(passable, target)
+    bounded = build_distance_field(passable, target, max_distance = 4)
+    for coord in Size[int](6, 5):
+        distance = unbounded.get_distance(coord)
+        expected = distance if distance is not None and distance <= 4 else None
+        assert bounded.get_distance(coord) == expected
+
+
+def test_wrapped_field_crosses_the_edges():
+    passable = np.ones((8, 8), dtype = np.bool_)
+    field = build_distance_field(passable, Coord[int](0, 0), max_distance = 3, wrap = True)
+    assert field.get_distance(Coord[int](7, 0)) == 1
+    assert field.get_distance(Coord[int](-1, -1)) == 2
+    assert field.get_steps_towards(Coord[int](7, 1)) == [Coord[int](7, 0), Coord[int](8, 1)]
+
+
+def test_steps_prefer_the_axis_with_further_to_go():
+    passable = np.ones((10, 10), dtype = np.bool_)
+    field = build_distance_field(passable, Coord[int](8, 4))
+    assert field.get_steps_towards(Coord[int](2, 2)) == [Coord[int](3, 2), Coord[int](2, 3)]
+
+
+def test_find_path_is_as_short_as_the_distance_field():
+    passable = _grid(MAZE)
+    start, goal = Coord[int](3, 0), Coord[int](2, 2)
+    path = find_path(passable, start, goal)
+    assert path[-1] == goal
+    assert len(path) == build_distance_field(passable, goal).get_distance(start)
+    assert all(a.taxi_distance(b) == 1 for a, b in zip([start] + path, path))
+
+
+def test_find_path_avoids_forbidden_coords_but_may_end_on_one():
+    passable = _grid(MAZE)
+    start, goal = Coord[int](0, 4), Coord[int](5, 4)
+
+    # someone standing in the bottom corridor: go round the top instead.
+    path = find_path(passable, start, goal, forbidden_coords = {Coord[int](3, 4), goal})
+    assert Coord[int](3, 4) not in path
+    assert path[-1] == goal
+
+    # boxed in altogether.
+    assert find_path(passable, start, goal, forbidden_coords = {Coord[int](0, 3), Coord[int](1, 4)}) is None
+
+
+def test_find_path_gives_up_after_max_nodes():
+    passable = _grid(MAZE)
+    assert find_path(passable, Coord[int](3, 0), Coord[int](2, 2), max_nodes = 3) is None
+
+
+def test_service_shares_distance_fields_between_movers():
+    pathfinding_service, _, _ = _build(MAZE)
+    target = Coord[int](2, 2)
+    for start in (Coord[int](0, 0), Coord[int](5, 0), Coord[int](5, 4)):
+        assert any(pathfinding_service.get_steps_towards(LOC, LVL, start, target))
+    assert pathfinding_service.distance_fields_built  == 1
+    assert pathfinding_service.distance_fields_reused == 2
+
+
+def test_tile_changes_invalidate_distance_fields():
+    # e.g. a door opening in the box's wall.
+    pathfinding_service, map_cache_service, map_level = _build(MAZE)
+    target = Coord[int](2, 2)
+    assert pathfinding_service.get_distance_field(LOC, LVL, target).get_distance(Coord[int](2, 0)) == 10
+
+    door = Coord[int](2, 1)
+    map_level.set_tile_id(door, TILE_GRASS)
+    map_cache_service.refresh_coord(LOC, LVL, door)
+
+    assert pathfinding_service.get_distance_field(LOC, LVL, target).get_distance(Coord[int](2, 0)) == 2
+    assert pathfinding_service.distance_fields_built == 2
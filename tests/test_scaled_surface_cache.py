@@ -0,0 +1,105 @@
+import pygame
+
+from dark_libraries.dark_math import Coord, Size
+from data.global_registry import GlobalRegistry
+from models.enums.ega_palette_values import EgaPaletteValues
+from models.u5_glyph import U5Glyph
+from service_implementations.surface_factory_implementation import SurfaceFactoryImplementation
+from view.display_config import DisplayConfig
+from view.scalable_component import ScalableComponent
+from view.scaled_surface_cache import ScaledSurfaceCache
+
+
+def _cache() -> ScaledSurfaceCache:
+    cache = ScaledSurfaceCache()
+    cache.display_config = DisplayConfig()
+    cache.global_registry = GlobalRegistry()
+    return cache
+
+
+def _glyph(seed: int) -> U5Glyph:
+    surface = pygame.Surface((8, 8))
+    for y in range(8):
+        for x in range(8):
+            surface.set_at((x, y), (255, 255, 255) if (x * seed + y) % 3 == 0 else (0, 0, 0))
+    return U5Glyph(surface)
+
+
+def _component(size: Size[int]) -> ScalableComponent:
+    registry = GlobalRegistry()
+    registry.colors.register(EgaPaletteValues.Black, 0)
+
+    component = ScalableComponent(size, DisplayConfig.SCALE_FACTOR)
+    component.global_registry = registry
+    component.surface_factory = SurfaceFactoryImplementation()
+    component.scaled_surface_cache = _cache()
+    component._after_inject()
+    return component
+
+
+def test_surfaces_are_scaled_once():
+    cache = _cache()
+    surface = pygame.Surface((8, 8))
+    scaled = cache.get_scaled_surface(surface)
+    assert scaled.get_size() == (8 * DisplayConfig.SCALE_FACTOR, 8 * DisplayConfig.SCALE_FACTOR)
+    assert cache.get_scaled_surface(surface) is scaled
+    assert len(cache) == 1
+
+
+def test_colorkey_survives_scaling():
+    surface = pygame.Surface((8, 8))
+    surface.set_colorkey((0, 0, 0))
+    assert _cache().get_scaled_surface(surface).get_colorkey()[:3] == (0, 0, 0)
+
+
+def test_drawing_matches_scaling_the_whole_surface():
+    size = Size[int](32, 16)
+    glyphs = [_glyph(seed) for seed in range(1, 6)]
+    char_coords = [Coord[int](0, 0), Coord[int](3, 0), Coord[int](1, 1), Coord[int](2, 1), Coord[int](3, 1)]
+
+    # the old way: draw unscaled, then scale everything.
+    unscaled = pygame.Surface(size.to_tuple())
+    unscaled.fill((0, 0, 0))
+    for glyph, char_coord in zip(glyphs, char_coords):
+        glyph.blit_at_char_coord(char_coord, unscaled)
+    expected = pygame.transform.scale_by(unscaled, DisplayConfig.SCALE_FACTOR)
+
+    component = _component(size)
+    component._clear()
+    for glyph, char_coord in zip(glyphs, char_coords):
+        component.blit_at_char_coord(glyph, char_coord)
+    actual = component.get_output_surface()
+
+    assert pygame.image.tobytes(actual, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+
+def test_scroll_is_in_unscaled_pixels():
+    component = _component(Size[int](16, 16))
+    component._clear()
+    component.blit_at_char_coord(_glyph(1), Coord[int](0, 1))
+
+    component.scroll_dy(-8)
+    scaled_glyph = component.scaled_surface_cache.get_scaled_surface(_glyph(1).get_surface())
+    top_row = component.get_output_surface().subsurface((0, 0, scaled_glyph.get_width(), scaled_glyph.get_height()))
+    assert pygame.image.tobytes(top_row, "RGB") == pygame.image.tobytes(scaled_glyph, "RGB")
+
+
+def test_batched_blits_wait_for_the_end_of_the_batch():
+    component = _component(Size[int](16, 16))
+    component._clear()
+    glyph = _glyph(1)
+
+    with component.batched_blits():
+        component.blit_at_char_coord(glyph, Coord[int](0, 0))
+        assert component._scaled_surface.get_at((0, 0))[:3] == (0, 0, 0)
+    assert component._scaled_surface.get_at((0, 0))[:3] == (255, 255, 255)
+
+
+def test_fills_inside_a_batch_keep_drawing_order():
+    component = _component(Size[int](16, 16))
+    glyph = _glyph(1)
+
+    with component.batched_blits():
+        component.blit_at_char_coord(glyph, Coord[int](0, 0))
+        component.fill_unscaled((0, 0, 255))
+    assert component.get_output_surface().get_at((0, 0))[:3] == (0, 0, 255)
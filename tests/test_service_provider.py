@@ -131,3 +131,93 @@ def test_register_mapping_injects_inherited_properties(provider):
     provider.register_mapping(SuperclassProperties, SubclassProperties)
     provider.inject_all()
     assert provider.resolve(SuperclassProperties).demo1 is demo
+
+
+class Counted:
+    built = 0
+
+    def __init__(self):
+        Counted.built += 1
+
+
+class NeedsCounted:
+    counted: Counted
+    seen_in_after_inject: Counted = None
+
+    def _after_inject(self):
+        # everything built alongside this one is already injected.
+        self.seen_in_after_inject = self.counted
+
+
+class Lazy_A:
+    lazy_b: "Lazy_B"
+
+
+class Lazy_B:
+    lazy_a: "Lazy_A"
+    after_inject_saw_a_injected: bool = False
+
+    def _after_inject(self):
+        self.after_inject_saw_a_injected = self.lazy_a.lazy_b is self
+
+
+@pytest.fixture
+def lazy_provider():
+    ServiceProvider._instance = None
+    p = ServiceProvider(lazy = True)
+    yield p
+    ServiceProvider._instance = None
+
+
+def test_lazy_services_are_built_on_first_resolve(lazy_provider):
+    Counted.built = 0
+    lazy_provider.register(Counted)
+    lazy_provider.register(NeedsCounted)
+    lazy_provider.inject_all()
+    assert Counted.built == 0
+
+    needs = lazy_provider.resolve(NeedsCounted)
+    assert Counted.built == 1
+    assert needs.counted is lazy_provider.resolve(Counted)
+    assert needs.seen_in_after_inject is needs.counted
+
+
+def test_lazy_services_nobody_resolves_are_never_built(lazy_provider):
+    Counted.built = 0
+    lazy_provider.register(Counted)
+    lazy_provider.register(Demo1)
+    lazy_provider.inject_all()
+    lazy_provider.resolve(Demo1)
+    assert Counted.built == 0
+
+
+def test_lazy_circular_injection(lazy_provider):
+    lazy_provider.register(Lazy_A)
+    lazy_provider.register(Lazy_B)
+    lazy_provider.inject_all()
+    b = lazy_provider.resolve(Lazy_B)
+    assert b.lazy_a.lazy_b is b
+    assert b.after_inject_saw_a_injected
+
+
+def test_lazy_mapping_resolves_to_concrete_subtype(lazy_provider):
+    lazy_provider.register_mapping(SuperclassProperties, SubclassProperties)
+    lazy_provider.register(Demo1)
+    lazy_provider.inject_all()
+    resolved = lazy_provider.resolve(SuperclassProperties)
+    assert type(resolved) is SubclassProperties
+    assert resolved.demo1 is lazy_provider.resolve(Demo1)
+
+
+def test_injection_plans_are_shared_between_providers(provider):
+    provider.register(Demo2)
+    provider.inject_all()
+    plan = ServiceProvider._injection_plans[Demo2]
+
+    ServiceProvider._instance = None
+    second = ServiceProvider()
+    second.register(Demo1)
+    second.register(Demo2)
+    second.inject_all()
+    assert ServiceProvider._injection_plans[Demo2] is plan
+    assert second.resolve(Demo2).demo1 is second.resolve(Demo1)
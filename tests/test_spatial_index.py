@@ -0,0 +1,48 @@
+from dark_libraries.dark_math import Coord, Rect
+from dark_libraries.spatial_index import SpatialIndex
+
+
+def test_lookups_follow_moves():
+    index = SpatialIndex[str]()
+    index.add(Coord[int](1, 1), "orc")
+    index.move("orc", Coord[int](1, 1), Coord[int](1, 2))
+
+    assert index.get(Coord[int](1, 1)) is None
+    assert index.get(Coord[int](1, 2)) == "orc"
+    assert Coord[int](1, 2) in index
+    assert len(index) == 1
+
+
+def test_shared_coords_keep_everyone():
+    index = SpatialIndex[str]()
+    index.add(Coord[int](3, 3), "rat")
+    index.add(Coord[int](3, 3), "bat")
+    assert index.get(Coord[int](3, 3)) == "bat"
+
+    index.move("bat", Coord[int](3, 3), Coord[int](4, 3))
+    assert index.get(Coord[int](3, 3)) == "rat"
+    assert index.get(Coord[int](4, 3)) == "bat"
+
+
+def test_items_that_are_not_indexed_are_left_alone():
+    index = SpatialIndex[str]()
+    index.add(Coord[int](0, 0), "orc")
+    index.move("clone", Coord[int](0, 0), Coord[int](5, 5))
+    assert index.get(Coord[int](0, 0)) == "orc"
+    assert Coord[int](5, 5) not in index
+    assert not index.remove(Coord[int](0, 0), "clone")
+
+    # nowhere isn't indexed.
+    index.move("orc", Coord[int](0, 0), None)
+    assert len(index) == 0
+    assert list(index.coords()) == []
+
+
+def test_rect_queries_only_return_whats_inside():
+    index = SpatialIndex[int]()
+    for n, coord in enumerate([(-1, -1), (0, 0), (15, 15), (16, 16), (40, 2), (18, 20)]):
+        index.add(Coord[int](*coord), n)
+
+    found = dict(index.items_in_rect(Rect[int](Coord[int](0, 0), (19, 19))))
+    assert found == {Coord[int](0, 0): 1, Coord[int](15, 15): 2, Coord[int](16, 16): 3}
+    assert dict(index.items_in_rect(Rect[int](Coord[int](-5, -5), (5, 5)))) == {Coord[int](-1, -1): 0}
@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from models.sprite import Sprite
+from services.map_cache.map_level_contents import MapLevelContents
+
+
+# The linear scan that Sprite used before it bisected, as the reference.
+def _reference_frame_index(sprite: Sprite, seconds: float, time_offset_seconds: float) -> int:
+    seconds_since_last_cycle_start = (seconds + time_offset_seconds) % sprite.frame_cycle_duration
+    for frame_index, (frame_start, frame_stop) in enumerate(sprite.frame_duration_ranges):
+        if frame_start <= seconds_since_last_cycle_start < frame_stop:
+            return frame_index % len(sprite.frames)
+    return frame_index % len(sprite.frames)
+
+
+def _randomized_sprite(seed: int) -> Sprite[str]:
+    random.seed(seed)
+    sprite = Sprite[str](["a", "b", "c", "d"])
+    sprite.set_randomized_frame_durations()
+    return sprite
+
+
+def test_uniform_frames_step_at_each_boundary():
+    sprite = Sprite[str](["a", "b", "c"], frame_duration_seconds = 0.5)
+    assert [sprite.get_frame_at(seconds, 0.0) for seconds in (0.0, 0.49, 0.5, 1.0, 1.49, 1.5)] == ["a", "a", "b", "c", "c", "a"]
+    assert sprite.get_frame_at(0.0, 0.5) == "b"
+
+
+def test_randomized_frames_match_the_linear_scan():
+    rng = random.Random(3)
+    for seed in range(5):
+        sprite = _randomized_sprite(seed)
+        assert len(sprite.frame_duration_ranges) == 4 * 18
+        for _ in range(500):
+            seconds, offset = rng.uniform(0, 100), rng.uniform(0, sprite.frame_cycle_duration)
+            expected = sprite.frames[_reference_frame_index(sprite, seconds, offset)]
+            assert sprite.get_frame_at(seconds, offset) == expected
+
+
+def test_exact_range_stops_match_the_linear_scan():
+    sprite = _randomized_sprite(7)
+    for _, frame_stop in sprite.frame_duration_ranges:
+        expected = sprite.frames[_reference_frame_index(sprite, frame_stop, 0.0)]
+        assert sprite.get_frame_at(frame_stop, 0.0) == expected
+
+
+def test_map_level_contents_resolves_a_view_in_one_batch():
+    animated = Sprite[str](["anim 0", "anim 1"], frame_duration_seconds = 1.0)
+    tile_ids = np.array([[0, 1], [1, 0]], dtype=np.uint8)
+    offsets = np.array([[0.0, 0.0], [1.0, 0.0]])
+    contents = MapLevelContents(
+        tile_ids            = tile_ids,
+        tiles               = ["plain", None],
+        terrains            = [None, None],
+        sprites             = [None, animated],
+        sprite_time_offsets = offsets
+    )
+    coords = [(0, 0), (1, 0), (0, 1), (1, 1), (5, 5)]
+    assert contents.get_renderable_frames(coords, 0.25) == ["plain", "anim 0", "anim 1", "plain", None]
@@ -0,0 +1,77 @@
+import struct
+
+import pygame
+import pytest
+
+from dark_libraries.dark_lzw import lzw_decompress
+from data.synthetic_u5_data import (
+    DAT_FILES, NPC_FILES, NUM_COMBAT_MAPS, NUM_DUNGEON_ROOMS, NUM_LOCATIONS, NUM_TILES, SYNTHETIC_U5_FILES,
+    SyntheticU5Data, write_synthetic_u5_data
+)
+
+
+@pytest.fixture(scope = "module")
+def u5_dir(tmp_path_factory):
+    return write_synthetic_u5_data(tmp_path_factory.mktemp("u5"), seed = 0)
+
+
+@pytest.fixture(scope = "module")
+def cache_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("caches")
+
+
+@pytest.fixture
+def game(u5_dir, cache_root):
+    from benchmarks.harness import boot_game
+    yield boot_game(u5_dir, cache_root = cache_root)
+    # the dummy video driver can't make a second renderer for the next boot otherwise.
+    pygame.quit()
+
+
+def test_writes_every_file(u5_dir):
+    assert sorted(path.name for path in u5_dir.iterdir()) == sorted(SYNTHETIC_U5_FILES)
+
+
+def test_files_are_sized_like_the_originals(u5_dir):
+    assert (u5_dir / "UNDER.DAT").stat().st_size == 256 * 256
+    assert (u5_dir / "IBM.CH").stat().st_size == 256 * 8
+    for dat_file in DAT_FILES:
+        assert (u5_dir / dat_file).stat().st_size % (32 * 32) == 0
+    for npc_file in NPC_FILES:
+        assert (u5_dir / npc_file).stat().st_size == 8 * 576
+
+
+def test_tiles_decompress(u5_dir):
+    raw = (u5_dir / "TILES.16").read_bytes()
+    (length,) = struct.unpack_from("<I", raw)
+    assert length == NUM_TILES * 16 * 16 // 2
+    assert len(lzw_decompress(raw[4:], length)) == length
+
+
+def test_same_seed_same_files():
+    assert SyntheticU5Data(7).build_brit_dat() == SyntheticU5Data(7).build_brit_dat()
+    assert SyntheticU5Data(7).build_saved_gam() == SyntheticU5Data(7).build_saved_gam()
+    assert SyntheticU5Data(7).build_brit_dat() != SyntheticU5Data(8).build_brit_dat()
+
+
+def test_loaders_fill_the_registries(game):
+    from data.global_registry import GlobalRegistry
+    registry = game.provider.resolve(GlobalRegistry)
+
+    assert len(registry.tiles)         == NUM_TILES
+    assert len(registry.combat_maps)   == NUM_COMBAT_MAPS
+    assert len(registry.dungeon_rooms) == NUM_DUNGEON_ROOMS
+    assert len(registry.npc_sections)  == NUM_LOCATIONS
+    assert len(registry.npc_dialogs)   == NUM_LOCATIONS
+    assert "BRITAIN" in {u5_map.name.upper() for u5_map in registry.maps.values()}
+
+
+def test_town_walk(game):
+    from benchmarks.scenarios import town_walk
+    town_walk(game.scripted)
+    game.run()
+
+    # still in town, with the townsfolk about.
+    assert game.party_agent.get_current_location().location_index != 0
+    assert len(game.party_controller.npc_service.get_npcs()) > 1
+    assert game.turn_timer.summary()["count"] > 40
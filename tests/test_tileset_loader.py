@@ -0,0 +1,87 @@
+import random
+
+import pygame
+import pytest
+
+from data.global_registry import GlobalRegistry
+from data.loaders.color_loader import ColorLoader
+from data.loaders.tileset_loader import TileLoader
+from models.enums.ega_palette_values import EgaPaletteValues
+from service_implementations.surface_factory_implementation import SurfaceFactoryImplementation
+from view.display_config import DisplayConfig
+
+
+TILE_BYTES = 16 * 8
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    # Tile.set_surface converts surfaces, which needs a display mode.
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def _raw_tileset(seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    return bytes(rng.randrange(256) for _ in range(TileLoader.TOTAL_TILES * TILE_BYTES))
+
+
+def _loader() -> TileLoader:
+    registry = GlobalRegistry()
+    surface_factory = SurfaceFactoryImplementation()
+
+    color_loader = ColorLoader()
+    color_loader.global_registry = registry
+    color_loader.surface_factory = surface_factory
+    color_loader.load()
+
+    loader = TileLoader()
+    loader.display_config = DisplayConfig()
+    loader.global_registry = registry
+    loader.surface_factory = surface_factory
+    return loader
+
+
+# The original per-pixel decoder, kept as an oracle.
+def _reference_pixels(tile_id: int, data: bytes) -> list[list[int]]:
+    pixels = []
+    base_offset = tile_id * TILE_BYTES
+    for y in range(16):
+        row = data[base_offset + y * 8 : base_offset + (y + 1) * 8]
+        pixels.append([(row[x // 2] >> (4 if x % 2 == 0 else 0)) & 0x0F for x in range(16)])
+    return pixels
+
+
+def test_decoded_indexes_match_reference():
+    data = _raw_tileset()
+    indexes = _loader().decode_tile_indexes(data)
+    assert indexes.shape == (TileLoader.TOTAL_TILES, 16, 16)
+    for tile_id in (0, 1, 255, 511):
+        assert indexes[tile_id].tolist() == _reference_pixels(tile_id, data)
+
+
+def test_surfaces_use_the_ega_palette():
+    data = _raw_tileset(1)
+    loader = _loader()
+    loader.register_tiles(data)
+
+    for tile_id in (0, 7, 300, 511):
+        tile = loader.global_registry.tiles.get(tile_id)
+        pixels = _reference_pixels(tile_id, data)
+        for y in range(16):
+            for x in range(16):
+                assert tuple(tile.get_surface().get_at((x, y)))[:3] == EgaPaletteValues.from_index(pixels[y][x]).value
+
+
+def test_tile_pixels_view_is_kept_and_read_only():
+    data = _raw_tileset(2)
+    loader = _loader()
+    loader.register_tiles(data)
+
+    tile = loader.global_registry.tiles.get(42)
+    assert tile.pixels[3][5] == _reference_pixels(42, data)[3][5]
+    assert tile._get_size() == (16, 16)
+    with pytest.raises(ValueError):
+        tile.pixels[0][0] = 1
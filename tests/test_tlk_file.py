@@ -14,29 +14,6 @@ from models.tlk_file import (
 )
 
 
-TLK_FILES = ("TOWNE.TLK", "CASTLE.TLK", "KEEP.TLK", "DWELLING.TLK")
-
-
-def _find_u5_dir() -> Path | None:
-    try:
-        from configure import get_u5_path
-        return get_u5_path()
-    except AssertionError:
-        pass
-    repo_local = Path(__file__).resolve().parents[1] / "u5"
-    if all((repo_local / name).exists() for name in TLK_FILES):
-        return repo_local
-    return None
-
-
-@pytest.fixture(scope="module")
-def u5_dir() -> Path:
-    path = _find_u5_dir()
-    if path is None:
-        pytest.skip("U5 game files not found")
-    return path
-
-
 @pytest.fixture(scope="module")
 def compressed_words(u5_dir: Path) -> CompressedWords:
     return CompressedWords(DataOVL(u5_dir).compressed_words)
@@ -83,7 +60,7 @@ def test_name_lines_decode_to_readable_ascii(towne_tlk: TlkFile):
         assert all(ch.isprintable() for ch in name), repr(name)
 
 
-def test_castle_tlk_decodes_known_names(castle_tlk: TlkFile):
+def test_castle_tlk_decodes_known_names(original_u5_dir: Path, castle_tlk: TlkFile):
     # Spot-check a handful of canonical Castle Britannia NPC names — these
     # exercise both plain-character decoding and compressed-word expansion
     # (e.g. "alistair the bard" relies on the 'the' compressed word).
@@ -181,7 +158,7 @@ def test_change_operand_unknown_returns_none():
     assert change_operand_kind(0x40) is None
 
 
-def test_jeremy_yew_locksmith_gives_five_keys(towne_tlk: TlkFile):
+def test_jeremy_yew_locksmith_gives_five_keys(original_u5_dir: Path, towne_tlk: TlkFile):
     # Jeremy in Yew (TOWNE.TLK npc#20) hands over keys via 5x CHANGE op=0x43.
     # This is empirical confirmation that operand 0x43 corresponds to KEYS.
     jeremy = next(
@@ -199,7 +176,7 @@ def test_jeremy_yew_locksmith_gives_five_keys(towne_tlk: TlkFile):
     assert found_5_keys, "Jeremy should hand over 5 keys via CHANGE op=0x43"
 
 
-def test_thrud_resistance_gives_crossbow_and_jewelled_shield(keep_tlk: TlkFile):
+def test_thrud_resistance_gives_crossbow_and_jewelled_shield(original_u5_dir: Path, keep_tlk: TlkFile):
     # Thrud in KEEP.TLK npc#8 is the resistance weapons supplier; he gives
     # the Avatar a crossbow and a jewelled shield after the password "dawn".
     # Empirical anchor for the items-array branch (operand < 0x40).
@@ -216,7 +193,7 @@ def test_thrud_resistance_gives_crossbow_and_jewelled_shield(keep_tlk: TlkFile):
     assert int(ChangeItemCode.JEWELLED_SHIELD) in operands
 
 
-def test_gold_opcode_consumes_three_digit_price(towne_tlk: TlkFile):
+def test_gold_opcode_consumes_three_digit_price(original_u5_dir: Path, towne_tlk: TlkFile):
     # Justin's L2 'y' branch (Britain, npc#7) is "...pay 3 gold coins...". The
     # parser should pack the 3-digit price into the GOLD ScriptItem's operand
     # and strip those digits from the trailing PLAIN_STRING text.
@@ -234,7 +211,7 @@ def test_gold_opcode_consumes_three_digit_price(towne_tlk: TlkFile):
     assert next_text.text.startswith("I thank thee"), next_text.text
 
 
-def test_jeremy_donation_branch_charges_thirty_gold(towne_tlk: TlkFile):
+def test_jeremy_donation_branch_charges_thirty_gold(original_u5_dir: Path, towne_tlk: TlkFile):
     # Jeremy's L0 'y' branch is the "donate to my keep-fund" path — charges 30
     # gold rather than 003. Sanity check that prices >= 100 also parse
     # (Kristi's 100-gold skull-key sale is in KEEP.TLK so we use Jeremy here).
@@ -247,7 +224,7 @@ def test_jeremy_donation_branch_charges_thirty_gold(towne_tlk: TlkFile):
     assert gold_item.operand == 30, gold_item
 
 
-def test_geoffrey_join_label_y_branch_emits_join_party(castle_tlk: TlkFile):
+def test_geoffrey_join_label_y_branch_emits_join_party(original_u5_dir: Path, castle_tlk: TlkFile):
     # Geoffrey's "join" keyword is a bare goto to label 3; that label's 'y'
     # branch ends in JOIN_PARTY (0x84). Pins the data shape the renderer
     # relies on: bare opcode, no operand, after some narration.
@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Iterable
 
+import numpy as np
+
 from dark_libraries.dark_math import Coord, Size
 from data.global_registry import GlobalRegistry
 from models.agents.town_npc_agent import TownNpcAgent
@@ -8,6 +10,8 @@ from models.enums.transport_mode import TransportMode
 from models.global_location import GlobalLocation
 from models.npc_file import NpcMapSection, NpcSchedule
 
+from services.pathfinding.pathfinding_service import PathfindingService
+from services.town_npc_schedule_simulator import TownNpcScheduleSimulator
 from services.town_npc_scheduler import TownNpcScheduler
 from services.town_npc_spawner   import TownNpcSpawner
 
@@ -52,19 +56,29 @@ class _FakeNpcService:
 
 
 class _FakeMapCacheService:
-    def __init__(self, blocked: set[Coord[int]] | None = None):
+    def __init__(self, map_size: Size[int], blocked: set[Coord[int]] | None = None):
         self._blocked = blocked or set()
+        self._passable = np.ones((map_size.h, map_size.w), dtype=np.bool_)
+        for coord in self._blocked:
+            self._passable[coord.y, coord.x] = False
 
     def get_blocked_coords(self, _location_index, _level_index, transport_mode: TransportMode):
         return set(self._blocked)
 
+    def get_passability_grid(self, _location_index, _level_index, transport_mode: TransportMode):
+        return self._passable
+
+    def get_passability_revision(self, _location_index, _level_index):
+        return 0
+
 
 class _FakeWorldClock:
     def __init__(self, hour: int):
         self._hour = hour
+        self._minute = 0
 
     def get_natural_time(self) -> datetime:
-        return datetime(year=139, month=4, day=4, hour=self._hour, minute=0)
+        return datetime(year=139, month=4, day=4, hour=self._hour, minute=self._minute)
 
 
 def _empty_schedule() -> NpcSchedule:
@@ -125,15 +139,27 @@ def _build_world(
     npc_service = _FakeNpcService()
     world_clock = _FakeWorldClock(hour)
 
+    map_cache_service = _FakeMapCacheService(map_size, blocked=blocked)
+
+    pathfinding_service = PathfindingService()
+    pathfinding_service.map_cache_service = map_cache_service
+
+    simulator = TownNpcScheduleSimulator()
+    simulator.global_registry     = registry
+    simulator.map_cache_service   = map_cache_service
+    simulator.pathfinding_service = pathfinding_service
+
     spawner = TownNpcSpawner()
     spawner.global_registry = registry
     spawner.npc_service     = npc_service
     spawner.world_clock     = world_clock
+    spawner.town_npc_schedule_simulator = simulator
 
     scheduler = TownNpcScheduler()
-    scheduler.global_registry   = registry
-    scheduler.map_cache_service = _FakeMapCacheService(blocked=blocked)
-    scheduler.npc_service       = npc_service
+    scheduler.global_registry     = registry
+    scheduler.map_cache_service   = map_cache_service
+    scheduler.pathfinding_service = pathfinding_service
+    scheduler.npc_service         = npc_service
     scheduler.town_npc_spawner  = spawner
     scheduler.world_clock       = world_clock
 
@@ -265,8 +291,8 @@ def test_npc_can_step_onto_non_walkable_target_tile():
 
 
 def test_npc_routes_around_obstacle_via_perpendicular_axis():
-    # NPC at (5,5), target (5,10). Direct path is blocked at (5,6); going
-    # around via the x-axis must be tried before any random fallback.
+    # NPC at (5,5), target (5,10). Direct path is blocked at (5,6), so the
+    # NPC has to sidestep around it.
     schedule = _schedule(
         coords=((5, 5), (5, 10), (5, 5)),
         times=(8, 12, 18, 22),
@@ -284,21 +310,45 @@ def test_npc_routes_around_obstacle_via_perpendicular_axis():
     world_clock._hour = 12
     scheduler.pass_time(party_location)
 
-    # y_step (5,6) is blocked → must take x_step (4,5) or (6,5). dx=0 so
-    # x_step is None; the only candidate is the blocked y_step → no move.
-    # That's the case this test confirms: no random wandering.
-    assert npc.coord == Coord[int](5, 5)
+    assert npc.coord in {Coord[int](4, 5), Coord[int](6, 5)}
+
+
+def test_npc_walks_around_a_wall_without_teleporting():
+    # A wall across the direct route (x=2..8 at y=7): greedy stepping would
+    # walk into it and stall until the teleport kicks in.
+    schedule = _schedule(
+        coords=((5, 5), (5, 10), (5, 5)),
+        times=(8, 12, 18, 22),
+    )
+    section = _section_with_schedule(1, schedule)
+    blocked = {Coord[int](x, 7) for x in range(2, 9)}
+
+    spawner, scheduler, _, world_clock, party_location = _build_world(
+        section=section, hour=10, party_level=0,
+        blocked=blocked,
+    )
+    npc = spawner.get_spawned()[1]
+
+    world_clock._hour = 12
+    for _ in range(20):
+        previous = npc.coord
+        scheduler.pass_time(party_location)
+        assert previous.taxi_distance(npc.coord) <= 1
+        assert npc.coord not in blocked
+
+    assert npc.coord == Coord[int](5, 10)
 
 
 def test_npc_teleports_after_being_stuck_for_threshold_ticks():
-    # Same setup as above (no perpendicular escape); after 8 stuck ticks the
-    # NPC should give up and teleport to the target.
+    # With no way through to the target, after 8 stuck ticks the NPC should
+    # give up and teleport to it.
     schedule = _schedule(
         coords=((5, 5), (5, 10), (5, 5)),
         times=(8, 12, 18, 22),
     )
     section = _section_with_schedule(1, schedule)
-    blocked = {Coord[int](5, 6), Coord[int](5, 7), Coord[int](5, 8), Coord[int](5, 9)}
+    # The target is walled in on every side, so there's no way through.
+    blocked = {Coord[int](5, 6), Coord[int](5, 7), Coord[int](5, 8), Coord[int](5, 9), Coord[int](4, 10), Coord[int](6, 10), Coord[int](5, 11)}
 
     spawner, scheduler, _, world_clock, party_location = _build_world(
         section=section, hour=10, party_level=0,
@@ -313,14 +363,15 @@ def test_npc_teleports_after_being_stuck_for_threshold_ticks():
 
 
 def test_npc_does_not_wander_to_random_neighbour_when_blocked():
-    # Confirm the new pather never picks a random direction. With the only
-    # axis blocked, NPC must stay put rather than jitter sideways.
+    # Confirm the pather never picks a random direction. With no way
+    # through, NPC must stay put rather than jitter sideways.
     schedule = _schedule(
         coords=((5, 5), (5, 10), (5, 5)),
         times=(8, 12, 18, 22),
     )
     section = _section_with_schedule(1, schedule)
-    blocked = {Coord[int](5, 6)}
+    # The target is walled in on every side, so there's no way through.
+    blocked = {Coord[int](5, 6), Coord[int](5, 7), Coord[int](5, 8), Coord[int](5, 9), Coord[int](4, 10), Coord[int](6, 10), Coord[int](5, 11)}
 
     spawner, scheduler, _, world_clock, party_location = _build_world(
         section=section, hour=10, party_level=0,
@@ -354,3 +405,137 @@ def test_walk_axis_priority_uses_longer_distance_first():
     scheduler.pass_time(party_location)
 
     assert npc.coord == Coord[int](6, 5)
+
+
+def test_spawns_part_way_along_the_walk_to_the_next_spot():
+    # At 12:00 the NPC sets off from (5,5) for (5,15), a tile a minute.
+    schedule = _schedule(
+        coords=((5, 5), (5, 15), (5, 5)),
+        times=(8, 12, 18, 22),
+    )
+    section = _section_with_schedule(1, schedule)
+
+    spawner, _, _, world_clock, party_location = _build_world(
+        section=section, hour=12, party_level=0,
+    )
+    assert spawner.get_spawned()[1].coord == Coord[int](5, 5)
+
+    world_clock._minute = 4
+    spawner.respawn(party_location)
+    assert spawner.get_spawned()[1].coord == Coord[int](5, 9)
+
+    world_clock._hour, world_clock._minute = 13, 0
+    spawner.respawn(party_location)
+    assert spawner.get_spawned()[1].coord == Coord[int](5, 15)
+
+
+def test_placement_follows_the_path_around_walls():
+    schedule = _schedule(
+        coords=((5, 5), (5, 10), (5, 5)),
+        times=(8, 12, 18, 22),
+    )
+    section = _section_with_schedule(1, schedule)
+    blocked = {Coord[int](x, 7) for x in range(2, 9)}
+
+    spawner, _, _, world_clock, _ = _build_world(
+        section=section, hour=12, party_level=0, blocked=blocked,
+    )
+    simulator = spawner.town_npc_schedule_simulator
+
+    # a tile a minute, round the end of the wall rather than through it.
+    previous = Coord[int](5, 5)
+    for minute in range(1, 60):
+        world_clock._minute = minute
+        placement = simulator.get_placement(LOCATION_INDEX, schedule, world_clock.get_natural_time())
+        assert placement.coord not in blocked
+        assert placement.coord.taxi_distance(previous) <= 1
+        previous = placement.coord
+        if placement.arrived:
+            break
+    assert previous == Coord[int](5, 10)
+    assert minute > 5
+
+
+def test_slot_history_looks_back_to_the_last_change():
+    schedule = _schedule(
+        coords=((5, 5), (5, 8), (9, 9)),
+        times=(8, 12, 18, 22),
+    )
+    at = lambda hour, minute: datetime(year=139, month=4, day=4, hour=hour, minute=minute)
+    assert TownNpcScheduleSimulator.get_slot_history(schedule, at(12, 30)) == (1, 0, 30)
+    assert TownNpcScheduleSimulator.get_slot_history(schedule, at(14, 5))  == (1, 0, 125)
+    # past midnight: slot 1 since 22:00.
+    assert TownNpcScheduleSimulator.get_slot_history(schedule, at(1, 0))   == (1, 2, 180)
+
+    stay_put = _schedule(coords=((5, 5), (5, 5), (5, 5)), times=(0, 0, 0, 0))
+    assert TownNpcScheduleSimulator.get_slot_history(stay_put, at(3, 0))[2] is None
+
+
+def test_changing_floors_spawns_the_new_floors_npcs():
+    schedule = _schedule(
+        coords=((5, 5), (5, 5), (5, 5)),
+        z=(1, 1, 1),
+    )
+    section = _section_with_schedule(1, schedule)
+
+    spawner, _, npc_service, _, party_location = _build_world(
+        section=section, hour=11, party_level=0,
+    )
+    assert spawner.get_spawned() == {}
+
+    upstairs = GlobalLocation(LOCATION_INDEX, 1, Coord[int](0, 0))
+    spawner.level_changed(upstairs)
+    assert spawner.get_spawned()[1].coord == Coord[int](5, 5)
+
+    spawner.level_changed(party_location)
+    assert spawner.get_spawned() == {}
+    assert npc_service.get_npcs() == {}
+
+
+def test_time_jumps_place_npcs_where_their_schedule_has_them():
+    schedule = _schedule(
+        coords=((5, 5), (5, 15), (5, 5)),
+        times=(8, 12, 18, 22),
+    )
+    section = _section_with_schedule(1, schedule)
+
+    spawner, scheduler, _, world_clock, party_location = _build_world(
+        section=section, hour=11, party_level=0,
+    )
+    scheduler.pass_time(party_location)
+
+    # waited until 12:06, so six tiles along rather than one.
+    world_clock._hour, world_clock._minute = 12, 6
+    scheduler.pass_time(party_location)
+    assert spawner.get_spawned()[1].coord == Coord[int](5, 12)
+
+
+def test_reentering_a_town_is_not_a_jump_in_time():
+    schedule = _schedule(
+        coords=((5, 5), (5, 15), (5, 5)),
+        times=(8, 12, 18, 22),
+    )
+    section = _section_with_schedule(1, schedule)
+
+    spawner, scheduler, _, world_clock, party_location = _build_world(
+        section=section, hour=11, party_level=0,
+    )
+    scheduler.pass_time(party_location)
+
+    # out into the overworld for an hour, then back in.
+    overworld = GlobalLocation(0, 0, Coord[int](10, 10))
+    for listener in (spawner, scheduler):
+        listener.level_changed(overworld)
+    scheduler.pass_time(overworld)
+
+    world_clock._hour, world_clock._minute = 12, 4
+    for listener in (spawner, scheduler):
+        listener.level_changed(party_location)
+    npc = spawner.get_spawned()[1]
+    assert npc.coord == Coord[int](5, 9)
+
+    # walked on from where the spawner put them, not placed all over again.
+    world_clock._minute = 5
+    scheduler.pass_time(party_location)
+    assert spawner.get_spawned()[1] is npc
+    assert npc.coord == Coord[int](5, 10)
@@ -0,0 +1,51 @@
+import random
+
+from dark_libraries.turn_queue import TurnQueue
+
+
+class _Actor:
+    def __init__(self, name: str, points: int):
+        self.name = name
+        self.points = points
+
+
+def _queue(*actors: _Actor) -> TurnQueue[_Actor]:
+    queue = TurnQueue[_Actor](lambda actor: actor.points, random.Random(0))
+    for actor in actors:
+        queue.add(actor)
+    return queue
+
+
+def test_updates_reorder_the_queue():
+    a, b = _Actor("a", 0), _Actor("b", 1)
+    queue = _queue(a, b)
+    assert queue.peek() is a
+
+    a.points = 5
+    queue.update(a)
+    assert queue.peek() is b
+
+
+def test_removed_actors_are_skipped():
+    a, b = _Actor("a", 0), _Actor("b", 1)
+    queue = _queue(a, b)
+    queue.remove(a)
+    queue.update(a)
+    assert queue.peek() is b
+    assert len(queue) == 1 and a not in queue
+
+
+def test_keys_changed_without_an_update_are_caught_at_the_top():
+    a, b = _Actor("a", 0), _Actor("b", 1)
+    queue = _queue(a, b)
+    a.points = 5
+    assert queue.peek() is b
+
+
+def test_dead_entries_do_not_pile_up():
+    a = _Actor("a", 0)
+    queue = _queue(a)
+    for points in range(1000):
+        a.points = points
+        queue.update(a)
+    assert len(queue._heap) < 20
@@ -0,0 +1,90 @@
+import numpy as np
+
+from dark_libraries.dark_math import Coord, Rect, Size
+from models.tile import TILE_ID_BLACK
+from models.u5_map_level import U5MapLevel
+
+
+SIZE = Size[int](4, 3)
+
+
+def _level() -> tuple[U5MapLevel, bytearray]:
+    # tile_id = 10 * y + x, so every coord is distinguishable.
+    raw = bytearray(10 * y + x for y in range(SIZE.h) for x in range(SIZE.w))
+    return U5MapLevel(raw, SIZE), raw
+
+
+def test_get_tile_id_is_row_major():
+    level, _ = _level()
+    assert level.get_tile_id(Coord[int](0, 0)) == 0
+    assert level.get_tile_id(Coord[int](3, 0)) == 3
+    assert level.get_tile_id(Coord[int](1, 2)) == 21
+
+
+def test_get_tile_id_returns_plain_int():
+    level, _ = _level()
+    assert type(level.get_tile_id(Coord[int](2, 1))) is int
+
+
+def test_get_tile_id_out_of_bounds_is_none():
+    level, _ = _level()
+    assert level.get_tile_id(Coord[int](-1, 0)) is None
+    assert level.get_tile_id(Coord[int](0, -1)) is None
+    assert level.get_tile_id(Coord[int](4, 0)) is None
+    assert level.get_tile_id(Coord[int](0, 3)) is None
+
+
+def test_level_is_a_view_over_the_source_buffer():
+    level, raw = _level()
+    raw[5] = 99
+    assert level.get_tile_id(Coord[int](1, 1)) == 99
+    assert level.tile_ids[1, 1] == 99
+
+
+def test_set_tile_id_visible_through_array_and_lookup():
+    level, _ = _level()
+    level.set_tile_id(Coord[int](2, 2), 200)
+    assert level.get_tile_id(Coord[int](2, 2)) == 200
+    assert level.tile_ids[2, 2] == 200
+
+
+def test_immutable_bytes_are_copied_so_level_stays_writable():
+    level = U5MapLevel(bytes(SIZE.w * SIZE.h), SIZE)
+    level.set_tile_id(Coord[int](0, 0), 7)
+    assert level.get_tile_id(Coord[int](0, 0)) == 7
+
+
+def test_tile_ids_shape_is_height_by_width():
+    level, _ = _level()
+    assert level.tile_ids.shape == (SIZE.h, SIZE.w)
+    assert level.tile_ids.dtype == np.uint8
+
+
+def test_get_tile_ids_inside_bounds():
+    level, _ = _level()
+    block = level.get_tile_ids(Rect[int](Coord[int](1, 1), Size[int](2, 2)))
+    assert block.tolist() == [[11, 12], [21, 22]]
+
+
+def test_get_tile_ids_pads_out_of_bounds():
+    level, _ = _level()
+    block = level.get_tile_ids(Rect[int](Coord[int](-1, 2), Size[int](3, 2)))
+    assert block.tolist() == [
+        [TILE_ID_BLACK, 20, 21],
+        [TILE_ID_BLACK, TILE_ID_BLACK, TILE_ID_BLACK],
+    ]
+
+
+def test_get_tile_ids_returns_a_copy():
+    level, _ = _level()
+    block = level.get_tile_ids(Rect[int](Coord[int](0, 0), SIZE))
+    block[0, 0] = 123
+    assert level.get_tile_id(Coord[int](0, 0)) == 0
+
+
+def test_iteration_matches_dict_semantics():
+    level, _ = _level()
+    as_dict = dict(level)
+    assert len(as_dict) == SIZE.w * SIZE.h
+    assert as_dict[Coord[int](3, 2)] == 23
+    assert all(level.get_tile_id(coord) == tile_id for coord, tile_id in level)
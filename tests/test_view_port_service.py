@@ -0,0 +1,165 @@
+import pygame
+
+from dark_libraries.dark_math import Coord, Rect
+from data.global_registry import GlobalRegistry
+from models.enums.ega_palette_values import EgaPaletteValues
+from service_implementations.surface_factory_implementation import SurfaceFactoryImplementation
+from services.view_port_service import ViewPortService
+from view.display_config import DisplayConfig
+from view.scaled_surface_cache import ScaledSurfaceCache
+from view.view_port import ViewPort
+
+
+class _FakeTile:
+    def __init__(self, tile_id: int):
+        self.tile_id = tile_id
+        self.surface = pygame.Surface((16, 16))
+
+    def get_surface(self, inverted = False) -> pygame.Surface:
+        return self.surface
+
+    def blit_to_surface(self, target_surface: pygame.Surface, pixel_offset: Coord[int], inverted = False):
+        target_surface.blit(self.surface, pixel_offset.to_tuple())
+
+
+class _FakeViewPortDataProvider:
+    def __init__(self):
+        self.tiles = dict[Coord[int], _FakeTile]()
+        self.default_tile: _FakeTile = None
+
+    def set_default_tile(self, tile):
+        self.default_tile = tile
+
+    def get_party_map_data(self, world_view_rect: Rect[int]) -> dict:
+        return {world_coord: self.tiles.get(world_coord, GRASS) for world_coord in world_view_rect}
+
+    get_combat_map_data = get_party_map_data
+
+
+class _FakePartyAgent:
+    coord = Coord[int](8, 8)
+
+
+class _FakeSprite:
+    def __init__(self, tile: _FakeTile):
+        self.tile = tile
+
+    def get_current_frame(self, _time: float) -> _FakeTile:
+        return self.tile
+
+
+GRASS  = _FakeTile(5)
+WATER  = _FakeTile(1)
+CURSOR = _FakeTile(2)
+
+CELL_COUNT = DisplayConfig.VIEW_PORT_SIZE.w * DisplayConfig.VIEW_PORT_SIZE.h
+
+
+def _service() -> ViewPortService:
+    registry = GlobalRegistry()
+    registry.colors.register(EgaPaletteValues.Black, 0)
+    for tile_id in (0, 5, 255):
+        registry.tiles.register(tile_id, _FakeTile(tile_id))
+
+    view_port = ViewPort()
+    view_port.display_config = DisplayConfig()
+    view_port.global_registry = registry
+    view_port.surface_factory = SurfaceFactoryImplementation()
+    view_port.scaled_surface_cache = ScaledSurfaceCache()
+    view_port.scaled_surface_cache.display_config = DisplayConfig()
+    view_port._after_inject()
+
+    service = ViewPortService()
+    service.display_config = DisplayConfig()
+    service.global_registry = registry
+    service.party_agent = _FakePartyAgent()
+    service.view_port = view_port
+    service.view_port_data_provider = _FakeViewPortDataProvider()
+    service._after_inject()
+    service.set_party_mode()
+    return service
+
+
+def test_first_frame_draws_every_cell():
+    service = _service()
+    service.render()
+    assert service.last_frame_blit_count == CELL_COUNT
+
+
+def test_unchanged_frame_draws_nothing():
+    service = _service()
+    service.render()
+    service.render()
+    assert service.last_frame_blit_count == 0
+    assert service.frame_count == 2
+
+
+def test_unchanged_frame_leaves_output_untouched():
+    service = _service()
+    service.render()
+    scaled = service.view_port.get_output_surface()
+    scaled.fill((1, 2, 3))
+
+    service.render()
+    assert service.view_port.get_output_surface().get_at((0, 0))[:3] == (1, 2, 3)
+
+
+def test_only_changed_cells_are_redrawn():
+    service = _service()
+    service.render()
+
+    service.view_port_data_provider.tiles[Coord[int](3, 4)] = WATER
+    service.render()
+    assert service.last_frame_blit_count == 1
+
+
+def test_cursor_is_drawn_over_its_cell_and_painted_out_on_removal():
+    service = _service()
+    service.render()
+
+    service.set_cursor(1, Coord[int](8, 8), _FakeSprite(CURSOR))
+    service.render()
+    assert service.last_frame_blit_count == 2    # the cell, then the cursor over it.
+
+    service.remove_cursor(1)
+    service.render()
+    assert service.last_frame_blit_count == 1
+
+
+def test_party_moving_redraws_cells_that_changed():
+    service = _service()
+    service.view_port_data_provider.tiles[Coord[int](0, 0)] = WATER
+    service.render()
+
+    service.party_agent.coord = Coord[int](9, 8)
+    service.render()
+    # the water scrolled out of view, so only the cell it was in differs.
+    assert service.last_frame_blit_count == 1
+
+
+def test_inverting_colors_redraws_everything():
+    service = _service()
+    service.render()
+
+    service.invert_colors(True)
+    service.render()
+    assert service.last_frame_blit_count == CELL_COUNT
+
+
+def test_mode_change_redraws_everything():
+    service = _service()
+    service.render()
+
+    service.set_combat_mode()
+    service.render()
+    assert service.last_frame_blit_count == CELL_COUNT
+
+
+def test_invalidated_cells_are_redrawn_next_frame():
+    service = _service()
+    service.render()
+
+    # e.g. a projectile spanning two cells.
+    service._invalidate_unscaled_rect(pygame.Rect(20, 4, 16, 8))
+    service.render()
+    assert service.last_frame_blit_count == 2
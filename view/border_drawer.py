@@ -1,23 +1,29 @@
-import pygame
-
-from typing import Iterable
+from typing import Iterable, TYPE_CHECKING
 
 from dark_libraries.dark_math import Coord
 from models.border_glyphs import BorderGlyphs
 from models.u5_glyph import U5Glyph
 
+if TYPE_CHECKING:
+    from .scalable_component import ScalableComponent
+
 class BorderDrawer:
-    def __init__(self, border_glyphs: BorderGlyphs, target_surface: pygame.Surface):
+    def __init__(self, border_glyphs: BorderGlyphs, target_component: 'ScalableComponent'):
         self._glyphs = border_glyphs
-        self._target_surface = target_surface
+        self._target_component = target_component
 
     def _blit_at(self, glyph: U5Glyph, x: int, y: int):
-        glyph.blit_at_char_coord(Coord[int](x, y), self._target_surface)
+        self._target_component.blit_at_char_coord(glyph, Coord[int](x, y))
 
     def _blit(self, glyph: U5Glyph, coords: Iterable[tuple[int,int]]):
-        for coord in coords:
-            x, y = coord
-            self._blit_at(glyph, x, y)
+        with self.batched_blits():
+            for coord in coords:
+                x, y = coord
+                self._blit_at(glyph, x, y)
+
+    # Wrap a run of border drawing in this to have it all submitted in one Surface.blits call.
+    def batched_blits(self):
+        return self._target_component.batched_blits()
 
     def left(self, x: int, y_range: Iterable[int]):
         self._blit(
@@ -65,6 +65,8 @@ class InfoPanel(ScalableComponent):
 
     def __init__(self):
 
+        self._inverted_glyphs = dict[U5Glyph, U5Glyph]()
+
         self.set_glyph_rows_top([])
         self.set_glyph_rows_bottom([])
         self.set_highlighted_item(None)
@@ -78,7 +80,15 @@ class InfoPanel(ScalableComponent):
         super()._after_inject()
 
     def _clear(self):
-        self.get_input_surface().fill((0,0,0))
+        self.fill_unscaled((0,0,0))
+
+    def _get_inverted_glyph(self, glyph: U5Glyph) -> U5Glyph:
+        # Inverted once per glyph, rather than every frame, which also keeps the scaled surface cache from filling up.
+        inverted_glyph = self._inverted_glyphs.get(glyph, None)
+        if inverted_glyph is None:
+            inverted_glyph = glyph.invert_colors()
+            self._inverted_glyphs[glyph] = inverted_glyph
+        return inverted_glyph
 
     def set_highlighted_item(self, item_index: int):
         self._highlighted_item_index = item_index
@@ -148,12 +158,11 @@ class InfoPanel(ScalableComponent):
     # This ignores all cursor state and just plasters the glyphs at the given coord.
     # It will not wrap, scroll, or update any state.
     def _print_glyphs_at(self, glyphs: Iterable[U5Glyph], char_coord: Coord[int], vertikal = False):
-        target = self.get_input_surface()
         direction = Vector2[int](1, 0)
         if vertikal:
             direction = Vector2[int](0,1)
         for glyph in glyphs:
-            glyph.blit_at_char_coord(char_coord, target)
+            self.blit_at_char_coord(glyph, char_coord)
             char_coord = char_coord + direction
 
     def _draw_border(self, y: int, border_glyphs: Iterable[U5Glyph], inset_glyphs: Iterable[U5Glyph]):
@@ -217,6 +226,10 @@ class InfoPanel(ScalableComponent):
         ]
 
     def draw(self):
+        with self.batched_blits():
+            self._draw()
+
+    def _draw(self):
 
         self._clear()
 
@@ -228,7 +241,7 @@ class InfoPanel(ScalableComponent):
         # draw_top_content
         for index, glyph_row in enumerate(self._glyph_rows_top):
             if index == self._highlighted_item_index:
-                glyph_row = [glyph.invert_colors() for glyph in glyph_row]
+                glyph_row = [self._get_inverted_glyph(glyph) for glyph in glyph_row]
             self._print_glyphs_at(glyph_row, self._top_content_rect.minimum_corner + Vector2[int](0, index))
 
         if self._split:
@@ -46,14 +46,17 @@ class InteractiveConsole(ScalableComponent):
     # This will print at the bottom of the screen and scroll by rolling the component surface upwards.
     # It maintains an x-axis cursor state.
     def print_glyphs(self, glyphs: Iterable[U5Glyph], include_carriage_return: bool = True, no_prompt = False):
+        with self.batched_blits():
+            self._print_glyphs(glyphs, include_carriage_return, no_prompt)
+
+    def _print_glyphs(self, glyphs: Iterable[U5Glyph], include_carriage_return: bool, no_prompt: bool):
 
-        target = self.get_input_surface()
         for glyph in glyphs:
             if self._cursor_x >= self.display_config.CONSOLE_SIZE.w:
                 self._scroll()
                 self._return()
             char_coord = Coord[int](self._cursor_x, self._cursor_y)
-            glyph.blit_at_char_coord(char_coord, target)
+            self.blit_at_char_coord(glyph, char_coord)
             self._advance()
 
         if include_carriage_return:
@@ -77,7 +80,7 @@ class InteractiveConsole(ScalableComponent):
         self._erase_cursor()
         self._cursor_x -= 1
         coord = Coord[int](self._cursor_x, self._cursor_y)
-        self._blank_glyph.blit_at_char_coord(coord, self.get_input_surface())
+        self.blit_at_char_coord(self._blank_glyph, coord)
 
     def _scroll(self, lines: int = 1):
         self._erase_cursor()
@@ -91,25 +94,24 @@ class InteractiveConsole(ScalableComponent):
 
     def _prompt(self):
         if self._border_drawer is None: 
-            self._border_drawer = BorderDrawer(self.global_registry.blue_border_glyphs, self.get_input_surface())
+            self._border_drawer = BorderDrawer(self.global_registry.blue_border_glyphs, self)
 
         self._border_drawer.right_prompt(self._cursor_x, self._cursor_y)
         self._advance()
 
     def _erase_cursor(self):
-        target = self.get_input_surface()
         coord = Coord[int](self._cursor_x, self._cursor_y)
-        self._blank_glyph.blit_at_char_coord(coord, target)
+        self.blit_at_char_coord(self._blank_glyph, coord)
 
     def _draw_cursor(self):
-        target = self.get_input_surface()
         coord = Coord[int](self._cursor_x, self._cursor_y)
         current_frame: U5Glyph = self._cursor_sprite.get_current_frame(0.0)
-        current_frame.blit_at_char_coord(coord, target)
+        self.blit_at_char_coord(current_frame, coord)
 
     def draw(self):
         #
         # NOTE: We preserve whatever already exists on the input surface, apart from animating the cursor
         #
-        self._erase_cursor()
-        self._draw_cursor()
+        with self.batched_blits():
+            self._erase_cursor()
+            self._draw_cursor()
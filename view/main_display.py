@@ -72,7 +72,7 @@ class MainDisplay(ScalableComponent):
         self.celestial_glyphs[0] = self.font_mapper.map_code("IBM.CH", CelestialGlyphCodes.BLANK.value)
 
         assert self.global_registry.blue_border_glyphs.vertical_block, "Must have a vertical_block"
-        self.drawer = BorderDrawer(self.global_registry.blue_border_glyphs, self.get_input_surface())
+        self.drawer = BorderDrawer(self.global_registry.blue_border_glyphs, self)
 
 
         self.char_x_middle = self.viewport_width_in_glyphs + 1
@@ -88,6 +88,10 @@ class MainDisplay(ScalableComponent):
         self.draw_borders()
 
     def draw_borders(self):
+        with self.batched_blits():
+            self._draw_borders()
+
+    def _draw_borders(self):
         drawer = self.drawer
 
         drawer.left      (                 0, self.y_range_full)
@@ -122,25 +126,26 @@ class MainDisplay(ScalableComponent):
 
     def draw_celestial_panorama(self):
 
-        surf = self.get_input_surface()
-
         # Sun and moons
 
         for cursor, glyph_code in enumerate(self.world_clock.get_celestial_panorama()):
             glyph = self.celestial_glyphs[glyph_code]
-            glyph.blit_at_char_coord(Coord[int](self.celestial_char_offset + cursor + 1, 0), surf)
+            self.blit_at_char_coord(glyph, Coord[int](self.celestial_char_offset + cursor + 1, 0))
 
     def draw_wind_direction(self):
-        surf = self.get_input_surface()
         char_y_bottom = self.size_in_glyphs.h - 1
 
         for cursor, glyph in enumerate(self.font_mapper.map_ascii_string("East  Winds")):
-            glyph.blit_at_char_coord(Coord[int](self.celestial_char_offset + cursor + 2, char_y_bottom), surf)
+            self.blit_at_char_coord(glyph, Coord[int](self.celestial_char_offset + cursor + 2, char_y_bottom))
 
     def set_info_panel_split_state(self, split: bool):
         self._info_panel_split = split
 
     def draw(self):
+        with self.batched_blits():
+            self._draw()
+
+    def _draw(self):
         self.draw_celestial_panorama()
         self.draw_wind_direction()
 
@@ -1,15 +1,26 @@
+from contextlib import contextmanager
+from typing import Iterable
+
 import pygame
 
-from dark_libraries.dark_math import Size
+from dark_libraries.dark_math import Coord, Size
 from data.global_registry import GlobalRegistry
 from models.enums.ega_palette_values import EgaPaletteValues
+from models.u5_glyph import U5Glyph
 from services.surface_factory import SurfaceFactory
 
+from .scaled_surface_cache import ScaledSurfaceCache
+
+#
+# Components are laid out in unscaled pixels, but draw straight onto a surface that is already scaled, using surfaces
+# that were scaled once up front (see ScaledSurfaceCache).  That way there's no full-surface scale every frame.
+#
 class ScalableComponent:
 
     # Injectable
     global_registry: GlobalRegistry
     surface_factory: SurfaceFactory
+    scaled_surface_cache: ScaledSurfaceCache
 
     def __init__(self, unscaled_size_in_pixels: Size[int], scale_factor: int):
         super().__init__()
@@ -17,52 +28,105 @@ class ScalableComponent:
         self._scale_factor = scale_factor
 
     def _after_inject(self):
-        self._unscaled_surface = self.surface_factory.create_surface(self._unscaled_size_in_pixels)
         self._scaled_surface   = self.surface_factory.create_surface(self._unscaled_size_in_pixels.scale(self._scale_factor))
         self._back_color       = EgaPaletteValues.Black
 
+        # (scaled surface, scaled dest) pairs waiting for a single Surface.blits call, see batched_blits.
+        self._queued_blits = list[tuple[pygame.Surface, tuple[int, int]]]()
+        self._batch_depth = 0
+
     def _rgb_back_color(self) -> int:
         return self.global_registry.colors.get(self._back_color)
 
     def _clear(self):
-        rgb_mapped = self._rgb_back_color()
-        self._scaled_surface.fill(rgb_mapped)
-        self._unscaled_surface.fill(rgb_mapped)
+        self._flush_blits()
+        self._scaled_surface.fill(self._rgb_back_color())
 
     def unscaled_size(self) -> Size[int]:
         return self._unscaled_size_in_pixels
-    
+
     def scaled_size(self) -> Size[int]:
         return self._unscaled_size_in_pixels.scale(self._scale_factor)
 
-    def get_input_surface(self) -> pygame.Surface:
-        return self._unscaled_surface
+    def _to_scaled_rect(self, unscaled_rect: tuple[int, int, int, int]) -> pygame.Rect:
+        x, y, w, h = unscaled_rect
+        return pygame.Rect(x * self._scale_factor, y * self._scale_factor, w * self._scale_factor, h * self._scale_factor)
+
+    def _to_unscaled_rect(self, scaled_rect: pygame.Rect) -> pygame.Rect:
+        # Rounds outwards, so the result covers every unscaled pixel that was touched.
+        left, top = scaled_rect.left // self._scale_factor, scaled_rect.top // self._scale_factor
+        right, bottom = -(-scaled_rect.right // self._scale_factor), -(-scaled_rect.bottom // self._scale_factor)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    #
+    # Blits made inside a batched_blits block are queued up and handed to Surface.blits in one go when the (outermost)
+    # block exits.  Anything that isn't a blit (fills, scrolls, lines) flushes the queue first, so drawing order holds.
+    #
+    @contextmanager
+    def batched_blits(self):
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_blits()
+
+    def _flush_blits(self):
+        if self._queued_blits:
+            self._scaled_surface.blits(self._queued_blits, doreturn = False)
+            self._queued_blits.clear()
+
+    def _queue_blits(self, scaled_blits: Iterable[tuple[pygame.Surface, tuple[int, int]]]):
+        self._queued_blits.extend(scaled_blits)
+        if self._batch_depth == 0:
+            self._flush_blits()
+
+    # Returns the unscaled pixel rect that was drawn over.
+    def blit_unscaled(self, unscaled_surface: pygame.Surface, unscaled_pixel_coord: tuple[int, int]) -> pygame.Rect:
+        x, y = int(unscaled_pixel_coord[0]), int(unscaled_pixel_coord[1])
+        scaled_surface = self.scaled_surface_cache.get_scaled_surface(unscaled_surface)
+        scaled_dest = (x * self._scale_factor, y * self._scale_factor)
+        if self._batch_depth == 0:
+            self._scaled_surface.blit(scaled_surface, scaled_dest)
+        else:
+            self._queued_blits.append((scaled_surface, scaled_dest))
+        return unscaled_surface.get_rect(topleft = (x, y))
+
+    def blit_at_char_coord(self, glyph: U5Glyph, char_coord: Coord[int]):
+        glyph_surface = glyph.get_surface()
+        glyph_w, glyph_h = glyph_surface.get_size()
+        self.blit_unscaled(glyph_surface, (char_coord[0] * glyph_w, char_coord[1] * glyph_h))
+
+    def fill_unscaled(self, rgb_mapped_color: int, unscaled_rect: tuple[int, int, int, int] = None):
+        self._flush_blits()
+        if unscaled_rect is None:
+            self._scaled_surface.fill(rgb_mapped_color)
+        else:
+            self._scaled_surface.fill(rgb_mapped_color, self._to_scaled_rect(unscaled_rect))
 
     def get_output_surface(self) -> pygame.Surface:
-        pygame.transform.scale_by(
-            surface      = self._unscaled_surface,
-            factor       = self._scale_factor,
-            dest_surface = self._scaled_surface
-        )
+        self._flush_blits()
         return self._scaled_surface
-   
+
     def scroll_dx(self, dx: int):
-        self._unscaled_surface.scroll(dx = dx, dy = 0)
+        self._flush_blits()
+        self._scaled_surface.scroll(dx = dx * self._scale_factor, dy = 0)
         fill_rect = (
             (self._unscaled_size_in_pixels.w + dx) % self._unscaled_size_in_pixels.w,
             0,
             abs(dx),
             self._unscaled_size_in_pixels.h
         )
-        self._unscaled_surface.fill(self._back_color, fill_rect)
+        self.fill_unscaled(self._rgb_back_color(), fill_rect)
 
     def scroll_dy(self, dy: int):
-        self._unscaled_surface.scroll(dx = 0, dy = dy)
+        self._flush_blits()
+        self._scaled_surface.scroll(dx = 0, dy = dy * self._scale_factor)
         fill_rect = (
             0,
             (self._unscaled_size_in_pixels.h + dy) % self._unscaled_size_in_pixels.h,
             self._unscaled_size_in_pixels.w,
             abs(dy)
         )
-        self._unscaled_surface.fill(self._rgb_back_color(), fill_rect)
-       
\ No newline at end of file
+        self.fill_unscaled(self._rgb_back_color(), fill_rect)
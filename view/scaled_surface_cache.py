@@ -0,0 +1,69 @@
+import pygame
+
+from dark_libraries.dark_surface import DarkSurface
+from dark_libraries.logging import LoggerMixin
+
+from data.global_registry import GlobalRegistry
+from models.border_glyphs import BorderGlyphs
+from models.tile import Tile
+
+from .display_config import DisplayConfig
+
+#
+# Everything that ends up on screen (tiles, sprite frames, glyphs) gets scaled up to DisplayConfig.SCALE_FACTOR exactly
+# once, so that ScalableComponents can draw straight onto their scaled surface instead of scaling the whole thing
+# every frame.
+#
+# Scaled surfaces are looked up by the source surface itself, so a Tile's inverted surface gets its own scaled copy.
+# Source surfaces must not be drawn on once they've been scaled.
+#
+class ScaledSurfaceCache(LoggerMixin):
+
+    # Injectable
+    display_config:  DisplayConfig
+    global_registry: GlobalRegistry
+
+    def __init__(self):
+        super().__init__()
+        self._scaled_surfaces = dict[pygame.Surface, pygame.Surface]()
+
+    def __len__(self) -> int:
+        return len(self._scaled_surfaces)
+
+    def get_scaled_surface(self, surface: pygame.Surface) -> pygame.Surface:
+        scaled_surface = self._scaled_surfaces.get(surface, None)
+        if scaled_surface is None:
+            # keeps the colorkey, so transparent glyphs stay transparent.
+            scaled_surface = pygame.transform.scale_by(surface, self.display_config.SCALE_FACTOR)
+            self._scaled_surfaces[surface] = scaled_surface
+        return scaled_surface
+
+    def _prescale_dark_surface(self, dark_surface: DarkSurface):
+        self.get_scaled_surface(dark_surface.get_surface())
+        if isinstance(dark_surface, Tile):
+            self.get_scaled_surface(dark_surface.get_surface(inverted = True))
+
+    def _prescale_border_glyphs(self, border_glyphs: BorderGlyphs):
+        if border_glyphs is None:
+            return
+        for glyph in border_glyphs.__dict__.values():
+            if not glyph is None:
+                self._prescale_dark_surface(glyph)
+
+    def prescale_registry(self):
+
+        dark_surfaces = list[DarkSurface]()
+        dark_surfaces.extend(self.global_registry.tiles.values())
+        dark_surfaces.extend(self.global_registry.font_glyphs.values())
+        for sprite_registry in (self.global_registry.sprites, self.global_registry.cursors, self.global_registry.projectile_sprites):
+            for sprite in sprite_registry.values():
+                dark_surfaces.extend(sprite.frames)
+
+        for dark_surface in dark_surfaces:
+            if not dark_surface.get_surface() is None:
+                self._prescale_dark_surface(dark_surface)
+
+        self._prescale_border_glyphs(self.global_registry.blue_border_glyphs)
+        self._prescale_border_glyphs(self.global_registry.scroll_border_glyphs)
+
+        self.log(f"Pre-scaled {len(self)} surfaces by x{self.display_config.SCALE_FACTOR}")
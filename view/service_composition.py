@@ -6,9 +6,11 @@ from .interactive_console import InteractiveConsole
 from .view_port           import ViewPort
 from .main_display        import MainDisplay
 from .info_panel          import InfoPanel
+from .scaled_surface_cache import ScaledSurfaceCache
 
 def compose(provider: ServiceProvider):
     provider.register(DisplayConfig)
+    provider.register(ScaledSurfaceCache)
     provider.register(ViewPort)
     provider.register(InteractiveConsole)
     provider.register(MainDisplay)
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 import pygame
 from dark_libraries.dark_math import Coord, Rect
 from dark_libraries.dark_surface import DarkSurface
@@ -36,20 +38,28 @@ class ViewPort(ScalableComponent, LoggerMixin):
         unscaled_pixel_coord = view_coord * self.display_config.TILE_SIZE
         self.draw_object_at_unscaled_coord(unscaled_pixel_coord, tile, inverted)
 
-    def draw_object_at_unscaled_coord(self, unscaled_pixel_coord: Coord[int], dark_surface: DarkSurface, inverted: bool):
-
-        dark_surface.blit_to_surface(
-            target_surface = self.get_input_surface(), 
-            pixel_offset   = unscaled_pixel_coord,
-            inverted       = inverted
+    def draw_tiles_to_view_coords(self, view_coords_and_tiles: Iterable[tuple[Coord[int], Tile]], inverted: bool):
+        # The bulk version of draw_tile_to_view_coord, which skips the per tile method calls and Coord arithmetic.
+        get_scaled_surface = self.scaled_surface_cache.get_scaled_surface
+        scaled_tile_w = self.display_config.TILE_SIZE.w * self._scale_factor
+        scaled_tile_h = self.display_config.TILE_SIZE.h * self._scale_factor
+        self._queue_blits(
+            (get_scaled_surface(tile.get_surface(inverted)), (view_x * scaled_tile_w, view_y * scaled_tile_h))
+            for (view_x, view_y), tile in view_coords_and_tiles
         )
 
-    def draw_unscaled_line(self, start_coord: Coord[int], end_coord: Coord[int], rgb_mapped_color: int):
-        pygame.draw.line(
-            surface   = self.get_input_surface(),
+    # Returns the unscaled pixel rect that was drawn over.
+    def draw_object_at_unscaled_coord(self, unscaled_pixel_coord: Coord[int], dark_surface: DarkSurface, inverted: bool) -> pygame.Rect:
+        return self.blit_unscaled(dark_surface.get_surface(inverted), unscaled_pixel_coord)
+
+    # Returns the unscaled pixel rect that was drawn over.
+    def draw_unscaled_line(self, start_coord: Coord[int], end_coord: Coord[int], rgb_mapped_color: int) -> pygame.Rect:
+        self._flush_blits()
+        scaled_rect = pygame.draw.line(
+            surface   = self._scaled_surface,
             color     = rgb_mapped_color,
-            start_pos = start_coord,
-            end_pos   = end_coord,
-            width = BIBLICALLY_ACCURATE_MISC_LINE_THICCNESS
+            start_pos = (start_coord[0] * self._scale_factor, start_coord[1] * self._scale_factor),
+            end_pos   = (end_coord[0]   * self._scale_factor, end_coord[1]   * self._scale_factor),
+            width     = BIBLICALLY_ACCURATE_MISC_LINE_THICCNESS * self._scale_factor
         )
-        
+        return self._to_unscaled_rect(scaled_rect)